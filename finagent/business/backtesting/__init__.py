@@ -0,0 +1,63 @@
+"""
+Module de backtesting des stratégies de trading.
+
+Ce module simule l'exécution d'une stratégie parsée sur un historique
+de barres (plusieurs symboles) et calcule courbes de capital, trades et
+métriques de performance, soit de façon vectorielle, soit barre par
+barre à travers la chaîne du moteur de stratégies. L'optimiseur répartit
+les backtests d'un espace de paramètres sur un pool de processus.
+"""
+
+from .vectorized_backtester import (
+    VectorizedBacktester,
+    BacktestConfig,
+    BacktestResult,
+    BacktestError
+)
+
+from .event_backtester import (
+    EventDrivenBacktester,
+    SimulatedBroker,
+    SimulatedClock
+)
+
+from .optimizer import (
+    ParameterOptimizer,
+    ParameterSpace,
+    ParameterRange,
+    OptimizationResult,
+    OptimizationError,
+    TrialResult,
+    WalkForwardWindow,
+    apply_parameters,
+    walk_forward_windows
+)
+
+from .metrics import compute_performance_metrics
+
+__all__ = [
+    # Backtest vectoriel
+    'VectorizedBacktester',
+    'BacktestConfig',
+    'BacktestResult',
+    'BacktestError',
+    
+    # Backtest événementiel
+    'EventDrivenBacktester',
+    'SimulatedBroker',
+    'SimulatedClock',
+    
+    # Optimisation des paramètres
+    'ParameterOptimizer',
+    'ParameterSpace',
+    'ParameterRange',
+    'OptimizationResult',
+    'OptimizationError',
+    'TrialResult',
+    'WalkForwardWindow',
+    'apply_parameters',
+    'walk_forward_windows',
+    
+    # Métriques
+    'compute_performance_metrics'
+]
@@ -0,0 +1,632 @@
+"""
+Backtest événementiel (barre par barre) des stratégies.
+
+Les barres historiques sont rejouées dans la chaîne de production
+``StrategyEngine`` → ``SignalGenerator`` → ``PortfolioAllocator`` (et
+``StrategyRiskManager`` si fourni), avec une horloge et un courtier
+simulés. Cette simulation capture la logique dépendante du chemin
+(stop-loss/take-profit des règles, contraintes d'allocation, limites de
+risque) que le backtest vectoriel ne peut pas représenter.
+
+Le rejeu est conçu pour de longs historiques (une année de barres
+minute): les contextes d'exécution et les données de marché sont créés
+une fois par symbole puis mis à jour en place, l'historique est exposé
+par une fenêtre croissante sans copie, et les indicateurs sont mis à
+jour de façon incrémentale par le registre partagé du moteur.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finagent.business.strategy.engine.signal_generator import SignalType, TradingSignal
+from finagent.business.strategy.engine.strategy_engine import (
+    ExecutionContext, ExecutionMode, StrategyEngine
+)
+from finagent.business.strategy.manager.portfolio_allocator import PortfolioAllocator
+from finagent.business.strategy.models.strategy_models import StopLossType, Strategy
+from finagent.business.strategy.parser.vector_compiler import PriceFrame
+from finagent.data.indicators.streaming import StreamingATR
+
+from .metrics import compute_performance_metrics
+from .vectorized_backtester import (
+    EXIT_END, EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT,
+    BacktestConfig, BacktestError, BacktestResult, _TradeLog, _align_benchmark, _date_window
+)
+
+logger = logging.getLogger(__name__)
+
+# Motif de sortie associé à chaque signal de clôture
+_EXIT_REASONS = {
+    SignalType.SELL: EXIT_SIGNAL,
+    SignalType.STOP_LOSS: EXIT_STOP_LOSS,
+    SignalType.TAKE_PROFIT: EXIT_TAKE_PROFIT
+}
+
+_BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class SimulatedClock:
+    """Horloge simulée: l'heure courante est celle de la barre rejouée."""
+
+    def __init__(self, start: Optional[datetime] = None):
+        """
+        Initialise l'horloge.
+
+        Args:
+            start: Heure initiale (heure réelle tant qu'aucune barre n'est rejouée)
+        """
+        self._now = start
+
+    def now(self) -> datetime:
+        """Retourne l'heure simulée."""
+        return self._now or datetime.now()
+
+    def advance(self, timestamp: datetime) -> None:
+        """
+        Avance l'horloge à l'horodatage d'une barre.
+
+        Args:
+            timestamp: Horodatage de la barre rejouée
+        """
+        self._now = timestamp
+
+
+class BarWindow:
+    """
+    Fenêtre croissante sur l'historique d'un symbole.
+
+    Les colonnes sont exposées en attributs (vues NumPy sans copie), comme
+    une BarSeries: le registre d'indicateurs n'intègre ainsi que la barre
+    ajoutée. L'accès par index retourne la barre sous forme de dictionnaire,
+    format attendu par les évaluateurs de règles.
+    """
+
+    __slots__ = ('_columns', '_timestamps', 'length')
+
+    def __init__(self, columns: Dict[str, np.ndarray], timestamps: np.ndarray):
+        """
+        Initialise la fenêtre (vide).
+
+        Args:
+            columns: Colonnes OHLCV complètes du symbole
+            timestamps: Horodatages des barres
+        """
+        self._columns = columns
+        self._timestamps = timestamps
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._bar(i) for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Index de barre hors de la fenêtre")
+        return self._bar(index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self.length]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._columns['open'][:self.length]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._columns['high'][:self.length]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._columns['low'][:self.length]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._columns['close'][:self.length]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._columns['volume'][:self.length]
+
+    def _bar(self, i: int) -> Dict[str, Any]:
+        bar = {name: float(self._columns[name][i]) for name in _BAR_FIELDS}
+        bar['timestamp'] = self._timestamps[i]
+        return bar
+
+
+class SimulatedBroker:
+    """
+    Courtier simulé: ordres, positions et trésorerie d'un backtest.
+
+    Les ordres soumis à la clôture d'une barre sont exécutés à l'ouverture
+    de la barre suivante du symbole, avec slippage et commissions
+    proportionnels. Les stop-loss et take-profit de la configuration sont
+    déclenchés sur les plus bas/plus hauts de la barre, comme dans le
+    backtest vectoriel.
+
+    Le courtier sert aussi de fournisseur de prix au ``SignalGenerator``
+    (prix de clôture de la barre courante).
+    """
+
+    def __init__(self, symbols: List[str], config: BacktestConfig, clock: SimulatedClock):
+        """
+        Initialise le courtier.
+
+        Args:
+            symbols: Univers du backtest
+            config: Paramètres de simulation
+            clock: Horloge simulée
+        """
+        self.config = config
+        self.clock = clock
+        self.symbols = symbols
+        self.cash = float(config.initial_capital)
+
+        # Positions (dictionnaires partagés avec les données de marché des contextes)
+        self.positions: Dict[str, Dict[str, Any]] = {symbol: self._flat_position() for symbol in symbols}
+        self.last_price: Dict[str, float] = {symbol: float('nan') for symbol in symbols}
+        self.orders: Dict[str, Tuple[str, float, str]] = {}
+        self._held: Dict[str, None] = {}
+
+        # ATR incrémental, pour les niveaux de sortie basés sur l'ATR
+        needs_atr = any(
+            value is not None and kind == StopLossType.ATR_BASED
+            for value, kind in ((config.stop_loss, config.stop_loss_type),
+                                (config.take_profit, config.take_profit_type))
+        )
+        self._atr = {symbol: StreamingATR(config.atr_period) for symbol in symbols} if needs_atr else {}
+
+        # État du portefeuille lu par le SignalGenerator (mis à jour en place)
+        self.portfolio_state: Dict[str, Any] = {
+            'total_value': self.cash,
+            'available_capital': self.cash,
+            'available_cash': self.cash,
+            'invested_value': 0.0,
+            'positions': self.positions
+        }
+
+        self.trades = _TradeLog()
+        self.costs = {'commission': 0.0, 'slippage': 0.0}
+        self.stats = {'orders_submitted': 0, 'orders_filled': 0, 'orders_cancelled': 0}
+        self._symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    async def initialize(self) -> None:
+        """Interface de fournisseur de données (rien à initialiser)."""
+
+    async def get_current_price(self, symbol: str) -> Dict[str, Any]:
+        """Prix de clôture de la barre courante du symbole."""
+        return {'price': self.last_price.get(symbol), 'timestamp': self.clock.now()}
+
+    async def get_market_conditions(self, symbol: str) -> Dict[str, Any]:
+        """Conditions de marché (non simulées)."""
+        return {}
+
+    def has_exposure(self, symbol: str) -> bool:
+        """Indique si le symbole est détenu ou a un ordre en attente."""
+        return symbol in self._held or symbol in self.orders
+
+    def submit_order(self, symbol: str, side: str, quantity: float = 0.0, reason: str = EXIT_SIGNAL) -> bool:
+        """
+        Soumet un ordre exécuté à la prochaine ouverture du symbole.
+
+        Une vente clôture toute la position et annule un achat en attente.
+
+        Args:
+            symbol: Symbole financier
+            side: ``buy`` ou ``sell``
+            quantity: Quantité à acheter (ignorée pour une vente)
+            reason: Motif de sortie d'une vente
+
+        Returns:
+            bool: True si l'ordre est retenu
+        """
+        if side == 'buy':
+            if self.has_exposure(symbol) or quantity <= 0:
+                return False
+            self.orders[symbol] = ('buy', quantity, '')
+        else:
+            pending = self.orders.get(symbol)
+            if pending is not None and pending[0] == 'buy':
+                del self.orders[symbol]
+                self.stats['orders_cancelled'] += 1
+                return False
+            if symbol not in self._held:
+                return False
+            self.orders[symbol] = ('sell', 0.0, reason)
+        self.stats['orders_submitted'] += 1
+        return True
+
+    def on_bar(self, symbol: str, bar: int, open_: float, high: float, low: float, close: float) -> None:
+        """
+        Traite une barre d'un symbole: ordres en attente à l'ouverture,
+        stop-loss puis take-profit sur l'étendue de la barre, valorisation.
+
+        Args:
+            symbol: Symbole financier
+            bar: Index de la barre dans la période simulée
+            open_, high, low, close: Prix de la barre
+        """
+        order = self.orders.pop(symbol, None)
+        if order is not None:
+            side, quantity, reason = order
+            if side == 'buy':
+                self._buy(symbol, quantity, open_, bar)
+            else:
+                self._sell(symbol, open_, bar, reason)
+
+        position = self.positions[symbol]
+        if symbol in self._held:
+            if low <= position['stop_loss']:
+                # Ouverture sous le stop (gap): exécution à l'ouverture
+                self._sell(symbol, min(open_, position['stop_loss']), bar, EXIT_STOP_LOSS)
+            elif high >= position['take_profit']:
+                self._sell(symbol, max(open_, position['take_profit']), bar, EXIT_TAKE_PROFIT)
+
+        atr = self._atr.get(symbol)
+        if atr is not None:
+            atr.update(close, high, low)
+
+        self.last_price[symbol] = close
+        if symbol in self._held:
+            position['market_value'] = position['quantity'] * close
+
+    def refresh(self) -> float:
+        """
+        Met à jour en place l'état du portefeuille.
+
+        Returns:
+            float: Valeur totale du portefeuille
+        """
+        invested = sum(self.positions[symbol]['market_value'] for symbol in self._held)
+        state = self.portfolio_state
+        state['invested_value'] = invested
+        state['total_value'] = self.cash + invested
+        state['available_capital'] = state['available_cash'] = self.cash
+        return self.cash + invested
+
+    def allocation_state(self, strategy_id: str, sector_of: Callable[[str], str]) -> Dict[str, Any]:
+        """
+        État du portefeuille au format du ``PortfolioAllocator``.
+
+        Les achats en attente sont comptés dans les expositions: plusieurs
+        signaux d'une même barre ne peuvent pas dépasser les limites.
+
+        Args:
+            strategy_id: Stratégie rejouée
+            sector_of: Secteur d'un symbole
+
+        Returns:
+            Dict: Valeurs, poids et expositions par symbole et par secteur
+        """
+        values = {symbol: self.positions[symbol]['market_value'] for symbol in self._held}
+        for symbol, (side, quantity, _) in self.orders.items():
+            if side == 'buy':
+                values[symbol] = quantity * self.last_price[symbol]
+
+        total = self.portfolio_state['total_value']
+        allocations = {symbol: value / total for symbol, value in values.items()} if total > 0 else {}
+        sectors: Dict[str, float] = {}
+        for symbol, weight in allocations.items():
+            sector = sector_of(symbol)
+            sectors[sector] = sectors.get(sector, 0.0) + weight
+
+        return {
+            'total_value': total,
+            'available_cash': self.cash,
+            'invested_value': self.portfolio_state['invested_value'],
+            'positions': values,
+            'allocations': allocations,
+            'sector_exposures': sectors,
+            'strategy_allocations': {strategy_id: sum(allocations.values())}
+        }
+
+    def close_all(self, bar: int, reason: str = EXIT_END) -> None:
+        """Clôture toutes les positions au dernier prix connu."""
+        for symbol in list(self._held):
+            self._sell(symbol, self.last_price[symbol], bar, reason)
+        self.orders.clear()
+
+    def _buy(self, symbol: str, quantity: float, raw_price: float, bar: int) -> None:
+        """Exécute un achat (quantité réduite au cash disponible)."""
+        config = self.config
+        fill = raw_price * (1.0 + config.slippage)
+        if quantity * fill * (1.0 + config.commission) > self.cash:
+            quantity = self.cash / (fill * (1.0 + config.commission))
+        if quantity <= 0 or not np.isfinite(fill):
+            return
+
+        cost = quantity * fill
+        fees = cost * config.commission
+        self.cash -= cost + fees
+        self.costs['commission'] += fees
+        self.costs['slippage'] += quantity * (fill - raw_price)
+
+        atr = self._atr[symbol].value if symbol in self._atr else None
+        position = self.positions[symbol]
+        position.update(
+            quantity=quantity,
+            entry_price=fill,
+            entry_cost=cost + fees,
+            entry_bar=bar,
+            market_value=quantity * raw_price,
+            stop_loss=_exit_level(config.stop_loss, config.stop_loss_type, fill, atr, -1.0),
+            take_profit=_exit_level(config.take_profit, config.take_profit_type, fill, atr, 1.0)
+        )
+        self._held[symbol] = None
+        self.stats['orders_filled'] += 1
+
+    def _sell(self, symbol: str, raw_price: float, bar: int, reason: str) -> None:
+        """Clôture la position d'un symbole."""
+        position = self.positions[symbol]
+        quantity = position['quantity']
+        fill = raw_price * (1.0 - self.config.slippage)
+        proceeds = quantity * fill
+        fees = proceeds * self.config.commission
+        pnl = proceeds - fees - position['entry_cost']
+
+        self.cash += proceeds - fees
+        self.costs['commission'] += fees
+        self.costs['slippage'] += quantity * (raw_price - fill)
+        self.trades.add(
+            symbol=np.array([self._symbol_index[symbol]]), entry_bar=np.array([position['entry_bar']]),
+            exit_bar=np.array([bar]), entry_price=np.array([position['entry_price']]),
+            exit_price=np.array([fill]), quantity=np.array([quantity]), pnl=np.array([pnl]),
+            **{'return': np.array([pnl / position['entry_cost']])},
+            exit_reason=np.array([reason], dtype=object)
+        )
+
+        position.update(self._flat_position())
+        del self._held[symbol]
+        self.stats['orders_filled'] += 1
+
+    @staticmethod
+    def _flat_position() -> Dict[str, Any]:
+        return {
+            'quantity': 0.0, 'entry_price': 0.0, 'entry_cost': 0.0, 'entry_bar': 0,
+            'market_value': 0.0, 'stop_loss': float('-inf'), 'take_profit': float('inf')
+        }
+
+
+class EventDrivenBacktester:
+    """
+    Moteur de backtest événementiel.
+
+    Chaque barre est évaluée par le ``StrategyEngine`` en mode backtest;
+    les signaux d'achat passent par l'allocateur (et le gestionnaire de
+    risques) avant d'être transmis au courtier simulé, les signaux de
+    sortie (vente, stop-loss, take-profit) sont exécutés directement.
+    Les conventions d'exécution sont celles du backtest vectoriel.
+    """
+
+    def __init__(self,
+                 allocator: Optional[PortfolioAllocator] = None,
+                 risk_manager=None,
+                 clock: Optional[SimulatedClock] = None):
+        """
+        Initialise le moteur.
+
+        Args:
+            allocator: Allocateur de portefeuille (créé sur l'horloge simulée si absent;
+                un allocateur fourni doit utiliser ``clock.now`` comme horloge)
+            risk_manager: Gestionnaire de risques appliqué aux achats (optionnel)
+            clock: Horloge simulée partagée
+        """
+        self.clock = clock or SimulatedClock()
+        self.allocator = allocator or PortfolioAllocator(clock=self.clock.now)
+        self.risk_manager = risk_manager
+
+    async def run(self,
+                  strategy: Strategy,
+                  data: Mapping[str, Any],
+                  config: Optional[BacktestConfig] = None,
+                  benchmark: Any = None) -> BacktestResult:
+        """
+        Rejoue l'historique barre par barre.
+
+        Args:
+            strategy: Stratégie parsée
+            data: Historique horodaté par symbole (BarSeries, DataFrame)
+            config: Paramètres de simulation (depuis la stratégie si absent)
+            benchmark: Historique du benchmark (BarSeries, DataFrame ou prix)
+
+        Returns:
+            BacktestResult: Courbes de capital, trades et métriques
+        """
+        name = strategy.strategy.name
+        if not data:
+            raise BacktestError("Aucun historique fourni", name)
+
+        config = config or BacktestConfig.from_strategy(strategy)
+        frames = {symbol: PriceFrame.from_data(series) for symbol, series in data.items()}
+        if any(frame.timestamps is None for frame in frames.values()):
+            raise BacktestError("Historique horodaté requis pour le rejeu", name)
+        symbols = list(frames)
+
+        # Calendrier commun et barres de chaque symbole à chaque date
+        stamps = {s: pd.DatetimeIndex(f.timestamps).to_numpy() for s, f in frames.items()}
+        timeline = np.unique(np.concatenate(list(stamps.values())))
+        schedule: List[List[Tuple[int, int]]] = [[] for _ in range(len(timeline))]
+        for row, symbol in enumerate(symbols):
+            for local, position in enumerate(np.searchsorted(timeline, stamps[symbol])):
+                schedule[position].append((row, local))
+
+        window = _date_window(timeline, config.start_date, config.end_date)
+        active = np.nonzero(window)[0] if window is not None else np.arange(len(timeline))
+        if len(active) < 2:
+            raise BacktestError("Historique insuffisant sur la période demandée", name)
+        first, last = int(active[0]), int(active[-1])
+        times = pd.DatetimeIndex(timeline).to_pydatetime()
+
+        broker = SimulatedBroker(symbols, config, self.clock)
+        engine = StrategyEngine(portfolio_manager=broker, execution_mode=ExecutionMode.BACKTEST)
+        engine.signal_generator.market_data_provider = broker
+        await engine.start()
+        await self.allocator.initialize()
+
+        stats = {'bars': 0, 'evaluations': 0, 'signals': 0,
+                 'allocation_rejected': 0, 'risk_rejected': 0}
+        n_bars = last - first + 1
+        equity = np.empty(n_bars)
+        cash = np.empty(n_bars)
+        position_values = np.zeros((len(symbols), n_bars))
+
+        try:
+            strategy_id = await engine.load_strategy(strategy, name)
+            compiled_rule = engine.compiled_rules[strategy_id]
+            if not compiled_rule.buy_conditions:
+                raise BacktestError("Aucune condition d'achat compilée (buy_conditions)", name)
+            timeframes = {c.metadata.get('timeframe', '1d')
+                          for c in compiled_rule.buy_conditions + compiled_rule.sell_conditions}
+
+            # Fenêtres, données de marché et contextes créés une fois par symbole
+            windows, market_data, contexts = [], [], []
+            for symbol in symbols:
+                columns = frames[symbol].columns
+                close = columns['close']
+                bars = BarWindow({
+                    'open': columns.get('open', close), 'high': columns.get('high', close),
+                    'low': columns.get('low', close), 'close': close,
+                    'volume': columns.get('volume', np.zeros(len(close)))
+                }, stamps[symbol])
+                data_view = {
+                    'symbol': symbol,
+                    'prices': {timeframe: bars for timeframe in timeframes},
+                    'price': float('nan'),
+                    'volume': 0.0,
+                    'position': broker.positions[symbol]
+                }
+                windows.append(bars)
+                market_data.append(data_view)
+                contexts.append(ExecutionContext(
+                    strategy_id=strategy_id, symbol=symbol, timestamp=times[first],
+                    market_data=data_view, portfolio_state=broker.portfolio_state,
+                    execution_mode=ExecutionMode.BACKTEST, metadata={}
+                ))
+
+            for t in range(last + 1):
+                updates = schedule[t]
+                for row, local in updates:
+                    windows[row].length = local + 1
+                if t < first:
+                    # Historique de préchauffage des indicateurs
+                    continue
+
+                bar = t - first
+                self.clock.advance(times[t])
+                for row, local in updates:
+                    columns = windows[row]._columns
+                    close = float(columns['close'][local])
+                    broker.on_bar(symbols[row], bar, float(columns['open'][local]),
+                                  float(columns['high'][local]), float(columns['low'][local]), close)
+                    market_data[row]['price'] = close
+                    market_data[row]['volume'] = float(columns['volume'][local])
+                broker.refresh()
+
+                for row, _ in updates:
+                    context = contexts[row]
+                    context.timestamp = times[t]
+                    result = await engine.execute_strategy(strategy_id, context)
+                    stats['evaluations'] += 1
+                    for signal in result.signals:
+                        stats['signals'] += 1
+                        await self._route_signal(signal, broker, strategy_id, stats)
+
+                for symbol in broker._held:
+                    position_values[broker._symbol_index[symbol], bar] = broker.positions[symbol]['market_value']
+                equity[bar] = broker.refresh()
+                cash[bar] = broker.cash
+                stats['bars'] += 1
+
+            if config.close_at_end and broker._held:
+                broker.close_all(n_bars - 1)
+                position_values[:, -1] = 0.0
+                equity[-1] = cash[-1] = broker.cash
+
+            stats['indicators'] = engine.rule_evaluator.indicator_registry.get_stats()
+        finally:
+            await engine.stop()
+
+        timestamps = timeline[first:last + 1]
+        benchmark_prices = _align_benchmark(benchmark, timestamps) if benchmark is not None else None
+        metrics = compute_performance_metrics(
+            equity, broker.trades.pnl(),
+            periods_per_year=config.periods_per_year,
+            risk_free_rate=config.risk_free_rate,
+            benchmark=benchmark_prices
+        )
+        metrics['total_return'] = metrics['relative_return']
+
+        logger.info(
+            f"Backtest événementiel {name}: {len(symbols)} symboles × {n_bars} barres, "
+            f"{stats['evaluations']} évaluations, {metrics['trades_count']} trades, "
+            f"rendement {metrics['total_return']:.2%}"
+        )
+        return BacktestResult(
+            strategy_name=name,
+            symbols=symbols,
+            timestamps=timestamps,
+            equity=equity,
+            cash=cash,
+            position_values=position_values,
+            trades=broker.trades.to_dataframe(symbols, timestamps),
+            metrics=metrics,
+            costs={**broker.costs, 'total': broker.costs['commission'] + broker.costs['slippage']},
+            config=config,
+            benchmark=benchmark_prices,
+            metadata={'mode': 'event_driven', **stats, **broker.stats}
+        )
+
+    async def _route_signal(self, signal: TradingSignal, broker: SimulatedBroker,
+                            strategy_id: str, stats: Dict[str, Any]) -> None:
+        """
+        Transmet un signal au courtier après allocation et contrôle des risques.
+
+        Args:
+            signal: Signal émis à la clôture de la barre
+            broker: Courtier simulé
+            strategy_id: Stratégie rejouée
+            stats: Compteurs du rejeu
+        """
+        reason = _EXIT_REASONS.get(signal.signal_type)
+        if reason is not None:
+            broker.submit_order(signal.symbol, 'sell', reason=reason)
+            return
+        if signal.signal_type != SignalType.BUY or broker.has_exposure(signal.symbol):
+            return
+
+        allocation = await self.allocator.allocate_signal(
+            signal, broker.allocation_state(strategy_id, self.allocator.get_symbol_sector)
+        )
+        if not allocation.is_approved:
+            stats['allocation_rejected'] += 1
+            return
+
+        quantity = signal.quantity or 0.0
+        if signal.price_target:
+            quantity = min(quantity, allocation.allocated_amount / signal.price_target)
+
+        if self.risk_manager is not None:
+            assessment = await self.risk_manager.assess_signal_risk(signal, broker.portfolio_state)
+            if not assessment.is_acceptable:
+                stats['risk_rejected'] += 1
+                return
+
+        broker.submit_order(signal.symbol, 'buy', quantity)
+
+
+def _exit_level(value: Optional[float], kind: StopLossType, fill: float,
+                atr: Optional[float], direction: float) -> float:
+    """Niveau de stop (direction -1) ou d'objectif (+1) fixé à l'entrée."""
+    if value is not None:
+        if kind == StopLossType.ATR_BASED and atr is not None:
+            return fill + direction * value * atr
+        if kind == StopLossType.PERCENTAGE:
+            return fill * (1.0 + direction * value)
+    return float('-inf') if direction < 0 else float('inf')
@@ -0,0 +1,164 @@
+"""
+Métriques de performance d'une courbe de capital.
+
+Les conventions sont celles du PerformanceTracker: drawdowns, VaR,
+CVaR et perte moyenne exprimés en valeurs positives, ratios annualisés
+sur la base de 252 séances.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def compute_performance_metrics(
+    equity: np.ndarray,
+    trade_pnl: Optional[np.ndarray] = None,
+    periods_per_year: int = 252,
+    risk_free_rate: float = 0.0,
+    benchmark: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Calcule les métriques de performance d'une courbe de capital.
+
+    Args:
+        equity: Valeur du portefeuille à chaque barre
+        trade_pnl: P&L net de chaque trade clôturé
+        periods_per_year: Nombre de barres par an
+        risk_free_rate: Taux sans risque annuel
+        benchmark: Prix (ou valeur) du benchmark aux mêmes barres
+
+    Returns:
+        Dict: Champs de ``PerformanceMetrics`` (hors identifiants et dates)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    returns = _returns(equity)
+    metrics: Dict[str, Any] = {}
+
+    # Rendements
+    relative_return = float(equity[-1] / equity[0] - 1.0) if len(equity) > 1 and equity[0] > 0 else 0.0
+    metrics['absolute_return'] = float(equity[-1] - equity[0]) if len(equity) else 0.0
+    metrics['relative_return'] = relative_return
+    metrics['annualized_return'] = _annualize(relative_return, len(returns), periods_per_year)
+
+    # Risque
+    volatility = float(np.std(returns) * np.sqrt(periods_per_year)) if len(returns) > 1 else 0.0
+    negative = returns[returns < 0]
+    downside = float(np.std(negative) * np.sqrt(periods_per_year)) if len(negative) > 1 else 0.0
+    metrics['volatility'] = volatility
+    metrics['downside_deviation'] = downside
+
+    if len(returns):
+        var_95 = np.percentile(returns, 5)
+        cvar_95 = returns[returns <= var_95].mean()
+    else:
+        var_95 = cvar_95 = 0.0
+    metrics['var_95'] = float(abs(var_95))
+    metrics['cvar_95'] = float(abs(cvar_95))
+
+    # Drawdown
+    max_drawdown, avg_drawdown, recovery_time = _drawdown_stats(equity)
+    metrics['max_drawdown'] = max_drawdown
+    metrics['avg_drawdown'] = avg_drawdown
+    metrics['recovery_time'] = recovery_time
+
+    # Ratios
+    mean_return = float(np.mean(returns) * periods_per_year) if len(returns) else 0.0
+    metrics['sharpe_ratio'] = (mean_return - risk_free_rate) / volatility if volatility > 0 else None
+    metrics['sortino_ratio'] = (mean_return - risk_free_rate) / downside if downside > 0 else None
+    metrics['calmar_ratio'] = metrics['annualized_return'] / max_drawdown if max_drawdown > 0 else None
+    losses = -returns[returns < 0].sum()
+    metrics['omega_ratio'] = float(returns[returns > 0].sum() / losses) if losses > 0 else None
+
+    metrics.update(_trade_stats(trade_pnl))
+    metrics.update(_benchmark_stats(returns, relative_return, benchmark, periods_per_year))
+    return metrics
+
+
+def _returns(values: np.ndarray) -> np.ndarray:
+    """Rendements simples barre à barre."""
+    if len(values) < 2:
+        return np.zeros(0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = values[1:] / values[:-1] - 1.0
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _annualize(total_return: float, periods: int, periods_per_year: int) -> float:
+    """Annualise un rendement composé sur ``periods`` barres."""
+    if periods <= 0 or total_return <= -1.0:
+        return -1.0 if total_return <= -1.0 else 0.0
+    return float((1.0 + total_return) ** (periods_per_year / periods) - 1.0)
+
+
+def _drawdown_stats(equity: np.ndarray) -> tuple:
+    """Drawdown maximum, moyen et durée de récupération (barres)."""
+    if len(equity) < 2:
+        return 0.0, 0.0, None
+
+    peaks = np.maximum.accumulate(equity)
+    drawdowns = np.where(peaks > 0, equity / peaks - 1.0, 0.0)
+    trough = int(np.argmin(drawdowns))
+    max_drawdown = float(abs(drawdowns[trough]))
+    underwater = drawdowns[drawdowns < 0]
+    avg_drawdown = float(abs(underwater.mean())) if len(underwater) else 0.0
+
+    # Barres entre le creux maximal et le retour au sommet précédent
+    recovery_time = None
+    if max_drawdown > 0:
+        recovered = np.nonzero(equity[trough:] >= peaks[trough])[0]
+        if len(recovered):
+            recovery_time = int(recovered[0])
+    return max_drawdown, avg_drawdown, recovery_time
+
+
+def _trade_stats(trade_pnl: Optional[np.ndarray]) -> Dict[str, Any]:
+    """Statistiques de gains/pertes par trade (facteur de profit infini sans perte)."""
+    pnl = np.asarray(trade_pnl if trade_pnl is not None else [], dtype=np.float64)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    if len(losses):
+        profit_factor = float(wins.sum() / abs(losses.sum()))
+    else:
+        profit_factor = float('inf') if len(wins) else 0.0
+    return {
+        'win_rate': float(len(wins) / len(pnl)) if len(pnl) else 0.0,
+        'profit_factor': profit_factor,
+        'avg_win': float(wins.mean()) if len(wins) else 0.0,
+        'avg_loss': float(abs(losses.mean())) if len(losses) else 0.0,
+        'trades_count': int(len(pnl)),
+        'profitable_trades': int(len(wins)),
+        'losing_trades': int(len(losses))
+    }
+
+
+def _benchmark_stats(returns: np.ndarray, total_return: float, benchmark: Optional[np.ndarray],
+                     periods_per_year: int) -> Dict[str, Any]:
+    """Comparaison au benchmark (rendement, alpha, bêta, tracking error)."""
+    stats: Dict[str, Any] = {
+        'benchmark_return': None, 'alpha': None, 'beta': None,
+        'tracking_error': None, 'information_ratio': None
+    }
+    if benchmark is None or len(benchmark) != len(returns) + 1 or len(returns) < 2:
+        return stats
+
+    benchmark = np.asarray(benchmark, dtype=np.float64)
+    benchmark_returns = _returns(benchmark)
+    benchmark_return = float(benchmark[-1] / benchmark[0] - 1.0) if benchmark[0] > 0 else 0.0
+    active = returns - benchmark_returns
+    tracking_error = float(np.std(active) * np.sqrt(periods_per_year))
+    variance = np.var(benchmark_returns)
+    beta = float(np.cov(returns, benchmark_returns, bias=True)[0, 1] / variance) if variance > 0 else None
+
+    stats['benchmark_return'] = benchmark_return
+    stats['beta'] = beta
+    stats['tracking_error'] = tracking_error
+    stats['information_ratio'] = (
+        float(np.mean(active) * periods_per_year / tracking_error) if tracking_error > 0 else None
+    )
+    periods = len(returns)
+    stats['alpha'] = (
+        _annualize(total_return, periods, periods_per_year)
+        - (beta or 0.0) * _annualize(benchmark_return, periods, periods_per_year)
+    )
+    return stats
@@ -0,0 +1,882 @@
+"""
+Optimisation des paramètres des stratégies.
+
+Un espace de recherche (grille YAML, tirage aléatoire ou recherche
+bayésienne) est évalué par des backtests vectoriels répartis sur un pool
+de processus. Les colonnes de prix sont publiées une seule fois en
+mémoire partagée: chaque worker les relit sans copie ni sérialisation.
+Les candidats sont classés sur l'objectif puis sur les métriques
+déclarées par la stratégie (section ``backtesting.metrics``), sur une
+fenêtre unique, un découpage entraînement/hors-échantillon ou des
+fenêtres walk-forward.
+"""
+
+import copy
+import itertools
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from finagent.business.strategy.models.strategy_models import Strategy
+from finagent.business.strategy.parser.vector_compiler import PriceFrame
+
+from .vectorized_backtester import BacktestConfig, BacktestError, VectorizedBacktester, _to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationError(BacktestError):
+    """Erreur d'optimisation (espace de recherche ou paramètre invalide)."""
+
+
+# Méthodes de recherche supportées
+OPTIMIZATION_METHODS = ('grid', 'random', 'bayesian')
+
+# Classement par défaut si la stratégie ne déclare aucune métrique
+DEFAULT_RANKING_METRICS = ['sharpe_ratio', 'max_drawdown', 'total_return']
+
+# Métriques pour lesquelles une valeur plus faible est meilleure
+LOWER_IS_BETTER = frozenset({
+    'max_drawdown', 'avg_drawdown', 'recovery_time', 'volatility', 'downside_deviation',
+    'var_95', 'cvar_95', 'avg_loss', 'losing_trades', 'tracking_error'
+})
+
+# Raccourcis de paramètres: (section de risk_management, champ de BacktestConfig)
+RISK_PARAMETERS = {
+    'stop_loss': ('stop_loss', 'stop_loss'),
+    'take_profit': ('take_profit', 'take_profit'),
+    'position_size': ('position_sizing', 'position_size')
+}
+
+
+@dataclass
+class ParameterRange:
+    """
+    Domaine d'un paramètre: liste de valeurs ou intervalle ``min``/``max``
+    (pas ``step`` optionnel, échelle logarithmique avec ``log``).
+    """
+    name: str
+    values: Optional[List[Any]] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    step: Optional[float] = None
+    log: bool = False
+
+    def __post_init__(self):
+        if self.values is not None:
+            if not self.values:
+                raise OptimizationError(f"Paramètre {self.name}: liste de valeurs vide")
+            return
+        if self.min is None or self.max is None or self.max < self.min:
+            raise OptimizationError(f"Paramètre {self.name}: intervalle min/max invalide")
+        if self.step is not None and self.step <= 0:
+            raise OptimizationError(f"Paramètre {self.name}: pas non positif")
+        if self.log and self.min <= 0:
+            raise OptimizationError(f"Paramètre {self.name}: échelle logarithmique sur des valeurs non positives")
+
+    @property
+    def is_integer(self) -> bool:
+        """Domaine entier (périodes, nombres de barres)."""
+        bounds = [self.min, self.max] + ([self.step] if self.step is not None else [])
+        return self.values is None and all(float(b).is_integer() for b in bounds)
+
+    def grid(self) -> List[Any]:
+        """
+        Valeurs de la grille.
+
+        Returns:
+            List: Valeurs énumérées (liste, ou intervalle parcouru au pas ``step``)
+
+        Raises:
+            OptimizationError: Si l'intervalle n'a pas de pas
+        """
+        if self.values is not None:
+            return list(self.values)
+        if self.step is None:
+            if not self.is_integer:
+                raise OptimizationError(f"Paramètre {self.name}: pas requis pour une grille")
+            return [int(v) for v in range(int(self.min), int(self.max) + 1)]
+        count = int(np.floor((self.max - self.min) / self.step + 1e-9)) + 1
+        return [self._cast(self.min + i * self.step) for i in range(count)]
+
+    def from_unit(self, u: float) -> Any:
+        """Valeur du domaine correspondant à une coordonnée de [0, 1]."""
+        if self.values is not None or self.step is not None or self.is_integer:
+            points = self.grid()
+            return points[min(int(u * len(points)), len(points) - 1)]
+        if self.log:
+            return float(np.exp(np.log(self.min) + u * (np.log(self.max) - np.log(self.min))))
+        return float(self.min + u * (self.max - self.min))
+
+    def to_unit(self, value: Any) -> float:
+        """Coordonnée de [0, 1] d'une valeur du domaine."""
+        if self.values is not None or self.step is not None or self.is_integer:
+            points = self.grid()
+            index = points.index(value) if value in points else int(np.argmin(np.abs(np.asarray(points) - value)))
+            return (index + 0.5) / len(points)
+        if self.max == self.min:
+            return 0.5
+        if self.log:
+            return float((np.log(value) - np.log(self.min)) / (np.log(self.max) - np.log(self.min)))
+        return float((value - self.min) / (self.max - self.min))
+
+    def _cast(self, value: float) -> Union[int, float]:
+        return int(round(value)) if self.is_integer else round(float(value), 10)
+
+
+class ParameterSpace:
+    """Espace de recherche (produit des domaines des paramètres)."""
+
+    def __init__(self, ranges: Sequence[ParameterRange]):
+        """
+        Initialise l'espace.
+
+        Args:
+            ranges: Domaines des paramètres
+        """
+        if not ranges:
+            raise OptimizationError("Espace de recherche vide")
+        self.ranges = list(ranges)
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> 'ParameterSpace':
+        """
+        Construit l'espace depuis un dictionnaire (section YAML).
+
+        Chaque paramètre est une liste de valeurs, une valeur fixe, ou un
+        dictionnaire ``{min, max, step, log}`` / ``{values}``.
+
+        Args:
+            spec: Domaines par nom de paramètre
+
+        Returns:
+            ParameterSpace: Espace de recherche
+        """
+        ranges = []
+        for name, domain in spec.items():
+            if isinstance(domain, Mapping):
+                ranges.append(ParameterRange(
+                    name=name,
+                    values=list(domain['values']) if 'values' in domain else None,
+                    min=domain.get('min'),
+                    max=domain.get('max'),
+                    step=domain.get('step'),
+                    log=bool(domain.get('log', False))
+                ))
+            elif isinstance(domain, (list, tuple)):
+                ranges.append(ParameterRange(name=name, values=list(domain)))
+            else:
+                ranges.append(ParameterRange(name=name, values=[domain]))
+        return cls(ranges)
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> 'ParameterSpace':
+        """
+        Charge l'espace depuis un fichier YAML (clé ``parameters`` optionnelle).
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            ParameterSpace: Espace de recherche
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            spec = yaml.safe_load(file) or {}
+        return cls.from_dict(spec.get('parameters', spec))
+
+    @property
+    def names(self) -> List[str]:
+        return [r.name for r in self.ranges]
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    @property
+    def grid_size(self) -> int:
+        """Nombre de combinaisons de la grille."""
+        return int(np.prod([len(r.grid()) for r in self.ranges]))
+
+    def grid(self) -> List[Dict[str, Any]]:
+        """Toutes les combinaisons de la grille."""
+        return [dict(zip(self.names, combo)) for combo in itertools.product(*(r.grid() for r in self.ranges))]
+
+    def sample(self, count: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+        """Tirage uniforme de ``count`` combinaisons."""
+        return [self.from_unit(u) for u in rng.random((count, len(self.ranges)))]
+
+    def from_unit(self, u: np.ndarray) -> Dict[str, Any]:
+        """Combinaison correspondant à un point du cube unité."""
+        return {r.name: r.from_unit(float(x)) for r, x in zip(self.ranges, u)}
+
+    def to_unit(self, parameters: Mapping[str, Any]) -> np.ndarray:
+        """Point du cube unité d'une combinaison."""
+        return np.array([r.to_unit(parameters[r.name]) for r in self.ranges])
+
+
+def apply_parameters(strategy: Strategy, parameters: Mapping[str, Any]) -> Strategy:
+    """
+    Applique des valeurs de paramètres à une copie de la stratégie.
+
+    Noms reconnus:
+        - ``stop_loss``, ``take_profit``, ``position_size``: valeurs de la gestion des risques
+        - ``[buy_|sell_]<indicateur>_<paramètre>``: paramètre des conditions portant sur
+          l'indicateur (``threshold``/``value``: seuil de la condition), par exemple
+          ``rsi_period`` ou ``buy_rsi_threshold``
+        - chemin pointé dans le modèle, par exemple
+          ``rules.buy_conditions.conditions.0.parameters.period``
+
+    Args:
+        strategy: Stratégie de référence (non modifiée)
+        parameters: Valeurs par nom de paramètre
+
+    Returns:
+        Strategy: Stratégie paramétrée
+
+    Raises:
+        OptimizationError: Si un paramètre ne correspond à aucun champ
+    """
+    name = strategy.strategy.name
+    rules = copy.deepcopy(strategy.rules)
+    sections: Dict[str, Dict[str, Any]] = {}
+
+    def section(key: str) -> Dict[str, Any]:
+        if key not in sections:
+            model = getattr(strategy, key, None)
+            if model is None:
+                raise OptimizationError(f"Section absente de la stratégie: {key}", name)
+            sections[key] = model.model_dump()
+        return sections[key]
+
+    for parameter, value in parameters.items():
+        if parameter in RISK_PARAMETERS:
+            risk_field = section('risk_management').get(RISK_PARAMETERS[parameter][0])
+            if risk_field is None:
+                raise OptimizationError(f"Paramètre {parameter}: non défini dans risk_management", name)
+            risk_field['value'] = value
+        elif '.' in parameter:
+            head, *path = parameter.split('.')
+            target = rules if head == 'rules' else section(head)
+            _set_path(target, path, value, parameter, name)
+        elif not _set_condition_parameter(rules, parameter, value):
+            raise OptimizationError(f"Paramètre {parameter}: aucune condition correspondante", name)
+
+    update: Dict[str, Any] = {'rules': rules}
+    for key, values in sections.items():
+        update[key] = type(getattr(strategy, key)).model_validate(values)
+    return strategy.model_copy(update=update)
+
+
+def _set_path(target: Any, path: List[str], value: Any, parameter: str, strategy_name: str) -> None:
+    """Affecte une valeur au bout d'un chemin de clés/indices."""
+    try:
+        for key in path[:-1]:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+        last = path[-1]
+        if isinstance(target, list):
+            target[int(last)] = value
+        elif isinstance(target, dict):
+            target[last] = value
+        else:
+            raise TypeError(type(target).__name__)
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise OptimizationError(f"Chemin de paramètre invalide: {parameter}", strategy_name)
+
+
+def _set_condition_parameter(rules: Dict[str, Any], parameter: str, value: Any) -> bool:
+    """Affecte un paramètre ``[buy_|sell_]<indicateur>_<paramètre>`` aux conditions."""
+    group, _, rest = parameter.partition('_')
+    if group not in ('buy', 'sell'):
+        group, rest = None, parameter
+
+    matched = False
+    for condition_group, condition in _iter_conditions(rules):
+        if group is not None and condition_group != group:
+            continue
+        indicator = str(condition['indicator']).lower()
+        if not rest.startswith(indicator + '_'):
+            continue
+        key = rest[len(indicator) + 1:]
+        if key in ('threshold', 'value'):
+            condition['threshold' if 'threshold' in condition and 'value' not in condition else 'value'] = value
+        else:
+            parameters = condition.get('parameters')
+            if not isinstance(parameters, dict):
+                parameters = condition['parameters'] = {}
+            parameters[key] = value
+        matched = True
+    return matched
+
+
+def _iter_conditions(node: Any, group: Optional[str] = None) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """Conditions (dictionnaires portant un ``indicator``) des règles, avec leur groupe."""
+    if isinstance(node, dict):
+        if 'indicator' in node:
+            yield group, node
+            return
+        for key, child in node.items():
+            child_group = group
+            if group is None and key.endswith('_conditions'):
+                child_group = key[:-len('_conditions')]
+            yield from _iter_conditions(child, child_group)
+    elif isinstance(node, list):
+        for child in node:
+            yield from _iter_conditions(child, group)
+
+
+@dataclass
+class WalkForwardWindow:
+    """Fenêtre d'entraînement et, éventuellement, de test hors-échantillon."""
+    fold: int
+    train_start: datetime
+    train_end: datetime
+    test_start: Optional[datetime] = None
+    test_end: Optional[datetime] = None
+
+
+def walk_forward_windows(timestamps: np.ndarray, folds: int = 1, train_ratio: float = 0.7,
+                         anchored: bool = False) -> List[WalkForwardWindow]:
+    """
+    Découpe une chronologie en fenêtres entraînement/test successives.
+
+    La part ``1 - train_ratio`` finale de la chronologie est divisée en
+    ``folds`` fenêtres de test consécutives. Chaque fenêtre de test est
+    précédée de sa fenêtre d'entraînement: de longueur fixe (glissante)
+    ou depuis le début de la chronologie (``anchored``). Avec un seul
+    pli, on obtient un découpage entraînement/hors-échantillon.
+
+    Args:
+        timestamps: Horodatages triés des barres
+        folds: Nombre de fenêtres de test
+        train_ratio: Part initiale de la chronologie réservée au premier entraînement
+        anchored: Fenêtres d'entraînement ancrées au début de la chronologie
+
+    Returns:
+        List[WalkForwardWindow]: Fenêtres dans l'ordre chronologique
+
+    Raises:
+        OptimizationError: Si la chronologie est trop courte
+    """
+    n_bars = len(timestamps)
+    if folds < 1 or not 0 < train_ratio < 1:
+        raise OptimizationError("Découpage invalide: folds >= 1 et 0 < train_ratio < 1 requis")
+    train_bars = int(n_bars * train_ratio)
+    test_bars = (n_bars - train_bars) // folds
+    if train_bars < 2 or test_bars < 2:
+        raise OptimizationError(f"Historique insuffisant pour {folds} fenêtre(s) de test ({n_bars} barres)")
+
+    windows = []
+    for fold in range(folds):
+        test_start = train_bars + fold * test_bars
+        test_stop = n_bars if fold == folds - 1 else test_start + test_bars
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append(WalkForwardWindow(
+            fold=fold,
+            train_start=_to_datetime(timestamps[train_start]),
+            train_end=_to_datetime(timestamps[test_start - 1]),
+            test_start=_to_datetime(timestamps[test_start]),
+            test_end=_to_datetime(timestamps[test_stop - 1])
+        ))
+    return windows
+
+
+@dataclass
+class TrialResult:
+    """Évaluation d'une combinaison de paramètres."""
+    parameters: Dict[str, Any]
+    metrics: Optional[Dict[str, Any]]
+    fold_metrics: List[Optional[Dict[str, Any]]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class OptimizationResult:
+    """Résultat d'une optimisation."""
+    strategy_name: str
+    method: str
+    objective: str
+    ranking_metrics: List[str]
+    trials: List[TrialResult]
+    windows: List[WalkForwardWindow]
+    folds: List[Dict[str, Any]]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def best_parameters(self) -> Dict[str, Any]:
+        """Paramètres retenus sur la fenêtre d'entraînement la plus récente."""
+        return self.folds[-1]['parameters']
+
+    @property
+    def best_metrics(self) -> Dict[str, Any]:
+        """Métriques d'entraînement des paramètres retenus."""
+        return self.folds[-1]['in_sample']
+
+    @property
+    def out_of_sample(self) -> Optional[Dict[str, Any]]:
+        """Métriques hors-échantillon moyennes sur les fenêtres de test."""
+        tested = [f['out_of_sample'] for f in self.folds if f.get('out_of_sample')]
+        return _mean_metrics(tested) if tested else None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Essais classés: une ligne par combinaison (paramètres et métriques de classement)."""
+        rows = []
+        for rank, trial in enumerate(self.trials, start=1):
+            row = {'rank': rank, **trial.parameters}
+            for name in [self.objective] + [m for m in self.ranking_metrics if m != self.objective]:
+                row[name] = (trial.metrics or {}).get(name)
+            row['error'] = trial.error
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def parameter_sensitivity(self) -> Dict[str, Dict[str, Any]]:
+        """Objectif moyen le plus faible/élevé selon la valeur de chaque paramètre."""
+        frame = self.to_frame()
+        frame = frame[frame[self.objective].notna()]
+        sensitivity = {}
+        for name in self.best_parameters:
+            if frame.empty:
+                break
+            means = frame.groupby(name)[self.objective].mean()
+            sensitivity[name] = {
+                'min': float(means.min()),
+                'max': float(means.max()),
+                'optimal': self.best_parameters[name]
+            }
+        return sensitivity
+
+
+def rank_trials(trials: Sequence[TrialResult], objective: str, metrics: Sequence[str],
+                fold: Optional[int] = None) -> List[TrialResult]:
+    """
+    Classe les essais sur l'objectif puis sur les autres métriques.
+
+    Args:
+        trials: Essais évalués
+        objective: Métrique principale
+        metrics: Métriques de départage, dans l'ordre
+        fold: Pli dont les métriques sont comparées (agrégées si absent)
+
+    Returns:
+        List[TrialResult]: Essais du meilleur au moins bon (échecs en dernier)
+    """
+    names = [objective] + [m for m in metrics if m != objective]
+
+    def key(trial: TrialResult) -> Tuple[float, ...]:
+        values = trial.metrics if fold is None else trial.fold_metrics[fold]
+        return tuple(_score(values, name) for name in names)
+
+    return sorted(trials, key=key, reverse=True)
+
+
+def _score(metrics: Optional[Mapping[str, Any]], name: str) -> float:
+    """Valeur orientée (plus grand = meilleur), -inf si indéfinie."""
+    value = (metrics or {}).get(name)
+    if value is None or np.isnan(value):
+        return -np.inf
+    return -float(value) if name in LOWER_IS_BETTER else float(value)
+
+
+def _mean_metrics(metrics: Sequence[Optional[Mapping[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Moyenne, métrique par métrique, des valeurs définies."""
+    defined = [m for m in metrics if m is not None]
+    if not defined:
+        return None
+    if len(defined) == 1:
+        return dict(defined[0])
+    mean = {}
+    for name in defined[0]:
+        values = [m[name] for m in defined if isinstance(m.get(name), (int, float))]
+        mean[name] = float(np.mean(values)) if values else None
+    return mean
+
+
+class _SharedPrices:
+    """
+    Colonnes de prix publiées en mémoire partagée.
+
+    Toutes les séries sont concaténées dans un bloc ``champs × barres``
+    (float64) et un bloc d'horodatages (datetime64[ns]); un descripteur
+    léger (noms des blocs, décalages par symbole) suffit aux workers
+    pour reconstruire des vues sans copie.
+    """
+
+    def __init__(self, frames: Mapping[str, PriceFrame]):
+        fields = [f for f in ('open', 'high', 'low', 'close', 'volume')
+                  if all(f in frame.columns for frame in frames.values())]
+        lengths = [len(frame.columns['close']) for frame in frames.values()]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(int)
+        total = int(offsets[-1])
+
+        self._values = shared_memory.SharedMemory(create=True, size=max(8, len(fields) * total * 8))
+        self._times = shared_memory.SharedMemory(create=True, size=max(8, total * 8))
+        values = np.ndarray((len(fields), total), dtype=np.float64, buffer=self._values.buf)
+        times = np.ndarray(total, dtype='datetime64[ns]', buffer=self._times.buf)
+        for row, frame in enumerate(frames.values()):
+            start, stop = offsets[row], offsets[row + 1]
+            for column, name in enumerate(fields):
+                values[column, start:stop] = frame.columns[name]
+            times[start:stop] = np.asarray(frame.timestamps, dtype='datetime64[ns]')
+        del values, times
+
+        self.descriptor = {
+            'values': self._values.name,
+            'times': self._times.name,
+            'fields': fields,
+            'symbols': [*frames],
+            'offsets': offsets.tolist()
+        }
+
+    @staticmethod
+    def attach(descriptor: Mapping[str, Any]) -> Tuple[List[shared_memory.SharedMemory], Dict[str, PriceFrame]]:
+        """
+        Vues des séries depuis un autre processus.
+
+        Args:
+            descriptor: Descripteur publié par le processus parent
+
+        Returns:
+            Tuple: Blocs ouverts (à garder vivants) et cadres de prix par symbole
+        """
+        blocks = [shared_memory.SharedMemory(name=descriptor['values']),
+                  shared_memory.SharedMemory(name=descriptor['times'])]
+        fields, offsets = descriptor['fields'], descriptor['offsets']
+        values = np.ndarray((len(fields), offsets[-1]), dtype=np.float64, buffer=blocks[0].buf)
+        times = np.ndarray(offsets[-1], dtype='datetime64[ns]', buffer=blocks[1].buf)
+        frames = {}
+        for row, symbol in enumerate(descriptor['symbols']):
+            start, stop = offsets[row], offsets[row + 1]
+            frames[symbol] = PriceFrame(
+                {name: values[column, start:stop] for column, name in enumerate(fields)},
+                times[start:stop]
+            )
+        return blocks, frames
+
+    def close(self) -> None:
+        """Libère les blocs (processus parent)."""
+        for block in (self._values, self._times):
+            block.close()
+            block.unlink()
+
+
+# État des workers du pool (initialisé une fois par processus)
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(descriptor: Mapping[str, Any], strategy: Strategy, config: Optional[BacktestConfig]) -> None:
+    blocks, frames = _SharedPrices.attach(descriptor)
+    _WORKER.update(blocks=blocks, data=frames, strategy=strategy, config=config,
+                   backtester=VectorizedBacktester())
+
+
+def _run_task(task: Tuple[Dict[str, Any], Optional[datetime], Optional[datetime]]) -> Tuple[Optional[Dict], Optional[str]]:
+    return _evaluate(_WORKER, *task)
+
+
+def _evaluate(state: Mapping[str, Any], parameters: Dict[str, Any], start: Optional[datetime],
+              end: Optional[datetime]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Backtest d'une combinaison sur une fenêtre: (métriques, erreur)."""
+    try:
+        strategy = apply_parameters(state['strategy'], parameters)
+        config = state['config']
+        if config is None:
+            config = replace(BacktestConfig.from_strategy(strategy), start_date=start, end_date=end)
+        else:
+            overrides = {RISK_PARAMETERS[k][1]: float(v) for k, v in parameters.items() if k in RISK_PARAMETERS}
+            config = replace(config, start_date=start, end_date=end, **overrides)
+        result = state['backtester'].run(strategy, state['data'], config)
+        return result.metrics, None
+    except BacktestError as e:
+        return None, e.message
+    except Exception as e:
+        return None, str(e)
+
+
+class ParameterOptimizer:
+    """
+    Optimiseur de paramètres par backtests vectoriels parallèles.
+
+    Les évaluations d'un même lot (toutes les combinaisons d'une grille,
+    sur toutes les fenêtres d'entraînement) sont soumises ensemble au
+    pool, de sorte que tous les cœurs restent occupés.
+    """
+
+    def __init__(self, workers: Optional[int] = None, seed: Optional[int] = None,
+                 mp_context: Any = None):
+        """
+        Initialise l'optimiseur.
+
+        Args:
+            workers: Nombre de processus (cœurs disponibles si absent, 1: exécution locale)
+            seed: Graine des tirages aléatoires
+            mp_context: Contexte multiprocessing du pool (fork/spawn)
+        """
+        self.workers = workers or _available_cores()
+        self.rng = np.random.default_rng(seed)
+        self.mp_context = mp_context
+
+    def optimize(self,
+                 strategy: Strategy,
+                 data: Mapping[str, Any],
+                 space: Union[ParameterSpace, Mapping[str, Any]],
+                 method: str = 'grid',
+                 objective: str = 'sharpe_ratio',
+                 iterations: int = 100,
+                 config: Optional[BacktestConfig] = None,
+                 walk_forward: Optional[int] = None,
+                 out_of_sample: float = 0.0,
+                 anchored: bool = False,
+                 metrics: Optional[Sequence[str]] = None) -> OptimizationResult:
+        """
+        Recherche les meilleurs paramètres d'une stratégie.
+
+        Args:
+            strategy: Stratégie de référence
+            data: Historique par symbole (BarSeries, DataFrame ou colonnes horodatées)
+            space: Espace de recherche (ou sa description dictionnaire/YAML)
+            method: Méthode de recherche ('grid', 'random', 'bayesian')
+            objective: Métrique à optimiser
+            iterations: Nombre de combinaisons évaluées (random/bayesian)
+            config: Paramètres de simulation (depuis la stratégie si absent);
+                ses dates bornent la période optimisée
+            walk_forward: Nombre de fenêtres walk-forward
+            out_of_sample: Part finale de la période réservée aux tests hors-échantillon
+                (0.3 par défaut en walk-forward)
+            anchored: Fenêtres d'entraînement ancrées au début de la période
+            metrics: Métriques de départage (celles déclarées par la stratégie si absent)
+
+        Returns:
+            OptimizationResult: Essais classés et sélection par fenêtre
+
+        Raises:
+            OptimizationError: Si la méthode, l'espace ou le découpage est invalide,
+                ou si toutes les combinaisons échouent
+        """
+        name = strategy.strategy.name
+        if method not in OPTIMIZATION_METHODS:
+            raise OptimizationError(f"Méthode d'optimisation non supportée: {method}", name)
+        if not data:
+            raise OptimizationError("Aucun historique fourni", name)
+        if not isinstance(space, ParameterSpace):
+            space = ParameterSpace.from_dict(space)
+        ranking = [*(metrics or _declared_metrics(strategy))]
+
+        frames = {symbol: PriceFrame.from_data(series) for symbol, series in data.items()}
+        if any(frame.timestamps is None for frame in frames.values()):
+            raise OptimizationError("Historique horodaté requis", name)
+        windows = self._windows(frames, config or BacktestConfig.from_strategy(strategy),
+                                walk_forward, out_of_sample, anchored)
+
+        started = time.perf_counter()
+        with self._evaluator(strategy, frames, config) as evaluate:
+            def run_trials(candidates: List[Dict[str, Any]]) -> List[TrialResult]:
+                tasks = [(p, w.train_start, w.train_end) for p in candidates for w in windows]
+                outcomes = evaluate(tasks)
+                trials = []
+                for i, parameters in enumerate(candidates):
+                    fold_outcomes = outcomes[i * len(windows):(i + 1) * len(windows)]
+                    fold_metrics = [m for m, _ in fold_outcomes]
+                    errors = [e for _, e in fold_outcomes if e]
+                    trials.append(TrialResult(parameters, _mean_metrics(fold_metrics), fold_metrics,
+                                              errors[0] if errors else None))
+                return trials
+
+            if method == 'grid':
+                trials = run_trials(space.grid())
+            elif method == 'random':
+                trials = run_trials(_unique(space.sample(iterations, self.rng)))
+            else:
+                trials = self._bayesian(space, run_trials, objective, iterations)
+
+            if all(trial.metrics is None for trial in trials):
+                raise OptimizationError(
+                    f"Aucune combinaison évaluée avec succès ({len(trials)} échecs): {trials[0].error}", name
+                )
+
+            folds = [self._select(trials, fold, window, objective, ranking) for fold, window in enumerate(windows)]
+            tested = [f for f in folds if windows[f['fold']].test_start is not None]
+            outcomes = evaluate([
+                (f['parameters'], windows[f['fold']].test_start, windows[f['fold']].test_end) for f in tested
+            ])
+            for fold, (fold_metrics, _) in zip(tested, outcomes):
+                fold['out_of_sample'] = fold_metrics
+
+        trials = rank_trials(trials, objective, ranking)
+        elapsed = time.perf_counter() - started
+        evaluations = len(trials) * len(windows) + len(tested)
+        logger.info(
+            f"Optimisation {name} ({method}): {len(trials)} combinaisons × {len(windows)} fenêtre(s), "
+            f"{evaluations} backtests en {elapsed:.1f}s sur {self.workers} processus"
+        )
+        return OptimizationResult(
+            strategy_name=name,
+            method=method,
+            objective=objective,
+            ranking_metrics=ranking,
+            trials=trials,
+            windows=windows,
+            folds=folds,
+            metadata={
+                'workers': self.workers,
+                'evaluations': evaluations,
+                'failed': sum(1 for t in trials if t.metrics is None),
+                'elapsed': elapsed
+            }
+        )
+
+    def _windows(self, frames: Mapping[str, PriceFrame], config: BacktestConfig, walk_forward: Optional[int],
+                 out_of_sample: float, anchored: bool) -> List[WalkForwardWindow]:
+        """Fenêtres d'évaluation sur la chronologie commune, bornée par la configuration."""
+        timestamps = np.unique(np.concatenate([
+            np.asarray(frame.timestamps, dtype='datetime64[ns]') for frame in frames.values()
+        ]))
+        index = pd.DatetimeIndex(timestamps)
+        mask = np.ones(len(index), dtype=bool)
+        if config.start_date is not None:
+            mask &= index >= pd.Timestamp(config.start_date)
+        if config.end_date is not None:
+            mask &= index <= pd.Timestamp(config.end_date)
+        timestamps = timestamps[mask]
+        if len(timestamps) < 2:
+            raise OptimizationError("Historique insuffisant sur la période demandée")
+
+        if walk_forward:
+            return walk_forward_windows(timestamps, walk_forward, 1.0 - (out_of_sample or 0.3), anchored)
+        if out_of_sample > 0:
+            return walk_forward_windows(timestamps, 1, 1.0 - out_of_sample)
+        return [WalkForwardWindow(0, _to_datetime(timestamps[0]), _to_datetime(timestamps[-1]))]
+
+    @staticmethod
+    def _select(trials: List[TrialResult], fold: int, window: WalkForwardWindow, objective: str,
+                ranking: List[str]) -> Dict[str, Any]:
+        """Meilleure combinaison d'une fenêtre d'entraînement."""
+        best = rank_trials(trials, objective, ranking, fold=fold)[0]
+        return {
+            'fold': fold,
+            'window': window,
+            'parameters': best.parameters,
+            'in_sample': best.fold_metrics[fold],
+            'out_of_sample': None
+        }
+
+    def _bayesian(self, space: ParameterSpace, run_trials: Callable[[List[Dict[str, Any]]], List[TrialResult]],
+                  objective: str, iterations: int) -> List[TrialResult]:
+        """
+        Recherche bayésienne: processus gaussien sur le cube unité et
+        amélioration espérée, proposée par lots de la taille du pool.
+        """
+        initial = min(iterations, max(2 * len(space) + 1, self.workers))
+        trials = run_trials(_unique(space.sample(initial, self.rng)))
+        seen = {_signature(t.parameters) for t in trials}
+
+        while len(trials) < iterations:
+            scores = np.array([_score(t.metrics, objective) for t in trials])
+            points = np.array([space.to_unit(t.parameters) for t in trials])
+            batch = min(self.workers, iterations - len(trials))
+            candidates = _propose(points, scores, batch, self.rng)
+            proposals = []
+            for u in candidates:
+                parameters = space.from_unit(u)
+                if _signature(parameters) not in seen:
+                    seen.add(_signature(parameters))
+                    proposals.append(parameters)
+            if not proposals:
+                break
+            trials.extend(run_trials(proposals))
+        return trials
+
+    @contextmanager
+    def _evaluator(self, strategy: Strategy, frames: Mapping[str, PriceFrame],
+                   config: Optional[BacktestConfig]) -> Iterator[Callable[[List[Tuple]], List[Tuple]]]:
+        """Fonction d'évaluation d'un lot de tâches (locale ou sur le pool)."""
+        if self.workers <= 1:
+            state = {'data': frames, 'strategy': strategy, 'config': config, 'backtester': VectorizedBacktester()}
+            yield lambda tasks: [_evaluate(state, *task) for task in tasks]
+            return
+
+        shared = _SharedPrices(frames)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=self.mp_context,
+                                     initializer=_init_worker,
+                                     initargs=(shared.descriptor, strategy, config)) as pool:
+                def evaluate(tasks: List[Tuple]) -> List[Tuple]:
+                    chunksize = max(1, len(tasks) // (self.workers * 4))
+                    return [*pool.map(_run_task, tasks, chunksize=chunksize)]
+                yield evaluate
+        finally:
+            shared.close()
+
+
+def _propose(points: np.ndarray, scores: np.ndarray, count: int, rng: np.random.Generator,
+             pool_size: int = 2048, length_scale: float = 0.2) -> np.ndarray:
+    """
+    Points candidats maximisant l'amélioration espérée d'un processus
+    gaussien (noyau RBF), pénalisés autour des points déjà retenus.
+    """
+    candidates = rng.random((pool_size, points.shape[1]))
+    finite = np.isfinite(scores)
+    if finite.sum() < 2:
+        return candidates[:count]
+
+    # Essais en échec: pire score observé; score infini (aucune perte): meilleur
+    y = np.where(finite, scores, scores[finite].min())
+    y = np.where(np.isposinf(scores), scores[finite].max(), y)
+    std = y.std() or 1.0
+    y = (y - y.mean()) / std
+
+    def kernel(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        distances = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+        return np.exp(-distances / (2 * length_scale ** 2))
+
+    L = np.linalg.cholesky(kernel(points, points) + 1e-4 * np.eye(len(points)))
+    alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+    K_s = kernel(candidates, points)
+    mean = K_s @ alpha
+    v = np.linalg.solve(L, K_s.T)
+    sigma = np.sqrt(np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None))
+
+    improvement = mean - y.max() - 0.01
+    z = improvement / sigma
+    cdf = 0.5 * (1.0 + np.vectorize(math.erf)(z / np.sqrt(2.0)))
+    pdf = np.exp(-0.5 * z ** 2) / np.sqrt(2 * np.pi)
+    expected = improvement * cdf + sigma * pdf
+
+    selected = []
+    for _ in range(min(count, pool_size)):
+        best = int(np.argmax(expected))
+        selected.append(candidates[best])
+        expected = expected * (1.0 - kernel(candidates, candidates[best:best + 1])[:, 0])
+    return np.array(selected)
+
+
+def _signature(parameters: Mapping[str, Any]) -> Tuple:
+    return tuple(sorted(parameters.items()))
+
+
+def _unique(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combinaisons distinctes (les tirages sur un domaine discret se répètent)."""
+    return [*{_signature(c): c for c in candidates}.values()]
+
+
+def _declared_metrics(strategy: Strategy) -> List[str]:
+    """Métriques déclarées par la stratégie (section ``backtesting.metrics``)."""
+    backtesting = strategy.backtesting
+    declared = backtesting.metrics if backtesting is not None else []
+    return [*declared] or DEFAULT_RANKING_METRICS
+
+
+def _available_cores() -> int:
+    """Cœurs utilisables par le processus (affinité CPU si disponible)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
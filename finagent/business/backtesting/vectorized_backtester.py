@@ -0,0 +1,521 @@
+"""
+Backtest vectoriel des stratégies.
+
+Les signaux d'achat et de vente sont générés en une passe par la cible
+vectorielle du compilateur de règles (symboles × barres). La simulation
+avance ensuite barre par barre, chaque étape étant vectorisée sur
+l'ensemble des symboles: exécution à l'ouverture suivant le signal,
+commissions et slippage proportionnels, stop-loss et take-profit
+déclenchés sur les plus bas/plus hauts de la barre.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+from uuid import UUID, uuid4
+
+import numpy as np
+import pandas as pd
+
+from finagent.business.models.portfolio_models import PerformanceMetrics
+from finagent.business.strategy.models.strategy_models import PositionSizingMethod, StopLossType, Strategy
+from finagent.business.strategy.parser.rule_compiler import CompilationError, RuleCompiler
+from finagent.business.strategy.parser.vector_compiler import PriceFrame, VectorSignals
+from finagent.data.indicators import kernels
+
+from .metrics import compute_performance_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestError(Exception):
+    """Erreur de backtest (stratégie non vectorisable, données absentes)."""
+
+    def __init__(self, message: str, strategy_name: Optional[str] = None):
+        self.message = message
+        self.strategy_name = strategy_name
+        super().__init__(f"[{strategy_name}] {message}" if strategy_name else message)
+
+
+# Motifs de sortie des trades
+EXIT_SIGNAL = "signal"
+EXIT_STOP_LOSS = "stop_loss"
+EXIT_TAKE_PROFIT = "take_profit"
+EXIT_END = "end_of_backtest"
+
+
+@dataclass
+class BacktestConfig:
+    """Paramètres de simulation d'un backtest."""
+    initial_capital: float = 100000.0
+    commission: float = 0.001
+    slippage: float = 0.0005
+    position_sizing: PositionSizingMethod = PositionSizingMethod.FIXED_PERCENTAGE
+    position_size: float = 0.1
+    stop_loss: Optional[float] = None
+    stop_loss_type: StopLossType = StopLossType.PERCENTAGE
+    take_profit: Optional[float] = None
+    take_profit_type: StopLossType = StopLossType.PERCENTAGE
+    max_positions: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    close_at_end: bool = True
+    periods_per_year: int = 252
+    risk_free_rate: float = 0.0
+    volatility_window: int = 20
+    atr_period: int = 14
+
+    @classmethod
+    def from_strategy(cls, strategy: Strategy, **overrides: Any) -> 'BacktestConfig':
+        """
+        Construit la configuration depuis les sections ``backtesting`` et
+        ``risk_management`` d'une stratégie.
+
+        Args:
+            strategy: Stratégie parsée
+            **overrides: Valeurs prioritaires (options de la CLI)
+
+        Returns:
+            BacktestConfig: Configuration de simulation
+        """
+        values: Dict[str, Any] = {}
+
+        backtesting = strategy.backtesting
+        if backtesting is not None:
+            values['initial_capital'] = float(backtesting.initial_capital)
+            values['commission'] = float(backtesting.commission)
+            values['slippage'] = float(backtesting.slippage or 0)
+            values['start_date'] = datetime.strptime(backtesting.start_date, '%Y-%m-%d')
+            values['end_date'] = datetime.strptime(backtesting.end_date, '%Y-%m-%d')
+
+        risk = strategy.risk_management
+        values['position_sizing'] = risk.position_sizing.method
+        values['position_size'] = float(risk.position_sizing.value)
+        if risk.stop_loss is not None:
+            values['stop_loss'] = float(risk.stop_loss.value)
+            values['stop_loss_type'] = risk.stop_loss.type
+        if risk.take_profit is not None:
+            values['take_profit'] = float(risk.take_profit.value)
+            values['take_profit_type'] = risk.take_profit.type
+
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+
+@dataclass
+class BacktestResult:
+    """Résultat d'un backtest."""
+    strategy_name: str
+    symbols: List[str]
+    timestamps: Optional[np.ndarray]
+    equity: np.ndarray
+    cash: np.ndarray
+    position_values: np.ndarray
+    trades: pd.DataFrame
+    metrics: Dict[str, Any]
+    costs: Dict[str, float]
+    config: BacktestConfig
+    benchmark: Optional[np.ndarray] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        """Courbe de capital du portefeuille indexée par date."""
+        return pd.Series(self.equity, index=self.timestamps, name='equity')
+
+    @property
+    def symbol_equity_curves(self) -> pd.DataFrame:
+        """Valeur de marché des positions par symbole (une colonne par symbole)."""
+        return pd.DataFrame(self.position_values.T, index=self.timestamps, columns=self.symbols)
+
+    @property
+    def final_equity(self) -> float:
+        """Valeur finale du portefeuille."""
+        return float(self.equity[-1]) if len(self.equity) else self.config.initial_capital
+
+    def to_performance_metrics(self, portfolio_id: Optional[UUID] = None) -> PerformanceMetrics:
+        """
+        Convertit les métriques au modèle ``PerformanceMetrics``.
+
+        Args:
+            portfolio_id: Identifiant associé (généré si absent)
+
+        Returns:
+            PerformanceMetrics: Métriques du backtest
+        """
+        fields = {k: v for k, v in self.metrics.items() if k in PerformanceMetrics.model_fields}
+        return PerformanceMetrics(
+            portfolio_id=portfolio_id or uuid4(),
+            period_start=_to_datetime(self.timestamps[0]) if self.timestamps is not None else datetime.now(),
+            period_end=_to_datetime(self.timestamps[-1]) if self.timestamps is not None else datetime.now(),
+            **fields
+        )
+
+
+class _TradeLog:
+    """Accumulateur des trades clôturés (tableaux par lot de sorties)."""
+
+    def __init__(self):
+        self.batches: List[Dict[str, np.ndarray]] = []
+
+    def add(self, **columns: np.ndarray) -> None:
+        self.batches.append(columns)
+
+    def pnl(self) -> np.ndarray:
+        if not self.batches:
+            return np.zeros(0)
+        return np.concatenate([batch['pnl'] for batch in self.batches])
+
+    def to_dataframe(self, symbols: List[str], timestamps: Optional[np.ndarray]) -> pd.DataFrame:
+        columns = ['symbol', 'entry_time', 'exit_time', 'entry_price', 'exit_price',
+                   'quantity', 'pnl', 'return', 'exit_reason']
+        if not self.batches:
+            return pd.DataFrame(columns=columns)
+
+        data = {name: np.concatenate([batch[name] for batch in self.batches]) for name in self.batches[0]}
+        index = timestamps if timestamps is not None else np.arange(int(data['exit_bar'].max()) + 1)
+        frame = pd.DataFrame({
+            'symbol': np.asarray(symbols, dtype=object)[data['symbol']],
+            'entry_time': index[data['entry_bar']],
+            'exit_time': index[data['exit_bar']],
+            'entry_price': data['entry_price'],
+            'exit_price': data['exit_price'],
+            'quantity': data['quantity'],
+            'pnl': data['pnl'],
+            'return': data['return'],
+            'exit_reason': data['exit_reason']
+        }, columns=columns)
+        return frame.sort_values(['exit_time', 'symbol'], kind='stable').reset_index(drop=True)
+
+
+class VectorizedBacktester:
+    """
+    Moteur de backtest vectoriel.
+
+    Les signaux émis à la clôture d'une barre sont exécutés à l'ouverture
+    de la barre suivante (pas de biais d'anticipation). Lorsqu'une barre
+    atteint à la fois le stop et l'objectif, le stop est retenu.
+    """
+
+    def __init__(self, rule_compiler: Optional[RuleCompiler] = None):
+        """
+        Initialise le moteur.
+
+        Args:
+            rule_compiler: Compilateur de règles (partagé avec le moteur de stratégies)
+        """
+        self.rule_compiler = rule_compiler or RuleCompiler()
+
+    def generate_signals(self, strategy: Strategy, data: Mapping[str, Any]) -> VectorSignals:
+        """
+        Génère les signaux de la stratégie sur tout l'historique.
+
+        Args:
+            strategy: Stratégie parsée
+            data: Historique par symbole (BarSeries, DataFrame ou colonnes)
+
+        Returns:
+            VectorSignals: Signaux symboles × barres
+
+        Raises:
+            BacktestError: Si les règles ne sont pas vectorisables
+        """
+        name = strategy.strategy.name
+        try:
+            rule = self.rule_compiler.compile_vectorized(strategy.rules, name)
+        except CompilationError as e:
+            raise BacktestError(f"Règles non vectorisables: {e.message}", name)
+        if not rule.buy_conditions:
+            raise BacktestError("Aucune condition d'achat compilée (buy_conditions)", name)
+        return rule.evaluate_universe(data)
+
+    def run(self,
+            strategy: Strategy,
+            data: Mapping[str, Any],
+            config: Optional[BacktestConfig] = None,
+            benchmark: Any = None) -> BacktestResult:
+        """
+        Exécute le backtest d'une stratégie.
+
+        Args:
+            strategy: Stratégie parsée
+            data: Historique par symbole (BarSeries, DataFrame ou colonnes)
+            config: Paramètres de simulation (depuis la stratégie si absent)
+            benchmark: Historique du benchmark (BarSeries, DataFrame ou prix)
+
+        Returns:
+            BacktestResult: Courbes de capital, trades et métriques
+        """
+        name = strategy.strategy.name
+        if not data:
+            raise BacktestError("Aucun historique fourni", name)
+
+        config = config or BacktestConfig.from_strategy(strategy)
+        frames = {symbol: PriceFrame.from_data(series) for symbol, series in data.items()}
+        signals = self.generate_signals(strategy, frames)
+        symbols = list(frames)
+
+        timestamps = signals.timestamps
+        prices = _align_prices(frames, timestamps)
+        buy, sell, confidence = signals.buy, signals.sell, signals.buy_confidence
+
+        # Fenêtre de simulation (les indicateurs utilisent l'historique antérieur)
+        window = _date_window(timestamps, config.start_date, config.end_date)
+        if window is not None:
+            timestamps = timestamps[window]
+            prices = {k: v[:, window] for k, v in prices.items()}
+            buy, sell, confidence = buy[:, window], sell[:, window], confidence[:, window]
+        if prices['close'].shape[1] < 2:
+            raise BacktestError("Historique insuffisant sur la période demandée", name)
+
+        result = self._simulate(prices, buy, sell, confidence, config)
+        benchmark_prices = _align_benchmark(benchmark, timestamps) if benchmark is not None else None
+        metrics = compute_performance_metrics(
+            result['equity'], result['trades'].pnl(),
+            periods_per_year=config.periods_per_year,
+            risk_free_rate=config.risk_free_rate,
+            benchmark=benchmark_prices
+        )
+        metrics['total_return'] = metrics['relative_return']
+
+        logger.info(
+            f"Backtest {name}: {len(symbols)} symboles × {len(result['equity'])} barres, "
+            f"{metrics['trades_count']} trades, rendement {metrics['total_return']:.2%}"
+        )
+        return BacktestResult(
+            strategy_name=name,
+            symbols=symbols,
+            timestamps=timestamps,
+            equity=result['equity'],
+            cash=result['cash'],
+            position_values=result['position_values'],
+            trades=result['trades'].to_dataframe(symbols, timestamps),
+            metrics=metrics,
+            costs=result['costs'],
+            config=config,
+            benchmark=benchmark_prices
+        )
+
+    def _simulate(self, prices: Dict[str, np.ndarray], buy: np.ndarray, sell: np.ndarray,
+                  confidence: np.ndarray, config: BacktestConfig) -> Dict[str, Any]:
+        """Simulation barre par barre, vectorisée sur les symboles."""
+        close = prices['close']
+        open_, high, low = prices['open'], prices['high'], prices['low']
+        n_symbols, n_bars = close.shape
+
+        weights = self._position_weights(close, config)
+        atr = self._atr_matrix(prices, config)
+        commission, slippage = config.commission, config.slippage
+
+        quantity = np.zeros(n_symbols)
+        entry_price = np.zeros(n_symbols)
+        entry_cost = np.zeros(n_symbols)
+        entry_bar = np.zeros(n_symbols, dtype=np.int64)
+        stop = np.full(n_symbols, np.nan)
+        target = np.full(n_symbols, np.nan)
+        last_close = np.full(n_symbols, np.nan)
+        pending_buy = np.zeros(n_symbols, dtype=bool)
+        pending_sell = np.zeros(n_symbols, dtype=bool)
+
+        cash = float(config.initial_capital)
+        equity = np.empty(n_bars)
+        cash_curve = np.empty(n_bars)
+        position_values = np.zeros((n_symbols, n_bars))
+        trades = _TradeLog()
+        costs = {'commission': 0.0, 'slippage': 0.0}
+
+        def close_positions(mask: np.ndarray, raw_price: np.ndarray, bar: int, reason: str) -> None:
+            nonlocal cash
+            rows = np.nonzero(mask)[0]
+            qty = quantity[rows]
+            fill = raw_price[rows] * (1.0 - slippage)
+            proceeds = qty * fill
+            fees = proceeds * commission
+            pnl = proceeds - fees - entry_cost[rows]
+            cash += float((proceeds - fees).sum())
+            costs['commission'] += float(fees.sum())
+            costs['slippage'] += float((qty * (raw_price[rows] - fill)).sum())
+            trades.add(
+                symbol=rows, entry_bar=entry_bar[rows], exit_bar=np.full(len(rows), bar),
+                entry_price=entry_price[rows], exit_price=fill, quantity=qty, pnl=pnl,
+                **{'return': pnl / entry_cost[rows]}, exit_reason=np.full(len(rows), reason, dtype=object)
+            )
+            quantity[rows] = 0.0
+            stop[rows] = np.nan
+            target[rows] = np.nan
+
+        for t in range(n_bars):
+            valid = ~np.isnan(close[:, t])
+            o = open_[:, t]
+
+            # 1. Sorties sur signal à l'ouverture
+            exits = pending_sell & (quantity > 0) & valid
+            if exits.any():
+                close_positions(exits, o, t, EXIT_SIGNAL)
+
+            # 2. Entrées à l'ouverture
+            entries = pending_buy & ~pending_sell & (quantity == 0) & valid & ~exits
+            if config.max_positions is not None and entries.any():
+                slots = config.max_positions - int((quantity > 0).sum())
+                candidates = np.nonzero(entries)[0]
+                if slots < len(candidates):
+                    ranked = candidates[np.argsort(-confidence[candidates, t - 1], kind='stable')]
+                    entries[:] = False
+                    entries[ranked[:max(slots, 0)]] = True
+            if entries.any() and cash > 0:
+                rows = np.nonzero(entries)[0]
+                fill = o[rows] * (1.0 + slippage)
+                marked = np.nansum(quantity * last_close)
+                notional = weights[rows, t - 1] * (cash + marked)
+                required = notional.sum() * (1.0 + commission)
+                if required > cash:
+                    notional *= cash / required
+                qty = notional / fill
+                cost = qty * fill
+                fees = cost * commission
+                cash -= float((cost + fees).sum())
+                costs['commission'] += float(fees.sum())
+                costs['slippage'] += float((qty * (fill - o[rows])).sum())
+
+                quantity[rows] = qty
+                entry_price[rows] = fill
+                entry_cost[rows] = cost + fees
+                entry_bar[rows] = t
+                stop[rows] = self._exit_level(config.stop_loss, config.stop_loss_type, fill, atr, rows, t, -1.0)
+                target[rows] = self._exit_level(config.take_profit, config.take_profit_type, fill, atr, rows, t, 1.0)
+
+            # 3. Stop-loss puis take-profit sur l'étendue de la barre
+            held = (quantity > 0) & valid
+            with np.errstate(invalid='ignore'):
+                stop_hit = held & (low[:, t] <= stop)
+                target_hit = held & ~stop_hit & (high[:, t] >= target)
+            if stop_hit.any():
+                # Ouverture sous le stop (gap): exécution à l'ouverture
+                close_positions(stop_hit, np.fmin(o, stop), t, EXIT_STOP_LOSS)
+            if target_hit.any():
+                close_positions(target_hit, np.fmax(o, target), t, EXIT_TAKE_PROFIT)
+
+            # 4. Valorisation à la clôture
+            last_close = np.where(valid, close[:, t], last_close)
+            values = np.nan_to_num(quantity * last_close)
+            position_values[:, t] = values
+            cash_curve[t] = cash
+            equity[t] = cash + values.sum()
+
+            pending_buy = buy[:, t]
+            pending_sell = sell[:, t]
+
+        if config.close_at_end and (quantity > 0).any():
+            close_positions(quantity > 0, last_close, n_bars - 1, EXIT_END)
+            position_values[:, -1] = 0.0
+            cash_curve[-1] = cash
+            equity[-1] = cash
+
+        return {
+            'equity': equity,
+            'cash': cash_curve,
+            'position_values': position_values,
+            'trades': trades,
+            'costs': {**costs, 'total': costs['commission'] + costs['slippage']}
+        }
+
+    @staticmethod
+    def _position_weights(close: np.ndarray, config: BacktestConfig) -> np.ndarray:
+        """Fraction du capital allouée à chaque entrée (symboles × barres)."""
+        if config.position_sizing == PositionSizingMethod.VOLATILITY_BASED:
+            # Volatilité cible: poids = cible / volatilité annualisée récente
+            returns = np.full(close.shape, np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1.0
+            volatility = pd.DataFrame(returns.T).rolling(config.volatility_window).std().to_numpy().T
+            volatility *= np.sqrt(config.periods_per_year)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weights = config.position_size / volatility
+            return np.clip(np.nan_to_num(weights, nan=0.0, posinf=0.0), 0.0, 1.0)
+        # Pourcentage fixe (la fraction de Kelly est fournie comme valeur)
+        return np.full(close.shape, min(max(config.position_size, 0.0), 1.0))
+
+    @staticmethod
+    def _atr_matrix(prices: Dict[str, np.ndarray], config: BacktestConfig) -> Optional[np.ndarray]:
+        """ATR par symbole, calculé seulement pour les niveaux basés sur l'ATR."""
+        needs_atr = any(
+            value is not None and kind == StopLossType.ATR_BASED
+            for value, kind in ((config.stop_loss, config.stop_loss_type),
+                                (config.take_profit, config.take_profit_type))
+        )
+        if not needs_atr:
+            return None
+        return np.vstack([
+            kernels.atr(prices['high'][row], prices['low'][row], prices['close'][row], config.atr_period)
+            for row in range(prices['close'].shape[0])
+        ])
+
+    @staticmethod
+    def _exit_level(value: Optional[float], kind: StopLossType, fill: np.ndarray,
+                    atr: Optional[np.ndarray], rows: np.ndarray, bar: int, direction: float) -> np.ndarray:
+        """Niveau de stop (direction -1) ou d'objectif (+1) fixé à l'entrée."""
+        if value is None:
+            return np.full(len(rows), np.nan)
+        if kind == StopLossType.ATR_BASED and atr is not None:
+            # ATR connu à la clôture de la barre du signal
+            return fill + direction * value * atr[rows, bar - 1]
+        if kind == StopLossType.PERCENTAGE:
+            return fill * (1.0 + direction * value)
+        return np.full(len(rows), np.nan)  # Niveaux techniques: non simulés
+
+
+def _align_prices(frames: Dict[str, PriceFrame], timestamps: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+    """Colonnes OHLC (symboles × barres) alignées sur les horodatages des signaux."""
+    first = next(iter(frames.values()))
+    aligned = timestamps is None or all(
+        f.timestamps is not None and len(f.timestamps) == len(timestamps) and np.array_equal(f.timestamps, timestamps)
+        for f in frames.values()
+    )
+    n_bars = len(first.columns['close']) if timestamps is None else len(timestamps)
+
+    prices: Dict[str, np.ndarray] = {}
+    for name in ('open', 'high', 'low', 'close'):
+        matrix = np.full((len(frames), n_bars), np.nan)
+        for row, frame in enumerate(frames.values()):
+            # Barres sans ouverture/plus haut/plus bas: clôture utilisée
+            values = frame.columns.get(name, frame.columns['close'])
+            if aligned:
+                matrix[row] = values
+            else:
+                matrix[row, np.searchsorted(timestamps, frame.timestamps)] = values
+        prices[name] = matrix
+    return prices
+
+
+def _date_window(timestamps: Optional[np.ndarray], start: Optional[datetime],
+                 end: Optional[datetime]) -> Optional[np.ndarray]:
+    """Masque des barres comprises entre ``start`` et ``end``."""
+    if timestamps is None or (start is None and end is None):
+        return None
+    index = pd.DatetimeIndex(timestamps)
+    mask = np.ones(len(index), dtype=bool)
+    if start is not None:
+        mask &= index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= index <= pd.Timestamp(end)
+    return mask
+
+
+def _align_benchmark(benchmark: Any, timestamps: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Clôtures du benchmark aux horodatages du backtest (dernière valeur connue)."""
+    if isinstance(benchmark, np.ndarray) or isinstance(benchmark, list):
+        values = np.asarray(benchmark, dtype=np.float64)
+        return values if timestamps is None or len(values) == len(timestamps) else None
+
+    frame = PriceFrame.from_data(benchmark)
+    if timestamps is None or frame.timestamps is None:
+        return None
+    series = pd.Series(frame.columns['close'], index=pd.DatetimeIndex(frame.timestamps))
+    aligned = series.reindex(pd.DatetimeIndex(timestamps), method='ffill')
+    return aligned.bfill().to_numpy()
+
+
+def _to_datetime(value: Any) -> datetime:
+    """Horodatage NumPy/pandas converti en datetime."""
+    return pd.Timestamp(value).to_pydatetime()
@@ -6,10 +6,13 @@ from .decision_engine import DecisionEngine
 from .market_analyzer import MarketAnalyzer
 from .signal_aggregator import SignalAggregator
 from .risk_evaluator import RiskEvaluator
+from .decision_snapshot import DecisionSnapshot, DecisionSnapshotLoader
 
 __all__ = [
     "DecisionEngine",
     "MarketAnalyzer", 
     "SignalAggregator",
     "RiskEvaluator",
+    "DecisionSnapshot",
+    "DecisionSnapshotLoader",
 ]
\ No newline at end of file
@@ -11,6 +11,7 @@ from uuid import UUID
 
 from finagent.ai.services.analysis_service import AnalysisService
 from finagent.ai.services.decision_service import DecisionService
+from finagent.business.decision.decision_snapshot import DecisionSnapshot, DecisionSnapshotLoader
 from finagent.business.models.decision_models import (
     DecisionContext,
     DecisionResult,
@@ -22,7 +23,9 @@ from finagent.business.models.decision_models import (
 )
 from finagent.business.models.portfolio_models import Portfolio, Position
 from finagent.business.strategy.manager.strategy_manager import StrategyManager
+from finagent.data.models.price_panel import PricePanel
 from finagent.data.providers.openbb_provider import OpenBBProvider
+from finagent.data.services.market_data_bus import MarketDataBus
 from finagent.infrastructure.config import settings
 
 logger = logging.getLogger(__name__)
@@ -48,7 +51,9 @@ class DecisionEngine:
         openbb_provider: OpenBBProvider,
         market_analyzer: Optional['MarketAnalyzer'] = None,
         signal_aggregator: Optional['SignalAggregator'] = None,
-        risk_evaluator: Optional['RiskEvaluator'] = None
+        risk_evaluator: Optional['RiskEvaluator'] = None,
+        market_data_bus: Optional[MarketDataBus] = None,
+        snapshot_loader: Optional[DecisionSnapshotLoader] = None
     ):
         """
         Initialise le moteur de décision.
@@ -61,6 +66,8 @@ class DecisionEngine:
             market_analyzer: Analyseur de marché (optionnel)
             signal_aggregator: Agrégateur de signaux (optionnel)
             risk_evaluator: Évaluateur de risque (optionnel)
+            market_data_bus: Bus de données de marché (dernières cotations publiées)
+            snapshot_loader: Chargeur des données par symbole (créé depuis le provider si absent)
         """
         self.analysis_service = analysis_service
         self.decision_service = decision_service
@@ -71,6 +78,10 @@ class DecisionEngine:
         self.market_analyzer = market_analyzer
         self.signal_aggregator = signal_aggregator
         self.risk_evaluator = risk_evaluator
+        self.market_data_bus = market_data_bus
+        self.snapshot_loader = snapshot_loader or DecisionSnapshotLoader(
+            openbb_provider, market_data_bus
+        )
         
         # Configuration
         self.max_concurrent_analyses = settings.ai.max_concurrent_requests or 3
@@ -82,7 +93,8 @@ class DecisionEngine:
         self,
         symbol: str,
         portfolio: Portfolio,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> DecisionResult:
         """
         Prend une décision de trading pour un symbole donné.
@@ -91,6 +103,7 @@ class DecisionEngine:
             symbol: Symbole du titre à analyser
             portfolio: Portefeuille actuel
             context: Contexte additionnel pour la décision
+            snapshot: Données du symbole déjà chargées (sinon chargées ici)
             
         Returns:
             DecisionResult: Décision de trading complète
@@ -98,27 +111,27 @@ class DecisionEngine:
         logger.info(f"Démarrage de la prise de décision pour {symbol}")
         
         try:
-            # 1. Construire le contexte de décision
+            # 1. Charger une seule fois les données du symbole pour toute la décision
+            if snapshot is None:
+                snapshot = await self.snapshot_loader.load(symbol)
+            market_data = snapshot.to_market_data()
+            
+            # 2. Construire le contexte de décision
             decision_context = await self._build_decision_context(
-                symbol, portfolio, context
+                symbol, portfolio, context, snapshot
             )
             
-            # 2. Collecter toutes les analyses en parallèle
+            # 3. Collecter toutes les analyses en parallèle
             analysis_tasks = [
-                self._get_market_data(symbol),
-                self._analyze_market_conditions(symbol, decision_context),
+                self._analyze_market_conditions(symbol, decision_context, snapshot),
                 self._evaluate_strategies(symbol, decision_context),
-                self._assess_risks(symbol, decision_context)
+                self._assess_risks(symbol, decision_context, snapshot)
             ]
             
-            market_data, market_analysis, strategy_signals, risk_assessment = \
+            market_analysis, strategy_signals, risk_assessment = \
                 await asyncio.gather(*analysis_tasks, return_exceptions=True)
             
-            # 3. Vérifier les erreurs
-            if isinstance(market_data, Exception):
-                logger.error(f"Erreur récupération données marché: {market_data}")
-                market_data = None
-            
+            # 4. Vérifier les erreurs
             if isinstance(market_analysis, Exception):
                 logger.error(f"Erreur analyse marché: {market_analysis}")
                 market_analysis = None
@@ -131,22 +144,22 @@ class DecisionEngine:
                 logger.error(f"Erreur évaluation risques: {risk_assessment}")
                 risk_assessment = None
             
-            # 4. Mettre à jour le contexte avec les données collectées
+            # 5. Mettre à jour le contexte avec les données collectées
             decision_context = await self._update_context_with_analysis(
                 decision_context, market_data, market_analysis, risk_assessment
             )
             
-            # 5. Agréger les signaux
+            # 6. Agréger les signaux
             signal_aggregation = await self._aggregate_signals(
-                symbol, strategy_signals, market_analysis, risk_assessment
+                symbol, strategy_signals, market_analysis, risk_assessment, snapshot
             )
             
-            # 6. Prendre la décision finale via l'IA
+            # 7. Prendre la décision finale via l'IA
             final_decision = await self._make_final_decision(
                 symbol, decision_context, signal_aggregation
             )
             
-            # 7. Valider et ajuster la décision
+            # 8. Valider et ajuster la décision
             validated_decision = await self._validate_and_adjust_decision(
                 final_decision, decision_context, portfolio
             )
@@ -187,12 +200,25 @@ class DecisionEngine:
         """
         logger.info(f"Prise de décisions par lot pour {len(symbols)} symboles")
         
+        # Précharger les données de tous les symboles en requêtes groupées
+        try:
+            snapshots = await self.snapshot_loader.load_many(symbols)
+        except Exception as e:
+            logger.error(f"Erreur préchargement des données du lot: {e}")
+            snapshots = {}
+        
+        # Analyse technique de tout le lot en une passe vectorielle
+        if self.market_analyzer and snapshots:
+            await self._analyze_universe(snapshots)
+        
         # Limiter la concurrence
         semaphore = asyncio.Semaphore(self.max_concurrent_analyses)
         
         async def make_single_decision(symbol: str) -> tuple[str, DecisionResult]:
             async with semaphore:
-                decision = await self.make_decision(symbol, portfolio, context)
+                decision = await self.make_decision(
+                    symbol, portfolio, context, snapshots.get(symbol)
+                )
                 return symbol, decision
         
         # Exécuter toutes les décisions en parallèle
@@ -216,13 +242,16 @@ class DecisionEngine:
         self,
         symbol: str,
         portfolio: Portfolio,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]],
+        snapshot: DecisionSnapshot
     ) -> DecisionContext:
         """Construit le contexte de décision initial."""
         
-        # Récupérer les données de prix de base
+        # Données de prix de base de l'instantané
         try:
-            price_data = await self.openbb_provider.get_quote(symbol)
+            price_data = snapshot.quote
+            if not price_data:
+                raise ValueError(snapshot.errors.get('quote', "cotation indisponible"))
             current_price = Decimal(str(price_data.get('price', 0)))
             previous_close = Decimal(str(price_data.get('previous_close', current_price)))
             day_high = Decimal(str(price_data.get('day_high', current_price)))
@@ -262,38 +291,38 @@ class DecisionEngine:
             strategy_context=context or {}
         )
     
-    async def _get_market_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Récupère les données de marché complètes."""
+    async def _analyze_universe(self, snapshots: Dict[str, DecisionSnapshot]) -> None:
+        """Analyse groupée des symboles du lot, rangée dans leurs instantanés."""
         try:
-            # Données de base
-            quote = await self.openbb_provider.get_quote(symbol)
-            
-            # Données historiques pour l'analyse technique
-            historical = await self.openbb_provider.get_historical_data(
-                symbol, period="1y", interval="1d"
+            panel = PricePanel.from_series({
+                symbol: snapshot.history
+                for symbol, snapshot in snapshots.items() if snapshot.has_history
+            })
+            if not len(panel):
+                return
+            analyses = await self.market_analyzer.analyze_universe(
+                panel, snapshots, include_sentiment=True,
+                max_concurrent_requests=self.max_concurrent_analyses
             )
-            
-            # Informations fondamentales
-            company_info = await self.openbb_provider.get_company_info(symbol)
-            
-            return {
-                'quote': quote,
-                'historical': historical,
-                'company_info': company_info
-            }
+            for symbol, analysis in analyses.items():
+                if symbol in snapshots:
+                    snapshots[symbol].analysis = analysis
         except Exception as e:
-            logger.error(f"Erreur récupération données marché pour {symbol}: {e}")
-            return None
+            logger.error(f"Erreur analyse groupée du lot: {e}")
     
     async def _analyze_market_conditions(
         self, 
         symbol: str, 
-        context: DecisionContext
+        context: DecisionContext,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> Optional[MarketAnalysis]:
         """Analyse les conditions de marché via l'IA."""
         try:
+            if snapshot is not None and snapshot.analysis is not None:
+                return snapshot.analysis
+            
             if self.market_analyzer:
-                return await self.market_analyzer.analyze_market(symbol, context)
+                return await self.market_analyzer.analyze_market(symbol, context, snapshot)
             
             # Fallback avec le service d'analyse
             analysis = await self.analysis_service.analyze_market_conditions(
@@ -359,12 +388,13 @@ class DecisionEngine:
     async def _assess_risks(
         self, 
         symbol: str, 
-        context: DecisionContext
+        context: DecisionContext,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> Optional[RiskAssessment]:
         """Évalue les risques associés au symbole."""
         try:
             if self.risk_evaluator:
-                return await self.risk_evaluator.assess_risk(symbol, context)
+                return await self.risk_evaluator.assess_risk(symbol, context, snapshot=snapshot)
             
             # Évaluation de base des risques
             return RiskAssessment(
@@ -413,13 +443,14 @@ class DecisionEngine:
         symbol: str,
         strategy_signals: List[Any],
         market_analysis: Optional[MarketAnalysis],
-        risk_assessment: Optional[RiskAssessment]
+        risk_assessment: Optional[RiskAssessment],
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> Optional[SignalAggregation]:
         """Agrège tous les signaux disponibles."""
         try:
             if self.signal_aggregator:
                 return await self.signal_aggregator.aggregate_signals(
-                    symbol, strategy_signals, market_analysis, risk_assessment
+                    symbol, strategy_signals, market_analysis, risk_assessment, snapshot
                 )
             
             # Agrégation simple par défaut
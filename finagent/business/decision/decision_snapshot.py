@@ -0,0 +1,233 @@
+"""
+Instantané de décision - Données de marché d'un symbole partagées par une décision.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from finagent.business.models.decision_models import MarketAnalysis
+from finagent.data.models.bar_series import BarSeries, to_bar_series
+from finagent.data.providers.openbb_provider import OpenBBProvider
+from finagent.data.services.market_data_bus import MarketDataBus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecisionSnapshot:
+    """
+    Données d'un symbole récupérées une seule fois pour une décision.
+
+    La cotation, l'historique et les informations de l'entreprise sont
+    lus par l'analyseur de marché, l'évaluateur de risque et
+    l'agrégateur de signaux; les DataFrames dérivés de l'historique sont
+    construits à la première demande puis réutilisés. ``analysis`` porte
+    une analyse de marché déjà calculée (analyse groupée d'un lot).
+    """
+    symbol: str
+    quote: Dict[str, Any] = field(default_factory=dict)
+    history: Optional[BarSeries] = None
+    company_info: Dict[str, Any] = field(default_factory=dict)
+    fetched_at: datetime = field(default_factory=datetime.now)
+    errors: Dict[str, str] = field(default_factory=dict)
+    analysis: Optional[MarketAnalysis] = None
+    _frames: Dict[str, pd.DataFrame] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def price(self) -> Optional[float]:
+        """Dernier prix connu (cotation, sinon dernière clôture)."""
+        price = self.quote.get('price')
+        if price is not None:
+            return float(price)
+        return self.history.last_close if self.history is not None else None
+
+    @property
+    def has_history(self) -> bool:
+        return self.history is not None and len(self.history) > 0
+
+    def history_frame(self) -> Optional[pd.DataFrame]:
+        """Historique en DataFrame (barres incomplètes supprimées)."""
+        if 'history' not in self._frames:
+            if not self.has_history:
+                return None
+            self._frames['history'] = self.history.to_dataframe().dropna()
+        return self._frames['history']
+
+    def returns_frame(self) -> Optional[pd.DataFrame]:
+        """Historique complété des rendements simples et logarithmiques."""
+        if 'returns' not in self._frames:
+            if not self.has_history:
+                return None
+            df = self.history.to_dataframe()
+            df['returns'] = df['close'].pct_change()
+            df['log_returns'] = np.log(df['close'] / df['close'].shift(1))
+            self._frames['returns'] = df.dropna()
+        return self._frames['returns']
+
+    def recent(self, bars: int) -> Optional[BarSeries]:
+        """Dernières ``bars`` barres de l'historique (vue sans copie)."""
+        if not self.has_history:
+            return None
+        return self.history[-bars:]
+
+    def to_market_data(self) -> Optional[Dict[str, Any]]:
+        """Données de marché au format du contexte stratégique."""
+        if not self.quote and self.history is None and not self.company_info:
+            return None
+        return {
+            'quote': self.quote,
+            'historical': self.history,
+            'company_info': self.company_info
+        }
+
+
+class DecisionSnapshotLoader:
+    """
+    Chargeur d'instantanés de marché.
+
+    Pour un symbole, la cotation, l'historique et les informations de
+    l'entreprise sont demandés en parallèle. Pour un lot, historiques et
+    cotations manquantes sont téléchargés en une requête groupée.
+    """
+
+    def __init__(
+        self,
+        openbb_provider: OpenBBProvider,
+        market_data_bus: Optional[MarketDataBus] = None,
+        period: str = "1y",
+        interval: str = "1d",
+        max_concurrent_requests: int = 8
+    ):
+        """
+        Initialise le chargeur.
+
+        Args:
+            openbb_provider: Provider de données financières
+            market_data_bus: Bus de données de marché (dernières cotations publiées)
+            period: Profondeur de l'historique
+            interval: Intervalle des barres
+            max_concurrent_requests: Requêtes d'informations simultanées d'un lot
+        """
+        self.openbb_provider = openbb_provider
+        self.market_data_bus = market_data_bus
+        self.period = period
+        self.interval = interval
+        self.max_concurrent_requests = max_concurrent_requests
+
+    async def load(self, symbol: str) -> DecisionSnapshot:
+        """
+        Charge l'instantané d'un symbole.
+
+        Args:
+            symbol: Symbole à charger
+
+        Returns:
+            DecisionSnapshot: Données du symbole (champs vides en cas d'erreur)
+        """
+        snapshot = DecisionSnapshot(symbol=symbol)
+        quote, history, company_info = await asyncio.gather(
+            self._get_quote(symbol),
+            self.openbb_provider.get_historical_data(
+                symbol, period=self.period, interval=self.interval, output="series"
+            ),
+            self.openbb_provider.get_company_info(symbol),
+            return_exceptions=True
+        )
+        self._fill(snapshot, quote, history, company_info)
+        return snapshot
+
+    async def load_many(self, symbols: Sequence[str]) -> Dict[str, DecisionSnapshot]:
+        """
+        Charge les instantanés d'un lot de symboles.
+
+        Args:
+            symbols: Symboles à charger
+
+        Returns:
+            Dict[str, DecisionSnapshot]: Instantanés par symbole
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        quotes = {s: q for s in symbols if (q := self._published_quote(s)) is not None}
+        missing = [s for s in symbols if s not in quotes]
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def company_info(symbol: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.openbb_provider.get_company_info(symbol)
+
+        histories, fetched_quotes, *infos = await asyncio.gather(
+            self.openbb_provider.get_historical_batch(
+                symbols, period=self.period, interval=self.interval, output="series"
+            ),
+            self.openbb_provider.get_quotes(missing) if missing else asyncio.sleep(0, {}),
+            *(company_info(s) for s in symbols),
+            return_exceptions=True
+        )
+        if isinstance(histories, Exception):
+            logger.error(f"Erreur téléchargement groupé des historiques: {histories}")
+        if isinstance(fetched_quotes, Exception):
+            logger.error(f"Erreur téléchargement groupé des cotations: {fetched_quotes}")
+        else:
+            quotes.update(fetched_quotes)
+
+        snapshots = {}
+        for symbol, info in zip(symbols, infos):
+            # Les erreurs des requêtes groupées sont reportées sur chaque symbole
+            history = histories if isinstance(histories, Exception) else histories.get(symbol)
+            quote = quotes.get(symbol)
+            if quote is None and isinstance(fetched_quotes, Exception):
+                quote = fetched_quotes
+            snapshot = DecisionSnapshot(symbol=symbol)
+            self._fill(snapshot, quote, history, info)
+            snapshots[symbol] = snapshot
+
+        logger.info(f"Instantanés chargés pour {len(snapshots)} symboles")
+        return snapshots
+
+    async def _get_quote(self, symbol: str) -> Dict[str, Any]:
+        """Dernière cotation publiée sur le bus, sinon requête au provider."""
+        quote = self._published_quote(symbol)
+        if quote is not None:
+            return quote
+        return await self.openbb_provider.get_quote(symbol)
+
+    def _published_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        if self.market_data_bus is None:
+            return None
+        return self.market_data_bus.latest_quote(symbol)
+
+    @staticmethod
+    def _fill(snapshot: DecisionSnapshot, quote: Any, history: Any, company_info: Any) -> None:
+        """Renseigne l'instantané, en notant les erreurs par source."""
+        symbol = snapshot.symbol
+
+        if isinstance(quote, Exception):
+            logger.warning(f"Erreur récupération prix pour {symbol}: {quote}")
+            snapshot.errors['quote'] = str(quote)
+        elif quote:
+            snapshot.quote = dict(quote)
+
+        if isinstance(history, Exception):
+            logger.error(f"Erreur récupération données historiques pour {symbol}: {history}")
+            snapshot.errors['history'] = str(history)
+        elif history is not None and len(history) > 0:
+            try:
+                snapshot.history = to_bar_series(history, symbol)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Données historiques incomplètes pour {symbol}: {e}")
+                snapshot.errors['history'] = str(e)
+
+        if isinstance(company_info, Exception):
+            logger.error(f"Erreur récupération informations pour {symbol}: {company_info}")
+            snapshot.errors['company_info'] = str(company_info)
+        elif company_info:
+            snapshot.company_info = dict(company_info)
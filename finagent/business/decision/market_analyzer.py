@@ -7,11 +7,15 @@ import logging
 import numpy as np
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
 import pandas as pd
 
+from finagent.business.decision.decision_snapshot import DecisionSnapshot
 from finagent.business.models.decision_models import MarketAnalysis, DecisionContext
 from finagent.data.providers.openbb_provider import OpenBBProvider
+from finagent.data.models.bar_series import to_bar_series
+from finagent.data.models.price_panel import PricePanel
+from finagent.data.indicators import kernels, panel as panel_kernels
 from finagent.ai.services.analysis_service import AnalysisService
 from finagent.infrastructure.config import settings
 
@@ -54,13 +58,17 @@ class MarketAnalyzer:
         self.bb_std = 2
         self.sma_periods = [20, 50, 200]
         self.ema_periods = [12, 26]
+        self.volume_lookback = 63  # ~3 mois de séances
+        self.pivot_window = 5
+        self.max_levels = 5
         
         logger.info("Analyseur de marché initialisé")
     
     async def analyze_market(
         self, 
         symbol: str, 
-        context: DecisionContext
+        context: DecisionContext,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> MarketAnalysis:
         """
         Analyse complète du marché pour un symbole.
@@ -68,6 +76,7 @@ class MarketAnalyzer:
         Args:
             symbol: Symbole à analyser
             context: Contexte de décision
+            snapshot: Données déjà chargées pour la décision (sinon récupérées)
             
         Returns:
             MarketAnalysis: Analyse complète du marché
@@ -75,16 +84,23 @@ class MarketAnalyzer:
         logger.info(f"Démarrage analyse marché pour {symbol}")
         
         try:
-            # Collecter toutes les données en parallèle
-            tasks = [
-                self._get_historical_data(symbol),
-                self._get_company_fundamentals(symbol),
-                self._get_market_sentiment(symbol),
-                self._get_volume_data(symbol)
-            ]
-            
-            historical_data, fundamentals, sentiment, volume_data = \
-                await asyncio.gather(*tasks, return_exceptions=True)
+            if snapshot is not None:
+                # Historique et fondamentaux partagés: seul le sentiment est demandé
+                historical_data = self._usable_history(snapshot.history_frame())
+                fundamentals = self._extract_fundamentals(snapshot.company_info)
+                volume_data = self._volume_metrics(snapshot.recent(self.volume_lookback))
+                sentiment = await self._get_market_sentiment(symbol)
+            else:
+                # Collecter toutes les données en parallèle
+                tasks = [
+                    self._get_historical_data(symbol),
+                    self._get_company_fundamentals(symbol),
+                    self._get_market_sentiment(symbol),
+                    self._get_volume_data(symbol)
+                ]
+                
+                historical_data, fundamentals, sentiment, volume_data = \
+                    await asyncio.gather(*tasks, return_exceptions=True)
             
             # Vérifier les erreurs
             if isinstance(historical_data, Exception):
@@ -108,7 +124,7 @@ class MarketAnalyzer:
             support_levels = []
             resistance_levels = []
             trend_direction = "neutral"
-            volatility = 0.0
+            volatility = 0.2
             
             if historical_data is not None and len(historical_data) > 0:
                 # Analyse technique
@@ -153,31 +169,221 @@ class MarketAnalyzer:
                 liquidity_score=0.5
             )
     
+    async def analyze_universe(
+        self,
+        panel: PricePanel,
+        snapshots: Optional[Mapping[str, DecisionSnapshot]] = None,
+        include_sentiment: bool = False,
+        max_concurrent_requests: int = 4
+    ) -> Dict[str, MarketAnalysis]:
+        """
+        Analyse groupée d'un univers de symboles.
+        
+        Indicateurs techniques, volatilité, tendance, supports/résistances
+        et volumes de tous les symboles sont calculés en une passe sur le
+        panel (symboles × dates). Seuls les fondamentaux (lus dans les
+        instantanés) et le sentiment restent propres à chaque symbole.
+        
+        Args:
+            panel: Prix alignés (symboles × dates)
+            snapshots: Instantanés par symbole (informations de l'entreprise)
+            include_sentiment: Demander le sentiment de chaque symbole au service IA
+            max_concurrent_requests: Requêtes de sentiment simultanées
+            
+        Returns:
+            Dict[str, MarketAnalysis]: Analyse par symbole
+        """
+        logger.info(f"Démarrage analyse groupée pour {len(panel)} symboles")
+        snapshots = snapshots or {}
+        
+        technicals = self._panel_technicals(panel)
+        volumes = self._panel_volume_metrics(panel)
+        sentiments = (
+            await self._get_sentiments(panel.symbols, max_concurrent_requests)
+            if include_sentiment else {}
+        )
+        
+        analyses = {}
+        for row, symbol in enumerate(panel.symbols):
+            snapshot = snapshots.get(symbol)
+            fundamentals = self._extract_fundamentals(snapshot.company_info if snapshot else None)
+            sentiment = sentiments.get(symbol, {})
+            volume_data = volumes[row]
+            
+            analyses[symbol] = MarketAnalysis(
+                symbol=symbol,
+                technical_indicators=technicals['indicators'][row],
+                support_levels=technicals['support_levels'][row],
+                resistance_levels=technicals['resistance_levels'][row],
+                trend_direction=technicals['trend_direction'][row],
+                volatility=technicals['volatility'][row],
+                pe_ratio=fundamentals.get('pe_ratio'),
+                market_cap=Decimal(str(fundamentals['market_cap'])) if fundamentals.get('market_cap') else None,
+                dividend_yield=fundamentals.get('dividend_yield'),
+                sentiment_score=sentiment.get('overall_score', 0.0),
+                news_sentiment=sentiment.get('news_sentiment'),
+                social_sentiment=sentiment.get('social_sentiment'),
+                avg_volume=Decimal(str(volume_data['avg_volume'])),
+                volume_trend=volume_data['trend'],
+                liquidity_score=volume_data['liquidity_score']
+            )
+        
+        logger.info(f"Analyse groupée terminée pour {len(analyses)} symboles")
+        return analyses
+    
+    def _panel_technicals(self, panel: PricePanel) -> Dict[str, List[Any]]:
+        """
+        Indicateurs, tendance, volatilité et niveaux de tous les symboles.
+        
+        Mêmes définitions et valeurs par défaut que l'analyse d'un symbole;
+        les symboles de 20 barres ou moins n'ont pas d'analyse technique.
+        """
+        rows = len(panel)
+        high, low, close = panel.high, panel.low, panel.close
+        eligible = panel.valid_counts() > 20  # Minimum 20 points
+        last = panel_kernels.last_values
+        
+        indicators = {'rsi': last(panel_kernels.rsi(close, self.rsi_period), 50.0)}
+        
+        macd_line, signal_line, histogram = panel_kernels.macd(
+            close, self.macd_fast, self.macd_slow, self.macd_signal
+        )
+        indicators['macd'] = last(macd_line, 0.0)
+        indicators['macd_signal'] = last(signal_line, 0.0)
+        indicators['macd_histogram'] = last(histogram, 0.0)
+        
+        upper, middle, lower, _ = panel_kernels.bollinger_bands(close, self.bb_period, self.bb_std)
+        indicators['bb_upper'] = last(upper, 0.0)
+        indicators['bb_middle'] = last(middle, 0.0)
+        indicators['bb_lower'] = last(lower, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            indicators['bb_width'] = np.where(
+                indicators['bb_middle'] != 0,
+                (indicators['bb_upper'] - indicators['bb_lower']) / indicators['bb_middle'],
+                0.0
+            )
+        
+        for period in self.sma_periods:
+            indicators[f'sma_{period}'] = last(panel_kernels.sma(close, period))
+        for period in self.ema_periods:
+            indicators[f'ema_{period}'] = last(panel_kernels.ema(close, period))
+        
+        stoch_k, stoch_d = panel_kernels.stochastic(high, low, close, 14, 3)
+        indicators['stoch_k'] = last(stoch_k, 50.0)
+        indicators['stoch_d'] = last(stoch_d, 50.0)
+        indicators['atr'] = last(panel_kernels.atr(high, low, close, 14), 0.0)
+        indicators['williams_r'] = last(panel_kernels.williams_r(high, low, close, 14), -50.0)
+        indicators['cci'] = last(panel_kernels.cci(high, low, close, 20), 0.0)
+        
+        # Tendance: consensus de quatre signaux (haussier si au moins trois)
+        current = close[:, -1] if close.shape[1] else np.full(rows, np.nan)
+        with np.errstate(invalid='ignore'):
+            bullish = (
+                (indicators['sma_20'] > indicators['sma_50']).astype(int)
+                + (current > indicators['sma_20'])
+                + (indicators['macd'] > indicators['macd_signal'])
+                + (panel_kernels.linear_slope(close, 20) > 0)
+            )
+        trend = np.where(bullish > 2, 'bullish', np.where(bullish < 2, 'bearish', 'neutral'))
+        
+        volatility = panel_kernels.annualized_volatility(close)
+        volatility = np.where(np.isnan(volatility), 0.2, volatility)
+        
+        # Supports/résistances: pivots locaux sous/au-dessus du dernier prix
+        with np.errstate(invalid='ignore'):
+            resistance = np.where(
+                panel_kernels.pivot_mask(high, self.pivot_window, highs=True) & (high > current[:, None]),
+                high, np.nan
+            )
+            support = np.where(
+                panel_kernels.pivot_mask(low, self.pivot_window, highs=False) & (low < current[:, None]),
+                low, np.nan
+            )
+        
+        names = list(indicators)
+        values = np.column_stack([indicators[name] for name in names]) if rows else np.empty((0, 0))
+        result: Dict[str, List[Any]] = {
+            'indicators': [], 'support_levels': [], 'resistance_levels': [],
+            'trend_direction': [], 'volatility': []
+        }
+        for row in range(rows):
+            if not eligible[row]:
+                result['indicators'].append({})
+                result['support_levels'].append([])
+                result['resistance_levels'].append([])
+                result['trend_direction'].append('neutral')
+                result['volatility'].append(0.2)
+                continue
+            result['indicators'].append(dict(zip(names, values[row].tolist())))
+            result['resistance_levels'].append(self._levels(resistance[row], descending=False))
+            result['support_levels'].append(self._levels(support[row], descending=True))
+            result['trend_direction'].append(str(trend[row]))
+            result['volatility'].append(float(volatility[row]))
+        return result
+    
+    def _levels(self, values: np.ndarray, descending: bool) -> List[Decimal]:
+        """Niveaux distincts les plus proches du prix (tri croissant ou décroissant)."""
+        levels = np.unique(values[~np.isnan(values)])
+        if descending:
+            levels = levels[::-1]
+        return [Decimal(str(float(v))) for v in levels[:self.max_levels]]
+    
+    def _panel_volume_metrics(self, panel: PricePanel) -> List[Dict[str, Any]]:
+        """Métriques de volume de tous les symboles sur la fenêtre récente."""
+        volumes = panel.volume[:, -self.volume_lookback:]
+        counts = np.count_nonzero(~np.isnan(volumes), axis=1)
+        enough = counts >= 20
+        
+        avg_volume = np.zeros(len(panel))
+        recent_volume = np.zeros(len(panel))
+        if enough.any():
+            avg_volume[enough] = np.nanmean(volumes[enough], axis=1)
+            recent_volume[enough] = np.nanmean(volumes[enough, -10:], axis=1)
+        
+        trend = np.where(
+            recent_volume > avg_volume * 1.2, 'increasing',
+            np.where(recent_volume < avg_volume * 0.8, 'decreasing', 'stable')
+        )
+        liquidity = np.minimum(1.0, avg_volume / 1000000)  # Normaliser
+        
+        return [
+            {'avg_volume': float(avg_volume[i]), 'trend': str(trend[i]), 'liquidity_score': float(liquidity[i])}
+            if enough[i] else {'avg_volume': 0, 'trend': 'stable', 'liquidity_score': 0.5}
+            for i in range(len(panel))
+        ]
+    
+    async def _get_sentiments(
+        self,
+        symbols: Sequence[str],
+        max_concurrent_requests: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Sentiment de plusieurs symboles, avec concurrence limitée."""
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+        
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._get_market_sentiment(symbol)
+        
+        results = await asyncio.gather(*(fetch(s) for s in symbols))
+        return dict(zip(symbols, results))
+    
     async def _get_historical_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """Récupère les données historiques."""
         try:
             # 1 an de données journalières
             data = await self.openbb_provider.get_historical_data(
-                symbol, period="1y", interval="1d"
+                symbol, period="1y", interval="1d", output="series"
             )
             
-            if data and len(data) > 0:
-                df = pd.DataFrame(data)
-                # S'assurer que les colonnes nécessaires existent
-                required_cols = ['open', 'high', 'low', 'close', 'volume']
-                for col in required_cols:
-                    if col not in df.columns:
-                        logger.warning(f"Colonne manquante {col} pour {symbol}")
-                        return None
-                
-                # Convertir en types numériques
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                # Supprimer les lignes avec des valeurs manquantes
-                df = df.dropna()
+            if data is not None and len(data) > 0:
+                try:
+                    series = to_bar_series(data, symbol)
+                except ValueError as e:
+                    logger.warning(f"Données historiques incomplètes pour {symbol}: {e}")
+                    return None
                 
-                return df if len(df) > 20 else None  # Minimum 20 points
+                # Conversion sans copie, puis suppression des barres incomplètes
+                return self._usable_history(series.to_dataframe().dropna())
             
             return None
             
@@ -185,30 +391,38 @@ class MarketAnalyzer:
             logger.error(f"Erreur récupération données historiques pour {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _usable_history(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Historique exploitable pour l'analyse technique."""
+        return df if df is not None and len(df) > 20 else None  # Minimum 20 points
+    
     async def _get_company_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """Récupère les données fondamentales."""
         try:
             company_info = await self.openbb_provider.get_company_info(symbol)
-            
-            fundamentals = {}
-            if company_info:
-                # Extraire les métriques fondamentales
-                fundamentals['pe_ratio'] = company_info.get('pe_ratio')
-                fundamentals['market_cap'] = company_info.get('market_cap')
-                fundamentals['dividend_yield'] = company_info.get('dividend_yield')
-                fundamentals['book_value'] = company_info.get('book_value')
-                fundamentals['earnings_growth'] = company_info.get('earnings_growth')
-                fundamentals['revenue_growth'] = company_info.get('revenue_growth')
-                fundamentals['debt_to_equity'] = company_info.get('debt_to_equity')
-                fundamentals['return_on_equity'] = company_info.get('return_on_equity')
-                fundamentals['profit_margin'] = company_info.get('profit_margin')
-            
-            return fundamentals
+            return self._extract_fundamentals(company_info)
             
         except Exception as e:
             logger.error(f"Erreur récupération fondamentaux pour {symbol}: {e}")
             return {}
     
+    @staticmethod
+    def _extract_fundamentals(company_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extrait les métriques fondamentales des informations de l'entreprise."""
+        fundamentals = {}
+        if company_info:
+            fundamentals['pe_ratio'] = company_info.get('pe_ratio')
+            fundamentals['market_cap'] = company_info.get('market_cap')
+            fundamentals['dividend_yield'] = company_info.get('dividend_yield')
+            fundamentals['book_value'] = company_info.get('book_value')
+            fundamentals['earnings_growth'] = company_info.get('earnings_growth')
+            fundamentals['revenue_growth'] = company_info.get('revenue_growth')
+            fundamentals['debt_to_equity'] = company_info.get('debt_to_equity')
+            fundamentals['return_on_equity'] = company_info.get('return_on_equity')
+            fundamentals['profit_margin'] = company_info.get('profit_margin')
+        
+        return fundamentals
+    
     async def _get_market_sentiment(self, symbol: str) -> Dict[str, Any]:
         """Analyse le sentiment de marché."""
         try:
@@ -239,18 +453,26 @@ class MarketAnalyzer:
         try:
             # Récupérer les données de volume récentes
             volume_data = await self.openbb_provider.get_historical_data(
-                symbol, period="3m", interval="1d"
+                symbol, period="3mo", interval="1d", output="series"
             )
             
-            if not volume_data or len(volume_data) < 20:
+            if volume_data is None:
                 return {'avg_volume': 0, 'trend': 'stable', 'liquidity_score': 0.5}
             
-            df = pd.DataFrame(volume_data)
-            volumes = pd.to_numeric(df['volume'], errors='coerce').dropna()
+            return self._volume_metrics(to_bar_series(volume_data, symbol))
             
-            if len(volumes) == 0:
+        except Exception as e:
+            logger.error(f"Erreur analyse volume pour {symbol}: {e}")
+            return {'avg_volume': 0, 'trend': 'stable', 'liquidity_score': 0.5}
+    
+    def _volume_metrics(self, series: Optional[Any]) -> Dict[str, Any]:
+        """Moyenne, tendance et score de liquidité des volumes récents."""
+        try:
+            if series is None or len(series) < 20:
                 return {'avg_volume': 0, 'trend': 'stable', 'liquidity_score': 0.5}
             
+            volumes = pd.Series(series.volume)
+            
             # Calculer la moyenne et la tendance
             avg_volume = volumes.mean()
             recent_volume = volumes.tail(10).mean()
@@ -273,7 +495,7 @@ class MarketAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"Erreur analyse volume pour {symbol}: {e}")
+            logger.error(f"Erreur calcul métriques de volume: {e}")
             return {'avg_volume': 0, 'trend': 'stable', 'liquidity_score': 0.5}
     
     async def _calculate_technical_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
@@ -302,11 +524,12 @@ class MarketAnalyzer:
             indicators['bb_width'] = (upper - lower) / middle if middle != 0 else 0
             
             # Moyennes mobiles
+            close = kernels.as_array(df['close'])
             for period in self.sma_periods:
-                indicators[f'sma_{period}'] = df['close'].rolling(window=period).mean().iloc[-1]
+                indicators[f'sma_{period}'] = kernels.last_value(kernels.sma(close, period))
             
             for period in self.ema_periods:
-                indicators[f'ema_{period}'] = df['close'].ewm(span=period).mean().iloc[-1]
+                indicators[f'ema_{period}'] = kernels.last_value(kernels.ema(close, period))
             
             # Stochastic
             stoch_k, stoch_d = self._calculate_stochastic(df, 14, 3)
@@ -331,12 +554,7 @@ class MarketAnalyzer:
     def _calculate_rsi(self, prices: pd.Series, period: int) -> float:
         """Calcule le RSI."""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return float(rsi.iloc[-1]) if not pd.isna(rsi.iloc[-1]) else 50.0
+            return kernels.last_value(kernels.rsi(prices, period), default=50.0)
         except:
             return 50.0
     
@@ -349,16 +567,12 @@ class MarketAnalyzer:
     ) -> Tuple[float, float, float]:
         """Calcule le MACD."""
         try:
-            exp1 = prices.ewm(span=fast).mean()
-            exp2 = prices.ewm(span=slow).mean()
-            macd_line = exp1 - exp2
-            signal_line = macd_line.ewm(span=signal).mean()
-            histogram = macd_line - signal_line
+            macd_line, signal_line, histogram = kernels.macd(prices, fast, slow, signal)
             
             return (
-                float(macd_line.iloc[-1]) if not pd.isna(macd_line.iloc[-1]) else 0.0,
-                float(signal_line.iloc[-1]) if not pd.isna(signal_line.iloc[-1]) else 0.0,
-                float(histogram.iloc[-1]) if not pd.isna(histogram.iloc[-1]) else 0.0
+                kernels.last_value(macd_line, default=0.0),
+                kernels.last_value(signal_line, default=0.0),
+                kernels.last_value(histogram, default=0.0)
             )
         except:
             return (0.0, 0.0, 0.0)
@@ -371,15 +585,12 @@ class MarketAnalyzer:
     ) -> Tuple[float, float, float]:
         """Calcule les Bollinger Bands."""
         try:
-            sma = prices.rolling(window=period).mean()
-            std = prices.rolling(window=period).std()
-            upper = sma + (std * std_dev)
-            lower = sma - (std * std_dev)
+            upper, middle, lower, _ = kernels.bollinger_bands(prices, period, std_dev)
             
             return (
-                float(upper.iloc[-1]) if not pd.isna(upper.iloc[-1]) else 0.0,
-                float(sma.iloc[-1]) if not pd.isna(sma.iloc[-1]) else 0.0,
-                float(lower.iloc[-1]) if not pd.isna(lower.iloc[-1]) else 0.0
+                kernels.last_value(upper, default=0.0),
+                kernels.last_value(middle, default=0.0),
+                kernels.last_value(lower, default=0.0)
             )
         except:
             return (0.0, 0.0, 0.0)
@@ -392,14 +603,13 @@ class MarketAnalyzer:
     ) -> Tuple[float, float]:
         """Calcule le Stochastic."""
         try:
-            low_min = df['low'].rolling(window=k_period).min()
-            high_max = df['high'].rolling(window=k_period).max()
-            k_percent = 100 * ((df['close'] - low_min) / (high_max - low_min))
-            d_percent = k_percent.rolling(window=d_period).mean()
+            k_percent, d_percent = kernels.stochastic(
+                df['high'], df['low'], df['close'], k_period, d_period
+            )
             
             return (
-                float(k_percent.iloc[-1]) if not pd.isna(k_percent.iloc[-1]) else 50.0,
-                float(d_percent.iloc[-1]) if not pd.isna(d_percent.iloc[-1]) else 50.0
+                kernels.last_value(k_percent, default=50.0),
+                kernels.last_value(d_percent, default=50.0)
             )
         except:
             return (50.0, 50.0)
@@ -407,38 +617,24 @@ class MarketAnalyzer:
     def _calculate_atr(self, df: pd.DataFrame, period: int) -> float:
         """Calcule l'Average True Range."""
         try:
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = ranges.max(axis=1)
-            atr = true_range.rolling(window=period).mean()
-            
-            return float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else 0.0
+            atr = kernels.atr(df['high'], df['low'], df['close'], period)
+            return kernels.last_value(atr, default=0.0)
         except:
             return 0.0
     
     def _calculate_williams_r(self, df: pd.DataFrame, period: int) -> float:
         """Calcule Williams %R."""
         try:
-            highest_high = df['high'].rolling(window=period).max()
-            lowest_low = df['low'].rolling(window=period).min()
-            williams_r = -100 * ((highest_high - df['close']) / (highest_high - lowest_low))
-            
-            return float(williams_r.iloc[-1]) if not pd.isna(williams_r.iloc[-1]) else -50.0
+            williams_r = kernels.williams_r(df['high'], df['low'], df['close'], period)
+            return kernels.last_value(williams_r, default=-50.0)
         except:
             return -50.0
     
     def _calculate_cci(self, df: pd.DataFrame, period: int) -> float:
         """Calcule le Commodity Channel Index."""
         try:
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            sma = typical_price.rolling(window=period).mean()
-            mad = typical_price.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
-            cci = (typical_price - sma) / (0.015 * mad)
-            
-            return float(cci.iloc[-1]) if not pd.isna(cci.iloc[-1]) else 0.0
+            cci = kernels.cci(df['high'], df['low'], df['close'], period)
+            return kernels.last_value(cci, default=0.0)
         except:
             return 0.0
     
@@ -8,12 +8,16 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
 from scipy import stats
 
+from finagent.business.decision.decision_snapshot import DecisionSnapshot
 from finagent.business.models.decision_models import RiskAssessment, DecisionContext
-from finagent.business.models.portfolio_models import Portfolio, Position
+from finagent.business.models.portfolio_models import Portfolio, Position, PositionType
+from finagent.business.risk import CovarianceRiskModel, ScenarioEngine, ScenarioResult
 from finagent.data.providers.openbb_provider import OpenBBProvider
+from finagent.data.models.bar_series import to_bar_series
+from finagent.data.models.price_panel import PricePanel
 from finagent.infrastructure.config import settings
 
 logger = logging.getLogger(__name__)
@@ -35,7 +39,8 @@ class RiskEvaluator:
     def __init__(
         self,
         openbb_provider: OpenBBProvider,
-        benchmark_symbol: str = "SPY"
+        benchmark_symbol: str = "SPY",
+        scenario_engine: Optional[ScenarioEngine] = None
     ):
         """
         Initialise l'évaluateur de risque.
@@ -43,9 +48,11 @@ class RiskEvaluator:
         Args:
             openbb_provider: Provider de données financières
             benchmark_symbol: Symbole de référence pour le beta
+            scenario_engine: Moteur de simulation de la VaR de portefeuille
         """
         self.openbb_provider = openbb_provider
         self.benchmark_symbol = benchmark_symbol
+        self.scenario_engine = scenario_engine or ScenarioEngine()
         
         # Configuration des calculs
         self.var_confidence_levels = [0.95, 0.99]
@@ -63,6 +70,7 @@ class RiskEvaluator:
         # Cache pour les données de benchmark
         self._benchmark_cache = {}
         self._cache_expiry = None
+        self._benchmark_lock = asyncio.Lock()
         
         logger.info("Évaluateur de risque initialisé")
     
@@ -70,7 +78,8 @@ class RiskEvaluator:
         self, 
         symbol: str, 
         context: DecisionContext,
-        portfolio: Optional[Portfolio] = None
+        portfolio: Optional[Portfolio] = None,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> RiskAssessment:
         """
         Évalue le risque complet pour un symbole.
@@ -79,6 +88,7 @@ class RiskEvaluator:
             symbol: Symbole à évaluer
             context: Contexte de décision
             portfolio: Portefeuille pour l'évaluation de concentration
+            snapshot: Données déjà chargées pour la décision (sinon récupérées)
             
         Returns:
             RiskAssessment: Évaluation complète des risques
@@ -86,15 +96,21 @@ class RiskEvaluator:
         logger.info(f"Évaluation des risques pour {symbol}")
         
         try:
-            # Collecter les données en parallèle
-            tasks = [
-                self._get_price_data(symbol),
-                self._get_benchmark_data(),
-                self._get_sector_info(symbol)
-            ]
-            
-            price_data, benchmark_data, sector_info = \
-                await asyncio.gather(*tasks, return_exceptions=True)
+            if snapshot is not None:
+                # Prix et secteur partagés: seul le benchmark (en cache) est demandé
+                price_data = snapshot.returns_frame()
+                sector_info = self._extract_sector_info(snapshot.company_info)
+                benchmark_data = await self._get_benchmark_data()
+            else:
+                # Collecter les données en parallèle
+                tasks = [
+                    self._get_price_data(symbol),
+                    self._get_benchmark_data(),
+                    self._get_sector_info(symbol)
+                ]
+                
+                price_data, benchmark_data, sector_info = \
+                    await asyncio.gather(*tasks, return_exceptions=True)
             
             # Vérifier les erreurs
             if isinstance(price_data, Exception):
@@ -189,17 +205,69 @@ class RiskEvaluator:
                 max_position_size=0.05
             )
     
+    async def simulate_portfolio_risk(
+        self,
+        portfolio: Portfolio,
+        method: str = "monte_carlo",
+        horizon: int = 1,
+        scenarios: Optional[int] = None,
+        confidence_levels: Optional[Sequence[float]] = None,
+        snapshots: Optional[Mapping[str, DecisionSnapshot]] = None
+    ) -> ScenarioResult:
+        """
+        VaR et CVaR du portefeuille par simulation de scénarios.
+        
+        Les historiques absents des instantanés sont téléchargés en une
+        requête groupée; la covariance EWMA des positions alimente le
+        Monte Carlo, leurs rendements la simulation historique.
+        
+        Args:
+            portfolio: Portefeuille à évaluer
+            method: ``monte_carlo`` ou ``historical``
+            horizon: Horizon en jours de bourse
+            scenarios: Nombre de scénarios (défaut du moteur sinon)
+            confidence_levels: Niveaux de confiance (défaut du moteur sinon)
+            snapshots: Données déjà chargées par symbole
+            
+        Returns:
+            ScenarioResult: VaR et CVaR (pertes en devise) par niveau de confiance
+        """
+        exposures = {
+            symbol: float(position.market_value) * (-1.0 if position.position_type == PositionType.SHORT else 1.0)
+            for symbol, position in portfolio.positions.items()
+        }
+        histories = {
+            symbol: snapshot.history
+            for symbol, snapshot in (snapshots or {}).items()
+            if symbol in exposures and snapshot.has_history
+        }
+        missing = [symbol for symbol in exposures if symbol not in histories]
+        if missing:
+            histories.update(await self.openbb_provider.get_historical_batch(
+                missing, period="1y", interval="1d", output="series"
+            ))
+        
+        model = CovarianceRiskModel(history_size=self.lookback_days)
+        model.fit(PricePanel.from_series(histories))
+        
+        result = await asyncio.to_thread(
+            self.scenario_engine.simulate, model, exposures, method, horizon, scenarios, confidence_levels
+        )
+        logger.info(
+            f"Simulation {method} du portefeuille {portfolio.name}: "
+            f"{result.scenarios} scénarios, {len(exposures)} positions"
+        )
+        return result
+    
     async def _get_price_data(self, symbol: str) -> Optional[pd.DataFrame]:
         """Récupère les données de prix historiques."""
         try:
             data = await self.openbb_provider.get_historical_data(
-                symbol, period="1y", interval="1d"
+                symbol, period="1y", interval="1d", output="series"
             )
             
-            if data and len(data) > 0:
-                df = pd.DataFrame(data)
-                df['date'] = pd.to_datetime(df.get('date', df.index))
-                df = df.set_index('date')
+            if data is not None and len(data) > 0:
+                df = to_bar_series(data, symbol).to_dataframe()
                 
                 # Calculer les rendements
                 df['returns'] = df['close'].pct_change()
@@ -216,31 +284,31 @@ class RiskEvaluator:
     async def _get_benchmark_data(self) -> Optional[pd.DataFrame]:
         """Récupère les données du benchmark avec cache."""
         try:
-            # Vérifier le cache
-            now = datetime.now()
-            if (self._benchmark_cache and self._cache_expiry and 
-                now < self._cache_expiry):
-                return self._benchmark_cache.get('data')
-            
-            # Récupérer de nouvelles données
-            data = await self.openbb_provider.get_historical_data(
-                self.benchmark_symbol, period="1y", interval="1d"
-            )
-            
-            if data and len(data) > 0:
-                df = pd.DataFrame(data)
-                df['date'] = pd.to_datetime(df.get('date', df.index))
-                df = df.set_index('date')
-                df['returns'] = df['close'].pct_change()
-                df = df.dropna()
+            # Les évaluations concurrentes d'un lot attendent un seul téléchargement
+            async with self._benchmark_lock:
+                # Vérifier le cache
+                now = datetime.now()
+                if (self._benchmark_cache and self._cache_expiry and 
+                    now < self._cache_expiry):
+                    return self._benchmark_cache.get('data')
                 
-                # Mettre à jour le cache
-                self._benchmark_cache = {'data': df}
-                self._cache_expiry = now + timedelta(hours=4)
+                # Récupérer de nouvelles données
+                data = await self.openbb_provider.get_historical_data(
+                    self.benchmark_symbol, period="1y", interval="1d", output="series"
+                )
                 
-                return df
-            
-            return None
+                if data is not None and len(data) > 0:
+                    df = to_bar_series(data, self.benchmark_symbol).to_dataframe()
+                    df['returns'] = df['close'].pct_change()
+                    df = df.dropna()
+                    
+                    # Mettre à jour le cache
+                    self._benchmark_cache = {'data': df}
+                    self._cache_expiry = now + timedelta(hours=4)
+                    
+                    return df
+                
+                return None
             
         except Exception as e:
             logger.error(f"Erreur récupération données benchmark: {e}")
@@ -250,41 +318,43 @@ class RiskEvaluator:
         """Récupère les informations sectorielles."""
         try:
             company_info = await self.openbb_provider.get_company_info(symbol)
-            return {
-                'sector': company_info.get('sector', 'Unknown'),
-                'industry': company_info.get('industry', 'Unknown'),
-                'market_cap': company_info.get('market_cap', 0),
-                'beta': company_info.get('beta'),
-            }
+            return self._extract_sector_info(company_info)
         except Exception as e:
             logger.error(f"Erreur info secteur pour {symbol}: {e}")
             return {}
     
+    @staticmethod
+    def _extract_sector_info(company_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Extrait les informations sectorielles des informations de l'entreprise."""
+        if not company_info:
+            return {}
+        return {
+            'sector': company_info.get('sector', 'Unknown'),
+            'industry': company_info.get('industry', 'Unknown'),
+            'market_cap': company_info.get('market_cap', 0),
+            'beta': company_info.get('beta'),
+        }
+    
     async def _calculate_var_metrics(self, price_data: pd.DataFrame) -> Dict[str, float]:
         """Calcule les métriques Value at Risk."""
         try:
             metrics = {}
-            returns = price_data['returns'].dropna()
+            returns = price_data['returns'].dropna().to_numpy(dtype=np.float64)
             
             if len(returns) < 30:
                 return metrics
             
-            # VaR historique pour différentes périodes
-            for period in self.var_periods:
-                for confidence in self.var_confidence_levels:
-                    # VaR historique
-                    var_hist = np.percentile(returns, (1 - confidence) * 100)
-                    
-                    # VaR paramétrique (normal)
-                    mean_return = returns.mean()
-                    std_return = returns.std()
-                    var_param = stats.norm.ppf(1 - confidence, mean_return, std_return)
-                    
-                    # Prendre le plus conservateur
-                    var_value = min(var_hist, var_param) * np.sqrt(period)
-                    
-                    key = f'var_{period}d_{int(confidence*100)}'
-                    metrics[key] = float(var_value)
+            # VaR historique et paramétrique (normale) de tous les niveaux en une passe
+            levels = np.asarray(self.var_confidence_levels, dtype=np.float64)
+            var_hist = np.percentile(returns, (1 - levels) * 100)
+            var_param = stats.norm.ppf(1 - levels, returns.mean(), returns.std(ddof=1))
+            
+            # Prendre le plus conservateur, mis à l'échelle de chaque période
+            scale = np.sqrt(np.asarray(self.var_periods, dtype=np.float64))
+            var_values = np.minimum(var_hist, var_param)[None, :] * scale[:, None]
+            for i, period in enumerate(self.var_periods):
+                for j, confidence in enumerate(self.var_confidence_levels):
+                    metrics[f'var_{period}d_{int(confidence*100)}'] = float(var_values[i, j])
             
             # CVaR (Expected Shortfall)
             for period in [1, 5]:
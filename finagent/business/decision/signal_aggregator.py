@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 
+from finagent.business.decision.decision_snapshot import DecisionSnapshot
 from finagent.business.models.decision_models import (
     DecisionSignal,
     SignalAggregation,
@@ -70,7 +71,8 @@ class SignalAggregator:
         symbol: str,
         strategy_signals: List[Any],
         market_analysis: Optional[MarketAnalysis] = None,
-        risk_assessment: Optional[RiskAssessment] = None
+        risk_assessment: Optional[RiskAssessment] = None,
+        snapshot: Optional[DecisionSnapshot] = None
     ) -> SignalAggregation:
         """
         Agrège tous les signaux disponibles pour un symbole.
@@ -80,6 +82,7 @@ class SignalAggregator:
             strategy_signals: Signaux des stratégies utilisateur
             market_analysis: Analyse de marché
             risk_assessment: Évaluation des risques
+            snapshot: Données de marché de la décision (prix courant)
             
         Returns:
             SignalAggregation: Signaux agrégés avec consensus
@@ -95,7 +98,10 @@ class SignalAggregator:
             
             # 2. Extraire les signaux d'analyse technique
             if market_analysis:
-                technical_signals = await self._extract_technical_signals(symbol, market_analysis)
+                current_price = snapshot.price if snapshot is not None else None
+                technical_signals = await self._extract_technical_signals(
+                    symbol, market_analysis, current_price
+                )
                 all_signals.extend(technical_signals)
                 
                 # 3. Extraire les signaux fondamentaux
@@ -172,7 +178,8 @@ class SignalAggregator:
     async def _extract_technical_signals(
         self, 
         symbol: str, 
-        market_analysis: MarketAnalysis
+        market_analysis: MarketAnalysis,
+        current_price: Optional[float] = None
     ) -> List[DecisionSignal]:
         """Extrait les signaux d'analyse technique."""
         signals = []
@@ -236,7 +243,8 @@ class SignalAggregator:
             
             # Signal Bollinger Bands
             if all(k in indicators for k in ['bb_upper', 'bb_lower', 'bb_middle']):
-                current_price = float(market_analysis.technical_indicators.get('close', 0))
+                if current_price is None:
+                    current_price = float(market_analysis.technical_indicators.get('close', 0))
                 bb_upper = indicators['bb_upper']
                 bb_lower = indicators['bb_lower']
                 bb_middle = indicators['bb_middle']
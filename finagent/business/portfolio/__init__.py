@@ -7,6 +7,7 @@ d'un portefeuille d'investissement :
 - PortfolioManager : Gestionnaire principal du portefeuille
 - PositionManager : Gestion détaillée des positions
 - PerformanceTracker : Suivi et analyse des performances
+- PortfolioHistory : Historique des snapshots en colonnes
 - Rebalancer : Rééquilibrage automatique du portefeuille
 
 Utilisation :
@@ -21,12 +22,14 @@ Utilisation :
 from .portfolio_manager import PortfolioManager
 from .position_manager import PositionManager
 from .performance_tracker import PerformanceTracker
+from .performance_history import PortfolioHistory
 from .rebalancer import Rebalancer
 
 __all__ = [
     'PortfolioManager',
     'PositionManager', 
     'PerformanceTracker',
+    'PortfolioHistory',
     'Rebalancer'
 ]
 
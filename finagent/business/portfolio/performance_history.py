@@ -0,0 +1,375 @@
+"""
+Historique de performance - Snapshots de portefeuille en colonnes.
+
+Ce module conserve les snapshots d'un portefeuille dans des tableaux
+numpy (une colonne par champ) et met à jour à chaque snapshot, en temps
+constant, les grandeurs dérivées: rendement, sommes cumulées des
+rendements et de leurs carrés, drawdown par rapport au plus haut de la
+fenêtre conservée, gains et pertes de P&L. Les métriques d'une période se lisent ensuite par
+recherche dichotomique des bornes et différence de sommes cumulées.
+"""
+
+import logging
+import math
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_COLUMNS = (
+    'total_value', 'cash_balance', 'invested_amount', 'total_pnl',
+    'unrealized_pnl', 'realized_pnl', 'position_count'
+)
+
+# Colonnes dérivées, calculées à l'ajout de chaque snapshot
+_DERIVED_COLUMNS = (
+    'returns', 'cum_returns', 'cum_squared_returns', 'drawdown',
+    'cum_wins', 'cum_win_sum', 'cum_losses', 'cum_loss_sum'
+)
+
+
+class PortfolioHistory:
+    """
+    Snapshots d'un portefeuille, stockés en colonnes avec rétention glissante.
+
+    Les snapshots sont ajoutés dans l'ordre chronologique (un horodatage
+    antérieur au dernier est ramené à celui-ci). Les snapshots plus
+    anciens que la rétention sont écartés en avançant un indice de début;
+    les tableaux sont compactés quand la moitié de leur capacité est
+    inutilisée, soit un coût amorti constant par snapshot. Le plus haut
+    de référence du drawdown est celui des snapshots conservés (file
+    monotone des valeurs candidates).
+    """
+
+    def __init__(self,
+                 retention: Optional[timedelta] = timedelta(days=730),
+                 capacity: int = 1024,
+                 min_pnl_change: float = 0.01):
+        """
+        Initialise l'historique.
+
+        Args:
+            retention: Durée de conservation des snapshots (None: illimitée)
+            capacity: Capacité initiale des colonnes
+            min_pnl_change: Variation de P&L en dessous de laquelle un snapshot
+                n'est compté ni comme gain ni comme perte
+        """
+        self.retention = retention
+        self.min_pnl_change = min_pnl_change
+
+        self._capacity = max(16, capacity)
+        self._start = 0
+        self._end = 0
+        self._timestamps = np.empty(self._capacity, dtype=np.float64)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(self._capacity, dtype=np.float64)
+            for name in SNAPSHOT_COLUMNS + _DERIVED_COLUMNS
+        }
+        self._positions: List[Optional[Dict[str, Any]]] = [None] * self._capacity
+        # (horodatage, valeur) décroissantes: plus haut de la fenêtre en tête
+        self._peaks: Deque[Tuple[float, float]] = deque()
+
+    @classmethod
+    def from_columns(cls,
+                     timestamps: np.ndarray,
+                     columns: Mapping[str, np.ndarray],
+                     retention: Optional[timedelta] = timedelta(days=730),
+                     min_pnl_change: float = 0.01) -> 'PortfolioHistory':
+        """
+        Construit un historique à partir de colonnes déjà triées (ex: stockage).
+
+        Les grandeurs dérivées sont calculées de façon vectorisée, sans
+        rejouer les snapshots un par un.
+
+        Args:
+            timestamps: Horodatages croissants (secondes epoch)
+            columns: Colonnes de ``SNAPSHOT_COLUMNS`` (0 si absentes)
+            retention: Durée de conservation des snapshots
+            min_pnl_change: Seuil de variation de P&L des gains/pertes
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        n = len(timestamps)
+        history = cls(retention=retention, capacity=max(2 * n, 16), min_pnl_change=min_pnl_change)
+        if not n:
+            return history
+
+        data = history._columns
+        history._timestamps[:n] = timestamps
+        for name in SNAPSHOT_COLUMNS:
+            data[name][:n] = np.asarray(columns[name], dtype=np.float64) if name in columns else 0.0
+
+        values = data['total_value'][:n]
+        previous = values[:-1]
+        returns = np.zeros(n)
+        np.divide(values[1:] - previous, previous, out=returns[1:], where=previous > 0)
+        pnl_changes = np.zeros(n)
+        pnl_changes[1:] = np.diff(data['total_pnl'][:n])
+        wins = pnl_changes > min_pnl_change
+        losses = pnl_changes < -min_pnl_change
+
+        data['returns'][:n] = returns
+        np.cumsum(returns, out=data['cum_returns'][:n])
+        np.cumsum(returns * returns, out=data['cum_squared_returns'][:n])
+        np.cumsum(wins, out=data['cum_wins'][:n])
+        np.cumsum(np.where(wins, pnl_changes, 0.0), out=data['cum_win_sum'][:n])
+        np.cumsum(losses, out=data['cum_losses'][:n])
+        np.cumsum(np.where(losses, pnl_changes, 0.0), out=data['cum_loss_sum'][:n])
+
+        history._end = n
+        history._trim(timestamps[-1])
+
+        # Plus hauts calculés sur les seuls snapshots conservés
+        start = history._start
+        retained = values[start:]
+        data['drawdown'][:n] = 0.0
+        if len(retained):
+            peak = np.maximum.accumulate(retained)
+            np.divide(retained - peak, peak, out=data['drawdown'][start:n], where=peak > 0)
+
+            suffix = np.maximum.accumulate(retained[::-1])[::-1]
+            candidates = np.flatnonzero(np.append(retained[:-1] > suffix[1:], True)) + start
+            history._peaks.extend(zip(timestamps[candidates].tolist(), values[candidates].tolist()))
+        return history
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    # Ajout
+
+    def append(self,
+               timestamp: datetime,
+               values: Mapping[str, float],
+               positions: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Ajoute un snapshot et met à jour les grandeurs dérivées en O(1).
+
+        Args:
+            timestamp: Horodatage du snapshot
+            values: Valeurs des colonnes de ``SNAPSHOT_COLUMNS`` (0 si absentes)
+            positions: Détail des positions au moment du snapshot
+        """
+        if self._end == self._capacity:
+            self._make_room()
+
+        i = self._end
+        seconds = timestamp.timestamp()
+        if len(self):
+            seconds = max(seconds, self._timestamps[i - 1])
+        self._timestamps[i] = seconds
+        columns = self._columns
+        for name in SNAPSHOT_COLUMNS:
+            columns[name][i] = float(values.get(name, 0.0))
+        self._positions[i] = positions
+
+        value = columns['total_value'][i]
+        if len(self):
+            previous = columns['total_value'][i - 1]
+            ret = (value - previous) / previous if previous > 0 else 0.0
+            pnl_change = columns['total_pnl'][i] - columns['total_pnl'][i - 1]
+            carry = i - 1
+        else:
+            ret, pnl_change, carry = 0.0, 0.0, None
+
+        def accumulate(name: str, increment: float) -> None:
+            columns[name][i] = (columns[name][carry] if carry is not None else 0.0) + increment
+
+        columns['returns'][i] = ret
+        accumulate('cum_returns', ret)
+        accumulate('cum_squared_returns', ret * ret)
+        is_win = pnl_change > self.min_pnl_change
+        is_loss = pnl_change < -self.min_pnl_change
+        accumulate('cum_wins', 1.0 if is_win else 0.0)
+        accumulate('cum_win_sum', pnl_change if is_win else 0.0)
+        accumulate('cum_losses', 1.0 if is_loss else 0.0)
+        accumulate('cum_loss_sum', pnl_change if is_loss else 0.0)
+
+        peaks = self._peaks
+        while peaks and peaks[-1][1] <= value:
+            peaks.pop()
+        peaks.append((seconds, value))
+
+        self._end += 1
+        self._trim(seconds)
+
+        peak = peaks[0][1] if peaks else value
+        columns['drawdown'][i] = (value - peak) / peak if peak > 0 else 0.0
+
+    # Lecture
+
+    @property
+    def last_timestamp(self) -> Optional[datetime]:
+        """Horodatage du dernier snapshot."""
+        return datetime.fromtimestamp(self._timestamps[self._end - 1]) if len(self) else None
+
+    def index(self, timestamp: datetime, side: str = 'left') -> int:
+        """Position (relative) du premier snapshot à ou après ``timestamp`` (dichotomie)."""
+        return int(np.searchsorted(self._timestamps[self._start:self._end], timestamp.timestamp(), side=side))
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Tuple[int, int]:
+        """Positions ``[a, b)`` des snapshots compris entre ``start`` et ``end`` (inclus)."""
+        a = self.index(start) if start is not None else 0
+        b = self.index(end, side='right') if end is not None else len(self)
+        return a, max(a, b)
+
+    def column(self, name: str, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Vue (sans copie) d'une colonne entre deux positions relatives."""
+        end = len(self) if end is None else end
+        return self._columns[name][self._start + start:self._start + end]
+
+    def timestamps(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Horodatages (secondes epoch) entre deux positions relatives."""
+        end = len(self) if end is None else end
+        return self._timestamps[self._start + start:self._start + end]
+
+    def records(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Snapshots sous forme de dictionnaires (format historique)."""
+        a, b = self.range(start, end)
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(self._timestamps[i]),
+                **{name: float(self._columns[name][i]) for name in SNAPSHOT_COLUMNS},
+                'position_count': int(self._columns['position_count'][i]),
+                'positions': self._positions[i] or {}
+            }
+            for i in range(self._start + a, self._start + b)
+        ]
+
+    # Métriques
+
+    def last_return(self) -> float:
+        """Rendement entre les deux derniers snapshots."""
+        return float(self._columns['returns'][self._end - 1]) if len(self) >= 2 else 0.0
+
+    def period_return(self, start: datetime) -> float:
+        """Rendement depuis le premier snapshot à ou après ``start`` (sinon le premier conservé)."""
+        if not len(self):
+            return 0.0
+        a = self.index(start)
+        if a >= len(self):
+            a = 0
+        values = self._columns['total_value']
+        first = values[self._start + a]
+        return float((values[self._end - 1] - first) / first) if first > 0 else 0.0
+
+    def period_volatility(self, start: datetime, periods_per_year: int = 252, min_points: int = 5) -> float:
+        """
+        Volatilité annualisée (ddof=1) des rendements depuis ``start``.
+
+        Obtenue en O(1) par différence des sommes cumulées des rendements et
+        de leurs carrés.
+        """
+        a = self.index(start)
+        if len(self) - a < min_points:
+            return 0.0
+        a = max(a, 1)  # Le premier snapshot conservé n'a pas de rendement
+        n = len(self) - a
+        if n < 2:
+            return 0.0
+        s1 = self._window_sum('cum_returns', a)
+        s2 = self._window_sum('cum_squared_returns', a)
+        variance = max((s2 - s1 * s1 / n) / (n - 1), 0.0)
+        return float(math.sqrt(variance) * math.sqrt(periods_per_year))
+
+    def current_drawdown(self) -> float:
+        """Drawdown du dernier snapshot par rapport au plus haut conservé."""
+        return float(abs(self._columns['drawdown'][self._end - 1])) if len(self) else 0.0
+
+    def period_max_drawdown(self, start: datetime) -> float:
+        """Drawdown maximum (par rapport au plus haut conservé) depuis ``start``."""
+        a = self.index(start)
+        if len(self) - a < 2:
+            return 0.0
+        return float(abs(self.column('drawdown', a).min()))
+
+    def win_loss(self, start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Gains et pertes de P&L entre snapshots consécutifs d'un intervalle.
+
+        Args:
+            start: Position relative du premier snapshot
+            end: Position relative suivant le dernier snapshot
+        """
+        end = len(self) if end is None else end
+        if end - start < 2:
+            return _empty_win_loss()
+
+        wins = int(round(self._window_sum('cum_wins', start + 1, end)))
+        losses = int(round(self._window_sum('cum_losses', start + 1, end)))
+        win_sum = self._window_sum('cum_win_sum', start + 1, end)
+        loss_sum = self._window_sum('cum_loss_sum', start + 1, end)
+        trades = wins + losses
+        if not trades:
+            return _empty_win_loss()
+
+        return {
+            'win_rate': wins / trades,
+            'profit_factor': win_sum / abs(loss_sum) if losses and loss_sum != 0 else 0.0,
+            'avg_win': win_sum / wins if wins else 0.0,
+            'avg_loss': abs(loss_sum / losses) if losses else 0.0,
+            'trades_count': trades,
+            'profitable_trades': wins,
+            'losing_trades': losses
+        }
+
+    # Implémentation
+
+    def _window_sum(self, name: str, start: int, end: Optional[int] = None) -> float:
+        """Somme d'une grandeur sur ``[start, end)`` par différence de sommes cumulées."""
+        end = len(self) if end is None else end
+        column = self._columns[name]
+        # Le snapshot précédant le début reste en mémoire (compaction comprise)
+        first = self._start + start
+        before = column[first - 1] if first > 0 else 0.0
+        return float(column[self._start + end - 1] - before)
+
+    def _trim(self, now: float) -> None:
+        """Écarte les snapshots plus anciens que la rétention."""
+        if self.retention is None:
+            return
+        cutoff = now - self.retention.total_seconds()
+        while self._peaks and self._peaks[0][0] <= cutoff:
+            self._peaks.popleft()
+        drop = int(np.searchsorted(self._timestamps[self._start:self._end], cutoff, side='right'))
+        if drop:
+            for i in range(self._start, self._start + drop):
+                self._positions[i] = None
+            self._start += drop
+
+    def _make_room(self) -> None:
+        """Compacte les colonnes ou double leur capacité."""
+        size = len(self)
+        if self._start >= self._capacity // 2:
+            capacity = self._capacity
+        else:
+            capacity = self._capacity * 2
+
+        # Conserver le snapshot précédant le début pour les sommes cumulées
+        keep = max(self._start - 1, 0)
+        offset = self._start - keep
+        count = size + offset
+
+        timestamps = np.empty(capacity, dtype=np.float64)
+        timestamps[:count] = self._timestamps[keep:self._end]
+        self._timestamps = timestamps
+        for name, column in self._columns.items():
+            resized = np.empty(capacity, dtype=np.float64)
+            resized[:count] = column[keep:self._end]
+            self._columns[name] = resized
+        self._positions = self._positions[keep:self._end] + [None] * (capacity - count)
+
+        self._capacity = capacity
+        self._start = offset
+        self._end = count
+        logger.debug(f"Historique compacté: {size} snapshots, capacité {capacity}")
+
+
+def _empty_win_loss() -> Dict[str, Any]:
+    return {
+        'win_rate': 0.0, 'profit_factor': 0.0,
+        'avg_win': 0.0, 'avg_loss': 0.0,
+        'trades_count': 0, 'profitable_trades': 0, 'losing_trades': 0
+    }
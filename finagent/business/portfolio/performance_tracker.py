@@ -8,7 +8,7 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from uuid import UUID
 
 from finagent.business.models.portfolio_models import (
@@ -16,8 +16,12 @@ from finagent.business.models.portfolio_models import (
     PortfolioMetrics,
     PerformanceMetrics
 )
+from finagent.business.portfolio.performance_history import PortfolioHistory
 from finagent.data.providers.openbb_provider import OpenBBProvider
 
+if TYPE_CHECKING:
+    from finagent.persistence.storage import PortfolioStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +40,9 @@ class PerformanceTracker:
     def __init__(
         self,
         openbb_provider: OpenBBProvider,
-        benchmark_symbols: List[str] = None
+        benchmark_symbols: List[str] = None,
+        history_retention: timedelta = timedelta(days=730),
+        store: Optional['PortfolioStore'] = None
     ):
         """
         Initialise le tracker de performance.
@@ -44,15 +50,19 @@ class PerformanceTracker:
         Args:
             openbb_provider: Provider de données financières
             benchmark_symbols: Symboles de référence pour comparaison
+            history_retention: Durée de conservation des snapshots
+            store: Stockage durable des snapshots (historique rechargé au redémarrage)
         """
         self.openbb_provider = openbb_provider
         self.benchmark_symbols = benchmark_symbols or ["SPY", "QQQ", "IWM"]
         
         # Configuration
         self.risk_free_rate = 0.02  # 2% annuel
+        self.history_retention = history_retention
+        self.store = store
         
-        # Cache pour l'historique des portefeuilles
-        self._portfolio_history: Dict[UUID, List[Dict[str, Any]]] = {}
+        # Historique des portefeuilles (colonnes numpy, métriques incrémentales)
+        self._portfolio_history: Dict[UUID, PortfolioHistory] = {}
         self._benchmark_cache: Dict[str, pd.DataFrame] = {}
         
         logger.info("Tracker de performance initialisé")
@@ -65,43 +75,63 @@ class PerformanceTracker:
             portfolio: Portefeuille à enregistrer
         """
         try:
-            snapshot = {
-                'timestamp': datetime.now(),
+            values = {
                 'total_value': float(portfolio.total_value),
                 'cash_balance': float(portfolio.cash_balance),
                 'invested_amount': float(portfolio.invested_amount),
                 'total_pnl': float(portfolio.total_pnl),
                 'unrealized_pnl': float(portfolio.unrealized_pnl),
                 'realized_pnl': float(portfolio.realized_pnl),
-                'position_count': portfolio.position_count,
-                'positions': {
-                    symbol: {
-                        'quantity': float(pos.quantity),
-                        'market_value': float(pos.market_value),
-                        'weight': pos.weight,
-                        'pnl': float(pos.total_pnl)
-                    }
-                    for symbol, pos in portfolio.active_positions.items()
+                'position_count': portfolio.position_count
+            }
+            positions = {
+                symbol: {
+                    'quantity': float(pos.quantity),
+                    'market_value': float(pos.market_value),
+                    'weight': pos.weight,
+                    'pnl': float(pos.total_pnl)
                 }
+                for symbol, pos in portfolio.active_positions.items()
             }
             
-            if portfolio.id not in self._portfolio_history:
-                self._portfolio_history[portfolio.id] = []
-            
-            self._portfolio_history[portfolio.id].append(snapshot)
+            # Ajout en O(1) amorti, rétention appliquée par l'historique
+            timestamp = datetime.now()
+            self.get_history(portfolio.id).append(timestamp, values, positions)
             
-            # Garder seulement les 2 dernières années
-            cutoff_date = datetime.now() - timedelta(days=730)
-            self._portfolio_history[portfolio.id] = [
-                s for s in self._portfolio_history[portfolio.id]
-                if s['timestamp'] > cutoff_date
-            ]
+            if self.store is not None:
+                await asyncio.to_thread(self.store.append_snapshot, portfolio.id, timestamp, values, positions)
             
             logger.debug(f"Snapshot enregistré pour portefeuille {portfolio.id}")
             
         except Exception as e:
             logger.error(f"Erreur enregistrement snapshot: {e}")
     
+    def get_history(self, portfolio_id: UUID) -> PortfolioHistory:
+        """
+        Retourne l'historique des snapshots d'un portefeuille.
+        
+        Au premier accès, l'historique est rechargé depuis le stockage
+        (fenêtre de rétention) s'il est configuré, sinon créé vide.
+        
+        Args:
+            portfolio_id: ID du portefeuille
+            
+        Returns:
+            PortfolioHistory: Historique en colonnes
+        """
+        history = self._portfolio_history.get(portfolio_id)
+        if history is None:
+            if self.store is not None:
+                history = self.store.load_history(
+                    portfolio_id,
+                    start=datetime.now() - self.history_retention,
+                    retention=self.history_retention
+                )
+            else:
+                history = PortfolioHistory(retention=self.history_retention)
+            self._portfolio_history[portfolio_id] = history
+        return history
+    
     async def calculate_metrics(self, portfolio: Portfolio) -> PortfolioMetrics:
         """
         Calcule les métriques complètes du portefeuille.
@@ -116,7 +146,7 @@ class PerformanceTracker:
         
         try:
             # Récupérer l'historique
-            history = self._portfolio_history.get(portfolio.id, [])
+            history = self.get_history(portfolio.id)
             
             # Calculs de base
             cash_percentage = float(portfolio.cash_balance / portfolio.total_value) if portfolio.total_value > 0 else 1.0
@@ -211,21 +241,18 @@ class PerformanceTracker:
         logger.info(f"Calcul métriques performance pour {period_start} - {period_end}")
         
         try:
-            # Récupérer l'historique pour la période
-            history = self._portfolio_history.get(portfolio.id, [])
-            period_history = [
-                h for h in history
-                if period_start <= h['timestamp'] <= period_end
-            ]
-            
-            if len(period_history) < 2:
+            # Bornes de la période par dichotomie
+            history = self.get_history(portfolio.id)
+            start, end = history.range(period_start, period_end)
+            
+            if end - start < 2:
                 logger.warning("Historique insuffisant pour calcul performance")
                 return self._create_empty_performance_metrics(
                     portfolio.id, period_start, period_end
                 )
             
             # Calculer les rendements du portefeuille
-            portfolio_returns = await self._calculate_period_returns(period_history)
+            portfolio_returns = await self._calculate_period_returns(history, start, end)
             
             # Récupérer les données du benchmark
             benchmark_data = await self._get_benchmark_data(
@@ -233,7 +260,7 @@ class PerformanceTracker:
             )
             
             # Calculer les métriques
-            absolute_return = portfolio_returns[-1] if portfolio_returns else 0.0
+            absolute_return = float(portfolio_returns[-1]) if len(portfolio_returns) else 0.0
             annualized_return = await self._annualize_return(absolute_return, period_start, period_end)
             
             # Benchmark et alpha
@@ -267,7 +294,7 @@ class PerformanceTracker:
             drawdown_stats = await self._calculate_detailed_drawdown(portfolio_returns)
             
             # Win/Loss statistics
-            win_loss_stats = await self._calculate_win_loss_stats(period_history)
+            win_loss_stats = history.win_loss(start, end)
             
             return PerformanceMetrics(
                 portfolio_id=portfolio.id,
@@ -306,175 +333,65 @@ class PerformanceTracker:
                 portfolio.id, period_start, period_end
             )
     
-    async def _calculate_returns(self, history: List[Dict[str, Any]]) -> Dict[str, float]:
+    async def _calculate_returns(self, history: PortfolioHistory) -> Dict[str, float]:
         """Calcule les rendements sur différentes périodes."""
         
         if len(history) < 2:
             return {'daily': 0.0, 'weekly': 0.0, 'monthly': 0.0, 'yearly': 0.0}
         
         try:
-            # Trier par timestamp
-            sorted_history = sorted(history, key=lambda x: x['timestamp'])
-            
-            # Rendement journalier (si disponible)
-            daily_return = 0.0
-            if len(sorted_history) >= 2:
-                latest = sorted_history[-1]
-                previous = sorted_history[-2]
-                if previous['total_value'] > 0:
-                    daily_return = (latest['total_value'] - previous['total_value']) / previous['total_value']
-            
-            # Rendements sur périodes plus longues
             now = datetime.now()
             
-            weekly_return = self._calculate_period_return(sorted_history, now - timedelta(weeks=1))
-            monthly_return = self._calculate_period_return(sorted_history, now - timedelta(days=30))
-            yearly_return = self._calculate_period_return(sorted_history, now - timedelta(days=365))
-            
             return {
-                'daily': daily_return,
-                'weekly': weekly_return,
-                'monthly': monthly_return,
-                'yearly': yearly_return
+                'daily': history.last_return(),
+                'weekly': history.period_return(now - timedelta(weeks=1)),
+                'monthly': history.period_return(now - timedelta(days=30)),
+                'yearly': history.period_return(now - timedelta(days=365))
             }
             
         except Exception as e:
             logger.error(f"Erreur calcul rendements: {e}")
             return {'daily': 0.0, 'weekly': 0.0, 'monthly': 0.0, 'yearly': 0.0}
     
-    def _calculate_period_return(
-        self, 
-        sorted_history: List[Dict[str, Any]], 
-        start_date: datetime
-    ) -> float:
-        """Calcule le rendement depuis une date donnée."""
-        
-        try:
-            # Trouver le point de départ le plus proche
-            start_point = None
-            for point in sorted_history:
-                if point['timestamp'] >= start_date:
-                    start_point = point
-                    break
-            
-            if start_point is None and sorted_history:
-                start_point = sorted_history[0]
-            
-            if start_point and sorted_history:
-                end_point = sorted_history[-1]
-                if start_point['total_value'] > 0:
-                    return (end_point['total_value'] - start_point['total_value']) / start_point['total_value']
-            
-            return 0.0
-            
-        except Exception as e:
-            logger.error(f"Erreur calcul rendement période: {e}")
-            return 0.0
-    
-    async def _calculate_volatility(self, history: List[Dict[str, Any]]) -> Dict[str, float]:
+    async def _calculate_volatility(self, history: PortfolioHistory) -> Dict[str, float]:
         """Calcule la volatilité sur différentes périodes."""
         
         if len(history) < 10:
             return {'1m': 0.0, '3m': 0.0, '1y': 0.0}
         
         try:
-            # Convertir en DataFrame
-            df = pd.DataFrame(history)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            
-            # Calculer les rendements journaliers
-            df['returns'] = df['total_value'].pct_change()
-            returns = df['returns'].dropna()
-            
-            if len(returns) < 5:
-                return {'1m': 0.0, '3m': 0.0, '1y': 0.0}
-            
-            # Volatilité sur différentes périodes
             now = datetime.now()
             
-            vol_1m = self._calculate_period_volatility(df, now - timedelta(days=30))
-            vol_3m = self._calculate_period_volatility(df, now - timedelta(days=90))
-            vol_1y = self._calculate_period_volatility(df, now - timedelta(days=365))
-            
-            return {'1m': vol_1m, '3m': vol_3m, '1y': vol_1y}
+            return {
+                '1m': history.period_volatility(now - timedelta(days=30)),
+                '3m': history.period_volatility(now - timedelta(days=90)),
+                '1y': history.period_volatility(now - timedelta(days=365))
+            }
             
         except Exception as e:
             logger.error(f"Erreur calcul volatilité: {e}")
             return {'1m': 0.0, '3m': 0.0, '1y': 0.0}
     
-    def _calculate_period_volatility(self, df: pd.DataFrame, start_date: datetime) -> float:
-        """Calcule la volatilité pour une période donnée."""
-        
-        try:
-            period_df = df[df['timestamp'] >= start_date]
-            if len(period_df) < 5:
-                return 0.0
-            
-            returns = period_df['returns'].dropna()
-            if len(returns) < 2:
-                return 0.0
-            
-            # Volatilité annualisée
-            volatility = returns.std() * np.sqrt(252)
-            return float(volatility)
-            
-        except Exception as e:
-            logger.error(f"Erreur calcul volatilité période: {e}")
-            return 0.0
-    
-    async def _calculate_drawdown(self, history: List[Dict[str, Any]]) -> Dict[str, float]:
+    async def _calculate_drawdown(self, history: PortfolioHistory) -> Dict[str, float]:
         """Calcule les métriques de drawdown."""
         
         if len(history) < 2:
             return {'current': 0.0, '1m': 0.0, '3m': 0.0, '1y': 0.0}
         
         try:
-            # Convertir en DataFrame
-            df = pd.DataFrame(history)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            
-            # Calculer les drawdowns
-            df['cummax'] = df['total_value'].cummax()
-            df['drawdown'] = (df['total_value'] - df['cummax']) / df['cummax']
-            
-            # Drawdown actuel
-            current_drawdown = float(abs(df['drawdown'].iloc[-1]))
-            
-            # Drawdowns sur périodes
             now = datetime.now()
             
-            dd_1m = self._calculate_period_max_drawdown(df, now - timedelta(days=30))
-            dd_3m = self._calculate_period_max_drawdown(df, now - timedelta(days=90))
-            dd_1y = self._calculate_period_max_drawdown(df, now - timedelta(days=365))
-            
             return {
-                'current': current_drawdown,
-                '1m': dd_1m,
-                '3m': dd_3m,
-                '1y': dd_1y
+                'current': history.current_drawdown(),
+                '1m': history.period_max_drawdown(now - timedelta(days=30)),
+                '3m': history.period_max_drawdown(now - timedelta(days=90)),
+                '1y': history.period_max_drawdown(now - timedelta(days=365))
             }
             
         except Exception as e:
             logger.error(f"Erreur calcul drawdown: {e}")
             return {'current': 0.0, '1m': 0.0, '3m': 0.0, '1y': 0.0}
     
-    def _calculate_period_max_drawdown(self, df: pd.DataFrame, start_date: datetime) -> float:
-        """Calcule le drawdown maximum pour une période."""
-        
-        try:
-            period_df = df[df['timestamp'] >= start_date]
-            if len(period_df) < 2:
-                return 0.0
-            
-            max_drawdown = period_df['drawdown'].min()
-            return float(abs(max_drawdown))
-            
-        except Exception as e:
-            logger.error(f"Erreur calcul max drawdown période: {e}")
-            return 0.0
-    
     async def _calculate_diversification(self, portfolio: Portfolio) -> Dict[str, float]:
         """Calcule les métriques de diversification."""
         
@@ -523,29 +440,19 @@ class PerformanceTracker:
             logger.error(f"Erreur récupération top positions: {e}")
             return []
     
-    async def _calculate_period_returns(self, history: List[Dict[str, Any]]) -> List[float]:
-        """Calcule les rendements cumulés pour une période."""
+    async def _calculate_period_returns(
+        self,
+        history: PortfolioHistory,
+        start: int,
+        end: int
+    ) -> np.ndarray:
+        """Calcule les rendements cumulés entre deux positions de l'historique."""
         
-        if len(history) < 2:
-            return [1.0]
+        values = history.column('total_value', start, end)
+        if len(values) < 2 or values[0] <= 0:
+            return np.ones(max(len(values), 1))
         
-        try:
-            sorted_history = sorted(history, key=lambda x: x['timestamp'])
-            base_value = sorted_history[0]['total_value']
-            
-            returns = []
-            for point in sorted_history:
-                if base_value > 0:
-                    cumulative_return = point['total_value'] / base_value
-                else:
-                    cumulative_return = 1.0
-                returns.append(cumulative_return)
-            
-            return returns
-            
-        except Exception as e:
-            logger.error(f"Erreur calcul rendements période: {e}")
-            return [1.0]
+        return values / values[0]
     
     async def _get_benchmark_data(
         self, 
@@ -733,68 +640,6 @@ class PerformanceTracker:
             logger.error(f"Erreur calcul drawdown détaillé: {e}")
             return {'max_drawdown': 0.0, 'avg_drawdown': 0.0, 'recovery_time': None}
     
-    async def _calculate_win_loss_stats(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calcule les statistiques de gains/pertes."""
-        
-        if len(history) < 2:
-            return {
-                'win_rate': 0.0, 'profit_factor': 0.0,
-                'avg_win': 0.0, 'avg_loss': 0.0,
-                'trades_count': 0, 'profitable_trades': 0, 'losing_trades': 0
-            }
-        
-        try:
-            # Calculer les changements journaliers de P&L
-            sorted_history = sorted(history, key=lambda x: x['timestamp'])
-            pnl_changes = []
-            
-            for i in range(1, len(sorted_history)):
-                prev_pnl = sorted_history[i-1]['total_pnl']
-                curr_pnl = sorted_history[i]['total_pnl']
-                change = curr_pnl - prev_pnl
-                if abs(change) > 0.01:  # Ignorer les très petits changements
-                    pnl_changes.append(change)
-            
-            if not pnl_changes:
-                return {
-                    'win_rate': 0.0, 'profit_factor': 0.0,
-                    'avg_win': 0.0, 'avg_loss': 0.0,
-                    'trades_count': 0, 'profitable_trades': 0, 'losing_trades': 0
-                }
-            
-            # Séparer gains et pertes
-            wins = [p for p in pnl_changes if p > 0]
-            losses = [p for p in pnl_changes if p < 0]
-            
-            # Statistiques
-            trades_count = len(pnl_changes)
-            profitable_trades = len(wins)
-            losing_trades = len(losses)
-            win_rate = profitable_trades / trades_count if trades_count > 0 else 0.0
-            
-            avg_win = np.mean(wins) if wins else 0.0
-            avg_loss = abs(np.mean(losses)) if losses else 0.0
-            
-            profit_factor = (sum(wins) / abs(sum(losses))) if losses and sum(losses) != 0 else 0.0
-            
-            return {
-                'win_rate': float(win_rate),
-                'profit_factor': float(profit_factor),
-                'avg_win': float(avg_win),
-                'avg_loss': float(avg_loss),
-                'trades_count': trades_count,
-                'profitable_trades': profitable_trades,
-                'losing_trades': losing_trades
-            }
-            
-        except Exception as e:
-            logger.error(f"Erreur calcul statistiques win/loss: {e}")
-            return {
-                'win_rate': 0.0, 'profit_factor': 0.0,
-                'avg_win': 0.0, 'avg_loss': 0.0,
-                'trades_count': 0, 'profitable_trades': 0, 'losing_trades': 0
-            }
-    
     def _create_empty_performance_metrics(
         self,
         portfolio_id: UUID,
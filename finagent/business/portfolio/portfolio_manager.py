@@ -6,9 +6,11 @@ import asyncio
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, TYPE_CHECKING
 from uuid import UUID, uuid4
 
+import numpy as np
+
 from finagent.business.models.portfolio_models import (
     Portfolio,
     Position,
@@ -22,10 +24,22 @@ from finagent.business.models.portfolio_models import (
 )
 from finagent.business.models.decision_models import DecisionResult, DecisionAction
 from finagent.data.providers.openbb_provider import OpenBBProvider
+from finagent.data.services.market_data_bus import MarketDataBus, MarketEvent, MarketEventType
 from finagent.infrastructure.config import settings
 
+if TYPE_CHECKING:
+    from finagent.persistence.storage import PortfolioStore
+
 logger = logging.getLogger(__name__)
 
+# Décimales conservées lors de la conversion des montants float64 en Decimal
+AMOUNT_DECIMALS = 6
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Convertit un montant calculé en float64 en Decimal arrondi."""
+    return Decimal(str(round(float(value), AMOUNT_DECIMALS)))
+
 
 class PortfolioManager:
     """
@@ -44,7 +58,9 @@ class PortfolioManager:
         openbb_provider: OpenBBProvider,
         position_manager: Optional['PositionManager'] = None,
         performance_tracker: Optional['PerformanceTracker'] = None,
-        rebalancer: Optional['Rebalancer'] = None
+        rebalancer: Optional['Rebalancer'] = None,
+        market_data_bus: Optional[MarketDataBus] = None,
+        store: Optional['PortfolioStore'] = None
     ):
         """
         Initialise le gestionnaire de portefeuille.
@@ -54,6 +70,8 @@ class PortfolioManager:
             position_manager: Gestionnaire de positions (optionnel)
             performance_tracker: Suivi de performance (optionnel)
             rebalancer: Gestionnaire de rééquilibrage (optionnel)
+            market_data_bus: Bus de données de marché (revalorisation sur cotation)
+            store: Stockage durable des portefeuilles et transactions
         """
         self.openbb_provider = openbb_provider
         self.position_manager = position_manager
@@ -65,9 +83,21 @@ class PortfolioManager:
         self.max_position_size = settings.trading.max_position_size or 0.2
         self.transaction_fee = Decimal("0.001")  # 0.1% par défaut
         
-        # Stockage des portefeuilles (en production: base de données)
+        # Portefeuilles en mémoire, enregistrés dans le stockage s'il est configuré
+        self.store = store
         self._portfolios: Dict[UUID, Portfolio] = {}
         self._transactions: Dict[UUID, List[Transaction]] = {}
+        self._persist_lock = asyncio.Lock()
+        
+        # Revalorisation continue sur les cotations publiées
+        self.market_data_bus = market_data_bus
+        self._quote_subscription = None
+        if market_data_bus is not None:
+            self._quote_subscription = market_data_bus.subscribe(
+                self._on_quote_event,
+                event_types=[MarketEventType.QUOTE],
+                name="portfolio_manager"
+            )
         
         logger.info("Gestionnaire de portefeuille initialisé")
     
@@ -108,10 +138,56 @@ class PortfolioManager:
         # Stocker le portefeuille
         self._portfolios[portfolio.id] = portfolio
         self._transactions[portfolio.id] = []
+        await self._persist(portfolio)
         
         logger.info(f"Portefeuille {portfolio.id} créé avec succès")
         return portfolio
     
+    async def load_portfolios(self) -> int:
+        """
+        Recharge les portefeuilles et leurs transactions depuis le stockage.
+        
+        Returns:
+            int: Nombre de portefeuilles rechargés
+        """
+        if self.store is None:
+            return 0
+        
+        portfolios = await asyncio.to_thread(self.store.load_portfolios)
+        for portfolio in portfolios:
+            self._portfolios[portfolio.id] = portfolio
+            self._transactions[portfolio.id] = await asyncio.to_thread(
+                self.store.load_transactions, portfolio.id
+            )
+        
+        logger.info(f"{len(portfolios)} portefeuilles rechargés depuis le stockage")
+        return len(portfolios)
+    
+    async def _persist(self, portfolio: Portfolio, transactions: Iterable[Transaction] = ()) -> None:
+        """Enregistre l'état d'un portefeuille et de nouvelles transactions."""
+        await self._persist_all([portfolio], transactions)
+    
+    async def _persist_all(self, portfolios: List[Portfolio], transactions: Iterable[Transaction] = ()) -> None:
+        """
+        Enregistre plusieurs portefeuilles (et les transactions du premier).
+        
+        Les écritures SQLite s'exécutent dans un thread, sur des copies
+        prises avant de rendre la main à la boucle; le verrou conserve
+        l'ordre des écritures.
+        """
+        if self.store is None or not portfolios:
+            return
+        
+        transactions = list(transactions)
+        copies = [portfolio.model_copy(deep=True) for portfolio in portfolios]
+        try:
+            async with self._persist_lock:
+                if transactions:
+                    await asyncio.to_thread(self.store.save_transactions, copies[0].id, transactions)
+                await asyncio.to_thread(self.store.save_portfolios, copies)
+        except Exception as e:
+            logger.error(f"Erreur persistance de {len(copies)} portefeuille(s): {e}")
+    
     async def get_portfolio(self, portfolio_id: UUID) -> Optional[Portfolio]:
         """Récupère un portefeuille par son ID."""
         return self._portfolios.get(portfolio_id)
@@ -128,70 +204,239 @@ class PortfolioManager:
         """
         logger.info(f"Mise à jour des prix pour le portefeuille {portfolio_id}")
         
-        portfolio = self._portfolios.get(portfolio_id)
-        if not portfolio:
+        if portfolio_id not in self._portfolios:
             raise ValueError(f"Portefeuille {portfolio_id} non trouvé")
         
-        try:
-            # Récupérer les prix pour toutes les positions
-            symbols = list(portfolio.active_positions.keys())
-            if not symbols:
-                return portfolio
+        portfolios = await self.update_all_portfolio_prices([portfolio_id])
+        return portfolios[portfolio_id]
+    
+    async def update_all_portfolio_prices(
+        self,
+        portfolio_ids: Optional[Iterable[UUID]] = None
+    ) -> Dict[UUID, Portfolio]:
+        """
+        Revalorise plusieurs portefeuilles en un seul passage.
+        
+        Chaque symbole est coté une seule fois pour l'ensemble des
+        portefeuilles. Les positions sont mises à plat dans des tableaux
+        (quantité, coût, P&L réalisé, indice de prix, indice de
+        portefeuille): valeurs de marché, P&L et poids sont calculés en
+        float64, les totaux par portefeuille par ``np.bincount``. Les
+        montants ne sont convertis en Decimal qu'à l'écriture dans les
+        positions et portefeuilles.
+        
+        Args:
+            portfolio_ids: Portefeuilles à revaloriser (tous par défaut)
             
-            # Obtenir les prix en parallèle
-            price_tasks = [
-                self.openbb_provider.get_quote(symbol) for symbol in symbols
-            ]
-            price_results = await asyncio.gather(*price_tasks, return_exceptions=True)
+        Returns:
+            Dict[UUID, Portfolio]: Portefeuilles revalorisés par ID
+        """
+        if portfolio_ids is None:
+            portfolios = list(self._portfolios.values())
+        else:
+            portfolios = [self._portfolios[pid] for pid in portfolio_ids if pid in self._portfolios]
+        
+        try:
+            # Mise à plat des positions de tous les portefeuilles
+            positions: List[Position] = []
+            owners: List[int] = []
+            for index, portfolio in enumerate(portfolios):
+                positions.extend(portfolio.positions.values())
+                owners.extend([index] * len(portfolio.positions))
             
-            # Mettre à jour chaque position
-            total_market_value = Decimal("0")
-            total_pnl = Decimal("0")
+            active = np.fromiter(
+                (p.status == PositionStatus.ACTIVE and not p.is_empty for p in positions),
+                dtype=bool, count=len(positions)
+            )
+            symbols = sorted({p.symbol for p, is_active in zip(positions, active) if is_active})
+            if not symbols:
+                return {portfolio.id: portfolio for portfolio in portfolios}
             
+            # Une cotation par symbole pour l'ensemble des portefeuilles
+            price_results = await self._fetch_quotes(symbols)
+            prices = np.full(len(symbols), np.nan)
             for i, symbol in enumerate(symbols):
-                price_result = price_results[i]
-                
-                if isinstance(price_result, Exception):
-                    logger.warning(f"Erreur prix pour {symbol}: {price_result}")
+                price_result = price_results.get(symbol)
+                if price_result is None or isinstance(price_result, Exception) or price_result.get('price') is None:
+                    logger.warning(f"Erreur prix pour {symbol}: {price_result or 'cotation absente'}")
                     continue
-                
-                current_price = Decimal(str(price_result.get('price', 0)))
-                position = portfolio.positions[symbol]
-                
-                # Mettre à jour la position
-                if self.position_manager:
-                    updated_position = await self.position_manager.update_position_price(
-                        position, current_price
+                prices[i] = float(price_result['price'])
+            
+            # Revalorisation vectorisée
+            symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+            owner = np.asarray(owners, dtype=np.intp)
+            price_index = np.fromiter(
+                (symbol_index.get(p.symbol, -1) for p in positions), dtype=np.intp, count=len(positions)
+            )
+            columns = np.array(
+                [(float(p.quantity), float(p.total_cost), float(p.realized_pnl),
+                  float(p.market_value), float(p.unrealized_pnl)) for p in positions],
+                dtype=np.float64
+            ).reshape(len(positions), 5)
+            quantity, total_cost, realized_pnl, market_value, unrealized_pnl = columns.T.copy()
+            
+            price = np.where(price_index >= 0, prices[price_index], np.nan)
+            repriced = active & ~np.isnan(price)
+            decimal_prices = {
+                symbol: Decimal(str(prices[i])) for i, symbol in enumerate(symbols) if not np.isnan(prices[i])
+            }
+            market_value[repriced] = quantity[repriced] * price[repriced]
+            unrealized_pnl[repriced] = market_value[repriced] - total_cost[repriced]
+            total_pnl = unrealized_pnl + realized_pnl
+            
+            if self.position_manager:
+                # Gestionnaire de positions configuré: revalorisation déléguée position par position
+                for i in np.flatnonzero(repriced).tolist():
+                    position = positions[i]
+                    updated = await self.position_manager.update_position_price(
+                        position, decimal_prices[position.symbol]
                     )
-                    portfolio.positions[symbol] = updated_position
-                else:
-                    # Mise à jour simple
-                    position.current_price = current_price
-                    position.market_value = position.quantity * current_price
-                    position.unrealized_pnl = position.market_value - position.total_cost
-                    position.total_pnl = position.unrealized_pnl + position.realized_pnl
-                    position.last_updated = datetime.now()
-                
-                total_market_value += position.market_value
-                total_pnl += position.total_pnl
+                    portfolios[owner[i]].positions[position.symbol] = updated
+                    positions[i] = updated
+                    market_value[i] = float(updated.market_value)
+                    unrealized_pnl[i] = float(updated.unrealized_pnl)
+                    total_pnl[i] = float(updated.total_pnl)
             
-            # Mettre à jour le portefeuille
-            portfolio.invested_amount = total_market_value
-            portfolio.total_value = portfolio.cash_balance + total_market_value
-            portfolio.total_pnl = total_pnl
-            portfolio.unrealized_pnl = sum(p.unrealized_pnl for p in portfolio.active_positions.values())
-            portfolio.last_updated = datetime.now()
+            # Totaux par portefeuille
+            count = len(portfolios)
+            held = np.bincount(owner[active], minlength=count) > 0
+            invested = np.bincount(owner[active], weights=market_value[active], minlength=count)
+            unrealized_totals = np.bincount(owner[active], weights=unrealized_pnl[active], minlength=count)
+            pnl_totals = np.bincount(owner[active], weights=total_pnl[active], minlength=count)
+            cash = np.fromiter((float(p.cash_balance) for p in portfolios), dtype=np.float64, count=count)
+            total_value = cash + invested
+            denominator = np.where(held[owner] & (total_value[owner] != 0), total_value[owner], np.nan)
+            weights = market_value / denominator
             
-            # Recalculer les poids
-            await self._update_position_weights(portfolio)
+            # Écriture groupée (conversion Decimal à la frontière comptable)
+            now = datetime.now()
+            if not self.position_manager:
+                for i in np.flatnonzero(repriced).tolist():
+                    position = positions[i]
+                    position.current_price = decimal_prices[position.symbol]
+                    position.market_value = _to_decimal(market_value[i])
+                    position.unrealized_pnl = _to_decimal(unrealized_pnl[i])
+                    position.total_pnl = _to_decimal(total_pnl[i])
+                    position.last_updated = now
+            for position, weight in zip(positions, weights.tolist()):
+                if not np.isnan(weight):
+                    position.weight = weight
             
-            logger.info(f"Prix mis à jour pour {len(symbols)} positions")
-            return portfolio
+            revalued = []
+            for index in np.flatnonzero(held).tolist():
+                portfolio = portfolios[index]
+                portfolio.invested_amount = _to_decimal(invested[index])
+                portfolio.total_value = portfolio.cash_balance + portfolio.invested_amount
+                portfolio.total_pnl = _to_decimal(pnl_totals[index])
+                portfolio.unrealized_pnl = _to_decimal(unrealized_totals[index])
+                portfolio.last_updated = now
+                revalued.append(portfolio)
+            
+            # Une seule écriture pour tous les portefeuilles revalorisés
+            await self._persist_all(revalued)
+            
+            logger.info(
+                f"Prix mis à jour pour {int(repriced.sum())} positions "
+                f"de {count} portefeuilles ({len(symbols)} symboles)"
+            )
+            return {portfolio.id: portfolio for portfolio in portfolios}
             
         except Exception as e:
-            logger.error(f"Erreur mise à jour prix portefeuille {portfolio_id}: {e}")
+            logger.error(f"Erreur revalorisation de {len(portfolios)} portefeuilles: {e}")
             raise
-    
+
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Récupère les cotations de plusieurs symboles.
+
+        Les cotations déjà publiées sur le bus sont réutilisées; les
+        symboles manquants utilisent le téléchargement groupé du provider
+        lorsqu'il est disponible (un seul aller-retour), sinon un appel
+        par symbole.
+
+        Args:
+            symbols: Symboles à coter
+
+        Returns:
+            Dictionnaire symbole -> cotation (ou exception)
+        """
+        quotes: Dict[str, Any] = {}
+        if self.market_data_bus is not None:
+            for symbol in symbols:
+                quote = self.market_data_bus.latest_quote(symbol)
+                if quote is not None:
+                    quotes[symbol] = quote
+
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if not missing:
+            return quotes
+
+        if hasattr(self.openbb_provider, 'get_quotes'):
+            quotes.update(await self.openbb_provider.get_quotes(missing))
+            return quotes
+
+        price_results = await asyncio.gather(
+            *(self.openbb_provider.get_quote(symbol) for symbol in missing),
+            return_exceptions=True
+        )
+        quotes.update(zip(missing, price_results))
+        return quotes
+
+    async def _apply_price(self, portfolio: Portfolio, symbol: str, current_price: Decimal) -> None:
+        """
+        Valorise une position au prix courant.
+
+        Args:
+            portfolio: Portefeuille détenteur
+            symbol: Symbole de la position
+            current_price: Prix courant
+        """
+        position = portfolio.positions[symbol]
+        
+        if self.position_manager:
+            portfolio.positions[symbol] = await self.position_manager.update_position_price(
+                position, current_price
+            )
+        else:
+            # Mise à jour simple
+            position.current_price = current_price
+            position.market_value = position.quantity * current_price
+            position.unrealized_pnl = position.market_value - position.total_cost
+            position.total_pnl = position.unrealized_pnl + position.realized_pnl
+            position.last_updated = datetime.now()
+
+    async def _refresh_portfolio_totals(self, portfolio: Portfolio) -> None:
+        """Recalcule valeur, P&L et poids du portefeuille à partir des positions."""
+        positions = portfolio.active_positions.values()
+        total_market_value = sum((p.market_value for p in positions), Decimal("0"))
+        
+        portfolio.invested_amount = total_market_value
+        portfolio.total_value = portfolio.cash_balance + total_market_value
+        portfolio.total_pnl = sum((p.total_pnl for p in positions), Decimal("0"))
+        portfolio.unrealized_pnl = sum(p.unrealized_pnl for p in positions)
+        portfolio.last_updated = datetime.now()
+        
+        # Recalculer les poids
+        await self._update_position_weights(portfolio)
+
+    async def _on_quote_event(self, event: MarketEvent) -> None:
+        """
+        Revalorise les portefeuilles détenant le symbole coté.
+
+        Args:
+            event: Cotation publiée sur le bus
+        """
+        price = event.data.get('price')
+        if price is None:
+            return
+        
+        current_price = Decimal(str(price))
+        for portfolio in self._portfolios.values():
+            if event.symbol not in portfolio.active_positions:
+                continue
+            await self._apply_price(portfolio, event.symbol, current_price)
+            await self._refresh_portfolio_totals(portfolio)
+
     async def execute_decision(
         self, 
         portfolio_id: UUID, 
@@ -235,6 +480,7 @@ class PortfolioManager:
                 
                 # Mettre à jour le portefeuille
                 await self._apply_transaction_to_portfolio(portfolio, transaction)
+                await self._persist(portfolio, [transaction])
                 
                 logger.info(f"Transaction {transaction.id} exécutée avec succès")
             
@@ -392,6 +638,7 @@ class PortfolioManager:
                         current_price=transaction.price,
                         market_value=transaction.quantity * transaction.price,
                         unrealized_pnl=Decimal("0"),
+                        total_pnl=Decimal("0"),
                         weight=0.0,
                         transactions=[transaction.id]
                     )
@@ -0,0 +1,30 @@
+"""
+Module de modèles de risque de portefeuille.
+
+Ce module maintient la covariance des rendements d'un univers de
+symboles, mise à jour barre par barre, dont découlent volatilité, VaR,
+Expected Shortfall, beta et contributions au risque d'un portefeuille,
+ainsi que le moteur de scénarios (Monte Carlo, simulation historique)
+pour la VaR et la CVaR de portefeuille.
+"""
+
+from .covariance_model import (
+    CovarianceRiskModel,
+    RiskDecomposition
+)
+
+from .scenario_engine import (
+    ScenarioEngine,
+    ScenarioResult,
+    cholesky_factor,
+    tail_measures
+)
+
+__all__ = [
+    'CovarianceRiskModel',
+    'RiskDecomposition',
+    'ScenarioEngine',
+    'ScenarioResult',
+    'cholesky_factor',
+    'tail_measures'
+]
@@ -0,0 +1,493 @@
+"""
+Modèle de covariance - Covariance EWMA rétrécie des rendements d'un univers.
+
+Ce module maintient la matrice de covariance des rendements journaliers
+d'un univers de symboles, mise à jour à chaque nouvelle barre (lissage
+exponentiel RiskMetrics) et rétrécie vers sa diagonale. Volatilité, VaR,
+Expected Shortfall, beta, corrélation et contributions au risque d'un
+portefeuille en découlent par produits matriciels.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import NormalDist
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from finagent.data.models.price_panel import PricePanel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RiskDecomposition:
+    """
+    Décomposition du risque d'un portefeuille.
+
+    Les montants sont exprimés dans la devise du portefeuille, sur un jour:
+    la somme des contributions est égale à l'écart-type du portefeuille.
+    """
+    symbols: List[str]
+    exposures: np.ndarray       # Montant investi par symbole
+    volatility: float           # Écart-type journalier du portefeuille
+    marginal: np.ndarray        # Risque marginal (dσ/dx)
+    component: np.ndarray       # Contribution au risque (x · dσ/dx)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit en dictionnaire."""
+        return {
+            'volatility': self.volatility,
+            'marginal': dict(zip(self.symbols, self.marginal.tolist())),
+            'component': dict(zip(self.symbols, self.component.tolist()))
+        }
+
+
+class CovarianceRiskModel:
+    """
+    Covariance EWMA rétrécie des rendements journaliers d'un univers.
+
+    Chaque période ajoute ``(1 - decay) · r rᵀ`` à la covariance amortie
+    (O(n²), sans relecture de l'historique); seuls les symboles observés
+    sur la période sont mis à jour. La covariance utilisée pour le risque
+    est ``(1 - shrinkage) · Σ + shrinkage · diag(Σ)``, appliquée à la
+    volée dans les produits matriciels. Un symbole inconnu est lu avec
+    la volatilité par défaut et sans corrélation; seules les mises à jour
+    l'ajoutent à l'univers.
+    """
+
+    def __init__(self,
+                 decay: float = 0.94,
+                 shrinkage: float = 0.1,
+                 min_observations: int = 20,
+                 default_volatility: float = 0.25,
+                 periods_per_year: int = 252,
+                 history_size: int = 252):
+        """
+        Initialise le modèle.
+
+        Args:
+            decay: Facteur de lissage exponentiel (RiskMetrics: 0.94)
+            shrinkage: Intensité du rétrécissement vers la diagonale (0-1)
+            min_observations: Observations requises pour qu'un symbole soit couvert
+            default_volatility: Volatilité annuelle des symboles sans historique
+            periods_per_year: Nombre de périodes par an (annualisation)
+            history_size: Périodes de rendements conservées (simulation historique)
+
+        Raises:
+            ValueError: Si un paramètre est hors bornes
+        """
+        if not 0.0 < decay < 1.0:
+            raise ValueError(f"decay doit être dans ]0, 1[: {decay}")
+        if not 0.0 <= shrinkage <= 1.0:
+            raise ValueError(f"shrinkage doit être dans [0, 1]: {shrinkage}")
+        if history_size < 1:
+            raise ValueError(f"history_size doit être >= 1: {history_size}")
+
+        self.decay = decay
+        self.shrinkage = shrinkage
+        self.min_observations = min_observations
+        self.default_volatility = default_volatility
+        self.periods_per_year = periods_per_year
+        self.history_size = history_size
+
+        self.updated_at: Optional[datetime] = None
+        self._reset()
+
+    # Univers
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symboles de l'univers (ordre des lignes de la covariance)."""
+        return list(self._symbols)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._index
+
+    def observations(self, symbol: str) -> int:
+        """Nombre de rendements observés pour un symbole."""
+        i = self._index.get(symbol.upper())
+        return int(self._count[i]) if i is not None else 0
+
+    def is_covered(self, symbols: Any) -> bool:
+        """Vrai si tous les symboles ont assez d'observations."""
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = list(symbols)
+        return bool(symbols) and all(self.observations(s) >= self.min_observations for s in symbols)
+
+    # Mises à jour
+
+    def fit(self, panel: PricePanel) -> None:
+        """
+        Réinitialise le modèle sur l'historique d'un panel de prix.
+
+        La covariance EWMA de toute la période est obtenue en un produit
+        matriciel pondéré (rendements non définis comptés comme nuls).
+
+        Args:
+            panel: Prix alignés (symboles × dates)
+        """
+        self._reset()
+        if not len(panel):
+            return
+        rows = self._ensure(panel.symbols)
+
+        close = panel.close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = (close[:, 1:] / close[:, :-1] - 1.0).T  # (périodes, symboles)
+        valid = np.isfinite(returns)
+        filled = np.where(valid, returns, 0.0)
+        periods = filled.shape[0]
+
+        if periods:
+            weights = (1.0 - self.decay) * self.decay ** np.arange(periods - 1, -1, -1)
+            prior = self.decay ** periods
+            n = len(rows)
+            self._cov[:n, :n] = (filled * weights[:, None]).T @ filled + prior * self._cov[:n, :n]
+            self._mean[:n] = weights @ filled
+            self._count[:n] = valid.sum(axis=0)
+
+            tail = min(periods, self.history_size)
+            self._history[:tail, :n] = np.where(valid[-tail:], returns[-tail:], np.nan)
+            self._history_count = tail
+            self._version += 1
+
+        last = panel.close[:, -1] if panel.shape[1] else np.full(len(panel), np.nan)
+        self._last_price = {
+            symbol: float(price) for symbol, price in zip(panel.symbols, last) if np.isfinite(price)
+        }
+        if panel.shape[1]:
+            self._fitted_until = panel.timestamps[-1].astype('datetime64[us]').item()
+        self.updated_at = datetime.now()
+        logger.info(f"Modèle de covariance ajusté: {len(panel)} symboles, {periods} périodes")
+
+    def update(self, returns: Mapping[str, float]) -> None:
+        """
+        Ajoute une période de rendements (coupe transversale).
+
+        Args:
+            returns: Rendement de la période par symbole observé
+        """
+        returns = {s: float(r) for s, r in returns.items() if np.isfinite(r)}
+        if not returns:
+            return
+        rows = self._ensure(list(returns))
+        r = np.fromiter(returns.values(), dtype=np.float64, count=len(returns))
+        decay = self.decay
+        n = len(self._symbols)
+
+        if len(rows) == n:
+            # Univers complet: mise à jour en place
+            full = np.empty(n)
+            full[rows] = r
+            cov = self._cov[:n, :n]
+            cov *= decay
+            cov += (1.0 - decay) * np.outer(full, full)
+        else:
+            block = np.ix_(rows, rows)
+            self._cov[block] = decay * self._cov[block] + (1.0 - decay) * np.outer(r, r)
+        self._mean[rows] = decay * self._mean[rows] + (1.0 - decay) * r
+        self._count[rows] += 1
+
+        slot = self._history_count % self.history_size
+        self._history[slot, :] = np.nan
+        self._history[slot, rows] = r
+        self._history_count += 1
+
+        self._version += 1
+        self.updated_at = datetime.now()
+
+    def observe(self, symbol: str, timestamp: Any, price: float) -> bool:
+        """
+        Enregistre la clôture d'une barre.
+
+        Les barres d'un même horodatage forment une période; la période est
+        ajoutée au modèle à l'arrivée de la première barre suivante (une
+        barre révisée remplace simplement la précédente). Les barres déjà
+        couvertes par ``fit`` sont ignorées.
+
+        Args:
+            symbol: Symbole de la barre
+            timestamp: Horodatage de la barre
+            price: Prix de clôture
+
+        Returns:
+            bool: Vrai si une période a été ajoutée au modèle
+        """
+        if price is None or not np.isfinite(price) or price <= 0:
+            return False
+        if self._fitted_until is not None and timestamp <= self._fitted_until:
+            return False  # Barre déjà comprise dans l'ajustement
+        if self._pending_timestamp is not None and timestamp < self._pending_timestamp:
+            return False  # Barre antérieure à la période en cours
+
+        flushed = False
+        if self._pending_timestamp is not None and timestamp > self._pending_timestamp:
+            flushed = self.flush()
+        self._pending_timestamp = timestamp
+        self._pending[symbol.upper()] = float(price)
+        return flushed
+
+    def flush(self) -> bool:
+        """Ajoute la période en cours au modèle; vrai si des rendements ont été ajoutés."""
+        returns = {
+            symbol: price / self._last_price[symbol] - 1.0
+            for symbol, price in self._pending.items()
+            if self._last_price.get(symbol, 0.0) > 0
+        }
+        self._last_price.update(self._pending)
+        self._pending = {}
+        if returns:
+            self.update(returns)
+        return bool(returns)
+
+    # Matrices
+
+    def covariance(self, symbols: Optional[Sequence[str]] = None, annualized: bool = False) -> np.ndarray:
+        """Covariance rétrécie des symboles demandés (tout l'univers par défaut)."""
+        rows = self._rows(symbols)
+        shrunk = (1.0 - self.shrinkage) * self._block(rows)
+        shrunk[np.diag_indices_from(shrunk)] = self._variances(rows)
+        return shrunk * self.periods_per_year if annualized else shrunk
+
+    def correlation(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Matrice de corrélation rétrécie."""
+        cov = self.covariance(symbols)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        return np.nan_to_num(corr)
+
+    def volatility(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Volatilités annualisées."""
+        return np.sqrt(self._variances(self._rows(symbols)) * self.periods_per_year)
+
+    def mean(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Rendements moyens (EWMA) d'une période."""
+        rows = self._rows(symbols)
+        known = rows >= 0
+        mean = np.zeros(len(rows))
+        mean[known] = self._mean[rows[known]]
+        return mean
+
+    def returns_history(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Derniers rendements conservés (périodes × symboles, ordre chronologique, NaN si absent)."""
+        rows = self._rows(symbols)
+        count = min(self._history_count, self.history_size)
+        start = self._history_count % self.history_size if self._history_count > self.history_size else 0
+        order = (start + np.arange(count)) % self.history_size
+        known = rows >= 0
+        history = np.full((count, len(rows)), np.nan)
+        history[:, known] = self._history[np.ix_(order, rows[known])]
+        return history
+
+    # Risque d'un portefeuille
+
+    def decompose(self, positions: Mapping[str, float]) -> RiskDecomposition:
+        """
+        Volatilité journalière et contributions au risque d'un portefeuille.
+
+        Args:
+            positions: Montant investi par symbole
+
+        Returns:
+            RiskDecomposition: Risque total, marginal et par composante
+        """
+        symbols, rows, x, sigma_x, variance = self._portfolio(positions)
+        volatility = float(np.sqrt(max(variance, 0.0)))
+        marginal = sigma_x / volatility if volatility > 0 else np.zeros_like(x)
+        return RiskDecomposition(
+            symbols=symbols, exposures=x, volatility=volatility,
+            marginal=marginal, component=x * marginal
+        )
+
+    def portfolio_volatility(self, positions: Mapping[str, float], days: int = 1) -> float:
+        """Écart-type des gains et pertes sur ``days`` périodes (devise)."""
+        variance = self._portfolio(positions)[4]
+        return float(np.sqrt(max(variance, 0.0) * days))
+
+    def value_at_risk(self, positions: Mapping[str, float], confidence: float = 0.95, days: int = 1) -> float:
+        """VaR paramétrique (normale) du portefeuille, en devise."""
+        z = NormalDist().inv_cdf(confidence)
+        return z * self.portfolio_volatility(positions, days)
+
+    def expected_shortfall(self, positions: Mapping[str, float], confidence: float = 0.95, days: int = 1) -> float:
+        """Expected Shortfall paramétrique (normale) du portefeuille, en devise."""
+        z = NormalDist().inv_cdf(confidence)
+        return NormalDist().pdf(z) / (1.0 - confidence) * self.portfolio_volatility(positions, days)
+
+    def beta(self, positions: Mapping[str, float], benchmark: str, total_value: float) -> Optional[float]:
+        """
+        Beta du portefeuille par rapport à un indice de référence de l'univers.
+
+        Returns:
+            Optional[float]: Beta (None si l'indice n'est pas couvert)
+        """
+        b = self._index.get(benchmark.upper())
+        if b is None or self._count[b] < self.min_observations or total_value <= 0:
+            return None
+        _, rows, x, _, _ = self._portfolio(positions)
+        benchmark_variance = self._cov[b, b]
+        if benchmark_variance <= 0:
+            return None
+        column = (1.0 - self.shrinkage) * self._cross(rows, b)
+        column[rows == b] = benchmark_variance
+        return float(column @ x / benchmark_variance / total_value)
+
+    def correlation_with(self, symbol: str, positions: Mapping[str, float]) -> Optional[float]:
+        """
+        Corrélation entre un symbole et le portefeuille (O(n): une ligne de la covariance).
+
+        Returns:
+            Optional[float]: Corrélation (None si le symbole ou le portefeuille est inconnu)
+        """
+        s = self._index.get(symbol.upper())
+        if s is None or not positions:
+            return None
+        _, rows, x, _, variance = self._portfolio(positions)
+        row = (1.0 - self.shrinkage) * self._cross(rows, s)
+        row[rows == s] = self._cov[s, s]
+        denominator = np.sqrt(self._cov[s, s] * variance)
+        return float(row @ x / denominator) if denominator > 0 else None
+
+    def average_correlation(self, positions: Mapping[str, float]) -> float:
+        """Corrélation moyenne entre positions, pondérée par les montants."""
+        symbols, _, x, _, _ = self._portfolio(positions)
+        if len(symbols) < 2:
+            return 0.0
+        a = np.abs(x)
+        corr = self.correlation(symbols)
+        squares = float(a @ a)
+        denominator = float(a.sum()) ** 2 - squares
+        return float((a @ corr @ a - squares) / denominator) if denominator > 0 else 0.0
+
+    def expected_return(self, positions: Mapping[str, float], total_value: float) -> float:
+        """Rendement annualisé attendu (moyenne EWMA des rendements)."""
+        if total_value <= 0:
+            return 0.0
+        symbols, _, x, _, _ = self._portfolio(positions)
+        return float(self.mean(symbols) @ x / total_value * self.periods_per_year)
+
+    def max_drawdown(self, positions: Mapping[str, float], total_value: float) -> Optional[float]:
+        """
+        Drawdown maximum des pondérations actuelles sur l'historique conservé.
+
+        Returns:
+            Optional[float]: Drawdown (0-1), None sans historique
+        """
+        if total_value <= 0 or self._history_count < 2:
+            return None
+        symbols, _, x, _, _ = self._portfolio(positions)
+        returns = np.nan_to_num(self.returns_history(symbols)) @ (x / total_value)
+        equity = np.cumprod(1.0 + returns)
+        peaks = np.maximum.accumulate(np.maximum(equity, 1.0))
+        return float(np.max(1.0 - equity / peaks))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du modèle."""
+        n = len(self._symbols)
+        return {
+            'symbols': n,
+            'covered_symbols': int(np.count_nonzero(self._count[:n] >= self.min_observations)),
+            'periods': self._history_count,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    # Implémentation
+
+    def _reset(self) -> None:
+        """Vide l'univers et l'état du modèle."""
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._cov = np.zeros((0, 0))
+        self._mean = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._history = np.full((self.history_size, 0), np.nan)
+        self._history_count = 0
+        self._last_price: Dict[str, float] = {}
+        self._pending: Dict[str, float] = {}
+        self._pending_timestamp: Any = None
+        self._fitted_until: Optional[datetime] = None
+        self._version = 0
+        self._portfolio_cache: Optional[Tuple[Any, Tuple]] = None
+
+    def _ensure(self, symbols: Sequence[str]) -> np.ndarray:
+        """Indices des symboles, ajoutés à l'univers si besoin (capacité doublée)."""
+        new = [s for s in dict.fromkeys(s.upper() for s in symbols) if s not in self._index]
+        if new:
+            n = len(self._symbols)
+            size = n + len(new)
+            capacity = self._cov.shape[0]
+            if size > capacity:
+                capacity = max(size, 2 * capacity, 16)
+                cov = np.zeros((capacity, capacity))
+                cov[:n, :n] = self._cov[:n, :n]
+                mean = np.zeros(capacity)
+                mean[:n] = self._mean[:n]
+                count = np.zeros(capacity, dtype=np.int64)
+                count[:n] = self._count[:n]
+                history = np.full((self.history_size, capacity), np.nan)
+                history[:, :n] = self._history[:, :n]
+                self._cov, self._mean, self._count, self._history = cov, mean, count, history
+
+            prior = self.default_volatility ** 2 / self.periods_per_year
+            for offset, symbol in enumerate(new):
+                self._index[symbol] = n + offset
+                self._symbols.append(symbol)
+                self._cov[n + offset, n + offset] = prior
+            self._version += 1
+        return np.array([self._index[s.upper()] for s in symbols], dtype=np.intp)
+
+    def _rows(self, symbols: Optional[Sequence[str]]) -> np.ndarray:
+        """Indices des symboles (-1 hors de l'univers), sans modifier le modèle."""
+        if symbols is None:
+            return np.arange(len(self._symbols))
+        return np.array([self._index.get(s.upper(), -1) for s in symbols], dtype=np.intp)
+
+    def _variances(self, rows: np.ndarray) -> np.ndarray:
+        """Variances des lignes (variance a priori hors de l'univers)."""
+        known = rows >= 0
+        variances = np.full(len(rows), self.default_volatility ** 2 / self.periods_per_year)
+        variances[known] = self._cov[rows[known], rows[known]]
+        return variances
+
+    def _block(self, rows: np.ndarray) -> np.ndarray:
+        """Covariance brute des lignes (sans corrélation hors de l'univers)."""
+        known = rows >= 0
+        block = np.zeros((len(rows), len(rows)))
+        block[np.ix_(known, known)] = self._cov[np.ix_(rows[known], rows[known])]
+        block[np.diag_indices_from(block)] = self._variances(rows)
+        return block
+
+    def _cross(self, rows: np.ndarray, column: int) -> np.ndarray:
+        """Covariances brutes des lignes avec un symbole de l'univers."""
+        known = rows >= 0
+        cross = np.zeros(len(rows))
+        cross[known] = self._cov[rows[known], column]
+        return cross
+
+    def _portfolio(self, positions: Mapping[str, float]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Exposition du portefeuille et produit Σx (mis en cache tant que le
+        modèle et les positions ne changent pas).
+        """
+        symbols = [s.upper() for s in positions]
+        rows = self._rows(symbols)
+        key = (self._version, tuple(positions.items()))
+        cached = self._portfolio_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        x = np.fromiter((float(v) for v in positions.values()), dtype=np.float64, count=len(symbols))
+        sigma_x = (1.0 - self.shrinkage) * (self._block(rows) @ x) \
+            + self.shrinkage * self._variances(rows) * x
+        variance = float(x @ sigma_x)
+
+        result = (symbols, rows, x, sigma_x, variance)
+        self._portfolio_cache = (key, result)
+        return result
@@ -0,0 +1,315 @@
+"""
+Moteur de scénarios - VaR et CVaR de portefeuille par simulation.
+
+Ce module génère des scénarios de rendements corrélés (Monte Carlo par
+décomposition de Cholesky de la covariance) ou rééchantillonne des
+fenêtres historiques, réévalue le portefeuille de façon vectorielle et
+en déduit VaR et CVaR pour plusieurs niveaux de confiance à la fois.
+Les tirages sont produits par blocs en float32 pour borner la mémoire,
+et répartis sur un pool de processus pour les très grandes simulations.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .covariance_model import CovarianceRiskModel
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CONFIDENCE_LEVELS = (0.90, 0.95, 0.975, 0.99, 0.995)
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Distribution simulée des gains et pertes d'un portefeuille.
+
+    VaR et CVaR sont des pertes positives exprimées dans la devise du
+    portefeuille, sur l'horizon simulé.
+    """
+    method: str
+    horizon: int
+    scenarios: int
+    confidence_levels: List[float]
+    var: Dict[float, float]
+    cvar: Dict[float, float]
+    mean_pnl: float
+    std_pnl: float
+    pnl: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit en dictionnaire."""
+        return {
+            'method': self.method,
+            'horizon': self.horizon,
+            'scenarios': self.scenarios,
+            'var': {f"{level:.3f}": value for level, value in self.var.items()},
+            'cvar': {f"{level:.3f}": value for level, value in self.cvar.items()},
+            'mean_pnl': self.mean_pnl,
+            'std_pnl': self.std_pnl
+        }
+
+
+class ScenarioEngine:
+    """
+    Simulation de la distribution des gains et pertes d'un portefeuille.
+
+    Monte Carlo: rendements gaussiens corrélés ``z Lᵀ`` (``Σ = L Lᵀ``).
+    Sur un horizon d'une période le portefeuille linéaire ne dépend que
+    de ``Lᵀx``: un produit matrice-vecteur par bloc suffit. Sur plusieurs
+    périodes, chaque symbole est réévalué par rendements composés.
+
+    Historique: fenêtres de ``horizon`` périodes consécutives tirées avec
+    remise; le rendement composé de chaque fenêtre est calculé une fois
+    par sommes cumulées de log-rendements.
+    """
+
+    def __init__(self,
+                 scenarios: int = 100_000,
+                 chunk_size: int = 20_000,
+                 confidence_levels: Sequence[float] = DEFAULT_CONFIDENCE_LEVELS,
+                 seed: Optional[int] = None,
+                 workers: int = 1,
+                 parallel_threshold: int = 2_000_000,
+                 mp_context: Any = None,
+                 keep_pnl: bool = False):
+        """
+        Initialise le moteur.
+
+        Args:
+            scenarios: Nombre de scénarios par défaut
+            chunk_size: Scénarios générés par bloc (mémoire bornée)
+            confidence_levels: Niveaux de confiance par défaut
+            seed: Graine du générateur aléatoire
+            workers: Processus utilisés pour les très grandes simulations
+            parallel_threshold: Scénarios × symboles × horizon à partir desquels le pool est utilisé
+            mp_context: Contexte multiprocessing du pool (fork/spawn)
+            keep_pnl: Conserver les gains et pertes simulés dans le résultat
+
+        Raises:
+            ValueError: Si un paramètre est hors bornes
+        """
+        if scenarios < 1 or chunk_size < 1:
+            raise ValueError("scenarios et chunk_size doivent être >= 1")
+        self.scenarios = scenarios
+        self.chunk_size = chunk_size
+        self.confidence_levels = _check_levels(confidence_levels)
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.workers = max(1, workers)
+        self.parallel_threshold = parallel_threshold
+        self.mp_context = mp_context
+        self.keep_pnl = keep_pnl
+
+    def monte_carlo(self,
+                    exposures: Any,
+                    covariance: Any,
+                    mean: Any = None,
+                    horizon: int = 1,
+                    scenarios: Optional[int] = None,
+                    confidence_levels: Optional[Sequence[float]] = None) -> ScenarioResult:
+        """
+        VaR/CVaR par simulation de rendements gaussiens corrélés.
+
+        Args:
+            exposures: Montant investi par symbole (négatif pour une vente à découvert)
+            covariance: Covariance des rendements d'une période
+            mean: Rendement moyen d'une période (nul par défaut)
+            horizon: Nombre de périodes simulées
+            scenarios: Nombre de scénarios (défaut du moteur sinon)
+            confidence_levels: Niveaux de confiance (défaut du moteur sinon)
+
+        Returns:
+            ScenarioResult: Distribution simulée et mesures de risque
+        """
+        x = np.asarray(exposures, dtype=np.float64)
+        n = len(x)
+        mean = np.zeros(n) if mean is None else np.asarray(mean, dtype=np.float64)
+        factor = cholesky_factor(covariance)
+        scenarios = scenarios or self.scenarios
+        _check_horizon(horizon)
+
+        if horizon == 1:
+            # Gains et pertes linéaires: seule la projection Lᵀx intervient
+            task = ('projected', (factor.T @ x).astype(np.float32), float(mean @ x))
+        else:
+            task = ('paths', factor.T.astype(np.float32), mean.astype(np.float32),
+                    x.astype(np.float32), horizon)
+
+        pnl = self._run(task, scenarios, work=scenarios * n * horizon)
+        return self._result('monte_carlo', horizon, pnl, confidence_levels)
+
+    def historical(self,
+                   exposures: Any,
+                   returns: Any,
+                   horizon: int = 1,
+                   scenarios: Optional[int] = None,
+                   confidence_levels: Optional[Sequence[float]] = None) -> ScenarioResult:
+        """
+        VaR/CVaR par rééchantillonnage de fenêtres historiques.
+
+        Args:
+            exposures: Montant investi par symbole
+            returns: Rendements historiques (périodes × symboles, NaN comptés nuls)
+            horizon: Longueur des fenêtres (périodes consécutives)
+            scenarios: Nombre de tirages (défaut du moteur sinon)
+            confidence_levels: Niveaux de confiance (défaut du moteur sinon)
+
+        Returns:
+            ScenarioResult: Distribution simulée et mesures de risque
+
+        Raises:
+            ValueError: Si l'historique est plus court que l'horizon
+        """
+        x = np.asarray(exposures, dtype=np.float64)
+        returns = np.nan_to_num(np.asarray(returns, dtype=np.float64).reshape(-1, len(x)))
+        _check_horizon(horizon)
+        if len(returns) < horizon:
+            raise ValueError(f"Historique trop court ({len(returns)} périodes) pour un horizon de {horizon}")
+
+        # Rendement composé de chaque fenêtre, puis gains et pertes par fenêtre
+        log_growth = np.vstack([np.zeros(len(x)), np.cumsum(np.log1p(returns), axis=0)])
+        window_pnl = np.expm1(log_growth[horizon:] - log_growth[:-horizon]) @ x
+
+        rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
+        pnl = window_pnl[rng.integers(len(window_pnl), size=scenarios or self.scenarios)]
+        return self._result('historical', horizon, pnl, confidence_levels)
+
+    def simulate(self,
+                 model: CovarianceRiskModel,
+                 positions: Mapping[str, float],
+                 method: str = "monte_carlo",
+                 horizon: int = 1,
+                 scenarios: Optional[int] = None,
+                 confidence_levels: Optional[Sequence[float]] = None) -> ScenarioResult:
+        """
+        Simulation d'un portefeuille à partir d'un modèle de covariance.
+
+        Args:
+            model: Modèle de covariance de l'univers
+            positions: Montant investi par symbole
+            method: ``monte_carlo`` (covariance rétrécie) ou ``historical`` (rendements conservés)
+            horizon: Nombre de périodes simulées
+            scenarios: Nombre de scénarios
+            confidence_levels: Niveaux de confiance
+
+        Returns:
+            ScenarioResult: Distribution simulée et mesures de risque
+        """
+        symbols = list(positions)
+        exposures = np.fromiter((float(v) for v in positions.values()), dtype=np.float64, count=len(symbols))
+        if method == "monte_carlo":
+            return self.monte_carlo(
+                exposures, model.covariance(symbols), model.mean(symbols),
+                horizon, scenarios, confidence_levels
+            )
+        if method == "historical":
+            return self.historical(
+                exposures, model.returns_history(symbols), horizon, scenarios, confidence_levels
+            )
+        raise ValueError(f"Méthode de simulation inconnue: {method}")
+
+    # Implémentation
+
+    def _run(self, task: tuple, scenarios: int, work: int) -> np.ndarray:
+        """Exécute la simulation par blocs, dans un pool si elle est très grande."""
+        workers = min(self.workers, max(1, scenarios // self.chunk_size))
+        if workers <= 1 or work < self.parallel_threshold:
+            return _simulate(task, scenarios, self.chunk_size, self.seed_sequence.spawn(1)[0])
+
+        counts = [len(part) for part in np.array_split(np.arange(scenarios), workers)]
+        seeds = self.seed_sequence.spawn(workers)
+        logger.debug(f"Simulation de {scenarios} scénarios sur {workers} processus")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context) as pool:
+            parts = pool.map(_simulate, [task] * workers, counts, [self.chunk_size] * workers, seeds)
+            return np.concatenate(list(parts))
+
+    def _result(self, method: str, horizon: int, pnl: np.ndarray,
+                confidence_levels: Optional[Sequence[float]]) -> ScenarioResult:
+        levels = _check_levels(confidence_levels) if confidence_levels else self.confidence_levels
+        var, cvar = tail_measures(pnl, levels)
+        return ScenarioResult(
+            method=method,
+            horizon=horizon,
+            scenarios=len(pnl),
+            confidence_levels=list(levels),
+            var=dict(zip(levels, var.tolist())),
+            cvar=dict(zip(levels, cvar.tolist())),
+            mean_pnl=float(pnl.mean()),
+            std_pnl=float(pnl.std()),
+            pnl=pnl if self.keep_pnl else None
+        )
+
+
+def cholesky_factor(covariance: Any) -> np.ndarray:
+    """
+    Facteur ``L`` tel que ``Σ ≈ L Lᵀ``.
+
+    Une covariance non définie positive (symboles redondants, historique
+    court) est rendue semi-définie positive en annulant ses valeurs
+    propres négatives.
+    """
+    cov = np.asarray(covariance, dtype=np.float64)
+    cov = (cov + cov.T) / 2.0
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+def tail_measures(pnl: np.ndarray, confidence_levels: Sequence[float]) -> tuple:
+    """
+    VaR et CVaR (pertes positives) pour plusieurs niveaux en un seul tri.
+
+    Pour un niveau ``c``, la queue contient les ``ceil(N · (1 - c))`` pires
+    scénarios: la VaR est la plus petite perte de la queue, la CVaR sa
+    moyenne.
+    """
+    losses = np.sort(-np.asarray(pnl, dtype=np.float64))[::-1]
+    levels = np.asarray(confidence_levels, dtype=np.float64)
+    # Arrondi avant ceil: 100 · (1 - 0.95) vaut 5.000000000000004 en flottant
+    tail = np.clip(np.ceil(np.round(len(losses) * (1.0 - levels), 9)).astype(int), 1, len(losses))
+    var = losses[tail - 1]
+    cvar = np.cumsum(losses)[tail - 1] / tail
+    return var, cvar
+
+
+def _simulate(task: tuple, scenarios: int, chunk_size: int, seed: Any) -> np.ndarray:
+    """Gains et pertes de ``scenarios`` tirages, générés par blocs float32."""
+    rng = np.random.default_rng(seed)
+    pnl = np.empty(scenarios, dtype=np.float64)
+    kind = task[0]
+
+    for start in range(0, scenarios, chunk_size):
+        size = min(chunk_size, scenarios - start)
+        if kind == 'projected':
+            _, projection, drift = task
+            z = rng.standard_normal((size, len(projection)), dtype=np.float32)
+            pnl[start:start + size] = z @ projection + drift
+        else:
+            _, factor_t, mean, exposures, horizon = task
+            log_growth = np.zeros((size, len(exposures)), dtype=np.float32)
+            for _ in range(horizon):
+                z = rng.standard_normal((size, len(exposures)), dtype=np.float32)
+                returns = z @ factor_t
+                returns += mean
+                log_growth += np.log1p(np.maximum(returns, -0.999999, out=returns))
+            pnl[start:start + size] = np.expm1(log_growth) @ exposures
+    return pnl
+
+
+def _check_levels(levels: Sequence[float]) -> List[float]:
+    levels = [float(level) for level in levels]
+    if not levels or any(not 0.0 < level < 1.0 for level in levels):
+        raise ValueError(f"Niveaux de confiance invalides: {levels}")
+    return levels
+
+
+def _check_horizon(horizon: int) -> None:
+    if horizon < 1:
+        raise ValueError(f"horizon doit être >= 1: {horizon}")
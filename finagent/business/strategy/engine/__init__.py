@@ -19,6 +19,11 @@ from .rule_evaluator import (
     EvaluationError
 )
 
+from .indicator_graph import (
+    IndicatorGraph,
+    IndicatorNode
+)
+
 from .signal_generator import (
     SignalGenerator,
     TradingSignal,
@@ -40,6 +45,10 @@ __all__ = [
     "EvaluationResult",
     "EvaluationError",
     
+    # Indicator Graph
+    "IndicatorGraph",
+    "IndicatorNode",
+    
     # Signal Generator
     "SignalGenerator",
     "TradingSignal",
@@ -0,0 +1,209 @@
+"""
+Graphe de dépendances des indicateurs partagé entre stratégies.
+
+Les conditions de toutes les stratégies actives sont décomposées en
+nœuds (indicateur, timeframe, paramètres). Les nœuds identiques sont
+fusionnés au chargement: chaque nœud est calculé une seule fois par
+symbole et par cycle, puis sa valeur est fournie à toutes les
+conditions qui en dépendent.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..parser.rule_compiler import CompiledRule, RuleCompiler
+from finagent.data.indicators.streaming import IndicatorRegistry, indicator_key
+
+logger = logging.getLogger(__name__)
+
+# Indicateurs dépendant de l'état du portefeuille (hors données de marché)
+_POSITION_INDICATORS = frozenset({'stop_loss', 'take_profit'})
+
+
+@dataclass
+class IndicatorNode:
+    """Nœud du graphe: un indicateur paramétré sur un timeframe."""
+    key: str
+    indicator: str
+    timeframe: str
+    parameters: Dict[str, Any]
+    lookback: int
+    # Nombre de conditions référençant le nœud, par stratégie
+    references: Dict[str, int] = field(default_factory=dict)
+
+
+class IndicatorGraph:
+    """
+    Graphe des indicateurs requis par les stratégies chargées.
+
+    Les indicateurs disposant d'une version incrémentale sont mis à jour
+    via le registre partagé; les autres sont calculés par l'évaluateur
+    d'indicateur du compilateur, exactement comme le ferait la condition.
+    """
+
+    def __init__(self, rule_compiler: RuleCompiler,
+                 indicator_registry: Optional[IndicatorRegistry] = None):
+        """
+        Initialise le graphe.
+
+        Args:
+            rule_compiler: Compilateur fournissant les évaluateurs d'indicateurs
+            indicator_registry: Registre d'indicateurs incrémentaux partagé
+        """
+        self.rule_compiler = rule_compiler
+        self.indicator_registry = indicator_registry or IndicatorRegistry()
+
+        self.nodes: Dict[str, IndicatorNode] = {}
+        self._strategy_nodes: Dict[str, Set[str]] = {}
+
+        # Statistiques
+        self.stats = {
+            'cycles': 0,
+            'computations': 0,
+            'computations_saved': 0,
+            'computation_errors': 0
+        }
+
+    def add_strategy(self, strategy_id: str, compiled_rule: CompiledRule) -> None:
+        """
+        Ajoute les indicateurs d'une stratégie au graphe.
+
+        Args:
+            strategy_id: Identifiant de la stratégie
+            compiled_rule: Règle compilée de la stratégie
+        """
+        self.remove_strategy(strategy_id)
+
+        keys = set()
+        for condition in compiled_rule.buy_conditions + compiled_rule.sell_conditions:
+            metadata = condition.metadata
+            name = metadata.get('indicator', '')
+            if not self._is_shareable(name):
+                continue
+
+            timeframe = metadata.get('timeframe', '1d')
+            parameters = metadata.get('parameters') or {}
+            key = indicator_key(name, timeframe, parameters)
+            node = self.nodes.get(key)
+            if node is None:
+                node = IndicatorNode(
+                    key=key,
+                    indicator=name,
+                    timeframe=timeframe,
+                    parameters=dict(parameters),
+                    lookback=metadata.get('lookback', 1)
+                )
+                self.nodes[key] = node
+            node.references[strategy_id] = node.references.get(strategy_id, 0) + 1
+            keys.add(key)
+
+        self._strategy_nodes[strategy_id] = keys
+        logger.debug(
+            f"Stratégie {strategy_id}: {len(keys)} indicateurs, "
+            f"{len(self.nodes)} nœuds partagés au total"
+        )
+
+    def remove_strategy(self, strategy_id: str) -> None:
+        """
+        Retire les indicateurs d'une stratégie (nœuds orphelins supprimés).
+
+        Args:
+            strategy_id: Identifiant de la stratégie
+        """
+        for key in self._strategy_nodes.pop(strategy_id, set()):
+            node = self.nodes.get(key)
+            if node is None:
+                continue
+            node.references.pop(strategy_id, None)
+            if not node.references:
+                del self.nodes[key]
+
+    def compute(self, symbol: str, market_data: Dict[str, Any],
+                strategy_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Calcule une fois chaque nœud requis pour un symbole (un cycle).
+
+        Args:
+            symbol: Symbole financier
+            market_data: Données de marché du symbole
+            strategy_ids: Stratégies exécutées sur ce symbole (toutes si absent)
+
+        Returns:
+            Valeurs par clé d'indicateur (clé attendue par les conditions)
+        """
+        if strategy_ids is None:
+            strategy_ids = list(self._strategy_nodes)
+
+        references = 0
+        keys: Set[str] = set()
+        for strategy_id in strategy_ids:
+            for key in self._strategy_nodes.get(strategy_id, ()):
+                keys.add(key)
+                references += self.nodes[key].references[strategy_id]
+
+        self.stats['cycles'] += 1
+        if not keys:
+            return {}
+
+        values = self._compute_streaming(symbol, market_data, keys)
+        for key in keys - values.keys():
+            node = self.nodes[key]
+            try:
+                evaluator = self.rule_compiler._indicator_evaluators[node.indicator]
+                values[key] = evaluator(market_data, node.timeframe, node.lookback, node.parameters)
+            except Exception as e:
+                # La condition recalculera elle-même l'indicateur
+                self.stats['computation_errors'] += 1
+                logger.debug(f"Calcul de {key} impossible pour {symbol}: {e}")
+
+        self.stats['computations'] += len(keys)
+        self.stats['computations_saved'] += references - len(keys)
+        return values
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques de partage."""
+        references = sum(sum(node.references.values()) for node in self.nodes.values())
+        return {
+            **self.stats,
+            'nodes': len(self.nodes),
+            'references': references,
+            'strategies': len(self._strategy_nodes)
+        }
+
+    def _is_shareable(self, name: str) -> bool:
+        """Indique si l'indicateur ne dépend que des données de marché."""
+        return name in self.rule_compiler._indicator_evaluators and name not in _POSITION_INDICATORS
+
+    def _compute_streaming(self, symbol: str, market_data: Dict[str, Any],
+                           keys: Set[str]) -> Dict[str, Any]:
+        """
+        Met à jour les nœuds disposant d'une version incrémentale.
+
+        Returns:
+            Valeurs des nœuds prêts, converties au format des évaluateurs
+        """
+        prices = market_data.get('prices', {})
+        by_timeframe: Dict[str, List[IndicatorNode]] = {}
+        for key in keys:
+            node = self.nodes[key]
+            if self.indicator_registry.supports(node.indicator) and len(prices.get(node.timeframe, ())):
+                self.indicator_registry.get(symbol, node.timeframe, node.indicator, node.parameters)
+                by_timeframe.setdefault(node.timeframe, []).append(node)
+
+        values = {}
+        for timeframe, nodes in by_timeframe.items():
+            updated = self.indicator_registry.update(symbol, timeframe, prices[timeframe])
+            for node in nodes:
+                value = updated.get(node.key)
+                if value is not None:
+                    values[node.key] = condition_value(node.indicator, value)
+        return values
+
+
+def condition_value(indicator: str, value: Any) -> Any:
+    """Aligne une valeur incrémentale sur celle de l'évaluateur du compilateur."""
+    if indicator == 'macd' and isinstance(value, dict):
+        # L'évaluateur de règle compare la ligne MACD
+        return value['macd']
+    return value
@@ -13,6 +13,9 @@ from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
 
+from finagent.data.indicators.streaming import IndicatorRegistry, indicator_key
+from .indicator_graph import condition_value
+
 from ..parser.rule_compiler import CompiledRule, CompiledCondition
 from ..models.condition_models import IndicatorCalculationResult
 
@@ -130,7 +133,8 @@ class RuleEvaluator:
     def __init__(self, 
                  indicators_service=None,
                  cache_ttl_seconds: int = 300,
-                 max_evaluation_time_ms: float = 5000.0):
+                 max_evaluation_time_ms: float = 5000.0,
+                 indicator_registry: Optional[IndicatorRegistry] = None):
         """
         Initialise l'évaluateur de règles.
         
@@ -138,6 +142,7 @@ class RuleEvaluator:
             indicators_service: Service de calcul d'indicateurs
             cache_ttl_seconds: TTL du cache des indicateurs
             max_evaluation_time_ms: Temps maximum d'évaluation
+            indicator_registry: Registre d'indicateurs incrémentaux partagé
         """
         self.logger = logging.getLogger(__name__)
         
@@ -152,6 +157,9 @@ class RuleEvaluator:
         self.indicators_cache: Dict[str, Dict[str, Any]] = {}
         self.cache_timestamps: Dict[str, datetime] = {}
         
+        # États incrémentaux réutilisés d'une évaluation à l'autre
+        self.indicator_registry = indicator_registry or IndicatorRegistry()
+        
         # Métriques de performance
         self.evaluation_stats = {
             'total_evaluations': 0,
@@ -202,8 +210,11 @@ class RuleEvaluator:
             if data_quality_score < 0.5:
                 self.logger.warning(f"Qualité des données faible: {data_quality_score}")
             
-            # Préparation du cache d'indicateurs
-            await self._prepare_indicators_cache(context)
+            # Préparation du cache d'indicateurs (valeurs partagées fournies par le moteur prioritaires)
+            shared_indicators = context.indicators_cache
+            await self._prepare_indicators_cache(context, compiled_rule)
+            if shared_indicators:
+                context.indicators_cache = {**(context.indicators_cache or {}), **shared_indicators}
             
             # Évaluation des conditions d'achat
             buy_signal, buy_confidence, buy_details = await self._evaluate_conditions(
@@ -386,8 +397,15 @@ class RuleEvaluator:
         
         return signal_triggered, confidence_score, details
     
-    async def _prepare_indicators_cache(self, context: EvaluationContext) -> None:
-        """Prépare le cache des indicateurs."""
+    async def _prepare_indicators_cache(self, context: EvaluationContext,
+                                        compiled_rule: Optional[CompiledRule] = None) -> None:
+        """
+        Prépare le cache des indicateurs.
+        
+        Args:
+            context: Contexte d'évaluation
+            compiled_rule: Règle évaluée (indicateurs requis par ses conditions)
+        """
         cache_key = f"{context.symbol}_{context.timestamp.strftime('%Y%m%d_%H%M')}"
         
         # Vérification du cache existant
@@ -421,7 +439,7 @@ class RuleEvaluator:
                 context.indicators_cache = {}
         else:
             # Mode dégradé sans service d'indicateurs
-            context.indicators_cache = self._calculate_basic_indicators(context.market_data)
+            context.indicators_cache = self._calculate_streaming_indicators(context, compiled_rule)
     
     def _assess_data_quality(self, market_data: Dict[str, Any]) -> float:
         """Évalue la qualité des données de marché."""
@@ -531,42 +549,63 @@ class RuleEvaluator:
         else:
             return EvaluationStatus.FAILED
     
-    def _calculate_basic_indicators(self, market_data: Dict[str, Any]) -> Dict[str, float]:
-        """Calcule des indicateurs de base sans service externe."""
-        indicators = {}
+    def _calculate_streaming_indicators(self, context: EvaluationContext,
+                                        compiled_rule: Optional[CompiledRule] = None) -> Dict[str, Any]:
+        """
+        Calcule les indicateurs sans service externe, de façon incrémentale.
         
-        prices = market_data.get('prices', {}).get('1d', [])
-        if prices and len(prices) >= 14:
-            # RSI simplifié
-            gains = []
-            losses = []
-            
-            for i in range(1, min(15, len(prices))):
-                change = prices[i]['close'] - prices[i-1]['close']
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            if gains and losses:
-                avg_gain = sum(gains) / len(gains)
-                avg_loss = sum(losses) / len(losses)
-                
-                if avg_loss > 0:
-                    rs = avg_gain / avg_loss
-                    rsi = 100 - (100 / (1 + rs))
-                    indicators['rsi'] = rsi
-            
-            # SMA 20
-            if len(prices) >= 20:
-                sma_20 = sum(p['close'] for p in prices[-20:]) / 20
-                indicators['sma_20'] = sma_20
+        Les états du registre sont conservés entre les évaluations: seules
+        les barres nouvelles (ou la barre en cours) sont intégrées.
+        
+        Args:
+            context: Contexte d'évaluation
+            compiled_rule: Règle évaluée
             
-            # Prix actuel
-            indicators['price'] = prices[-1]['close']
-            indicators['volume'] = prices[-1].get('volume', 0)
+        Returns:
+            Valeurs par nom d'indicateur et par clé paramétrée
+        """
+        indicators = {}
+        prices = context.market_data.get('prices', {})
+        shared = context.indicators_cache or {}
+        
+        # Indicateurs de base puis indicateurs requis par les conditions
+        required = [('rsi', '1d', {'period': 14}), ('sma', '1d', {'period': 20})]
+        if compiled_rule:
+            for condition in compiled_rule.buy_conditions + compiled_rule.sell_conditions:
+                metadata = condition.metadata
+                name = metadata.get('indicator', '')
+                if self.indicator_registry.supports(name):
+                    # Indicateurs déjà calculés par le graphe du moteur ignorés
+                    params = metadata.get('parameters') or {}
+                    timeframe = metadata.get('timeframe', '1d')
+                    if indicator_key(name, timeframe, params) not in shared:
+                        required.append((name, timeframe, params))
+        
+        for name, timeframe, params in required:
+            if self.indicator_registry.supports(name):
+                self.indicator_registry.get(context.symbol, timeframe, name, params)
+        
+        for timeframe in {timeframe for _, timeframe, _ in required}:
+            bars = prices.get(timeframe, [])
+            if bars:
+                indicators.update(self.indicator_registry.update(context.symbol, timeframe, bars))
+        
+        for name, timeframe, params in required:
+            key = indicator_key(name, timeframe, params)
+            if key in indicators:
+                indicators[key] = condition_value(name, indicators[key])
+                indicators.setdefault(name, indicators[key])
+        
+        # Nom historique de la SMA 20
+        sma_20 = indicators.get(indicator_key('sma', '1d', {'period': 20}))
+        if sma_20 is not None:
+            indicators['sma_20'] = sma_20
+        
+        daily = prices.get('1d', [])
+        if daily:
+            last_bar = daily[-1]
+            indicators['price'] = last_bar['close']
+            indicators['volume'] = last_bar.get('volume', 0)
         
         return indicators
     
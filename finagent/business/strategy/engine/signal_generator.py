@@ -114,13 +114,18 @@ class TradingSignal:
         else:
             return SignalPriority.LOW
     
-    def is_valid(self) -> bool:
-        """Vérifie si le signal est encore valide."""
+    def is_valid(self, now: Optional[datetime] = None) -> bool:
+        """
+        Vérifie si le signal est encore valide.
+        
+        Args:
+            now: Heure de référence (horloge simulée en backtest, heure courante sinon)
+        """
         if self.validity_duration is None:
             return True
         
         expiry_time = self.timestamp + self.validity_duration
-        return datetime.now() < expiry_time
+        return (now or datetime.now()) < expiry_time
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit en dictionnaire."""
@@ -7,6 +7,7 @@ coordonne l'évaluation des règles et la génération de signaux.
 
 import logging
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, AsyncGenerator
 from dataclasses import dataclass
@@ -16,10 +17,50 @@ from enum import Enum
 from ..models.strategy_models import Strategy
 from ..parser.rule_compiler import CompiledRule, RuleCompiler
 from .rule_evaluator import RuleEvaluator, EvaluationContext
+from .indicator_graph import IndicatorGraph
 from .signal_generator import SignalGenerator, TradingSignal
 
 logger = logging.getLogger(__name__)
 
+# État des processus d'évaluation (un compilateur et un évaluateur par processus)
+_worker_rules: Dict[str, CompiledRule] = {}
+_worker_compiler: Optional[RuleCompiler] = None
+_worker_evaluator: Optional[RuleEvaluator] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _evaluate_in_process(rule_version: str, rule_id: str, rules: Dict[str, Any],
+                         context: EvaluationContext):
+    """
+    Évalue une règle dans un processus du pool.
+    
+    Les règles compilées (closures) ne sont pas transférables entre
+    processus: elles sont recompilées une fois par processus et par
+    version de stratégie.
+    
+    Args:
+        rule_version: Version de la stratégie (clé du cache de compilation)
+        rule_id: Identifiant de la règle
+        rules: Règles de la stratégie
+        context: Contexte d'évaluation
+        
+    Returns:
+        EvaluationResult: Résultat de l'évaluation
+    """
+    global _worker_compiler, _worker_evaluator, _worker_loop
+    
+    if _worker_evaluator is None:
+        _worker_compiler = RuleCompiler()
+        _worker_evaluator = RuleEvaluator()
+        _worker_loop = asyncio.new_event_loop()
+    
+    compiled_rule = _worker_rules.get(rule_version)
+    if compiled_rule is None:
+        compiled_rule = _worker_compiler.compile(rules, rule_id)
+        _worker_rules[rule_version] = compiled_rule
+    
+    return _worker_loop.run_until_complete(_worker_evaluator.evaluate(compiled_rule, context))
+
 
 class EngineState(str, Enum):
     """États du moteur de stratégie."""
@@ -51,6 +92,7 @@ class ExecutionContext:
     market_conditions: Optional[Dict[str, Any]] = None
     execution_config: Optional[Dict[str, Any]] = None
     risk_limits: Optional[Dict[str, Any]] = None
+    indicators: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -102,7 +144,9 @@ class StrategyEngine:
                  data_provider=None,
                  portfolio_manager=None,
                  risk_manager=None,
-                 execution_mode: ExecutionMode = ExecutionMode.SIMULATION):
+                 execution_mode: ExecutionMode = ExecutionMode.SIMULATION,
+                 max_parallelism: int = 1,
+                 process_workers: int = 0):
         """
         Initialise le moteur de stratégie.
         
@@ -111,6 +155,8 @@ class StrategyEngine:
             portfolio_manager: Gestionnaire de portefeuille
             risk_manager: Gestionnaire de risques
             execution_mode: Mode d'exécution
+            max_parallelism: Nombre max d'exécutions symbole × stratégie simultanées
+            process_workers: Processus dédiés à l'évaluation des règles (0 = dans la boucle)
         """
         self.logger = logging.getLogger(__name__)
         
@@ -128,6 +174,11 @@ class StrategyEngine:
         self.rule_evaluator = RuleEvaluator()
         self.signal_generator = SignalGenerator()
         
+        # Indicateurs partagés entre stratégies (calculés une fois par symbole)
+        self.indicator_graph = IndicatorGraph(
+            self.rule_compiler, self.rule_evaluator.indicator_registry
+        )
+        
         # Stratégies actives
         self.active_strategies: Dict[str, Dict[str, Any]] = {}
         self.compiled_rules: Dict[str, CompiledRule] = {}
@@ -145,6 +196,11 @@ class StrategyEngine:
         # Configuration des timeouts
         self.execution_timeout = 30.0  # secondes
         self.evaluation_timeout = 10.0  # secondes
+        
+        # Parallélisme de execute_all_strategies
+        self.max_parallelism = max(1, max_parallelism)
+        self.process_workers = process_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
     
     async def initialize(self) -> None:
         """Initialise le moteur de stratégie."""
@@ -188,6 +244,8 @@ class StrategyEngine:
             # Sauvegarde des métriques
             await self._save_performance_metrics()
             
+            self._shutdown_process_pool()
+            
             self.state = EngineState.STOPPED
             self.logger.info("Moteur de stratégie arrêté")
             
@@ -218,6 +276,7 @@ class StrategyEngine:
             # Compilation des règles
             compiled_rule = self.rule_compiler.compile(strategy.rules, strategy_id)
             self.compiled_rules[strategy_id] = compiled_rule
+            self.indicator_graph.add_strategy(strategy_id, compiled_rule)
             
             # Stockage de la stratégie
             self.active_strategies[strategy_id] = {
@@ -263,6 +322,7 @@ class StrategyEngine:
             # Suppression des références
             del self.active_strategies[strategy_id]
             del self.compiled_rules[strategy_id]
+            self.indicator_graph.remove_strategy(strategy_id)
             
             # Conservation des métriques pour historique
             # (ne supprime pas performance_metrics)
@@ -317,17 +377,25 @@ class StrategyEngine:
                         error=f"Exécution bloquée par gestion des risques: {risk_check['reason']}"
                     )
             
+            # Indicateurs du graphe (déjà calculés pour le cycle si fournis)
+            indicators = execution_context.indicators
+            if indicators is None:
+                indicators = self.indicator_graph.compute(
+                    execution_context.symbol, execution_context.market_data, [strategy_id]
+                )
+            
             # Évaluation des règles
             evaluation_context = EvaluationContext(
                 strategy_id=strategy_id,
                 symbol=execution_context.symbol,
                 market_data=execution_context.market_data,
                 portfolio_state=execution_context.portfolio_state,
-                timestamp=execution_context.timestamp
+                timestamp=execution_context.timestamp,
+                indicators_cache=indicators
             )
             
             evaluation_result = await asyncio.wait_for(
-                self.rule_evaluator.evaluate(compiled_rule, evaluation_context),
+                self._evaluate_rule(strategy_id, compiled_rule, evaluation_context),
                 timeout=self.evaluation_timeout
             )
             
@@ -347,6 +415,14 @@ class StrategyEngine:
             # Mise à jour des statistiques
             self._update_execution_stats(strategy_id, execution_time, True)
             
+            # Rejeu historique: pas de sérialisation (pydantic) à chaque barre
+            metadata = None
+            if execution_context.execution_mode != ExecutionMode.BACKTEST:
+                metadata = {
+                    'evaluation_result': evaluation_result.dict() if hasattr(evaluation_result, 'dict') else {},
+                    'strategy_config': strategy.strategy.dict()
+                }
+            
             result = ExecutionResult(
                 strategy_id=strategy_id,
                 symbol=execution_context.symbol,
@@ -354,10 +430,7 @@ class StrategyEngine:
                 signals=signals,
                 performance_metrics=performance_metrics,
                 execution_time_ms=execution_time,
-                metadata={
-                    'evaluation_result': evaluation_result.dict() if hasattr(evaluation_result, 'dict') else {},
-                    'strategy_config': strategy.strategy.dict()
-                }
+                metadata=metadata
             )
             
             self.logger.debug(f"Stratégie {strategy_id} exécutée en {execution_time:.2f}ms")
@@ -377,47 +450,161 @@ class StrategyEngine:
             raise EngineError(error_msg, strategy_id, "EXECUTION_FAILED")
     
     async def execute_all_strategies(self, market_data: Dict[str, Any], 
-                                   symbols: List[str]) -> List[ExecutionResult]:
+                                   symbols: List[str],
+                                   max_parallelism: Optional[int] = None) -> List[ExecutionResult]:
         """
         Exécute toutes les stratégies actives pour les symboles donnés.
         
+        Le contexte de chaque symbole (état du portefeuille, indicateurs
+        partagés) est construit une seule fois, puis les couples
+        symbole × stratégie sont exécutés avec un parallélisme borné.
+        Chaque exécution est limitée par ``execution_timeout``.
+        
         Args:
             market_data: Données de marché
             symbols: Liste des symboles à traiter
+            max_parallelism: Parallélisme de ce cycle (configuration du moteur par défaut)
             
         Returns:
-            List[ExecutionResult]: Résultats d'exécution
+            List[ExecutionResult]: Résultats d'exécution, ordonnés par symbole
+            puis par stratégie quel que soit l'ordre de terminaison
         """
-        results = []
-        
-        for symbol in symbols:
-            for strategy_id in self.active_strategies.keys():
-                try:
-                    # Vérification de l'univers de la stratégie
-                    strategy = self.active_strategies[strategy_id]['strategy']
-                    if not self._symbol_in_strategy_universe(symbol, strategy):
-                        continue
-                    
-                    # Contexte d'exécution
-                    execution_context = ExecutionContext(
-                        strategy_id=strategy_id,
-                        symbol=symbol,
-                        timestamp=datetime.now(),
-                        market_data=market_data.get(symbol, {}),
-                        portfolio_state=await self._get_portfolio_state(symbol) if self.portfolio_manager else {},
-                        execution_mode=self.execution_mode,
-                        metadata={}
-                    )
-                    
-                    # Exécution
-                    result = await self.execute_strategy(strategy_id, execution_context)
-                    results.append(result)
-                    
-                except Exception as e:
-                    self.logger.error(f"Erreur lors de l'exécution de {strategy_id} pour {symbol}: {e}")
-                    # Continue avec les autres stratégies
+        semaphore = asyncio.Semaphore(max(1, max_parallelism or self.max_parallelism))
+        
+        async def execute_symbol(symbol: str) -> List[Optional[ExecutionResult]]:
+            # Stratégies concernées par le symbole
+            strategy_ids = [
+                strategy_id for strategy_id, strategy_data in self.active_strategies.items()
+                if self._symbol_in_strategy_universe(symbol, strategy_data['strategy'])
+            ]
+            if not strategy_ids:
+                return []
+            
+            async with semaphore:
+                symbol_context = await self._build_symbol_context(
+                    symbol, market_data.get(symbol, {}), strategy_ids
+                )
+            
+            return await asyncio.gather(*[
+                self._execute_with_timeout(strategy_id, symbol_context, semaphore)
+                for strategy_id in strategy_ids
+            ])
+        
+        per_symbol = await asyncio.gather(*[execute_symbol(symbol) for symbol in symbols])
+        
+        return [result for results in per_symbol for result in results if result is not None]
+    
+    async def _build_symbol_context(self, symbol: str, symbol_data: Dict[str, Any],
+                                    strategy_ids: List[str]) -> Dict[str, Any]:
+        """
+        Construit le contexte commun aux stratégies d'un symbole.
+        
+        Args:
+            symbol: Symbole financier
+            symbol_data: Données de marché du symbole
+            strategy_ids: Stratégies exécutées sur le symbole
+            
+        Returns:
+            Dict: Données, état du portefeuille et indicateurs partagés
+        """
+        portfolio_state = await self._get_portfolio_state(symbol) if self.portfolio_manager else {}
+        
+        # Chaque indicateur commun n'est calculé qu'une fois pour le symbole
+        try:
+            indicators = self.indicator_graph.compute(symbol, symbol_data, strategy_ids)
+        except Exception as e:
+            self.logger.warning(f"Erreur calcul des indicateurs partagés pour {symbol}: {e}")
+            indicators = None
         
-        return results
+        return {
+            'symbol': symbol,
+            'market_data': symbol_data,
+            'portfolio_state': portfolio_state,
+            'indicators': indicators
+        }
+    
+    async def _execute_with_timeout(self, strategy_id: str, symbol_context: Dict[str, Any],
+                                    semaphore: asyncio.Semaphore) -> Optional[ExecutionResult]:
+        """
+        Exécute une stratégie sur un symbole sous le sémaphore du cycle.
+        
+        Args:
+            strategy_id: Identifiant de la stratégie
+            symbol_context: Contexte commun du symbole
+            semaphore: Sémaphore bornant le parallélisme
+            
+        Returns:
+            Optional[ExecutionResult]: Résultat, None en cas d'erreur ou de timeout
+        """
+        symbol = symbol_context['symbol']
+        
+        async with semaphore:
+            try:
+                execution_context = ExecutionContext(
+                    strategy_id=strategy_id,
+                    symbol=symbol,
+                    timestamp=datetime.now(),
+                    market_data=symbol_context['market_data'],
+                    portfolio_state=symbol_context['portfolio_state'],
+                    execution_mode=self.execution_mode,
+                    metadata={},
+                    indicators=symbol_context['indicators']
+                )
+                
+                return await asyncio.wait_for(
+                    self.execute_strategy(strategy_id, execution_context),
+                    timeout=self.execution_timeout
+                )
+                
+            except asyncio.TimeoutError:
+                self._update_execution_stats(strategy_id, self.execution_timeout * 1000, False)
+                self.logger.error(
+                    f"Timeout lors de l'exécution de {strategy_id} pour {symbol} (>{self.execution_timeout}s)"
+                )
+                
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'exécution de {strategy_id} pour {symbol}: {e}")
+                # Continue avec les autres stratégies
+            
+            return None
+    
+    async def _evaluate_rule(self, strategy_id: str, compiled_rule: CompiledRule,
+                             evaluation_context: EvaluationContext):
+        """
+        Évalue une règle dans la boucle ou dans le pool de processus.
+        
+        Args:
+            strategy_id: Identifiant de la stratégie
+            compiled_rule: Règle compilée
+            evaluation_context: Contexte d'évaluation
+            
+        Returns:
+            EvaluationResult: Résultat de l'évaluation
+        """
+        if self.process_workers <= 0:
+            return await self.rule_evaluator.evaluate(compiled_rule, evaluation_context)
+        
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        
+        strategy_data = self.active_strategies[strategy_id]
+        rule_version = f"{strategy_id}:{strategy_data['loaded_at'].timestamp()}"
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._process_pool,
+            _evaluate_in_process,
+            rule_version,
+            compiled_rule.rule_id,
+            strategy_data['strategy'].rules,
+            evaluation_context
+        )
+    
+    def _shutdown_process_pool(self) -> None:
+        """Arrête le pool de processus d'évaluation."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
     
     async def get_engine_status(self) -> Dict[str, Any]:
         """Retourne le statut du moteur."""
@@ -428,6 +615,7 @@ class StrategyEngine:
             'active_strategies': list(self.active_strategies.keys()),
             'execution_stats': self.execution_stats,
             'performance_summary': self._get_performance_summary(),
+            'indicator_graph': self.indicator_graph.get_stats(),
             'uptime_seconds': self._get_uptime_seconds(),
             'memory_usage': self._get_memory_usage()
         }
@@ -575,6 +763,8 @@ class StrategyEngine:
             if hasattr(self.signal_generator, 'cleanup'):
                 await self.signal_generator.cleanup()
             
+            self._shutdown_process_pool()
+            
             # Déconnexion du data provider
             if self.data_provider and hasattr(self.data_provider, 'disconnect'):
                 await self.data_provider.disconnect()
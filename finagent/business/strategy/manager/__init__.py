@@ -14,6 +14,14 @@ from .strategy_manager import (
     StrategyManagerError
 )
 
+from .scheduler import (
+    StrategyScheduler,
+    ScheduleConfig,
+    ScheduleEntry,
+    MissedRunPolicy,
+    TriggerType
+)
+
 from .portfolio_allocator import (
     PortfolioAllocator,
     AllocationResult,
@@ -44,6 +52,13 @@ __all__ = [
     'ManagerStatus',
     'StrategyManagerError',
     
+    # Scheduler
+    'StrategyScheduler',
+    'ScheduleConfig',
+    'ScheduleEntry',
+    'MissedRunPolicy',
+    'TriggerType',
+    
     # Portfolio Allocator
     'PortfolioAllocator',
     'AllocationResult',
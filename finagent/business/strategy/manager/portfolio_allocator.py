@@ -8,7 +8,7 @@ contraintes de risque.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from decimal import Decimal
@@ -173,7 +173,8 @@ class PortfolioAllocator:
                  max_sector_weight: float = 0.25,    # 25% max par secteur
                  min_cash_percentage: float = 0.05,  # 5% min en cash
                  max_strategy_weight: float = 0.30,  # 30% max par stratégie
-                 rebalance_threshold: float = 0.05): # Seuil de rééquilibrage 5%
+                 rebalance_threshold: float = 0.05,  # Seuil de rééquilibrage 5%
+                 clock: Optional[Callable[[], datetime]] = None):
         """
         Initialise l'allocateur de portefeuille.
         
@@ -184,6 +185,7 @@ class PortfolioAllocator:
             min_cash_percentage: Pourcentage minimum en cash
             max_strategy_weight: Poids maximum par stratégie
             rebalance_threshold: Seuil de rééquilibrage
+            clock: Horloge de référence (horloge simulée en backtest)
         """
         self.logger = logging.getLogger(__name__)
         
@@ -194,6 +196,7 @@ class PortfolioAllocator:
         self.min_cash_percentage = min_cash_percentage
         self.max_strategy_weight = max_strategy_weight
         self.rebalance_threshold = rebalance_threshold
+        self.clock = clock or datetime.now
         
         # Contraintes configurables
         self.constraints: List[AllocationConstraint] = []
@@ -309,7 +312,7 @@ class PortfolioAllocator:
                     'allocation_method': self.default_allocation_method.value,
                     'portfolio_value': portfolio.total_value,
                     'cash_percentage': portfolio.cash_percentage,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': self.clock().isoformat()
                 }
             )
             
@@ -402,7 +405,7 @@ class PortfolioAllocator:
             max_additional_position = max(0, self.max_position_weight - current_position_weight)
             
             # Limite par secteur
-            sector = self._get_symbol_sector(symbol)
+            sector = self.get_symbol_sector(symbol)
             current_sector_weight = portfolio.sector_exposures.get(sector, 0.0)
             max_additional_sector = max(0, self.max_sector_weight - current_sector_weight)
             
@@ -469,6 +472,10 @@ class PortfolioAllocator:
             ]
         }
     
+    def get_symbol_sector(self, symbol: str) -> str:
+        """Retourne le secteur d'un symbole ('Unknown' s'il n'est pas référencé)."""
+        return self._sector_mappings.get(symbol, 'Unknown')
+    
     # Méthodes privées d'implémentation
     
     def _setup_default_constraints(self) -> None:
@@ -535,7 +542,7 @@ class PortfolioAllocator:
             allocations=portfolio_state.get('allocations', {}),
             sector_exposures=portfolio_state.get('sector_exposures', {}),
             strategy_allocations=portfolio_state.get('strategy_allocations', {}),
-            last_update=datetime.now()
+            last_update=self.clock()
         )
     
     def _check_preliminary_constraints(self, signal: TradingSignal, portfolio: PortfolioState) -> Dict[str, Any]:
@@ -548,7 +555,7 @@ class PortfolioAllocator:
             }
         
         # Vérification de la validité du signal
-        if not signal.is_valid():
+        if not signal.is_valid(self.clock()):
             return {
                 'passed': False,
                 'reason': "Signal expiré ou invalide"
@@ -681,7 +688,7 @@ class PortfolioAllocator:
             return {'violated': new_weight > constraint.value}
         
         elif constraint.constraint_type == "max_sector_weight":
-            sector = self._get_symbol_sector(signal.symbol)
+            sector = self.get_symbol_sector(signal.symbol)
             current_sector_weight = portfolio.sector_exposures.get(sector, 0.0)
             new_sector_weight = current_sector_weight + allocation_percentage
             return {'violated': new_sector_weight > constraint.value}
@@ -711,7 +718,7 @@ class PortfolioAllocator:
                 adjusted_amount = min(adjusted_amount, max_amount)
             
             elif violation == "max_sector_weight":
-                sector = self._get_symbol_sector(signal.symbol)
+                sector = self.get_symbol_sector(signal.symbol)
                 current_sector_weight = portfolio.sector_exposures.get(sector, 0.0)
                 max_additional = max(0, self.max_sector_weight - current_sector_weight)
                 max_amount = max_additional * portfolio.total_value
@@ -816,10 +823,6 @@ class PortfolioAllocator:
         else:
             return 1
     
-    def _get_symbol_sector(self, symbol: str) -> str:
-        """Retourne le secteur d'un symbole."""
-        return self._sector_mappings.get(symbol, 'Unknown')
-    
     async def _get_symbol_volatility(self, symbol: str) -> float:
         """Récupère la volatilité d'un symbole."""
         # Vérification du cache
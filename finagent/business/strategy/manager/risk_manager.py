@@ -5,15 +5,19 @@ Ce module évalue et gère les risques associés aux stratégies et signaux
 de trading, en appliquant des limites et des contrôles de risque.
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from decimal import Decimal
 import math
 import numpy as np
 
+from finagent.business.risk.covariance_model import CovarianceRiskModel
+from finagent.business.risk.scenario_engine import ScenarioEngine, ScenarioResult
+from finagent.data.models.price_panel import PricePanel
 from ..models.strategy_models import Strategy, RiskLevel
 from ..engine.signal_generator import TradingSignal, SignalType
 
@@ -170,7 +174,12 @@ class StrategyRiskManager:
                  max_correlation: float = 0.70,         # Corrélation max 70%
                  max_concentration: float = 0.20,       # Concentration max 20%
                  confidence_level: float = 0.95,        # Niveau de confiance VaR
-                 lookback_days: int = 252):             # Période de calcul 1 an
+                 lookback_days: int = 252,              # Période de calcul 1 an
+                 covariance_model: Optional[CovarianceRiskModel] = None,
+                 scenario_engine: Optional[ScenarioEngine] = None,
+                 benchmark_symbol: str = "SPY",
+                 risk_free_rate: float = 0.02,
+                 bar_timeframe: str = "1d"):
         """
         Initialise le gestionnaire de risques.
         
@@ -182,6 +191,11 @@ class StrategyRiskManager:
             max_concentration: Concentration maximum autorisée
             confidence_level: Niveau de confiance pour VaR
             lookback_days: Période de calcul historique
+            covariance_model: Modèle de covariance de l'univers (créé si absent)
+            scenario_engine: Moteur de simulation de la VaR de portefeuille
+            benchmark_symbol: Indice de référence du beta
+            risk_free_rate: Taux sans risque annuel (ratio de Sharpe)
+            bar_timeframe: Timeframe des barres alimentant le modèle de covariance
         """
         self.logger = logging.getLogger(__name__)
         
@@ -193,13 +207,19 @@ class StrategyRiskManager:
         self.max_concentration = max_concentration
         self.confidence_level = confidence_level
         self.lookback_days = lookback_days
+        self.benchmark_symbol = benchmark_symbol
+        self.risk_free_rate = risk_free_rate
+        self.bar_timeframe = bar_timeframe
+        
+        # Covariance des rendements, mise à jour à chaque barre
+        self.covariance_model = covariance_model or CovarianceRiskModel(history_size=lookback_days)
+        self.scenario_engine = scenario_engine or ScenarioEngine()
         
         # Limites de risque configurables
         self.risk_limits: Dict[str, RiskLimit] = {}
         self._setup_default_limits()
         
         # Cache des données de risque
-        self._volatility_cache: Dict[str, Tuple[float, datetime]] = {}
         self._correlation_cache: Dict[Tuple[str, str], Tuple[float, datetime]] = {}
         self._var_cache: Dict[str, Tuple[float, datetime]] = {}
         
@@ -418,6 +438,89 @@ class StrategyRiskManager:
             self.logger.error(f"Erreur calcul risque portefeuille: {e}")
             raise RiskManagerError(f"Erreur calcul risque portefeuille: {e}", "portfolio", "PORTFOLIO_RISK_CALC_FAILED")
     
+    def simulate_portfolio_risk(self,
+                                portfolio_state: Dict[str, Any],
+                                method: str = "monte_carlo",
+                                horizon: int = 1,
+                                scenarios: Optional[int] = None,
+                                confidence_levels: Optional[List[float]] = None) -> ScenarioResult:
+        """
+        VaR et CVaR du portefeuille par simulation sur le modèle de covariance.
+        
+        Args:
+            portfolio_state: État du portefeuille (montant par symbole dans ``positions``)
+            method: ``monte_carlo`` ou ``historical``
+            horizon: Horizon en périodes
+            scenarios: Nombre de scénarios (défaut du moteur sinon)
+            confidence_levels: Niveaux de confiance (défaut du moteur sinon)
+            
+        Returns:
+            ScenarioResult: VaR et CVaR (pertes en devise) par niveau de confiance
+        """
+        positions = portfolio_state.get('positions', {})
+        if not positions:
+            raise RiskManagerError("Portefeuille sans position", "portfolio", "EMPTY_PORTFOLIO")
+        return self.scenario_engine.simulate(
+            self.covariance_model, positions, method, horizon, scenarios, confidence_levels
+        )
+    
+    def load_price_history(self, panel: PricePanel) -> None:
+        """
+        Initialise le modèle de covariance sur un historique de prix.
+        
+        Args:
+            panel: Prix alignés de l'univers (symboles × dates)
+        """
+        self.covariance_model.fit(panel)
+    
+    async def load_history(self, history_service: Any, symbols: Sequence[str], period: str = "1y") -> int:
+        """
+        Ajuste le modèle de covariance sur l'historique d'un univers.
+        
+        L'indice de référence (beta) est ajouté à l'univers; les symboles
+        dont l'historique est indisponible sont ignorés.
+        
+        Args:
+            history_service: Service d'historique (``get_series``)
+            symbols: Symboles de l'univers
+            period: Période d'historique chargée
+            
+        Returns:
+            int: Nombre de symboles couverts par l'ajustement
+        """
+        symbols = list(dict.fromkeys([*(s.upper() for s in symbols), self.benchmark_symbol.upper()]))
+        results = await asyncio.gather(
+            *(history_service.get_series(symbol, period, self.bar_timeframe) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        histories = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Historique indisponible pour le modèle de risque ({symbol}): {result}")
+            elif result is not None and len(result):
+                histories[symbol] = result
+        
+        if histories:
+            self.load_price_history(PricePanel.from_series(histories))
+        return len(histories)
+    
+    def on_bar(self, symbol: str, timeframe: str, bar: Dict[str, Any]) -> None:
+        """
+        Met à jour le modèle de covariance avec une nouvelle barre.
+        
+        Args:
+            symbol: Symbole de la barre
+            timeframe: Timeframe de la barre (les autres timeframes sont ignorées)
+            bar: Barre (``timestamp`` et ``close``)
+        """
+        if timeframe != self.bar_timeframe or not bar:
+            return
+        try:
+            self.covariance_model.observe(symbol, bar['timestamp'], float(bar['close']))
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning(f"Barre ignorée par le modèle de covariance ({symbol}): {e}")
+    
     def add_risk_limit(self, limit: RiskLimit) -> None:
         """Ajoute une limite de risque."""
         self.risk_limits[limit.limit_type] = limit
@@ -444,10 +547,10 @@ class StrategyRiskManager:
                 for limit_type, limit in self.risk_limits.items()
             },
             'cache_stats': {
-                'volatility_cache_size': len(self._volatility_cache),
                 'correlation_cache_size': len(self._correlation_cache),
                 'var_cache_size': len(self._var_cache)
-            }
+            },
+            'covariance_model': self.covariance_model.get_stats()
         }
     
     # Méthodes privées d'implémentation
@@ -794,19 +897,32 @@ class StrategyRiskManager:
     
     async def _calculate_signal_correlation_risk(self, signal: TradingSignal, portfolio_state: Dict[str, Any]) -> float:
         """Calcule le risque de corrélation d'un signal."""
-        # Corrélation avec les positions existantes
-        # Implémentation simplifiée
-        return 0.60  # 60% de corrélation par défaut
+        # Corrélation avec le portefeuille existant (une ligne de la covariance)
+        positions = portfolio_state.get('positions', {})
+        if not positions:
+            return 0.0
+        
+        if self._is_modeled([signal.symbol, *positions]):
+            correlation = self.covariance_model.correlation_with(signal.symbol, positions)
+            if correlation is not None:
+                return max(0.0, correlation)
+        
+        return 0.60  # 60% de corrélation par défaut (symboles sans historique)
+    
+    def _is_modeled(self, symbols: Any) -> bool:
+        """Vrai si le modèle de covariance couvre tous les symboles."""
+        return self.covariance_model.is_covered(symbols)
     
     async def _calculate_portfolio_var(self, positions: Dict[str, float], total_value: float, days: int) -> float:
         """Calcule le VaR du portefeuille."""
-        # Implémentation simplifiée du calcul VaR
-        # En pratique, utiliserait des données historiques ou Monte Carlo
-        
         if not positions or total_value <= 0:
             return 0.0
         
-        # VaR basé sur la volatilité moyenne et la diversification
+        if self._is_modeled(positions):
+            # VaR paramétrique sur la covariance des positions
+            return self.covariance_model.value_at_risk(positions, self.confidence_level, days)
+        
+        # Sans historique: volatilité moyenne et diversification supposées
         avg_volatility = 0.20  # 20% de volatilité moyenne
         diversification_factor = 0.8  # Réduction due à la diversification
         time_factor = math.sqrt(days / 252)  # Ajustement temporel
@@ -817,16 +933,23 @@ class StrategyRiskManager:
     
     async def _calculate_expected_shortfall(self, positions: Dict[str, float], total_value: float) -> float:
         """Calcule l'Expected Shortfall."""
+        if positions and total_value > 0 and self._is_modeled(positions):
+            return self.covariance_model.expected_shortfall(positions, self.confidence_level)
+        
         var_1d = await self._calculate_portfolio_var(positions, total_value, 1)
         # ES typiquement 1.3x le VaR pour une distribution normale
         return var_1d * 1.3
     
     async def _calculate_portfolio_volatility(self, positions: Dict[str, float], total_value: float) -> float:
         """Calcule la volatilité du portefeuille."""
-        # Implémentation simplifiée
-        if not positions:
+        if not positions or total_value <= 0:
             return 0.0
         
+        if self._is_modeled(positions):
+            # Volatilité annualisée: sqrt(xᵀΣx) rapportée à la valeur du portefeuille
+            daily = self.covariance_model.portfolio_volatility(positions)
+            return daily / total_value * math.sqrt(self.covariance_model.periods_per_year)
+        
         # Volatilité moyenne pondérée
         weighted_volatility = 0.0
         for symbol, value in positions.items():
@@ -839,22 +962,37 @@ class StrategyRiskManager:
     
     async def _calculate_max_drawdown(self, positions: Dict[str, float]) -> float:
         """Calcule le drawdown maximum."""
-        # Implémentation simplifiée basée sur l'historique
+        if positions and self._is_modeled(positions):
+            # Pondérations actuelles rejouées sur l'historique des rendements
+            total = sum(abs(value) for value in positions.values())
+            drawdown = self.covariance_model.max_drawdown(positions, total)
+            if drawdown is not None:
+                return drawdown
         return 0.18  # 18% par défaut
     
     async def _calculate_sharpe_ratio(self, positions: Dict[str, float], total_value: float) -> float:
         """Calcule le ratio de Sharpe."""
-        # Implémentation simplifiée
+        if positions and total_value > 0 and self._is_modeled(positions):
+            volatility = await self._calculate_portfolio_volatility(positions, total_value)
+            if volatility > 0:
+                expected_return = self.covariance_model.expected_return(positions, total_value)
+                return (expected_return - self.risk_free_rate) / volatility
         return 1.2  # Ratio de Sharpe par défaut
     
     async def _calculate_portfolio_beta(self, positions: Dict[str, float], total_value: float) -> float:
         """Calcule le beta du portefeuille."""
-        # Beta par rapport au marché
+        # Beta par rapport à l'indice de référence
+        if positions and self._is_modeled(positions):
+            beta = self.covariance_model.beta(positions, self.benchmark_symbol, total_value)
+            if beta is not None:
+                return beta
         return 1.0  # Beta neutre par défaut
     
     async def _calculate_correlation_risk(self, positions: Dict[str, float]) -> float:
         """Calcule le risque de corrélation."""
         # Corrélation moyenne entre les positions
+        if positions and self._is_modeled(positions):
+            return self.covariance_model.average_correlation(positions)
         return 0.65  # 65% de corrélation moyenne par défaut
     
     def _calculate_concentration_risk(self, positions: Dict[str, float], total_value: float) -> float:
@@ -879,26 +1017,11 @@ class StrategyRiskManager:
     
     async def _get_symbol_volatility(self, symbol: str) -> float:
         """Récupère la volatilité d'un symbole."""
-        # Vérification du cache
-        if symbol in self._volatility_cache:
-            volatility, timestamp = self._volatility_cache[symbol]
-            if datetime.now() - timestamp < timedelta(hours=1):
-                return volatility
-        
-        # Volatilités par défaut
-        default_volatilities = {
-            'AAPL': 0.25, 'GOOGL': 0.28, 'MSFT': 0.23,
-            'AMZN': 0.35, 'TSLA': 0.55, 'JPM': 0.30,
-            'BAC': 0.35, 'XOM': 0.40, 'CVX': 0.38,
-            'JNJ': 0.18, 'PFE': 0.20
-        }
-        
-        volatility = default_volatilities.get(symbol, 0.25)
-        
-        # Mise en cache
-        self._volatility_cache[symbol] = (volatility, datetime.now())
+        if self._is_modeled(symbol):
+            return float(self.covariance_model.volatility([symbol])[0])
         
-        return volatility
+        # Sans historique: volatilité par défaut du modèle
+        return self.covariance_model.default_volatility
     
     def _update_risk_stats(self, assessment: RiskAssessment) -> None:
         """Met à jour les statistiques de risque."""
@@ -0,0 +1,359 @@
+"""
+Planificateur d'exécution des stratégies.
+
+Chaque stratégie possède sa propre prochaine échéance, conservée dans un
+tas (heap) trié par date d'exécution. Une tâche de répartition attend la
+prochaine échéance et place les exécutions dues dans une file consommée
+par un nombre borné de workers. Les stratégies peuvent aussi être
+déclenchées par l'arrivée d'une nouvelle barre plutôt que par un
+intervalle fixe.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerType(str, Enum):
+    """Déclencheurs d'exécution."""
+    INTERVAL = "interval"
+    NEW_BAR = "new_bar"
+
+
+class MissedRunPolicy(str, Enum):
+    """Politique appliquée aux échéances manquées (retard d'au moins un intervalle)."""
+    SKIP = "skip"           # Échéances manquées ignorées, reprise à la prochaine
+    RUN_ONCE = "run_once"   # Une seule exécution de rattrapage
+    CATCH_UP = "catch_up"   # Une exécution par échéance manquée
+
+
+@dataclass
+class ScheduleConfig:
+    """Configuration de planification d'une stratégie."""
+    interval_seconds: float = 60.0
+    jitter_seconds: float = 0.0
+    missed_run_policy: MissedRunPolicy = MissedRunPolicy.SKIP
+    trigger: TriggerType = TriggerType.INTERVAL
+    timeframe: Optional[str] = None
+    symbols: Optional[Set[str]] = None
+
+
+@dataclass
+class ScheduleEntry:
+    """État de planification d'une stratégie."""
+    strategy_id: str
+    config: ScheduleConfig
+    slot: float = 0.0
+    version: int = 0
+    running: bool = False
+    pending: Optional[Dict[str, Any]] = None
+    queued_runs: int = 0
+    run_count: int = 0
+    missed_runs: int = 0
+    overruns: int = 0
+    last_run: Optional[float] = None
+
+
+class StrategyScheduler:
+    """
+    Planificateur à tas des exécutions de stratégies.
+
+    Les stratégies à intervalle sont replanifiées sur leur grille
+    (``slot + intervalle``) avec une gigue aléatoire optionnelle; une
+    exécution encore en cours à l'échéance suivante n'est pas dupliquée.
+    Les stratégies sur barre sont exécutées à chaque ``notify_bar``
+    correspondant, les événements reçus pendant une exécution étant
+    regroupés en une seule exécution suivante.
+    """
+
+    def __init__(self,
+                 run_callback: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+                 max_workers: int = 5):
+        """
+        Initialise le planificateur.
+
+        Args:
+            run_callback: Coroutine exécutant une stratégie (identifiant, déclencheur)
+            max_workers: Nombre maximum d'exécutions simultanées
+        """
+        self.run_callback = run_callback
+        self.max_workers = max(1, max_workers)
+
+        self._entries: Dict[str, ScheduleEntry] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = 0
+        self._version = 0
+        self._ready: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._workers: List[asyncio.Task] = []
+
+        # Statistiques
+        self.stats = {
+            'dispatched': 0,
+            'completed': 0,
+            'failed': 0,
+            'missed_runs': 0,
+            'overruns': 0,
+            'bar_events': 0
+        }
+
+    @property
+    def running(self) -> bool:
+        """Indique si le planificateur est démarré."""
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self) -> None:
+        """Démarre la tâche de répartition et les workers."""
+        if self.running:
+            return
+
+        self._ready = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        self._workers = [asyncio.create_task(self._worker_loop()) for _ in range(self.max_workers)]
+        logger.info(f"Planificateur démarré ({self.max_workers} workers)")
+
+    async def stop(self) -> None:
+        """Arrête la répartition et les workers (exécutions en cours annulées)."""
+        tasks = [self._dispatcher] + self._workers if self._dispatcher else self._workers
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        self._dispatcher = None
+        self._workers = []
+        for entry in self._entries.values():
+            entry.running = False
+        logger.info("Planificateur arrêté")
+
+    def schedule(self, strategy_id: str, config: Optional[ScheduleConfig] = None,
+                 start_delay: float = 0.0) -> ScheduleEntry:
+        """
+        Planifie (ou replanifie) une stratégie.
+
+        Args:
+            strategy_id: Identifiant de la stratégie
+            config: Configuration de planification
+            start_delay: Délai avant la première exécution (secondes)
+
+        Returns:
+            ScheduleEntry: État de planification
+        """
+        config = config or ScheduleConfig()
+        # Version globale: les entrées du tas d'une planification précédente
+        # (même retirée) ne correspondent jamais à la nouvelle
+        self._version += 1
+        entry = self._entries.get(strategy_id)
+        if entry is None:
+            entry = ScheduleEntry(strategy_id=strategy_id, config=config, version=self._version)
+            self._entries[strategy_id] = entry
+        else:
+            entry.config = config
+            entry.version = self._version
+
+        if config.trigger == TriggerType.INTERVAL:
+            entry.slot = self._now() + start_delay
+            self._push(entry)
+        return entry
+
+    def unschedule(self, strategy_id: str) -> None:
+        """
+        Retire une stratégie (les entrées du tas deviennent obsolètes).
+
+        Args:
+            strategy_id: Identifiant de la stratégie
+        """
+        entry = self._entries.pop(strategy_id, None)
+        if entry is not None:
+            entry.queued_runs = 0
+
+    def is_scheduled(self, strategy_id: str) -> bool:
+        """Indique si la stratégie est planifiée."""
+        return strategy_id in self._entries
+
+    def trigger(self, strategy_id: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Déclenche immédiatement une exécution, hors grille.
+
+        Args:
+            strategy_id: Identifiant de la stratégie
+            payload: Informations de déclenchement transmises à l'exécution
+
+        Returns:
+            bool: True si l'exécution a été placée en file ou regroupée
+        """
+        entry = self._entries.get(strategy_id)
+        if entry is None:
+            return False
+        self._enqueue(entry, payload or {'trigger': 'manual'})
+        return True
+
+    def notify_bar(self, symbol: str, timeframe: str, bar: Any = None) -> int:
+        """
+        Signale une nouvelle barre aux stratégies déclenchées par barre.
+
+        Args:
+            symbol: Symbole de la barre
+            timeframe: Timeframe de la barre
+            bar: Barre reçue (transmise à l'exécution)
+
+        Returns:
+            int: Nombre de stratégies déclenchées
+        """
+        self.stats['bar_events'] += 1
+        payload = {'trigger': TriggerType.NEW_BAR.value, 'symbol': symbol, 'timeframe': timeframe, 'bar': bar}
+
+        triggered = 0
+        for entry in list(self._entries.values()):
+            config = entry.config
+            if config.trigger != TriggerType.NEW_BAR:
+                continue
+            if config.timeframe and config.timeframe != timeframe:
+                continue
+            if config.symbols and symbol not in config.symbols:
+                continue
+            self._enqueue(entry, payload)
+            triggered += 1
+        return triggered
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du planificateur."""
+        now = self._now()
+        upcoming = [entry for entry in self._entries.values() if entry.config.trigger == TriggerType.INTERVAL]
+        return {
+            **self.stats,
+            'scheduled': len(self._entries),
+            'running': sum(1 for entry in self._entries.values() if entry.running),
+            'ready_queue': self._ready.qsize() if self._ready else 0,
+            'max_workers': self.max_workers,
+            'next_run_in_seconds': min((entry.slot - now for entry in upcoming), default=None)
+        }
+
+    def _now(self) -> float:
+        """Horloge monotone (celle de la boucle asyncio par défaut)."""
+        return time.monotonic()
+
+    def _push(self, entry: ScheduleEntry) -> None:
+        """Insère la prochaine échéance (gigue incluse) dans le tas."""
+        due = entry.slot
+        if entry.config.jitter_seconds > 0:
+            due += random.uniform(0.0, entry.config.jitter_seconds)
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, entry.strategy_id, entry.version))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _enqueue(self, entry: ScheduleEntry, payload: Dict[str, Any]) -> None:
+        """Place une exécution en file (regroupée si la stratégie tourne déjà)."""
+        if entry.running or entry.pending is not None:
+            entry.pending = payload
+            return
+        if self._ready is None:
+            entry.pending = payload
+            return
+        entry.running = True
+        self.stats['dispatched'] += 1
+        self._ready.put_nowait((entry, payload))
+
+    async def _dispatch_loop(self) -> None:
+        """Attend la prochaine échéance et répartit les exécutions dues."""
+        # Déclenchements reçus avant le démarrage
+        for entry in list(self._entries.values()):
+            if entry.pending is not None and not entry.running:
+                payload, entry.pending = entry.pending, None
+                self._enqueue(entry, payload)
+
+        while True:
+            self._wakeup.clear()
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - self._now())
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            now = self._now()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, strategy_id, version = heapq.heappop(self._heap)
+                entry = self._entries.get(strategy_id)
+                if entry is None or entry.version != version:
+                    continue  # Entrée obsolète (stratégie retirée ou replanifiée)
+                self._dispatch_due(entry, now)
+
+    def _dispatch_due(self, entry: ScheduleEntry, now: float) -> None:
+        """Applique la politique de rattrapage puis replanifie l'entrée."""
+        config = entry.config
+        interval = max(config.interval_seconds, 1e-3)
+        missed = int((now - entry.slot) // interval)
+        run = True
+
+        if missed >= 1:
+            if config.missed_run_policy == MissedRunPolicy.SKIP:
+                run = False
+                entry.missed_runs += missed + 1
+                self.stats['missed_runs'] += missed + 1
+            elif config.missed_run_policy == MissedRunPolicy.RUN_ONCE:
+                entry.missed_runs += missed
+                self.stats['missed_runs'] += missed
+
+        if run:
+            if entry.running and config.missed_run_policy == MissedRunPolicy.CATCH_UP:
+                # Échéance conservée, exécutée par le worker après l'exécution en cours
+                entry.queued_runs += 1
+            elif entry.running:
+                # Exécution précédente toujours en cours: pas de doublon
+                entry.overruns += 1
+                self.stats['overruns'] += 1
+            else:
+                self._enqueue(entry, {'trigger': TriggerType.INTERVAL.value, 'scheduled_at': entry.slot})
+
+        if config.missed_run_policy == MissedRunPolicy.CATCH_UP:
+            entry.slot += interval
+        else:
+            entry.slot += interval * (max(missed, 0) + 1)
+        self._push(entry)
+
+    async def _worker_loop(self) -> None:
+        """Exécute les stratégies dues."""
+        while True:
+            entry, payload = await self._ready.get()
+            try:
+                entry.last_run = self._now()
+                await self.run_callback(entry.strategy_id, payload)
+                entry.run_count += 1
+                self.stats['completed'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.error(f"Erreur exécution planifiée de {entry.strategy_id}: {e}")
+            finally:
+                entry.running = False
+                self._ready.task_done()
+
+            if self._entries.get(entry.strategy_id) is not entry:
+                continue
+            if entry.pending is not None:
+                # Déclenchement regroupé pendant l'exécution
+                payload, entry.pending = entry.pending, None
+                self._enqueue(entry, payload)
+            elif entry.queued_runs:
+                # Échéance de rattrapage en attente
+                entry.queued_runs -= 1
+                self._enqueue(entry, {'trigger': TriggerType.INTERVAL.value, 'catch_up': True})
@@ -24,6 +24,10 @@ from ..engine.strategy_engine import StrategyEngine, ExecutionContext, Execution
 from ..engine.signal_generator import TradingSignal, SignalType, SignalPriority
 from .portfolio_allocator import PortfolioAllocator, AllocationResult
 from .risk_manager import StrategyRiskManager, RiskAssessment
+from .scheduler import StrategyScheduler, ScheduleConfig, MissedRunPolicy, TriggerType
+from finagent.data.cache import get_cache_manager
+from finagent.data.services.history_service import IncrementalHistoryService
+from finagent.data.services.market_data_bus import MarketDataBus, MarketDataPublisher, MarketEvent, MarketEventType
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,7 @@ class StrategyInstance:
     performance: Optional[StrategyPerformance] = None
     active_signals: List[TradingSignal] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    schedule: Optional[ScheduleConfig] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit en dictionnaire."""
@@ -130,7 +135,8 @@ class StrategyManager:
                  risk_service=None,
                  max_concurrent_strategies: int = 10,
                  execution_interval_seconds: int = 60,
-                 enable_auto_allocation: bool = True):
+                 enable_auto_allocation: bool = True,
+                 market_data_bus: Optional[MarketDataBus] = None):
         """
         Initialise le gestionnaire de stratégies.
         
@@ -143,6 +149,7 @@ class StrategyManager:
             max_concurrent_strategies: Nombre max de stratégies simultanées
             execution_interval_seconds: Intervalle d'exécution en secondes
             enable_auto_allocation: Active l'allocation automatique
+            market_data_bus: Bus de données de marché (barres et cotations publiées)
         """
         self.logger = logging.getLogger(__name__)
         
@@ -157,6 +164,9 @@ class StrategyManager:
         self.execution_service = execution_service
         self.portfolio_service = portfolio_service
         self.risk_service = risk_service
+        self.market_data_bus = market_data_bus or MarketDataBus()
+        self.market_data_publisher: Optional[MarketDataPublisher] = None
+        self._bar_subscription = None
         
         # Composants internes
         self.yaml_parser = StrategyYAMLParser()
@@ -167,11 +177,9 @@ class StrategyManager:
         # État du gestionnaire
         self.status = ManagerStatus.INACTIVE
         self.strategy_instances: Dict[str, StrategyInstance] = {}
-        self.execution_queue: asyncio.Queue = asyncio.Queue()
         self.signal_queue: asyncio.Queue = asyncio.Queue()
         
         # Tâches en arrière-plan
-        self._execution_task: Optional[asyncio.Task] = None
         self._signal_processing_task: Optional[asyncio.Task] = None
         self._monitoring_task: Optional[asyncio.Task] = None
         
@@ -184,9 +192,17 @@ class StrategyManager:
             'batch_size': 5,
             'timeout_seconds': 30,
             'retry_attempts': 3,
-            'error_threshold': 0.1
+            'error_threshold': 0.1,
+            'max_workers': 5,
+            'jitter_seconds': 0.0,
+            'missed_run_policy': MissedRunPolicy.SKIP.value
         }
         
+        # Planification des exécutions (échéance propre à chaque stratégie)
+        self.scheduler = StrategyScheduler(
+            self._run_scheduled_strategy, max_workers=self.execution_config['max_workers']
+        )
+        
         # Cache et optimisations
         self._portfolio_cache = {}
         self._market_cache = {}
@@ -209,6 +225,9 @@ class StrategyManager:
             # Chargement des stratégies existantes
             await self._load_existing_strategies()
             
+            # Modèle de covariance ajusté sur l'historique de leur univers
+            await self._fit_risk_model()
+            
             # Démarrage des tâches d'arrière-plan
             await self._start_background_tasks()
             
@@ -303,17 +322,28 @@ class StrategyManager:
             self.logger.error(error_msg)
             raise StrategyManagerError(error_msg, error_code="STRATEGY_ADD_FAILED")
     
-    async def start_strategy(self, strategy_id: str) -> None:
-        """Démarre une stratégie."""
+    async def start_strategy(self, strategy_id: str, schedule: Optional[ScheduleConfig] = None) -> None:
+        """
+        Démarre une stratégie.
+        
+        Args:
+            strategy_id: Identifiant de la stratégie
+            schedule: Planification (intervalle du gestionnaire par défaut)
+        """
         try:
             if strategy_id not in self.strategy_instances:
                 raise StrategyManagerError(f"Stratégie {strategy_id} non trouvée", 
                                          strategy_id, "STRATEGY_NOT_FOUND")
             
             instance = self.strategy_instances[strategy_id]
+            if schedule is not None:
+                instance.schedule = schedule
             
             if instance.status == StrategyStatus.ACTIVE:
-                self.logger.warning(f"Stratégie {strategy_id} déjà active")
+                if not self.scheduler.is_scheduled(strategy_id):
+                    self._schedule_strategy(instance)
+                else:
+                    self.logger.warning(f"Stratégie {strategy_id} déjà active")
                 return
             
             # Vérification des limites
@@ -326,6 +356,11 @@ class StrategyManager:
                     strategy_id, "MAX_STRATEGIES_REACHED"
                 )
             
+            # Univers de la stratégie absent du modèle de covariance: nouvel ajustement
+            symbols = self._strategy_symbols(instance.strategy)
+            if any(symbol not in self.risk_manager.covariance_model for symbol in symbols):
+                await self._fit_risk_model()
+            
             # Évaluation des risques
             risk_assessment = await self.risk_manager.assess_strategy_risk(
                 instance.strategy, self._get_current_portfolio_state()
@@ -343,8 +378,8 @@ class StrategyManager:
             instance.metadata['started_at'] = datetime.now().isoformat()
             instance.metadata['risk_assessment'] = risk_assessment.to_dict()
             
-            # Ajout à la queue d'exécution
-            await self.execution_queue.put(strategy_id)
+            # Planification des exécutions
+            self._schedule_strategy(instance)
             
             # Mise à jour des métriques
             self._update_metrics()
@@ -372,6 +407,7 @@ class StrategyManager:
                 return
             
             # Arrêt de la stratégie
+            self.scheduler.unschedule(strategy_id)
             await instance.engine.stop()
             instance.status = StrategyStatus.STOPPED
             instance.metadata['stopped_at'] = datetime.now().isoformat()
@@ -401,6 +437,7 @@ class StrategyManager:
                 raise StrategyManagerError(f"Stratégie {strategy_id} non active", 
                                          strategy_id, "STRATEGY_NOT_ACTIVE")
             
+            self.scheduler.unschedule(strategy_id)
             await instance.engine.pause()
             instance.status = StrategyStatus.PAUSED
             instance.metadata['paused_at'] = datetime.now().isoformat()
@@ -429,8 +466,8 @@ class StrategyManager:
             instance.status = StrategyStatus.ACTIVE
             instance.metadata['resumed_at'] = datetime.now().isoformat()
             
-            # Remise en queue d'exécution
-            await self.execution_queue.put(strategy_id)
+            # Replanification
+            self._schedule_strategy(instance)
             
             self._update_metrics()
             self.logger.info(f"Stratégie {strategy_id} reprise")
@@ -452,6 +489,7 @@ class StrategyManager:
                 await self.stop_strategy(strategy_id)
             
             # Nettoyage des ressources
+            self.scheduler.unschedule(strategy_id)
             await instance.engine.cleanup()
             
             # Suppression de l'instance
@@ -464,8 +502,15 @@ class StrategyManager:
             self.logger.error(f"Erreur suppression stratégie {strategy_id}: {e}")
             raise StrategyManagerError(f"Erreur suppression stratégie: {e}", strategy_id, "STRATEGY_REMOVE_FAILED")
     
-    async def execute_strategy(self, strategy_id: str) -> List[TradingSignal]:
-        """Exécute une stratégie et retourne les signaux générés."""
+    async def execute_strategy(self, strategy_id: str,
+                               trigger: Optional[Dict[str, Any]] = None) -> List[TradingSignal]:
+        """
+        Exécute une stratégie et retourne les signaux générés.
+        
+        Args:
+            strategy_id: Identifiant de la stratégie
+            trigger: Déclencheur (barre reçue: seul son symbole est évalué)
+        """
         try:
             if strategy_id not in self.strategy_instances:
                 raise StrategyManagerError(f"Stratégie {strategy_id} non trouvée", 
@@ -476,17 +521,17 @@ class StrategyManager:
             if instance.status != StrategyStatus.ACTIVE:
                 return []
             
-            # Création du contexte d'exécution
-            execution_context = await self._create_execution_context(strategy_id)
+            # Contextes d'exécution (un instantané du bus pour tout le cycle)
+            execution_contexts = await self._create_execution_contexts(strategy_id, trigger)
             
-            # Exécution de la stratégie
+            # Exécution de la stratégie sur chaque symbole
             start_time = datetime.now()
-            result = await instance.engine.execute_strategy(strategy_id, execution_context)
+            signals = []
+            for execution_context in execution_contexts:
+                result = await instance.engine.execute_strategy(strategy_id, execution_context)
+                signals.extend(result.signals)
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
             
-            # Extraction des signaux du résultat
-            signals = result.signals
-            
             # Mise à jour de l'instance
             instance.last_execution = start_time
             instance.execution_count += 1
@@ -554,11 +599,27 @@ class StrategyManager:
             'metrics': self.metrics.__dict__,
             'execution_config': self.execution_config,
             'queue_sizes': {
-                'execution_queue': self.execution_queue.qsize(),
+                'execution_queue': self.scheduler.get_stats()['ready_queue'],
                 'signal_queue': self.signal_queue.qsize()
-            }
+            },
+            'scheduler': self.scheduler.get_stats(),
+            'market_data_bus': self.market_data_bus.get_stats()
         }
     
+    def on_new_bar(self, symbol: str, timeframe: str, bar: Any = None) -> int:
+        """
+        Déclenche les stratégies planifiées sur nouvelle barre.
+        
+        Args:
+            symbol: Symbole de la barre
+            timeframe: Timeframe de la barre
+            bar: Barre reçue
+            
+        Returns:
+            int: Nombre de stratégies déclenchées
+        """
+        return self.scheduler.notify_bar(symbol, timeframe, bar)
+    
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Retourne les métriques de performance."""
         return {
@@ -579,10 +640,33 @@ class StrategyManager:
         
         if self.market_data_provider:
             await self.market_data_provider.initialize()
+            # Le bus est alimenté depuis le provider (historique via le cache partagé)
+            if self.market_data_publisher is None:
+                self.market_data_publisher = MarketDataPublisher(
+                    self.market_data_bus,
+                    self.market_data_provider,
+                    IncrementalHistoryService(self.market_data_provider, get_cache_manager())
+                )
         
         if self.portfolio_service:
             await self.portfolio_service.initialize()
     
+    async def _fit_risk_model(self) -> None:
+        """Ajuste le modèle de covariance sur l'historique de l'univers des stratégies."""
+        if self.market_data_publisher is None or self.market_data_publisher.history_service is None:
+            return
+        symbols = sorted({
+            symbol
+            for instance in self.strategy_instances.values()
+            for symbol in self._strategy_symbols(instance.strategy)
+        })
+        if not symbols:
+            return
+        try:
+            await self.risk_manager.load_history(self.market_data_publisher.history_service, symbols)
+        except Exception as e:
+            self.logger.warning(f"Modèle de risque non ajusté sur l'historique: {e}")
+    
     async def _load_existing_strategies(self) -> None:
         """Charge les stratégies existantes depuis le répertoire."""
         if not self.strategies_directory.exists():
@@ -599,13 +683,20 @@ class StrategyManager:
     
     async def _start_background_tasks(self) -> None:
         """Démarre les tâches d'arrière-plan."""
-        self._execution_task = asyncio.create_task(self._execution_loop())
+        await self.scheduler.start()
+        self._bar_subscription = self.market_data_bus.subscribe(
+            self._on_bar_event, event_types=[MarketEventType.BAR], name="strategy_manager"
+        )
         self._signal_processing_task = asyncio.create_task(self._signal_processing_loop())
         self._monitoring_task = asyncio.create_task(self._monitoring_loop())
     
     async def _stop_background_tasks(self) -> None:
         """Arrête les tâches d'arrière-plan."""
-        tasks = [self._execution_task, self._signal_processing_task, self._monitoring_task]
+        await self.scheduler.stop()
+        if self._bar_subscription is not None:
+            self.market_data_bus.unsubscribe(self._bar_subscription)
+            self._bar_subscription = None
+        tasks = [self._signal_processing_task, self._monitoring_task]
         
         for task in tasks:
             if task and not task.done():
@@ -648,59 +739,104 @@ class StrategyManager:
         
         return strategy_id
     
-    async def _create_execution_context(self, strategy_id: str) -> ExecutionContext:
-        """Crée le contexte d'exécution pour une stratégie."""
+    async def _create_execution_contexts(self, strategy_id: str,
+                                         trigger: Optional[Dict[str, Any]] = None) -> List[ExecutionContext]:
+        """
+        Crée les contextes d'exécution d'une stratégie à partir d'un
+        instantané du bus de données de marché. Hors déclenchement sur
+        barre, les symboles de l'univers sont d'abord rafraîchis depuis le
+        provider (cotations groupées, historique incrémental).
+        
+        Args:
+            strategy_id: Identifiant de la stratégie
+            trigger: Déclencheur de l'exécution
+            
+        Returns:
+            List[ExecutionContext]: Un contexte par symbole de l'univers
+        """
+        strategy = self.strategy_instances[strategy_id].strategy
+        symbols = self._strategy_symbols(strategy)
+        
+        trigger_symbol = (trigger or {}).get('symbol')
+        if trigger_symbol and (not symbols or trigger_symbol in symbols):
+            symbols = [trigger_symbol]
+        
+        snapshot = None
+        trigger_type = (trigger or {}).get('trigger')
+        if self.market_data_publisher and symbols and trigger_type != TriggerType.NEW_BAR.value:
+            try:
+                snapshot = await self.market_data_publisher.refresh(
+                    symbols, timeframe=(trigger or {}).get('timeframe') or "1d"
+                )
+            except Exception as e:
+                self.logger.warning(f"Rafraîchissement des données impossible pour {strategy_id}: {e}")
+        if snapshot is None:
+            snapshot = self.market_data_bus.snapshot(symbols or None)
+        if not symbols:
+            symbols = sorted(set(snapshot.quotes) | set(snapshot.bars))
+        
         portfolio_state = await self._get_portfolio_state()
         market_conditions = await self._get_market_conditions()
+        risk_limits = await self._get_risk_limits(strategy_id)
         
-        return ExecutionContext(
-            strategy_id=strategy_id,
-            symbol="AAPL",  # Symbole par défaut pour les tests
-            timestamp=datetime.now(),
-            market_data={"price": 150.0, "volume": 1000000},  # Données de marché fictives
-            portfolio_state=portfolio_state,
-            execution_mode=ExecutionMode.SIMULATION,
-            metadata={"test_mode": True},
-            market_conditions=market_conditions,
-            execution_config=self.execution_config,
-            risk_limits=await self._get_risk_limits(strategy_id)
+        return [
+            ExecutionContext(
+                strategy_id=strategy_id,
+                symbol=symbol,
+                timestamp=snapshot.created_at,
+                market_data=snapshot.market_data(symbol),
+                portfolio_state=portfolio_state,
+                execution_mode=ExecutionMode.SIMULATION,
+                metadata={'snapshot_sequence': snapshot.sequence, 'trigger': trigger_type},
+                market_conditions=market_conditions,
+                execution_config=self.execution_config,
+                risk_limits=risk_limits
+            )
+            for symbol in symbols
+        ]
+    
+    def _strategy_symbols(self, strategy: Strategy) -> List[str]:
+        """Symboles de l'univers d'une stratégie (vide: pas de restriction)."""
+        universe = strategy.universe
+        if not universe:
+            return []
+        if universe.watchlist:
+            return [symbol.upper() for symbol in universe.watchlist]
+        return [instrument.symbol.upper() for instrument in universe.instruments or []]
+    
+    async def _on_bar_event(self, event: MarketEvent) -> None:
+        """Nouvelle barre publiée sur le bus: modèle de risque puis stratégies sur barre."""
+        self.risk_manager.on_bar(event.symbol, event.timeframe, event.data)
+        self.on_new_bar(event.symbol, event.timeframe, event.data)
+    
+    def _schedule_strategy(self, instance: StrategyInstance) -> None:
+        """Planifie une stratégie active (configuration par défaut du gestionnaire)."""
+        schedule = instance.schedule or ScheduleConfig(
+            interval_seconds=self.execution_interval.total_seconds(),
+            jitter_seconds=self.execution_config['jitter_seconds'],
+            missed_run_policy=MissedRunPolicy(self.execution_config['missed_run_policy'])
         )
+        self.scheduler.schedule(instance.strategy_id, schedule)
     
-    async def _execution_loop(self) -> None:
-        """Boucle d'exécution des stratégies."""
-        while self.status == ManagerStatus.ACTIVE:
-            try:
-                # Traitement par batch
-                strategy_ids = []
-                for _ in range(self.execution_config['batch_size']):
-                    try:
-                        strategy_id = await asyncio.wait_for(
-                            self.execution_queue.get(), 
-                            timeout=1.0
-                        )
-                        strategy_ids.append(strategy_id)
-                    except asyncio.TimeoutError:
-                        break
-                
-                if strategy_ids:
-                    # Exécution en parallèle
-                    tasks = [self.execute_strategy(sid) for sid in strategy_ids]
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    # Remise en queue pour la prochaine exécution
-                    for strategy_id in strategy_ids:
-                        if (strategy_id in self.strategy_instances and 
-                            self.strategy_instances[strategy_id].status == StrategyStatus.ACTIVE):
-                            await asyncio.sleep(self.execution_interval.total_seconds())
-                            await self.execution_queue.put(strategy_id)
-                
-                await asyncio.sleep(1)  # Pause courte
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self.logger.error(f"Erreur boucle d'exécution: {e}")
-                await asyncio.sleep(5)  # Pause en cas d'erreur
+    async def _run_scheduled_strategy(self, strategy_id: str, trigger: Dict[str, Any]) -> None:
+        """Exécution déclenchée par le planificateur."""
+        instance = self.strategy_instances.get(strategy_id)
+        if instance is None or instance.status != StrategyStatus.ACTIVE:
+            self.scheduler.unschedule(strategy_id)
+            return
+        
+        try:
+            await asyncio.wait_for(
+                self.execute_strategy(strategy_id, trigger),
+                timeout=self.execution_config['timeout_seconds']
+            )
+        except asyncio.TimeoutError:
+            instance.error_count += 1
+            instance.last_error = f"Timeout (>{self.execution_config['timeout_seconds']}s)"
+            self.logger.error(f"Timeout exécution stratégie {strategy_id} ({trigger.get('trigger')})")
+        except StrategyManagerError:
+            # Erreur déjà journalisée et comptabilisée par execute_strategy
+            pass
     
     async def _signal_processing_loop(self) -> None:
         """Boucle de traitement des signaux."""
@@ -871,10 +1007,12 @@ class StrategyManager:
                     time_since_execution = datetime.now() - instance.last_execution
                     max_idle_time = self.execution_interval * 3
                     
-                    if time_since_execution > max_idle_time:
+                    interval_driven = instance.schedule is None or instance.schedule.trigger == TriggerType.INTERVAL
+                    if interval_driven and time_since_execution > max_idle_time:
                         self.logger.warning(f"Stratégie {strategy_id} inactive depuis {time_since_execution}")
-                        # Remise en queue si nécessaire
-                        await self.execution_queue.put(strategy_id)
+                        # Exécution immédiate hors grille
+                        if not self.scheduler.trigger(strategy_id):
+                            self._schedule_strategy(instance)
                 
             except Exception as e:
                 self.logger.error(f"Erreur vérification santé {strategy_id}: {e}")
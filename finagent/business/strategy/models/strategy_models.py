@@ -366,6 +366,10 @@ class StrategyBacktesting(BaseModel):
         default="SPY",
         description="Symbole de référence pour comparaison"
     )
+    metrics: List[str] = Field(
+        default_factory=list,
+        description="Métriques de performance suivies (classement des optimisations)"
+    )
 
     @field_validator('initial_capital', 'commission', 'slippage', mode='before')
     def validate_decimal_fields(cls, v):
@@ -23,6 +23,12 @@ from .rule_compiler import (
     CompilationError
 )
 
+from .vector_compiler import (
+    VectorRuleCompiler,
+    VectorRule,
+    VectorSignals
+)
+
 __all__ = [
     # Parser
     "StrategyYAMLParser",
@@ -37,5 +43,8 @@ __all__ = [
     # Compiler
     "RuleCompiler",
     "CompiledRule",
-    "CompilationError"
+    "CompilationError",
+    "VectorRuleCompiler",
+    "VectorRule",
+    "VectorSignals"
 ]
\ No newline at end of file
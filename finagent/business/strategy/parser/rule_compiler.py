@@ -8,10 +8,14 @@ pour une évaluation rapide en temps réel.
 import logging
 import ast
 import inspect
-from typing import Dict, List, Any, Callable, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Any, Callable, Optional, Union
 from dataclasses import dataclass
 from decimal import Decimal
 
+import numpy as np
+
+from finagent.data.indicators import kernels, indicator_key
+
 from ..models.rule_models import (
     Rule, BuyConditions, SellConditions, ConditionOperator,
     RuleOperator, TechnicalCondition, FundamentalCondition,
@@ -19,6 +23,9 @@ from ..models.rule_models import (
 )
 from ..models.condition_models import IndicatorType, ComparisonOperator
 
+if TYPE_CHECKING:
+    from .vector_compiler import VectorRule
+
 logger = logging.getLogger(__name__)
 
 
@@ -209,6 +216,24 @@ class RuleCompiler:
         except Exception as e:
             raise CompilationError(f"Échec de compilation: {e}", rule_id)
     
+    def compile_vectorized(self, rules: Dict[str, Any], rule_id: str = "default") -> 'VectorRule':
+        """
+        Compile un ensemble de règles vers la cible vectorielle.
+        
+        Args:
+            rules: Règles à compiler
+            rule_id: Identifiant de la règle
+            
+        Returns:
+            VectorRule: Règle évaluable sur des séries complètes
+            
+        Raises:
+            CompilationError: Si la compilation échoue
+        """
+        from .vector_compiler import VectorRuleCompiler
+        
+        return VectorRuleCompiler(self).compile(self.compile(rules, rule_id))
+    
     def _compile_condition(self, condition_data: Dict[str, Any], condition_id: str) -> CompiledCondition:
         """
         Compile une condition individuelle.
@@ -337,13 +362,18 @@ class RuleCompiler:
         if not comparison_func:
             comparison_func = self._comparison_operators['greater']
         
+        # Clé de la valeur incrémentale éventuellement fournie par l'évaluateur
+        streaming_key = indicator_key(indicator, timeframe, parameters)
+        
         def evaluator(market_data: Dict[str, Any]) -> bool:
             """Fonction d'évaluation compilée."""
             try:
-                # Calcule la valeur de l'indicateur
-                indicator_value = indicator_func(
-                    market_data, timeframe, lookback, parameters
-                )
+                # Valeur incrémentale si disponible, sinon calcul sur l'historique
+                indicator_value = (market_data.get('indicators_cache') or {}).get(streaming_key)
+                if indicator_value is None:
+                    indicator_value = indicator_func(
+                        market_data, timeframe, lookback, parameters
+                    )
                 
                 # Compare avec la valeur de référence
                 return comparison_func(indicator_value, value)
@@ -412,52 +442,24 @@ class RuleCompiler:
     
     # Évaluateurs d'indicateurs techniques
     def _evaluate_rsi(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
-        """Évalue l'indicateur RSI."""
+        """Évalue l'indicateur RSI (lissage de Wilder)."""
         period = params.get('period', 14)
-        prices = market_data.get('prices', {}).get(timeframe, [])
+        close = self._price_array(market_data, timeframe, 'close')
         
-        if len(prices) < period:
+        if len(close) <= period:
             return 50.0  # Valeur neutre par défaut
         
-        # Calcul RSI simplifié (version réelle utiliserait une bibliothèque spécialisée)
-        gains = []
-        losses = []
-        
-        for i in range(1, min(period + 1, len(prices))):
-            change = prices[i]['close'] - prices[i-1]['close']
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if not gains and not losses:
-            return 50.0
-        
-        avg_gain = sum(gains) / len(gains) if gains else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return kernels.last_value(kernels.rsi(close, period), default=50.0)
     
     def _evaluate_sma(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
         """Évalue la moyenne mobile simple."""
         period = params.get('period', 20)
-        prices = market_data.get('prices', {}).get(timeframe, [])
+        close = self._price_array(market_data, timeframe, 'close')
         
-        if len(prices) < period:
+        if len(close) < period:
             return 0.0
         
-        recent_prices = prices[-period:]
-        sma = sum(p['close'] for p in recent_prices) / period
-        
-        return sma
+        return kernels.last_value(kernels.sma(close, period), default=0.0)
     
     def _evaluate_volume(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
         """Évalue l'indicateur de volume."""
@@ -551,88 +553,89 @@ class RuleCompiler:
     
     # Évaluateurs spéciaux
     def _evaluate_macd(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
-        """Évalue l'indicateur MACD."""
-        # Implémentation simplifiée - version réelle utiliserait une bibliothèque spécialisée
+        """Évalue la ligne MACD (EMA rapide - EMA lente)."""
         fast_period = params.get('fast_period', 12)
         slow_period = params.get('slow_period', 26)
+        signal_period = params.get('signal_period', 9)
+        close = self._price_array(market_data, timeframe, 'close')
         
-        fast_ema = self._evaluate_sma(market_data, timeframe, lookback, {'period': fast_period})
-        slow_ema = self._evaluate_sma(market_data, timeframe, lookback, {'period': slow_period})
+        if len(close) < slow_period:
+            return 0.0
         
-        return fast_ema - slow_ema
+        macd_line, _, _ = kernels.macd(close, fast_period, slow_period, signal_period)
+        return kernels.last_value(macd_line, default=0.0)
     
     def _evaluate_ema(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
         """Évalue la moyenne mobile exponentielle."""
-        # Implémentation simplifiée
-        return self._evaluate_sma(market_data, timeframe, lookback, params)
+        period = params.get('period', 20)
+        close = self._price_array(market_data, timeframe, 'close')
+        
+        if len(close) < period:
+            return 0.0
+        
+        return kernels.last_value(kernels.ema(close, period), default=0.0)
     
     def _evaluate_bollinger_bands(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> Dict[str, float]:
         """Évalue les bandes de Bollinger."""
         period = params.get('period', 20)
         std_dev = params.get('std_deviation', 2.0)
+        close = self._price_array(market_data, timeframe, 'close')
         
-        sma = self._evaluate_sma(market_data, timeframe, lookback, {'period': period})
-        
-        # Calcul simplifié de l'écart-type
-        prices = market_data.get('prices', {}).get(timeframe, [])
-        if len(prices) < period:
-            return {'upper': sma, 'middle': sma, 'lower': sma}
-        
-        recent_prices = [p['close'] for p in prices[-period:]]
-        variance = sum((p - sma) ** 2 for p in recent_prices) / period
-        std = variance ** 0.5
+        if len(close) < period:
+            last_close = float(close[-1]) if len(close) else 0.0
+            return {'upper': last_close, 'middle': last_close, 'lower': last_close}
         
+        upper, middle, lower, _ = kernels.bollinger_bands(close, period, std_dev)
         return {
-            'upper': sma + (std_dev * std),
-            'middle': sma,
-            'lower': sma - (std_dev * std)
+            'upper': kernels.last_value(upper),
+            'middle': kernels.last_value(middle),
+            'lower': kernels.last_value(lower)
         }
     
     def _evaluate_stochastic(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> Dict[str, float]:
         """Évalue l'oscillateur stochastique."""
         k_period = params.get('k_period', 14)
-        prices = market_data.get('prices', {}).get(timeframe, [])
+        d_period = params.get('d_period', 3)
+        close = self._price_array(market_data, timeframe, 'close')
         
-        if len(prices) < k_period:
+        if len(close) < k_period:
             return {'k': 50.0, 'd': 50.0}
         
-        recent_prices = prices[-k_period:]
-        highs = [p['high'] for p in recent_prices]
-        lows = [p['low'] for p in recent_prices]
-        current_close = prices[-1]['close']
-        
-        highest_high = max(highs)
-        lowest_low = min(lows)
-        
-        if highest_high == lowest_low:
-            k_value = 50.0
-        else:
-            k_value = ((current_close - lowest_low) / (highest_high - lowest_low)) * 100
-        
-        return {'k': k_value, 'd': k_value}  # Simplification
+        k_percent, d_percent = kernels.stochastic(
+            self._price_array(market_data, timeframe, 'high'),
+            self._price_array(market_data, timeframe, 'low'),
+            close, k_period, d_period
+        )
+        k_value = kernels.last_value(k_percent, default=50.0)
+        return {'k': k_value, 'd': kernels.last_value(d_percent, default=k_value)}
     
     def _evaluate_atr(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
-        """Évalue l'Average True Range."""
+        """Évalue l'Average True Range (lissage de Wilder)."""
         period = params.get('period', 14)
-        prices = market_data.get('prices', {}).get(timeframe, [])
+        close = self._price_array(market_data, timeframe, 'close')
         
-        if len(prices) < period + 1:
+        if len(close) < period + 1:
             return 0.0
         
-        true_ranges = []
-        for i in range(1, min(period + 1, len(prices))):
-            high = prices[i]['high']
-            low = prices[i]['low']
-            prev_close = prices[i-1]['close']
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
+        atr = kernels.atr(
+            self._price_array(market_data, timeframe, 'high'),
+            self._price_array(market_data, timeframe, 'low'),
+            close, period
+        )
+        return kernels.last_value(atr, default=0.0)
+    
+    def _price_array(self, market_data: Dict[str, Any], timeframe: str, field: str) -> np.ndarray:
+        """
+        Extrait une colonne de prix sous forme de tableau.
         
-        return sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
+        Accepte une liste de barres (dictionnaires) ou une série columnar
+        exposant la colonne en attribut (BarSeries).
+        """
+        prices = market_data.get('prices', {}).get(timeframe, [])
+        column = getattr(prices, field, None)
+        if column is not None:
+            return kernels.as_array(column)
+        return np.fromiter((p.get(field, np.nan) for p in prices), dtype=np.float64, count=len(prices))
     
     def _generic_indicator_evaluator(self, market_data: Dict[str, Any], timeframe: str, lookback: int, params: Dict) -> float:
         """Évaluateur générique pour indicateurs non spécifiés."""
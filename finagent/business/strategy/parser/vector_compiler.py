@@ -0,0 +1,452 @@
+"""
+Compilation vectorielle des règles de trading.
+
+Ce module transforme une règle compilée (``CompiledRule``) en graphe
+d'expressions évalué sur des colonnes de prix complètes. Une seule
+évaluation produit les signaux d'achat/vente et les scores de confiance
+pour chaque barre (tableau 1D) ou pour chaque symbole × barre (tableau
+2D), au lieu d'appeler la règle barre par barre.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from finagent.data.indicators import kernels, indicator_key
+
+from ..models.rule_models import RuleOperator
+from .rule_compiler import CompilationError, CompiledCondition, CompiledRule, RuleCompiler
+
+logger = logging.getLogger(__name__)
+
+
+# Colonnes de prix disponibles directement
+_PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Sorties des indicateurs multiples (paramètre ``output``, première par défaut
+# sauf Bollinger: bande médiane)
+_OUTPUTS = {
+    'macd': ('macd', 'signal', 'histogram'),
+    'bollinger_bands': ('upper', 'middle', 'lower'),
+    'stochastic': ('k', 'd')
+}
+
+_OPERATORS = frozenset({
+    'greater', '>', 'above', 'above_threshold', 'greater_equal', '>=',
+    'less', '<', 'below', 'below_threshold', 'less_equal', '<=',
+    'equal', '==', 'not_equal', '!=', 'between', 'outside',
+    'crossover_up', 'crossover_down'
+})
+
+
+def _volume_ratio(cols: Dict[str, np.ndarray], p: Dict[str, Any]) -> np.ndarray:
+    """Volume rapporté à sa moyenne (volume brut pendant la chauffe)."""
+    volume = cols['volume']
+    average = kernels.sma(volume, p.get('avg_period', 20))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(average > 0, volume / average, 1.0)
+    return np.where(np.isnan(average), volume, ratio)
+
+
+def _select(outputs: Tuple[np.ndarray, ...], indicator: str, p: Dict[str, Any], default: str) -> np.ndarray:
+    """Sélectionne une sortie d'un indicateur multiple (paramètre ``output``)."""
+    return outputs[_OUTPUTS[indicator].index(p.get('output', default))]
+
+
+# Indicateurs séries: colonnes 1D + paramètres -> tableau 1D
+# (mêmes noms et paramètres par défaut que les évaluateurs du RuleCompiler)
+VECTOR_INDICATORS: Dict[str, Callable[[Dict[str, np.ndarray], Dict[str, Any]], np.ndarray]] = {
+    'sma': lambda c, p: kernels.sma(c['close'], p.get('period', 20)),
+    'ema': lambda c, p: kernels.ema(c['close'], p.get('period', 20)),
+    'wma': lambda c, p: kernels.wma(c['close'], p.get('period', 20)),
+    'rsi': lambda c, p: kernels.rsi(c['close'], p.get('period', 14)),
+    'macd': lambda c, p: _select(
+        kernels.macd(c['close'], p.get('fast_period', 12), p.get('slow_period', 26), p.get('signal_period', 9)),
+        'macd', p, 'macd'
+    ),
+    'bollinger_bands': lambda c, p: _select(
+        kernels.bollinger_bands(c['close'], p.get('period', 20), p.get('std_deviation', 2.0))[:3],
+        'bollinger_bands', p, 'middle'
+    ),
+    'stochastic': lambda c, p: _select(
+        kernels.stochastic(c['high'], c['low'], c['close'], p.get('k_period', 14), p.get('d_period', 3)),
+        'stochastic', p, 'k'
+    ),
+    'atr': lambda c, p: kernels.atr(c['high'], c['low'], c['close'], p.get('period', 14)),
+    'williams_r': lambda c, p: kernels.williams_r(c['high'], c['low'], c['close'], p.get('period', 14)),
+    'cci': lambda c, p: kernels.cci(c['high'], c['low'], c['close'], p.get('period', 20)),
+    'volume': _volume_ratio,
+    'price': lambda c, p: c[p.get('price_type', 'close')],
+    'open': lambda c, p: c['open'],
+    'high': lambda c, p: c['high'],
+    'low': lambda c, p: c['low'],
+    'close': lambda c, p: c['close']
+}
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Valeur de la barre précédente le long du dernier axe."""
+    previous = np.full(values.shape, np.nan)
+    previous[..., 1:] = values[..., :-1]
+    return previous
+
+
+def _compare(op: str, left: np.ndarray, right: Any) -> np.ndarray:
+    """Comparaison élément par élément (NaN: condition non remplie)."""
+    with np.errstate(invalid='ignore'):
+        if op in ('greater', '>', 'above', 'above_threshold'):
+            return left > right
+        if op in ('greater_equal', '>='):
+            return left >= right
+        if op in ('less', '<', 'below', 'below_threshold'):
+            return left < right
+        if op in ('less_equal', '<='):
+            return left <= right
+        if op in ('equal', '=='):
+            return left == right
+        if op in ('not_equal', '!='):
+            return (left != right) & ~np.isnan(left)
+        if op == 'between':
+            return (left >= right[0]) & (left <= right[1])
+        if op == 'outside':
+            return (left < right[0]) | (left > right[1])
+        if op == 'crossover_up':
+            return (_shift(left) <= _shift(right)) & (left > right)
+        if op == 'crossover_down':
+            return (_shift(left) >= _shift(right)) & (left < right)
+    raise CompilationError(f"Opérateur non supporté en mode vectoriel: {op}")
+
+
+class PriceFrame:
+    """
+    Colonnes de prix d'une évaluation vectorielle.
+
+    Les colonnes sont des tableaux 1D (barres) ou 2D (symboles × barres).
+    Les indicateurs calculés sont mémorisés par clé, de sorte qu'un même
+    indicateur utilisé par plusieurs conditions n'est calculé qu'une fois.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], timestamps: Optional[np.ndarray] = None,
+                 context: Optional[Dict[str, Any]] = None):
+        self.columns = columns
+        self.timestamps = timestamps
+        self.context = context or {}
+        self._memo: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_data(cls, data: Any, context: Optional[Dict[str, Any]] = None) -> 'PriceFrame':
+        """
+        Construit le cadre depuis une BarSeries, un DataFrame ou un
+        dictionnaire de colonnes.
+
+        Args:
+            data: Source columnar des prix
+            context: Données non séries (fondamentaux, sentiment, position)
+
+        Returns:
+            Cadre d'évaluation
+        """
+        if isinstance(data, PriceFrame):
+            return data
+        if hasattr(data, 'timestamps') and hasattr(data, 'close'):
+            columns = {f: getattr(data, f) for f in _PRICE_FIELDS if getattr(data, f, None) is not None}
+            return cls({k: kernels.as_array(v) for k, v in columns.items()}, data.timestamps, context)
+        if isinstance(data, pd.DataFrame):
+            columns = {str(c).lower(): data[c].to_numpy(dtype=np.float64) for c in data.columns}
+            columns = {k: v for k, v in columns.items() if k in _PRICE_FIELDS}
+            return cls(columns, data.index.to_numpy(), context)
+        if isinstance(data, Mapping):
+            return cls({k: np.asarray(v, dtype=np.float64) for k, v in data.items() if k in _PRICE_FIELDS},
+                       None, context)
+        raise TypeError(f"Format de données non supporté: {type(data).__name__}")
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Forme des colonnes (barres) ou (symboles, barres)."""
+        return self.columns['close'].shape
+
+    def indicator(self, name: str, params: Dict[str, Any]) -> np.ndarray:
+        """Calcule (ou relit) un indicateur sur toutes les barres."""
+        key = indicator_key(name, "", params)
+        values = self._memo.get(key)
+        if values is None:
+            func = VECTOR_INDICATORS[name]
+            close = self.columns['close']
+            if close.ndim == 1:
+                values = func(self.columns, params)
+            else:
+                # Noyaux 1D appliqués ligne par ligne (un symbole par ligne)
+                values = np.vstack([
+                    func({k: v[row] for k, v in self.columns.items()}, params)
+                    for row in range(close.shape[0])
+                ])
+            self._memo[key] = values
+        return values
+
+
+@dataclass
+class VectorCondition:
+    """Condition compilée en expression vectorielle."""
+    condition_id: str
+    weight: float
+    metadata: Dict[str, Any]
+    evaluate: Callable[[PriceFrame], np.ndarray]
+
+
+@dataclass
+class VectorSignals:
+    """Signaux d'une règle sur toutes les barres (et tous les symboles)."""
+    buy: np.ndarray
+    sell: np.ndarray
+    buy_confidence: np.ndarray
+    sell_confidence: np.ndarray
+    timestamps: Optional[np.ndarray] = None
+    symbols: Optional[List[str]] = None
+    conditions: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convertit des signaux 1D en DataFrame indexé par date."""
+        if self.buy.ndim != 1:
+            raise ValueError("Conversion DataFrame réservée aux signaux d'un seul symbole")
+        return pd.DataFrame({
+            'buy': self.buy,
+            'sell': self.sell,
+            'buy_confidence': self.buy_confidence,
+            'sell_confidence': self.sell_confidence
+        }, index=self.timestamps)
+
+
+@dataclass
+class VectorRule:
+    """Règle compilée en graphe d'expressions vectorielles."""
+    rule_id: str
+    buy_conditions: List[VectorCondition]
+    sell_conditions: List[VectorCondition]
+    buy_operator: RuleOperator
+    sell_operator: RuleOperator
+    timeframe: str
+    metadata: Dict[str, Any]
+
+    def evaluate(self, data: Any, context: Optional[Dict[str, Any]] = None) -> VectorSignals:
+        """
+        Évalue la règle sur toutes les barres en une passe.
+
+        Args:
+            data: BarSeries, DataFrame ou colonnes (1D ou symboles × barres)
+            context: Données non séries (fondamentaux, sentiment, position)
+
+        Returns:
+            Signaux et confiances pour chaque barre
+        """
+        frame = PriceFrame.from_data(data, context)
+        conditions: Dict[str, np.ndarray] = {}
+        buy, buy_confidence = self._combine(self.buy_conditions, self.buy_operator, frame, conditions)
+        sell, sell_confidence = self._combine(self.sell_conditions, self.sell_operator, frame, conditions)
+        return VectorSignals(buy, sell, buy_confidence, sell_confidence, frame.timestamps,
+                             conditions=conditions)
+
+    def evaluate_universe(self, series_by_symbol: Mapping[str, Any],
+                          context: Optional[Dict[str, Any]] = None) -> VectorSignals:
+        """
+        Évalue la règle pour un univers de symboles (symboles × barres).
+
+        Les séries de mêmes horodatages sont empilées et évaluées en une
+        seule passe 2D; sinon chaque symbole est évalué puis aligné sur
+        l'union des horodatages (barres absentes: pas de signal).
+
+        Args:
+            series_by_symbol: Séries de barres par symbole
+            context: Données non séries communes
+
+        Returns:
+            Signaux 2D (une ligne par symbole)
+        """
+        symbols = list(series_by_symbol)
+        frames = [PriceFrame.from_data(series_by_symbol[s], context) for s in symbols]
+        if not frames:
+            empty = np.zeros((0, 0))
+            return VectorSignals(empty.astype(bool), empty.astype(bool), empty, empty, None, [])
+
+        first = frames[0].timestamps
+        aligned = all(
+            f.timestamps is not None and first is not None and len(f.timestamps) == len(first)
+            and np.array_equal(f.timestamps, first)
+            for f in frames
+        )
+        if aligned:
+            columns = {
+                name: np.vstack([f.columns[name] for f in frames])
+                for name in frames[0].columns if all(name in f.columns for f in frames)
+            }
+            signals = self.evaluate(PriceFrame(columns, first, context))
+            signals.symbols = symbols
+            return signals
+
+        # Horodatages différents: évaluation par symbole puis alignement
+        timestamps = np.unique(np.concatenate([f.timestamps for f in frames]))
+        shape = (len(symbols), len(timestamps))
+        buy, sell = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+        buy_confidence, sell_confidence = np.zeros(shape), np.zeros(shape)
+        for row, frame in enumerate(frames):
+            result = self.evaluate(frame)
+            cols = np.searchsorted(timestamps, frame.timestamps)
+            buy[row, cols] = result.buy
+            sell[row, cols] = result.sell
+            buy_confidence[row, cols] = result.buy_confidence
+            sell_confidence[row, cols] = result.sell_confidence
+        return VectorSignals(buy, sell, buy_confidence, sell_confidence, timestamps, symbols)
+
+    @staticmethod
+    def _combine(
+        conditions: List[VectorCondition],
+        operator: RuleOperator,
+        frame: PriceFrame,
+        results: Dict[str, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Combine les conditions (opérateur logique et confiance pondérée)."""
+        if not conditions:
+            return np.zeros(frame.shape, dtype=bool), np.zeros(frame.shape)
+
+        stacked = np.stack([
+            np.broadcast_to(condition.evaluate(frame), frame.shape) for condition in conditions
+        ])
+        for condition, values in zip(conditions, stacked):
+            results[condition.condition_id] = values
+
+        if operator == RuleOperator.AND:
+            signal = stacked.all(axis=0)
+        elif operator == RuleOperator.OR:
+            signal = stacked.any(axis=0)
+        elif operator == RuleOperator.NOT:
+            signal = ~stacked[0]
+        else:
+            signal = np.zeros(frame.shape, dtype=bool)
+
+        weights = np.array([condition.weight for condition in conditions])
+        total = weights.sum()
+        if total > 0:
+            confidence = np.tensordot(weights, stacked.astype(np.float64), axes=1) / total
+        else:
+            confidence = np.zeros(frame.shape)
+        return signal, confidence
+
+
+class VectorRuleCompiler:
+    """
+    Compilateur de règles vers des expressions vectorielles.
+
+    Les indicateurs séries sont calculés par les noyaux partagés; les
+    indicateurs sans historique (fondamentaux, sentiment, risque) sont
+    évalués une fois sur le contexte et diffusés sur toutes les barres.
+    """
+
+    def __init__(self, rule_compiler: Optional[RuleCompiler] = None):
+        """
+        Initialise le compilateur.
+
+        Args:
+            rule_compiler: Compilateur scalaire (évaluateurs non séries)
+        """
+        self.rule_compiler = rule_compiler or RuleCompiler()
+
+    def compile(self, compiled_rule: CompiledRule) -> VectorRule:
+        """
+        Transforme une règle compilée en règle vectorielle.
+
+        Args:
+            compiled_rule: Règle issue de ``RuleCompiler.compile``
+
+        Returns:
+            VectorRule: Règle évaluable sur des séries complètes
+
+        Raises:
+            CompilationError: Si une condition n'est pas vectorisable
+        """
+        all_conditions = compiled_rule.buy_conditions + compiled_rule.sell_conditions
+        timeframes = {c.metadata.get('timeframe', '1d') for c in all_conditions}
+        if len(timeframes) > 1:
+            raise CompilationError(
+                f"Le mode vectoriel exige un timeframe unique (reçu: {sorted(timeframes)})",
+                compiled_rule.rule_id
+            )
+
+        try:
+            buy_conditions = [self._compile_condition(c) for c in compiled_rule.buy_conditions]
+            sell_conditions = [self._compile_condition(c) for c in compiled_rule.sell_conditions]
+        except CompilationError as e:
+            raise CompilationError(e.message, compiled_rule.rule_id)
+
+        return VectorRule(
+            rule_id=compiled_rule.rule_id,
+            buy_conditions=buy_conditions,
+            sell_conditions=sell_conditions,
+            buy_operator=compiled_rule.buy_operator,
+            sell_operator=compiled_rule.sell_operator,
+            timeframe=timeframes.pop() if timeframes else '1d',
+            metadata={**compiled_rule.metadata, 'vectorized': True}
+        )
+
+    def _compile_condition(self, condition: CompiledCondition) -> VectorCondition:
+        """Compile une condition en expression sur un PriceFrame."""
+        metadata = condition.metadata
+        operator = str(metadata.get('operator', 'greater'))
+        if operator not in _OPERATORS:
+            raise CompilationError(f"Opérateur non supporté en mode vectoriel: {operator}")
+        left = self._compile_operand(metadata.get('indicator', ''), metadata.get('parameters') or {}, metadata)
+        value = metadata.get('value')
+
+        if operator in ('between', 'outside'):
+            if not isinstance(value, (list, tuple)) or len(value) != 2:
+                raise CompilationError(
+                    f"'{operator}' attend une liste [min, max] ({condition.condition_id})"
+                )
+            low, high = float(value[0]), float(value[1])
+            right = lambda frame: (low, high)
+        elif isinstance(value, Mapping) and 'indicator' in value:
+            # Référence à une autre série (ex: croisement SMA 20 / SMA 50)
+            right = self._compile_operand(
+                str(value['indicator']).lower(), value.get('parameters') or {}, metadata
+            )
+        else:
+            try:
+                constant = float(value)
+            except (TypeError, ValueError):
+                raise CompilationError(f"Valeur non numérique pour {condition.condition_id}: {value!r}")
+            right = lambda frame: constant
+
+        def evaluate(frame: PriceFrame) -> np.ndarray:
+            return _compare(operator, left(frame), right(frame))
+
+        return VectorCondition(
+            condition_id=condition.condition_id,
+            weight=float(condition.weight),
+            metadata=metadata,
+            evaluate=evaluate
+        )
+
+    def _compile_operand(self, indicator: str, params: Dict[str, Any],
+                         metadata: Dict[str, Any]) -> Callable[[PriceFrame], np.ndarray]:
+        """Compile un opérande (indicateur série ou valeur de contexte)."""
+        if indicator in VECTOR_INDICATORS:
+            outputs = _OUTPUTS.get(indicator)
+            if outputs and params.get('output', outputs[0]) not in outputs:
+                raise CompilationError(
+                    f"Sortie inconnue '{params['output']}' pour {indicator} (attendu: {', '.join(outputs)})"
+                )
+            return lambda frame: frame.indicator(indicator, params)
+
+        evaluator = self.rule_compiler._indicator_evaluators.get(indicator)
+        if evaluator is None:
+            raise CompilationError(f"Indicateur non supporté en mode vectoriel: {indicator}")
+
+        timeframe = metadata.get('timeframe', '1d')
+        lookback = metadata.get('lookback', 1)
+
+        def context_value(frame: PriceFrame) -> np.ndarray:
+            value = evaluator(frame.context, timeframe, lookback, params)
+            return np.full(frame.shape, float(value))
+
+        return context_value
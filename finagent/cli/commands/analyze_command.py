@@ -21,7 +21,9 @@ from ..utils import (
 )
 
 # Imports des services
-from ...data.providers.openbb_provider import OpenBBProvider
+from ...data.cache import get_cache_manager
+from ...data.providers.openbb_provider import HistoricalRecords, OpenBBProvider
+from ...data.services.history_service import IncrementalHistoryService
 from ...ai import AIProviderFactory, get_ai_config
 from ...ai.models.base import ProviderType
 
@@ -306,7 +308,12 @@ async def _perform_stock_analysis(symbol: str, timeframe: str, indicators: List[
             # Récupération de données réelles via OpenBB
             current_price_data = await openbb_provider.get_current_price(symbol)
             current_price = current_price_data.get("price", 150.00) if current_price_data else 150.00
-            historical_data = await openbb_provider.get_historical_data(symbol)
+            if use_cache:
+                # Historique conservé dans le cache disque, rafraîchi par delta
+                history_service = IncrementalHistoryService(openbb_provider, get_cache_manager())
+                historical_data = HistoricalRecords(await history_service.get_series(symbol))
+            else:
+                historical_data = await openbb_provider.get_historical_data(symbol)
             company_info = await openbb_provider.get_company_info(symbol)
             
             market_data = {
@@ -28,7 +28,11 @@ from ..utils import (
 # Imports des services (à adapter selon l'architecture finale)
 # from finagent.business.strategy.strategy_engine import StrategyEngine
 # from finagent.business.strategy.strategy_validator import StrategyValidator
-# from finagent.business.backtest.backtest_engine import BacktestEngine
+from ...business.backtesting import (
+    BacktestConfig, BacktestError, ParameterOptimizer, ParameterSpace, VectorizedBacktester
+)
+from ...business.strategy.parser import StrategyYAMLParser
+from ...data.providers.openbb_provider import OpenBBProvider
 
 console = Console()
 
@@ -309,7 +313,7 @@ def backtest(ctx, strategy_file: str, symbol: Optional[str], start_date: Optiona
 )
 @click.option(
     '--method',
-    type=click.Choice(['grid_search', 'random_search', 'bayesian', 'genetic']),
+    type=click.Choice(['grid_search', 'random_search', 'bayesian']),
     default='grid_search',
     help='Méthode d\'optimisation'
 )
@@ -317,7 +321,7 @@ def backtest(ctx, strategy_file: str, symbol: Optional[str], start_date: Optiona
     '--iterations',
     type=int,
     default=100,
-    help='Nombre d\'itérations (pour random/bayesian/genetic)'
+    help='Nombre d\'itérations (pour random/bayesian)'
 )
 @click.option(
     '--start-date',
@@ -329,6 +333,27 @@ def backtest(ctx, strategy_file: str, symbol: Optional[str], start_date: Optiona
     type=click.DateTime(formats=['%Y-%m-%d']),
     help='Date de fin de l\'optimisation'
 )
+@click.option(
+    '--symbol', '-s',
+    type=SYMBOL,
+    help='Symbole à utiliser (univers de la stratégie par défaut)'
+)
+@click.option(
+    '--walk-forward',
+    type=click.IntRange(min=1),
+    help='Nombre de fenêtres walk-forward'
+)
+@click.option(
+    '--out-of-sample',
+    type=click.FloatRange(min=0.0, max=0.9),
+    default=0.0,
+    help='Part finale de la période réservée au test hors-échantillon'
+)
+@click.option(
+    '--workers',
+    type=click.IntRange(min=1),
+    help='Nombre de processus (tous les cœurs par défaut)'
+)
 @click.option(
     '--save-best',
     type=click.Path(),
@@ -337,7 +362,8 @@ def backtest(ctx, strategy_file: str, symbol: Optional[str], start_date: Optiona
 @click.pass_context
 def optimize(ctx, strategy_file: str, parameters: tuple, objective: str,
             method: str, iterations: int, start_date: Optional[datetime],
-            end_date: Optional[datetime], save_best: Optional[str]):
+            end_date: Optional[datetime], symbol: Optional[str], walk_forward: Optional[int],
+            out_of_sample: float, workers: Optional[int], save_best: Optional[str]):
     """
     Optimise les paramètres d'une stratégie.
     
@@ -346,8 +372,9 @@ def optimize(ctx, strategy_file: str, parameters: tuple, objective: str,
     Exemples:
     \b
         finagent strategy optimize strategies/rsi.yaml -p "rsi_period:10:30:2"
-        finagent strategy optimize strategies/ma.yaml -p "fast_ma:5:20:1" -p "slow_ma:20:50:5"
+        finagent strategy optimize strategies/momentum.yaml -p "sma_crossover_fast_period:5:20:5" -p "sma_crossover_slow_period:30:60:10"
         finagent strategy optimize strategies/bollinger.yaml --method bayesian --iterations 200
+        finagent strategy optimize strategies/rsi.yaml -p "rsi_threshold:20:40:5" --walk-forward 4
     """
     try:
         verbose = ctx.obj.get('verbose', False) if ctx.obj else False
@@ -377,6 +404,10 @@ def optimize(ctx, strategy_file: str, parameters: tuple, objective: str,
             iterations=iterations,
             start_date=start_date,
             end_date=end_date,
+            symbol=symbol,
+            walk_forward=walk_forward,
+            out_of_sample=out_of_sample,
+            workers=workers,
             verbose=verbose
         ))
         
@@ -722,137 +753,194 @@ async def _run_strategy_backtest(strategy_file: str, symbol: Optional[str],
     
     with progress_manager.progress_context() as progress:
         # Étape 1: Chargement de la stratégie
-        load_task = progress.add_task("📖 Chargement stratégie", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.01)
-            progress.update(load_task, advance=1)
+        load_task = progress.add_task("📖 Chargement stratégie", total=1)
+        strategy_model = StrategyYAMLParser().parse_file(strategy_file)
+        symbols = [symbol] if symbol else _strategy_universe(strategy_model)
+        if not symbols:
+            raise BacktestError("Aucun symbole: utilisez --symbol ou définissez l'univers", 
+                                strategy_model.strategy.name)
+        progress.update(load_task, advance=1)
         
-        # Étape 2: Récupération des données historiques
-        data_task = progress.add_task("📊 Récupération données", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.02)
-            progress.update(data_task, advance=1)
+        # Étape 2: Récupération des données historiques (un téléchargement groupé)
+        data_task = progress.add_task("📊 Récupération données", total=1)
+        provider = OpenBBProvider()
+        histories = await provider.get_historical_batch(
+            [*dict.fromkeys(symbols + [benchmark])],
+            period=_history_period(start_date),
+            interval="1d",
+            output="series"
+        )
+        data = {s: histories[s] for s in symbols if s in histories}
+        if not data:
+            raise BacktestError(f"Aucun historique disponible pour {', '.join(symbols)}",
+                                strategy_model.strategy.name)
+        progress.update(data_task, advance=1)
         
         # Étape 3: Exécution du backtest
-        backtest_task = progress.add_task("🔄 Exécution backtest", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.03)
-            progress.update(backtest_task, advance=1)
-        
-        # Étape 4: Calcul des métriques
-        metrics_task = progress.add_task("📈 Calcul métriques", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.02)
-            progress.update(metrics_task, advance=1)
+        backtest_task = progress.add_task("🔄 Exécution backtest", total=1)
+        config = BacktestConfig.from_strategy(
+            strategy_model,
+            initial_capital=initial_capital,
+            commission=commission,
+            slippage=slippage,
+            start_date=start_date,
+            end_date=end_date
+        )
+        result = VectorizedBacktester().run(strategy_model, data, config, benchmark=histories.get(benchmark))
+        progress.update(backtest_task, advance=1)
     
-    # Simulation de résultats de backtest
-    total_days = (end_date - start_date).days
+    metrics = result.metrics
+    trades = result.trades
+    wins = trades['return'][trades['pnl'] > 0]
+    losses = trades['return'][trades['pnl'] < 0]
+    benchmark_return = metrics['benchmark_return']
     
     return {
         "strategy_file": strategy_file,
-        "symbol": symbol or "AAPL",  # Symbole par défaut
+        "symbol": ", ".join(result.symbols),
         "period": {
             "start_date": start_date,
             "end_date": end_date,
-            "total_days": total_days
+            "total_days": (end_date - start_date).days
         },
         "capital": {
             "initial": initial_capital,
-            "final": initial_capital * 1.187,  # +18.7% simulé
-            "peak": initial_capital * 1.243,
-            "trough": initial_capital * 0.912
+            "final": result.final_equity,
+            "peak": float(result.equity.max()),
+            "trough": float(result.equity.min())
         },
         "performance": {
-            "total_return": 0.187,
-            "annualized_return": 0.156,
-            "volatility": 0.184,
-            "sharpe_ratio": 1.23,
-            "sortino_ratio": 1.67,
-            "calmar_ratio": 1.95,
-            "max_drawdown": -0.088,
-            "win_rate": 0.64,
-            "profit_factor": 1.85
+            "total_return": metrics['total_return'],
+            "annualized_return": metrics['annualized_return'],
+            "volatility": metrics['volatility'],
+            "sharpe_ratio": metrics['sharpe_ratio'],
+            "sortino_ratio": metrics['sortino_ratio'],
+            "calmar_ratio": metrics['calmar_ratio'],
+            "max_drawdown": -metrics['max_drawdown'],
+            "win_rate": metrics['win_rate'],
+            "profit_factor": metrics['profit_factor']
         },
         "benchmark_comparison": {
             "benchmark": benchmark,
-            "benchmark_return": 0.134,
-            "excess_return": 0.053,
-            "tracking_error": 0.045,
-            "information_ratio": 1.18,
-            "beta": 1.05,
-            "alpha": 0.021
+            "benchmark_return": benchmark_return,
+            "excess_return": metrics['total_return'] - benchmark_return if benchmark_return is not None else None,
+            "tracking_error": metrics['tracking_error'],
+            "information_ratio": metrics['information_ratio'],
+            "beta": metrics['beta'],
+            "alpha": metrics['alpha']
         },
         "trade_statistics": {
-            "total_trades": 47,
-            "winning_trades": 30,
-            "losing_trades": 17,
-            "avg_win": 0.034,
-            "avg_loss": -0.019,
-            "largest_win": 0.087,
-            "largest_loss": -0.054
+            "total_trades": metrics['trades_count'],
+            "winning_trades": metrics['profitable_trades'],
+            "losing_trades": metrics['losing_trades'],
+            "avg_win": float(wins.mean()) if len(wins) else 0.0,
+            "avg_loss": float(losses.mean()) if len(losses) else 0.0,
+            "largest_win": float(wins.max()) if len(wins) else 0.0,
+            "largest_loss": float(losses.min()) if len(losses) else 0.0
         },
         "costs": {
-            "total_commission": initial_capital * commission * 47,  # 47 trades
-            "total_slippage": initial_capital * slippage * 47,
-            "total_costs": initial_capital * (commission + slippage) * 47
+            "total_commission": result.costs['commission'],
+            "total_slippage": result.costs['slippage'],
+            "total_costs": result.costs['total']
         }
     }
 
 
+def _strategy_universe(strategy_model) -> List[str]:
+    """Symboles de l'univers d'une stratégie (watchlist ou instruments)."""
+    universe = strategy_model.universe
+    if not universe:
+        return []
+    if universe.watchlist:
+        return [s.upper() for s in universe.watchlist]
+    return [instrument.symbol.upper() for instrument in universe.instruments or []]
+
+
+def _history_period(start_date: datetime) -> str:
+    """Période yfinance couvrant le backtest et un an de chauffe des indicateurs."""
+    years = ((datetime.now() - start_date).days + 365) / 365.25
+    for period, span in (("2y", 2), ("5y", 5), ("10y", 10)):
+        if years <= span:
+            return period
+    return "max"
+
+
 async def _optimize_strategy_parameters(strategy_file: str, parameters: Dict[str, Dict],
                                       objective: str, method: str, iterations: int,
                                       start_date: datetime, end_date: datetime,
+                                      symbol: Optional[str], walk_forward: Optional[int],
+                                      out_of_sample: float, workers: Optional[int],
                                       verbose: bool) -> Dict[str, Any]:
     """Optimise les paramètres d'une stratégie."""
     
     with progress_manager.progress_context() as progress:
-        # Initialisation
-        init_task = progress.add_task("⚙️  Initialisation optimisation", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.01)
-            progress.update(init_task, advance=1)
+        # Étape 1: Chargement de la stratégie et de l'espace de recherche
+        load_task = progress.add_task("📖 Chargement stratégie", total=1)
+        strategy_model = StrategyYAMLParser().parse_file(strategy_file)
+        space = ParameterSpace.from_dict(parameters)
+        symbols = [symbol] if symbol else _strategy_universe(strategy_model)
+        if not symbols:
+            raise BacktestError("Aucun symbole: utilisez --symbol ou définissez l'univers",
+                                strategy_model.strategy.name)
+        progress.update(load_task, advance=1)
         
-        # Optimisation des paramètres
-        optim_task = progress.add_task(f"🔄 Optimisation ({method})", total=iterations)
-        for i in range(iterations):
-            await asyncio.sleep(0.05)  # Simulation d'une itération
-            progress.update(optim_task, advance=1)
+        # Étape 2: Récupération des données historiques (un téléchargement groupé)
+        data_task = progress.add_task("📊 Récupération données", total=1)
+        histories = await OpenBBProvider().get_historical_batch(
+            symbols, period=_history_period(start_date), interval="1d", output="series"
+        )
+        data = {s: histories[s] for s in symbols if s in histories}
+        if not data:
+            raise BacktestError(f"Aucun historique disponible pour {', '.join(symbols)}",
+                                strategy_model.strategy.name)
+        progress.update(data_task, advance=1)
         
-        # Évaluation finale
-        eval_task = progress.add_task("📊 Évaluation résultats", total=100)
-        for i in range(100):
-            await asyncio.sleep(0.01)
-            progress.update(eval_task, advance=1)
+        # Étape 3: Backtests parallèles des combinaisons
+        optim_task = progress.add_task(f"🔄 Optimisation ({method})", total=1)
+        config = BacktestConfig.from_strategy(strategy_model, start_date=start_date, end_date=end_date)
+        result = ParameterOptimizer(workers=workers).optimize(
+            strategy_model, data, space,
+            method=_OPTIMIZATION_METHODS[method],
+            objective=objective,
+            iterations=iterations,
+            config=config,
+            walk_forward=walk_forward,
+            out_of_sample=out_of_sample
+        )
+        progress.update(optim_task, advance=1)
     
-    # Simulation de résultats d'optimisation
     return {
         "strategy_file": strategy_file,
         "method": method,
         "objective": objective,
-        "iterations": iterations,
-        "best_parameters": {
-            "rsi_period": 16,  # exemple
-            "sma_period": 22,
-            "stop_loss": 0.065,
-            "take_profit": 0.125
-        },
-        "best_performance": {
-            objective: 1.67,  # valeur optimisée
-            "total_return": 0.234,
-            "max_drawdown": -0.067,
-            "win_rate": 0.68
-        },
-        "optimization_history": [
-            {"iteration": 1, objective: 1.23},
-            {"iteration": 25, objective: 1.45},
-            {"iteration": 50, objective: 1.58},
-            {"iteration": 75, objective: 1.64},
-            {"iteration": 100, objective: 1.67}
-        ],
-        "parameter_sensitivity": {
-            "rsi_period": {"min": 1.12, "max": 1.67, "optimal": 16},
-            "sma_period": {"min": 1.05, "max": 1.58, "optimal": 22}
-        }
+        "iterations": len(result.trials),
+        "workers": result.metadata['workers'],
+        "best_parameters": result.best_parameters,
+        "best_performance": _optimization_performance(result.best_metrics, objective),
+        "out_of_sample": _optimization_performance(result.out_of_sample, objective),
+        "optimization_history": result.to_frame().head(10).to_dict('records'),
+        "parameter_sensitivity": result.parameter_sensitivity()
+    }
+
+
+# Méthodes de la CLI vers celles de l'optimiseur
+_OPTIMIZATION_METHODS = {
+    'grid_search': 'grid',
+    'random_search': 'random',
+    'bayesian': 'bayesian'
+}
+
+
+def _optimization_performance(metrics: Optional[Dict[str, Any]], objective: str) -> Optional[Dict[str, Any]]:
+    """Métriques affichées d'une combinaison (drawdown négatif, comme le backtest)."""
+    if metrics is None:
+        return None
+    return {
+        objective: metrics.get(objective),
+        "total_return": metrics.get('total_return'),
+        "max_drawdown": -metrics['max_drawdown'] if metrics.get('max_drawdown') is not None else None,
+        "win_rate": metrics.get('win_rate'),
+        "trades_count": metrics.get('trades_count')
     }
 
 
@@ -1021,7 +1109,7 @@ def _display_backtest_result(backtest_result: Dict[str, Any]) -> None:
         f"💰 Capital: ${backtest_result['capital']['initial']:,.0f} → "
         f"${backtest_result['capital']['final']:,.0f}\n"
         f"📈 Rendement Total: [green]{backtest_result['performance']['total_return']:.1%}[/green]\n"
-        f"📊 Ratio de Sharpe: [cyan]{backtest_result['performance']['sharpe_ratio']:.2f}[/cyan]",
+        f"📊 Ratio de Sharpe: [cyan]{_format_optional(backtest_result['performance']['sharpe_ratio'], '.2f')}[/cyan]",
         title="🔬 Backtest",
         border_style="blue"
     ))
@@ -1036,10 +1124,10 @@ def _display_backtest_result(backtest_result: Dict[str, Any]) -> None:
     bench = backtest_result['benchmark_comparison']
     
     metrics = [
-        ("Rendement Total", f"{perf['total_return']:.1%}", f"{bench['benchmark_return']:.1%}"),
+        ("Rendement Total", f"{perf['total_return']:.1%}", _format_optional(bench['benchmark_return'], ".1%")),
         ("Rendement Annualisé", f"{perf['annualized_return']:.1%}", "-"),
         ("Volatilité", f"{perf['volatility']:.1%}", "-"),
-        ("Ratio de Sharpe", f"{perf['sharpe_ratio']:.2f}", "-"),
+        ("Ratio de Sharpe", _format_optional(perf['sharpe_ratio'], ".2f"), "-"),
         ("Drawdown Max", f"{perf['max_drawdown']:.1%}", "-"),
         ("Taux de Gain", f"{perf['win_rate']:.1%}", "-")
     ]
@@ -1051,14 +1139,23 @@ def _display_backtest_result(backtest_result: Dict[str, Any]) -> None:
     console.print(table)
 
 
+def _format_optional(value: Optional[float], fmt: str) -> str:
+    """Formate une métrique éventuellement indéfinie (ratio sans volatilité...)."""
+    return "-" if value is None else format(value, fmt)
+
+
 def _display_optimization_result(optimization_result: Dict[str, Any]) -> None:
     """Affiche les résultats d'optimisation."""
+    objective = optimization_result['objective']
+    best_performance = optimization_result['best_performance']
+    out_of_sample = optimization_result.get('out_of_sample')
     console.print(Panel.fit(
         f"⚙️  [bold]Optimisation Terminée[/bold]\n\n"
         f"🎯 Objectif: {optimization_result['objective']}\n"
         f"🔄 Méthode: {optimization_result['method']}\n"
         f"📊 Itérations: {optimization_result['iterations']}\n"
-        f"🏆 Meilleur Score: [green]{optimization_result['best_performance'][optimization_result['objective']]:.2f}[/green]",
+        f"🏆 Meilleur Score: [green]{_format_optional(best_performance[objective] if best_performance else None, '.2f')}[/green]\n"
+        f"🧪 Hors-échantillon: {_format_optional(out_of_sample[objective] if out_of_sample else None, '.2f')}",
         title="⚙️  Optimisation",
         border_style="green"
     ))
@@ -6,11 +6,17 @@ tags, et invalidation intelligente.
 """
 
 import asyncio
+import heapq
 import json
-import pickle
+import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Union
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 from abc import ABC, abstractmethod
 import hashlib
 import logging
@@ -41,15 +47,29 @@ class CacheKeys:
         """Génère une clé pour les indicateurs techniques."""
         return f"indicators:{symbol}:{timeframe}:{indicators}"
     
+    @staticmethod
+    def indicator(symbol: str, timeframe: str, name: str) -> str:
+        """Génère une clé pour un indicateur technique unique."""
+        return f"indicator:{symbol}:{timeframe}:{name}"
+    
     @staticmethod
     def company_info(symbol: str) -> str:
         """Génère une clé pour les informations d'entreprise."""
         return f"company_info:{symbol}"
     
     @staticmethod
-    def historical_data(symbol: str, start: str, end: str, timeframe: str) -> str:
+    def historical_data(symbol: str, start: str, end: str, timeframe: str,
+                        limit: Optional[int] = None) -> str:
         """Génère une clé pour les données historiques."""
-        return f"historical:{symbol}:{start}:{end}:{timeframe}"
+        key = f"historical:{symbol}:{start}:{end}:{timeframe}"
+        if limit is not None:
+            key = f"{key}:{limit}"
+        return key
+
+    @staticmethod
+    def historical_series(symbol: str, start: str, end: str, timeframe: str) -> str:
+        """Génère une clé pour un historique en colonnes (BarSeries)."""
+        return f"historical_series:{symbol}:{start}:{end}:{timeframe}"
 
 
 class CacheTags:
@@ -60,6 +80,7 @@ class CacheTags:
     HISTORICAL = "historical"
     NEWS = "news"
     INDICATORS = "indicators"
+    TECHNICAL_INDICATORS = INDICATORS
     COMPANY = "company"
     
     @staticmethod
@@ -83,6 +104,55 @@ class CacheTags:
         return f"source:{source}"
 
 
+class RequestCoalescer:
+    """
+    Regroupement des requêtes concurrentes identiques (single-flight).
+    
+    Tant qu'une requête pour une clé est en cours, les appels suivants
+    pour la même clé attendent son résultat au lieu de relancer un appel
+    au provider.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced_count = 0
+    
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute ``factory`` une seule fois pour toutes les requêtes concurrentes.
+        
+        Args:
+            key: Clé identifiant la requête
+            factory: Coroutine à exécuter si aucune requête n'est en cours
+            
+        Returns:
+            Résultat partagé de la requête
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._release(k, t))
+        else:
+            self.coalesced_count += 1
+        
+        # shield: l'annulation d'un appelant n'interrompt pas les autres
+        return await asyncio.shield(task)
+    
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        """Libère la clé une fois la requête terminée."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Marque l'exception comme récupérée si tous les appelants sont partis
+            task.exception()
+    
+    @property
+    def inflight_count(self) -> int:
+        """Nombre de requêtes actuellement en cours."""
+        return len(self._inflight)
+
+
 class CacheItem:
     """Élément de cache avec métadonnées."""
     
@@ -99,6 +169,11 @@ class CacheItem:
         """Vérifie si l'élément a expiré."""
         return time.time() - self.created_at > self.ttl
     
+    @property
+    def expires_at(self) -> float:
+        """Timestamp d'expiration de l'élément."""
+        return self.created_at + self.ttl
+    
     @property
     def age_seconds(self) -> int:
         """Âge de l'élément en secondes."""
@@ -145,12 +220,29 @@ class BaseCacheBackend(ABC):
 
 
 class MemoryCacheBackend(BaseCacheBackend):
-    """Backend de cache en mémoire simple."""
+    """
+    Backend de cache en mémoire.
+    
+    Structure:
+    - ``OrderedDict`` trié par ordre d'accès (LRU en O(1))
+    - index inverse tag -> clés (invalidation par tag sans parcours complet)
+    - tas min des expirations (purge proactive en O(log n))
+    """
     
     def __init__(self, max_size: int = 1000):
-        self.cache: Dict[str, CacheItem] = {}
+        self.cache: "OrderedDict[str, CacheItem]" = OrderedDict()
         self.max_size = max_size
         self._lock = asyncio.Lock()
+        
+        # Index inverse tag -> clés
+        self._tag_index: Dict[str, Set[str]] = {}
+        # Tas (expires_at, key); les entrées obsolètes sont ignorées au dépilage
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
+        # Statistiques maintenues incrémentalement
+        self._total_accesses = 0
+        self.evictions = 0
+        self.expirations = 0
     
     async def get(self, key: str) -> Optional[Any]:
         """Récupère une valeur du cache."""
@@ -160,26 +252,38 @@ class MemoryCacheBackend(BaseCacheBackend):
                 return None
             
             if item.is_expired:
-                del self.cache[key]
+                self._remove(key)
+                self.expirations += 1
                 return None
             
+            self.cache.move_to_end(key)
+            self._total_accesses += 1
             return item.access()
     
     async def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
         """Stocke une valeur dans le cache."""
         async with self._lock:
-            # Éviction si nécessaire
-            if len(self.cache) >= self.max_size:
-                await self._evict_lru()
+            if key in self.cache:
+                self._remove(key)
+            else:
+                # Libère d'abord les éléments expirés, puis évince le LRU
+                self._purge_expired()
+                while len(self.cache) >= self.max_size and self.cache:
+                    self._evict_lru()
             
-            self.cache[key] = CacheItem(value, ttl, tags)
+            item = CacheItem(value, ttl, tags)
+            self.cache[key] = item
+            for tag in item.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            heapq.heappush(self._expiry_heap, (item.expires_at, key))
+            self._compact_heap()
             return True
     
     async def delete(self, key: str) -> bool:
         """Supprime une clé du cache."""
         async with self._lock:
             if key in self.cache:
-                del self.cache[key]
+                self._remove(key)
                 return True
             return False
     
@@ -188,6 +292,9 @@ class MemoryCacheBackend(BaseCacheBackend):
         async with self._lock:
             count = len(self.cache)
             self.cache.clear()
+            self._tag_index.clear()
+            self._expiry_heap.clear()
+            self._total_accesses = 0
             return count
     
     async def exists(self, key: str) -> bool:
@@ -198,7 +305,8 @@ class MemoryCacheBackend(BaseCacheBackend):
                 return False
             
             if item.is_expired:
-                del self.cache[key]
+                self._remove(key)
+                self.expirations += 1
                 return False
             
             return True
@@ -206,43 +314,643 @@ class MemoryCacheBackend(BaseCacheBackend):
     async def invalidate_by_tag(self, tag: str) -> int:
         """Invalide tous les éléments avec un tag spécifique."""
         async with self._lock:
-            keys_to_delete = []
-            for key, item in self.cache.items():
-                if item.has_tag(tag):
-                    keys_to_delete.append(key)
+            keys_to_delete = list(self._tag_index.get(tag, ()))
             
             for key in keys_to_delete:
-                del self.cache[key]
+                self._remove(key)
             
             return len(keys_to_delete)
     
-    async def _evict_lru(self) -> None:
+    def _remove(self, key: str) -> Optional[CacheItem]:
+        """Retire une clé du cache et de l'index des tags."""
+        item = self.cache.pop(key, None)
+        if item is None:
+            return None
+        
+        for tag in item.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        
+        self._total_accesses -= item.access_count
+        # L'entrée du tas devient obsolète et sera ignorée au dépilage
+        return item
+    
+    def _evict_lru(self) -> None:
         """Évince l'élément le moins récemment utilisé."""
         if not self.cache:
             return
         
-        # Trouve l'élément le moins récemment accédé
-        lru_key = min(self.cache.keys(), 
-                     key=lambda k: self.cache[k].last_accessed)
-        del self.cache[lru_key]
+        lru_key = next(iter(self.cache))
+        self._remove(lru_key)
+        self.evictions += 1
+    
+    def _purge_expired(self) -> int:
+        """
+        Supprime les éléments expirés en tête du tas.
+        
+        Returns:
+            Nombre d'éléments supprimés
+        """
+        now = time.time()
+        purged = 0
+        heap = self._expiry_heap
+        
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            item = self.cache.get(key)
+            # Ignore les entrées obsolètes (clé supprimée ou réécrite)
+            if item is not None and item.expires_at == expires_at:
+                self._remove(key)
+                purged += 1
+        
+        self.expirations += purged
+        return purged
+    
+    def _compact_heap(self) -> None:
+        """Reconstruit le tas lorsqu'il contient trop d'entrées obsolètes."""
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                (item.expires_at, key) for key, item in self.cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
     
     async def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du cache."""
         async with self._lock:
+            expired_items = self._purge_expired()
             total_items = len(self.cache)
-            expired_items = sum(1 for item in self.cache.values() if item.is_expired)
-            total_accesses = sum(item.access_count for item in self.cache.values())
             
             return {
                 'total_items': total_items,
                 'expired_items': expired_items,
-                'active_items': total_items - expired_items,
-                'total_accesses': total_accesses,
+                'active_items': total_items,
+                'total_accesses': self._total_accesses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'tags': len(self._tag_index),
                 'max_size': self.max_size,
                 'utilization': total_items / self.max_size if self.max_size > 0 else 0
             }
 
 
+class CacheCodec:
+    """
+    Encodage binaire compact des valeurs du cache persistant.
+    
+    Format: 1 octet de type, 1 octet de drapeaux, puis la charge utile.
+    - ``J``: JSON (types natifs, tuples, Decimal et datetime inclus)
+    - ``M``: modèle pydantic autorisé (nom de classe + JSON du modèle)
+    - ``N``: tableau NumPy (en-tête dtype/shape + buffer brut)
+    - ``B``: série de barres columnar (en-tête + colonnes brutes)
+    
+    Aucun code n'est chargé depuis le fichier de cache: seuls les modèles
+    de ``finagent.data.models`` et ceux enregistrés par
+    :meth:`register_model` sont décodés. Les autres types lèvent
+    ``TypeError`` à l'encodage.
+    
+    Les charges utiles supérieures à ``compress_threshold`` sont
+    compressées avec zlib.
+    """
+    
+    FLAG_ZLIB = 0x01
+    
+    # Modèles pydantic autorisés: "module:classe" -> classe
+    _models: Dict[str, type] = {}
+    _default_models_loaded = False
+    
+    def __init__(self, compress_threshold: int = 1024, compress_level: int = 3):
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+    
+    def encode(self, value: Any) -> bytes:
+        """
+        Encode une valeur en octets.
+        
+        Args:
+            value: Valeur à encoder
+            
+        Returns:
+            Représentation binaire
+        """
+        kind, payload = self._encode_payload(value)
+        
+        flags = 0
+        if len(payload) > self.compress_threshold:
+            payload = zlib.compress(payload, self.compress_level)
+            flags |= self.FLAG_ZLIB
+        
+        return kind + bytes((flags,)) + payload
+    
+    def decode(self, blob: bytes) -> Any:
+        """
+        Décode une valeur encodée par :meth:`encode`.
+        
+        Args:
+            blob: Représentation binaire
+            
+        Returns:
+            Valeur d'origine
+        """
+        kind, flags, payload = blob[:1], blob[1], blob[2:]
+        if flags & self.FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        
+        if kind == b"J":
+            return json.loads(payload, object_hook=self._json_object_hook)
+        
+        if kind == b"M":
+            header, body = payload.split(b"\n", 1)
+            model_cls = self._allowed_models().get(header.decode())
+            if model_cls is None:
+                raise ValueError(f"Modèle non autorisé dans le cache: {header.decode()}")
+            return model_cls.model_validate_json(body)
+        
+        if kind == b"B":
+            return self._decode_bar_series(payload)
+        
+        if kind == b"N":
+            import numpy as np
+            header, body = payload.split(b"\n", 1)
+            meta = json.loads(header)
+            return np.frombuffer(body, dtype=np.dtype(meta["dtype"])).reshape(meta["shape"]).copy()
+        
+        raise ValueError(f"Type d'encodage inconnu: {kind!r}")
+    
+    @classmethod
+    def register_model(cls, model_cls: type) -> type:
+        """
+        Autorise une classe de modèle pydantic dans le cache persistant.
+        
+        Utilisable comme décorateur.
+        """
+        cls._models[cls._model_key(model_cls)] = model_cls
+        return model_cls
+    
+    @staticmethod
+    def _model_key(model_cls: type) -> str:
+        return f"{model_cls.__module__}:{model_cls.__qualname__}"
+    
+    @classmethod
+    def _allowed_models(cls) -> Dict[str, type]:
+        """Modèles exportés par ``finagent.data.models`` et modèles enregistrés."""
+        if not cls._default_models_loaded:
+            from . import models
+            for name in models.__all__:
+                model_cls = getattr(models, name)
+                if isinstance(model_cls, type) and hasattr(model_cls, "model_validate_json"):
+                    cls._models.setdefault(cls._model_key(model_cls), model_cls)
+            cls._default_models_loaded = True
+        return cls._models
+    
+    def _encode_payload(self, value: Any) -> Tuple[bytes, bytes]:
+        """Sélectionne l'encodage le plus compact pour une valeur."""
+        model_dump_json = getattr(value, "model_dump_json", None)
+        if model_dump_json is not None:
+            key = self._model_key(type(value))
+            if key not in self._allowed_models():
+                raise TypeError(f"Modèle non autorisé dans le cache persistant: {key}")
+            return b"M", key.encode() + b"\n" + model_dump_json().encode()
+        
+        if type(value).__name__ == "BarSeries":
+            return b"B", self._encode_bar_series(value)
+        
+        if type(value).__name__ == "ndarray" and value.dtype.kind in "biufcmM":
+            header = json.dumps({"dtype": value.dtype.str, "shape": list(value.shape)})
+            return b"N", header.encode() + b"\n" + value.tobytes()
+        
+        if self._is_json_safe(value):
+            payload = json.dumps(self._to_json(value), default=self._json_default, separators=(",", ":"))
+            return b"J", payload.encode()
+        
+        raise TypeError(f"Type non pris en charge par le cache persistant: {type(value).__name__}")
+    
+    @staticmethod
+    def _encode_bar_series(series: Any) -> bytes:
+        """Encode une BarSeries colonne par colonne."""
+        has_adjusted = series.adjusted_close is not None
+        header = json.dumps({
+            "symbol": series.symbol,
+            "timeframe": series.timeframe.value,
+            "length": len(series),
+            "adjusted": has_adjusted
+        })
+        columns = [
+            series.timestamps.view("int64"), series.open, series.high,
+            series.low, series.close, series.volume
+        ]
+        if has_adjusted:
+            columns.append(series.adjusted_close)
+        return header.encode() + b"\n" + b"".join(c.tobytes() for c in columns)
+    
+    @staticmethod
+    def _decode_bar_series(payload: bytes) -> Any:
+        """Décode une BarSeries encodée par :meth:`_encode_bar_series`."""
+        import numpy as np
+        from .models.base import TimeFrame
+        from .models.bar_series import BarSeries
+        
+        header, body = payload.split(b"\n", 1)
+        meta = json.loads(header)
+        length = meta["length"]
+        count = 7 if meta["adjusted"] else 6
+        columns = np.frombuffer(body, dtype=np.uint8)
+        stride = length * 8
+        raw = [columns[i * stride:(i + 1) * stride] for i in range(count)]
+        
+        return BarSeries(
+            symbol=meta["symbol"],
+            timeframe=TimeFrame(meta["timeframe"]),
+            timestamps=raw[0].view(np.int64).view("datetime64[ns]"),
+            open=raw[1].view(np.float64),
+            high=raw[2].view(np.float64),
+            low=raw[3].view(np.float64),
+            close=raw[4].view(np.float64),
+            volume=raw[5].view(np.int64),
+            adjusted_close=raw[6].view(np.float64) if meta["adjusted"] else None
+        )
+    
+    @classmethod
+    def _is_json_safe(cls, value: Any) -> bool:
+        """Vérifie qu'une valeur survit à un aller-retour JSON sans perte de type."""
+        value_type = type(value)
+        if value is None or value_type in (str, int, float, bool, Decimal, datetime):
+            return True
+        if value_type in (list, tuple):
+            return all(cls._is_json_safe(v) for v in value)
+        if value_type is dict:
+            return all(
+                type(k) is not list and cls._is_json_safe(k) and cls._is_json_safe(v)
+                for k, v in value.items()
+            )
+        return False
+    
+    @classmethod
+    def _to_json(cls, value: Any) -> Any:
+        """Marque les tuples et les dictionnaires à clés non textuelles."""
+        value_type = type(value)
+        if value_type is list:
+            return [cls._to_json(v) for v in value]
+        if value_type is tuple:
+            return {"__tuple__": [cls._to_json(v) for v in value]}
+        if value_type is dict:
+            if all(type(k) is str for k in value):
+                return {k: cls._to_json(v) for k, v in value.items()}
+            return {"__items__": [[cls._to_json(k), cls._to_json(v)] for k, v in value.items()]}
+        return value
+    
+    @staticmethod
+    def _json_default(obj: Any) -> Any:
+        """Sérialise les types non natifs JSON."""
+        if isinstance(obj, Decimal):
+            return {"__decimal__": str(obj)}
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.isoformat()}
+        raise TypeError(f"Type non sérialisable en JSON: {type(obj).__name__}")
+    
+    @staticmethod
+    def _json_object_hook(obj: Dict[str, Any]) -> Any:
+        """Restaure les types encodés par :meth:`_json_default`."""
+        if len(obj) == 1:
+            if "__decimal__" in obj:
+                return Decimal(obj["__decimal__"])
+            if "__datetime__" in obj:
+                return datetime.fromisoformat(obj["__datetime__"])
+            if "__tuple__" in obj:
+                return tuple(obj["__tuple__"])
+            if "__items__" in obj:
+                return {k: v for k, v in obj["__items__"]}
+        return obj
+
+
+class SQLiteCacheBackend(BaseCacheBackend):
+    """
+    Backend de cache persistant sur disque (SQLite).
+    
+    Destiné au niveau L2: survit aux redémarrages du processus afin
+    que les démarrages à chaud lisent le disque plutôt que le réseau.
+    Supporte TTL, tags et éviction LRU bornée en taille.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            last_accessed REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at);
+        CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache_entries(last_accessed);
+        CREATE TABLE IF NOT EXISTS cache_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL,
+            PRIMARY KEY (tag, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key);
+    """
+    
+    def __init__(self,
+                 directory: str = "./data/cache",
+                 max_size_mb: int = 100,
+                 filename: str = "l2_cache.db",
+                 codec: Optional[CacheCodec] = None):
+        """
+        Initialise le backend persistant.
+        
+        Args:
+            directory: Répertoire du fichier de cache
+            max_size_mb: Taille maximale des valeurs stockées (Mo)
+            filename: Nom du fichier SQLite
+            codec: Encodeur des valeurs (CacheCodec par défaut)
+        """
+        self.path = Path(directory) / filename
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.codec = codec or CacheCodec()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._db_lock = threading.Lock()
+        
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        self._total_bytes = int(row[0])
+        self.evictions = 0
+        
+        # Derniers accès en attente d'écriture (clé -> horodatage)
+        self.touch_batch_size = 256
+        self._touched: Dict[str, float] = {}
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Récupère une valeur du cache."""
+        blob = await asyncio.to_thread(self._get_sync, key)
+        if blob is None:
+            return None
+        
+        try:
+            return self.codec.decode(blob)
+        except Exception as e:
+            logger.warning(f"Entrée de cache illisible {key}: {e}")
+            await self.delete(key)
+            return None
+    
+    async def get_entry(self, key: str) -> Optional[Tuple[Any, int, List[str]]]:
+        """
+        Récupère une valeur avec son TTL restant et ses tags.
+        
+        Utilisé pour la remontée en L1 sans allonger la durée de vie.
+        
+        Args:
+            key: Clé à rechercher
+            
+        Returns:
+            Tuple (valeur, TTL restant en secondes, tags) ou None
+        """
+        entry = await asyncio.to_thread(self._get_entry_sync, key)
+        if entry is None:
+            return None
+        
+        blob, remaining_ttl, tags = entry
+        try:
+            return self.codec.decode(blob), remaining_ttl, tags
+        except Exception as e:
+            logger.warning(f"Entrée de cache illisible {key}: {e}")
+            await self.delete(key)
+            return None
+    
+    async def set(self, key: str, value: Any, ttl: int = 3600, tags: Optional[List[str]] = None) -> bool:
+        """Stocke une valeur dans le cache (ignorée si son type n'est pas encodable)."""
+        try:
+            blob = self.codec.encode(value)
+        except TypeError as e:
+            logger.warning(f"Valeur non persistée pour {key}: {e}")
+            return False
+        return await asyncio.to_thread(self._set_sync, key, blob, ttl, list(tags or []))
+    
+    async def delete(self, key: str) -> bool:
+        """Supprime une clé du cache."""
+        return await asyncio.to_thread(self._delete_sync, key)
+    
+    async def clear(self) -> int:
+        """Vide complètement le cache."""
+        return await asyncio.to_thread(self._clear_sync)
+    
+    async def exists(self, key: str) -> bool:
+        """Vérifie si une clé existe."""
+        return await asyncio.to_thread(self._exists_sync, key)
+    
+    async def invalidate_by_tag(self, tag: str) -> int:
+        """Invalide tous les éléments avec un tag spécifique."""
+        return await asyncio.to_thread(self._invalidate_tag_sync, tag)
+    
+    async def purge_expired(self) -> int:
+        """
+        Supprime les éléments expirés.
+        
+        Returns:
+            Nombre d'éléments supprimés
+        """
+        return await asyncio.to_thread(self._purge_expired_sync)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache."""
+        return await asyncio.to_thread(self._stats_sync)
+    
+    def close(self) -> None:
+        """Ferme la connexion SQLite (accès en attente écrits)."""
+        with self._db_lock:
+            self._flush_touches_locked()
+            self._conn.commit()
+            self._conn.close()
+    
+    # Opérations synchrones exécutées dans un thread
+    
+    def _get_sync(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                # Entrée expirée supprimée à la prochaine purge
+                return None
+            
+            # Accès LRU enregistrés en mémoire, écrits avec la prochaine écriture
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch_size:
+                self._flush_touches_locked()
+                self._conn.commit()
+            return row[0]
+    
+    def _get_entry_sync(self, key: str) -> Optional[Tuple[bytes, int, List[str]]]:
+        now = time.time()
+        blob = self._get_sync(key)
+        if blob is None:
+            return None
+        
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            tags = [r[0] for r in self._conn.execute(
+                "SELECT tag FROM cache_tags WHERE key = ?", (key,)
+            )]
+        
+        remaining_ttl = max(1, int(row[0] - now)) if row else 1
+        return blob, remaining_ttl, tags
+    
+    def _set_sync(self, key: str, blob: bytes, ttl: int, tags: List[str]) -> bool:
+        now = time.time()
+        size = len(blob)
+        with self._db_lock:
+            self._flush_touches_locked()
+            self._delete_locked(key)
+            self._conn.execute(
+                "INSERT INTO cache_entries (key, value, expires_at, last_accessed, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), now + ttl, now, size)
+            )
+            if tags:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags]
+                )
+            self._total_bytes += size
+            
+            if self._total_bytes > self.max_size_bytes:
+                self._enforce_size_locked()
+            
+            self._conn.commit()
+            return True
+    
+    def _delete_sync(self, key: str) -> bool:
+        with self._db_lock:
+            deleted = self._delete_locked(key)
+            self._conn.commit()
+            return deleted
+    
+    def _clear_sync(self) -> int:
+        with self._db_lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("DELETE FROM cache_tags")
+            self._touched.clear()
+            self._conn.commit()
+            self._total_bytes = 0
+            return count
+    
+    def _exists_sync(self, key: str) -> bool:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cache_entries WHERE key = ? AND expires_at >= ?",
+                (key, time.time())
+            ).fetchone()
+            return row is not None
+    
+    def _invalidate_tag_sync(self, tag: str) -> int:
+        with self._db_lock:
+            keys = [row[0] for row in self._conn.execute(
+                "SELECT key FROM cache_tags WHERE tag = ?", (tag,)
+            )]
+            for key in keys:
+                self._delete_locked(key)
+            self._conn.commit()
+            return len(keys)
+    
+    def _purge_expired_sync(self) -> int:
+        with self._db_lock:
+            purged = self._purge_expired_locked()
+            self._conn.commit()
+            return purged
+    
+    def _stats_sync(self) -> Dict[str, Any]:
+        with self._db_lock:
+            total_items, expired_items = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at < ?), 0) FROM cache_entries",
+                (time.time(),)
+            ).fetchone()
+            
+            return {
+                'total_items': total_items,
+                'expired_items': expired_items,
+                'active_items': total_items - expired_items,
+                'size_bytes': self._total_bytes,
+                'max_size_bytes': self.max_size_bytes,
+                'evictions': self.evictions,
+                'utilization': self._total_bytes / self.max_size_bytes if self.max_size_bytes > 0 else 0,
+                'path': str(self.path)
+            }
+    
+    def _delete_locked(self, key: str) -> bool:
+        """Supprime une entrée et ses tags (verrou déjà acquis)."""
+        row = self._conn.execute(
+            "SELECT size FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False
+        
+        self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+        self._touched.pop(key, None)
+        self._total_bytes -= row[0]
+        return True
+    
+    def _flush_touches_locked(self) -> None:
+        """Écrit les derniers accès en attente en une seule requête (verrou déjà acquis)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache_entries SET last_accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+    
+    def _purge_expired_locked(self) -> int:
+        """Supprime les entrées expirées en une requête (verrou déjà acquis)."""
+        now = time.time()
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE expires_at < ?", (now,)
+        ).fetchone()
+        if not count:
+            return 0
+        
+        self._conn.execute(
+            "DELETE FROM cache_tags WHERE key IN (SELECT key FROM cache_entries WHERE expires_at < ?)", (now,)
+        )
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at < ?", (now,))
+        self._total_bytes -= int(size)
+        return count
+    
+    def _enforce_size_locked(self) -> None:
+        """
+        Ramène la taille sous 90% du maximum: purge des expirés puis
+        éviction des entrées les moins récemment utilisées.
+        """
+        self._purge_expired_locked()
+        self._flush_touches_locked()
+        target = int(self.max_size_bytes * 0.9)
+        if self._total_bytes <= target:
+            return
+        
+        cursor = self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY last_accessed ASC"
+        )
+        to_evict = []
+        remaining = self._total_bytes
+        for key, size in cursor:
+            if remaining <= target:
+                break
+            to_evict.append(key)
+            remaining -= size
+        
+        for key in to_evict:
+            self._delete_locked(key)
+        self.evictions += len(to_evict)
+
+
 class MultiLevelCacheManager:
     """Gestionnaire de cache multi-niveaux."""
     
@@ -267,6 +975,31 @@ class MultiLevelCacheManager:
         self.hits_l2 = 0
         self.misses = 0
     
+    @classmethod
+    def from_settings(cls, cache_settings: Any) -> "MultiLevelCacheManager":
+        """
+        Construit le gestionnaire à partir de la configuration du cache.
+        
+        Args:
+            cache_settings: Instance de ``CacheSettings``
+            
+        Returns:
+            Gestionnaire avec L1 mémoire et L2 SQLite si activé
+        """
+        l1_backend = MemoryCacheBackend(max_size=cache_settings.memory_max_size)
+        l2_backend = None
+        if cache_settings.file_enabled:
+            l2_backend = SQLiteCacheBackend(
+                directory=cache_settings.file_directory,
+                max_size_mb=cache_settings.file_max_size_mb
+            )
+        
+        return cls(
+            l1_backend=l1_backend,
+            l2_backend=l2_backend,
+            default_ttl=cache_settings.file_ttl
+        )
+    
     async def get(self, key: str) -> Optional[Any]:
         """
         Récupère une valeur du cache (multi-niveaux).
@@ -285,12 +1018,21 @@ class MultiLevelCacheManager:
         
         # Essayer L2 si disponible
         if self.l2_backend:
-            value = await self.l2_backend.get(key)
-            if value is not None:
-                self.hits_l2 += 1
-                # Remonter en L1 pour les accès futurs
-                await self.l1_backend.set(key, value)
-                return value
+            if hasattr(self.l2_backend, 'get_entry'):
+                # Conserve le TTL restant et les tags lors de la remontée
+                entry = await self.l2_backend.get_entry(key)
+                if entry is not None:
+                    self.hits_l2 += 1
+                    value, remaining_ttl, tags = entry
+                    await self.l1_backend.set(key, value, remaining_ttl, tags)
+                    return value
+            else:
+                value = await self.l2_backend.get(key)
+                if value is not None:
+                    self.hits_l2 += 1
+                    # Remonter en L1 pour les accès futurs
+                    await self.l1_backend.set(key, value)
+                    return value
         
         self.misses += 1
         return None
@@ -442,4 +1184,20 @@ class MultiLevelCacheManager:
         else:
             health['l2'] = None  # Pas configuré
         
-        return health
\ No newline at end of file
+        return health
+
+_cache_manager: Optional[MultiLevelCacheManager] = None
+
+
+def get_cache_manager() -> MultiLevelCacheManager:
+    """
+    Retourne le gestionnaire de cache partagé du processus.
+    
+    Construit au premier appel à partir de la configuration
+    (L1 mémoire, L2 SQLite si ``cache.file_enabled``).
+    """
+    global _cache_manager
+    if _cache_manager is None:
+        from finagent.config.settings import get_settings
+        _cache_manager = MultiLevelCacheManager.from_settings(get_settings().cache)
+    return _cache_manager
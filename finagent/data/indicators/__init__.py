@@ -0,0 +1,67 @@
+"""
+Indicateurs techniques partagés.
+
+Ce package fournit les noyaux vectorisés qui calculent les indicateurs
+sur des séries complètes. Ils constituent la définition unique utilisée
+par les services de données, l'analyse de marché et les stratégies.
+Les versions incrémentales (``streaming``) produisent les mêmes valeurs
+avec une mise à jour en O(1) par barre pour les boucles temps réel.
+Le module ``panel`` calcule les mêmes indicateurs sur un panel
+(symboles × barres) en une passe.
+"""
+
+from .kernels import (
+    NUMBA_AVAILABLE,
+    as_array,
+    last_value,
+    sma,
+    ema,
+    wma,
+    rsi,
+    macd,
+    stochastic,
+    williams_r,
+    cci,
+    bollinger_bands,
+    true_range,
+    atr
+)
+from .streaming import (
+    StreamingIndicator,
+    StreamingSMA,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingMACD,
+    StreamingBollinger,
+    StreamingATR,
+    STREAMING_INDICATORS,
+    IndicatorRegistry,
+    indicator_key
+)
+
+__all__ = [
+    "NUMBA_AVAILABLE",
+    "as_array",
+    "last_value",
+    "sma",
+    "ema",
+    "wma",
+    "rsi",
+    "macd",
+    "stochastic",
+    "williams_r",
+    "cci",
+    "bollinger_bands",
+    "true_range",
+    "atr",
+    "StreamingIndicator",
+    "StreamingSMA",
+    "StreamingEMA",
+    "StreamingRSI",
+    "StreamingMACD",
+    "StreamingBollinger",
+    "StreamingATR",
+    "STREAMING_INDICATORS",
+    "IndicatorRegistry",
+    "indicator_key"
+]
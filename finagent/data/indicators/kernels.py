@@ -0,0 +1,433 @@
+"""
+Noyaux de calcul vectorisés des indicateurs techniques.
+
+Chaque fonction reçoit des séries complètes (tableau NumPy, pandas.Series
+ou liste) et retourne un tableau float64 de même longueur, rempli de NaN
+pendant la période de chauffe. C'est la définition de référence des
+indicateurs pour tout le projet (services, analyse de marché, règles de
+stratégie, backtests).
+
+Conventions retenues:
+    - EMA amorcée par la SMA des ``period`` premières valeurs,
+      alpha = 2 / (period + 1)
+    - RSI et ATR lissés selon Wilder (alpha = 1 / period)
+    - Bollinger avec écart-type de population (ddof=0)
+
+Les lissages récursifs utilisent numba lorsqu'il est installé, pandas
+sinon.
+"""
+
+import logging
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def as_array(values: Any) -> np.ndarray:
+    """
+    Convertit une série de valeurs en tableau float64 contigu.
+
+    Args:
+        values: Tableau, pandas.Series ou séquence de nombres
+
+    Returns:
+        Tableau float64 (sans copie si déjà au bon format)
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def last_value(values: np.ndarray, default: float = np.nan) -> float:
+    """
+    Retourne la dernière valeur d'une série d'indicateur.
+
+    Args:
+        values: Sortie d'un noyau
+        default: Valeur retournée si la série est vide ou non définie
+
+    Returns:
+        Dernière valeur finie, sinon ``default``
+    """
+    if len(values) == 0 or not np.isfinite(values[-1]):
+        return default
+    return float(values[-1])
+
+
+# Lissages récursifs
+
+def _ewm_python(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Lissage exponentiel (boucle de référence, compilée par numba)."""
+    out = np.empty_like(values)
+    prev = np.nan
+    for i in range(values.shape[0]):
+        x = values[i]
+        if np.isnan(prev):
+            prev = x
+        elif not np.isnan(x):
+            prev = prev + alpha * (x - prev)
+        out[i] = prev
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _ewm_numba = numba.njit(cache=True, nogil=True)(_ewm_python)
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Lissage exponentiel récursif ``y[i] = y[i-1] + alpha * (x[i] - y[i-1])``.
+
+    Les NaN de tête sont conservés, la première valeur définie sert
+    d'amorce.
+    """
+    if NUMBA_AVAILABLE:
+        return _ewm_numba(values, alpha)
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _seeded_ewm(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Lissage exponentiel amorcé par la moyenne des ``period`` premières
+    valeurs définies.
+    """
+    out = np.full(values.shape[0], np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    first = valid[0]
+    seed_end = first + period
+    if seed_end > values.shape[0]:
+        return out
+
+    x = values[seed_end - 1:].copy()
+    x[0] = values[first:seed_end].mean()
+    out[seed_end - 1:] = _ewm(x, alpha)
+    return out
+
+
+def _rolling_windows(values: np.ndarray, period: int) -> np.ndarray:
+    """Vue (sans copie) des fenêtres glissantes de ``period`` valeurs."""
+    return sliding_window_view(values, period)
+
+
+def _pad(values: np.ndarray, length: int) -> np.ndarray:
+    """Complète une sortie de fenêtres glissantes par des NaN en tête."""
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values
+    return out
+
+
+def _check_period(period: int, minimum: int = 1) -> None:
+    """Valide une période de calcul."""
+    if period < minimum:
+        raise ValueError(f"La période doit être >= {minimum} (reçu: {period})")
+
+
+# Moyennes mobiles
+
+def sma(values: Any, period: int) -> np.ndarray:
+    """
+    Moyenne mobile simple.
+
+    Args:
+        values: Série de prix
+        period: Nombre de valeurs de la fenêtre
+
+    Returns:
+        SMA (NaN pour les ``period - 1`` premières valeurs)
+    """
+    _check_period(period)
+    x = as_array(values)
+    if len(x) < period:
+        return np.full(len(x), np.nan)
+
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    return _pad((csum[period:] - csum[:-period]) / period, len(x))
+
+
+def ema(values: Any, period: int) -> np.ndarray:
+    """
+    Moyenne mobile exponentielle amorcée par la SMA.
+
+    Args:
+        values: Série de prix
+        period: Période (alpha = 2 / (period + 1))
+
+    Returns:
+        EMA (NaN pendant la chauffe)
+    """
+    _check_period(period)
+    return _seeded_ewm(as_array(values), period, 2.0 / (period + 1))
+
+
+def wma(values: Any, period: int) -> np.ndarray:
+    """
+    Moyenne mobile pondérée linéairement (poids 1..period).
+
+    Args:
+        values: Série de prix
+        period: Nombre de valeurs de la fenêtre
+
+    Returns:
+        WMA (NaN pour les ``period - 1`` premières valeurs)
+    """
+    _check_period(period)
+    x = as_array(values)
+    if len(x) < period:
+        return np.full(len(x), np.nan)
+
+    weights = np.arange(1, period + 1, dtype=np.float64)
+    # np.convolve retourne le noyau: poids inversés pour 1..period
+    values_wma = np.convolve(x, weights[::-1], mode='valid') / weights.sum()
+    return _pad(values_wma, len(x))
+
+
+# Oscillateurs
+
+def rsi(values: Any, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index avec lissage de Wilder.
+
+    Args:
+        values: Série de prix de clôture
+        period: Période (défaut: 14)
+
+    Returns:
+        RSI entre 0 et 100 (NaN pour les ``period`` premières valeurs)
+    """
+    _check_period(period, 2)
+    x = as_array(values)
+    out = np.full(len(x), np.nan)
+    if len(x) <= period:
+        return out
+
+    delta = np.diff(x)
+    avg_gain = _seeded_ewm(np.clip(delta, 0.0, None), period, 1.0 / period)
+    avg_loss = _seeded_ewm(np.clip(-delta, 0.0, None), period, 1.0 / period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values_rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Aucune baisse: 100, aucune variation: neutre
+    values_rsi = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), values_rsi)
+    out[1:] = values_rsi
+    return out
+
+
+def macd(
+    values: Any,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence.
+
+    Args:
+        values: Série de prix de clôture
+        fast: Période de l'EMA rapide
+        slow: Période de l'EMA lente
+        signal: Période de l'EMA de la ligne de signal
+
+    Returns:
+        Tuple (ligne MACD, ligne de signal, histogramme)
+    """
+    _check_period(signal)
+    if fast >= slow:
+        raise ValueError("La période rapide doit être < période lente")
+
+    x = as_array(values)
+    macd_line = ema(x, fast) - ema(x, slow)
+    signal_line = _seeded_ewm(macd_line, signal, 2.0 / (signal + 1))
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def stochastic(
+    high: Any,
+    low: Any,
+    close: Any,
+    k_period: int = 14,
+    d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Oscillateur stochastique.
+
+    Args:
+        high: Plus hauts
+        low: Plus bas
+        close: Clôtures
+        k_period: Période de %K
+        d_period: Période de lissage de %D
+
+    Returns:
+        Tuple (%K, %D) entre 0 et 100
+    """
+    _check_period(k_period)
+    _check_period(d_period)
+    h, l, c = as_array(high), as_array(low), as_array(close)
+    n = len(c)
+    if n < k_period:
+        nan = np.full(n, np.nan)
+        return nan, nan.copy()
+
+    highest = _pad(_rolling_windows(h, k_period).max(axis=1), n)
+    lowest = _pad(_rolling_windows(l, k_period).min(axis=1), n)
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(span == 0, 50.0, 100.0 * (c - lowest) / span)
+    k[:k_period - 1] = np.nan
+
+    d = np.full(n, np.nan)
+    d[k_period - 1:] = sma(k[k_period - 1:], d_period)
+    return k, d
+
+
+def williams_r(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """
+    Williams %R.
+
+    Args:
+        high: Plus hauts
+        low: Plus bas
+        close: Clôtures
+        period: Période de la fenêtre
+
+    Returns:
+        %R entre -100 et 0
+    """
+    _check_period(period)
+    h, l, c = as_array(high), as_array(low), as_array(close)
+    n = len(c)
+    if n < period:
+        return np.full(n, np.nan)
+
+    highest = _pad(_rolling_windows(h, period).max(axis=1), n)
+    lowest = _pad(_rolling_windows(l, period).min(axis=1), n)
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(span == 0, -50.0, -100.0 * (highest - c) / span)
+    out[:period - 1] = np.nan
+    return out
+
+
+def cci(
+    high: Any,
+    low: Any,
+    close: Any,
+    period: int = 20,
+    constant: float = 0.015
+) -> np.ndarray:
+    """
+    Commodity Channel Index.
+
+    Args:
+        high: Plus hauts
+        low: Plus bas
+        close: Clôtures
+        period: Période de la fenêtre
+        constant: Constante de Lambert (défaut: 0.015)
+
+    Returns:
+        CCI (NaN pour les ``period - 1`` premières valeurs)
+    """
+    _check_period(period)
+    typical = (as_array(high) + as_array(low) + as_array(close)) / 3.0
+    n = len(typical)
+    if n < period:
+        return np.full(n, np.nan)
+
+    windows = _rolling_windows(typical, period)
+    mean = windows.mean(axis=1)
+    mean_deviation = np.abs(windows - mean[:, None]).mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values_cci = np.where(
+            mean_deviation == 0, 0.0,
+            (typical[period - 1:] - mean) / (constant * mean_deviation)
+        )
+    return _pad(values_cci, n)
+
+
+# Volatilité
+
+def bollinger_bands(
+    values: Any,
+    period: int = 20,
+    std_multiplier: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bandes de Bollinger (écart-type de population).
+
+    Args:
+        values: Série de prix de clôture
+        period: Période de la moyenne
+        std_multiplier: Nombre d'écarts-types des bandes
+
+    Returns:
+        Tuple (bande haute, bande médiane, bande basse, écart-type)
+    """
+    _check_period(period)
+    x = as_array(values)
+    n = len(x)
+    if n < period:
+        nan = np.full(n, np.nan)
+        return nan, nan.copy(), nan.copy(), nan.copy()
+
+    windows = _rolling_windows(x, period)
+    middle = _pad(windows.mean(axis=1), n)
+    std = _pad(windows.std(axis=1), n)
+    return middle + std_multiplier * std, middle, middle - std_multiplier * std, std
+
+
+def true_range(high: Any, low: Any, close: Any) -> np.ndarray:
+    """
+    True Range (la première barre vaut ``high - low``).
+
+    Args:
+        high: Plus hauts
+        low: Plus bas
+        close: Clôtures
+
+    Returns:
+        True Range de chaque barre
+    """
+    h, l, c = as_array(high), as_array(low), as_array(close)
+    tr = h - l
+    if len(c) > 1:
+        prev_close = c[:-1]
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(h[1:] - prev_close), np.abs(l[1:] - prev_close)])
+    return tr
+
+
+def atr(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """
+    Average True Range avec lissage de Wilder.
+
+    Args:
+        high: Plus hauts
+        low: Plus bas
+        close: Clôtures
+        period: Période (défaut: 14)
+
+    Returns:
+        ATR (NaN pour les ``period`` premières valeurs)
+    """
+    _check_period(period)
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    if len(tr) <= period:
+        return out
+    # La première barre n'a pas de clôture précédente: exclue de l'amorce
+    out[1:] = _seeded_ewm(tr[1:], period, 1.0 / period)
+    return out
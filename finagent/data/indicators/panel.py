@@ -0,0 +1,450 @@
+"""
+Noyaux 2D des indicateurs techniques (symboles × barres).
+
+Versions des noyaux de ``kernels`` opérant ligne par ligne sur un panel
+de prix: chaque fonction reçoit des tableaux ``(symboles, barres)`` et
+calcule l'indicateur de tous les symboles en une passe. Les conventions
+sont celles des noyaux 1D (amorce des EMA, lissage de Wilder, écart-type
+de population); les NaN de tête d'une ligne (historique plus court)
+décalent sa période de chauffe.
+
+Les lissages récursifs avancent barre par barre mais sont vectorisés sur
+les symboles: le coût est ``barres`` opérations NumPy, quel que soit le
+nombre de symboles.
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .kernels import _check_period
+
+
+def as_panel(values: Any) -> np.ndarray:
+    """
+    Convertit des valeurs en tableau float64 2D (une ligne par symbole).
+
+    Args:
+        values: Tableau 2D, ou série 1D (un seul symbole)
+
+    Returns:
+        Tableau float64 contigu ``(symboles, barres)``
+    """
+    x = np.asarray(values, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[None, :]
+    return np.ascontiguousarray(x)
+
+
+def last_values(values: np.ndarray, default: float = np.nan) -> np.ndarray:
+    """
+    Dernière valeur de chaque ligne d'un indicateur.
+
+    Args:
+        values: Sortie d'un noyau 2D
+        default: Valeur des lignes dont la dernière valeur n'est pas définie
+
+    Returns:
+        Tableau 1D (une valeur par symbole)
+    """
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], default)
+    last = values[:, -1]
+    return np.where(np.isfinite(last), last, default)
+
+
+def _pad(values: np.ndarray, length: int) -> np.ndarray:
+    """Complète une sortie de fenêtres glissantes par des NaN en tête de ligne."""
+    out = np.full((values.shape[0], length), np.nan)
+    if values.shape[1]:
+        out[:, length - values.shape[1]:] = values
+    return out
+
+
+def _windows(values: np.ndarray, period: int) -> np.ndarray:
+    """Vue (sans copie) des fenêtres glissantes de chaque ligne."""
+    return sliding_window_view(values, period, axis=1)
+
+
+def _seeded_ewm(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Lissage exponentiel de chaque ligne, amorcé par la moyenne de ses
+    ``period`` premières valeurs définies.
+    """
+    rows, n = values.shape
+    out = np.full((rows, n), np.nan)
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), n)
+    seed_at = first + period - 1
+    ready = seed_at < n
+    if not ready.any():
+        return out
+
+    csum = np.zeros((rows, n + 1))
+    np.cumsum(np.where(valid, values, 0.0), axis=1, out=csum[:, 1:])
+    seed = np.full(rows, np.nan)
+    r = np.flatnonzero(ready)
+    seed[r] = (csum[r, seed_at[r] + 1] - csum[r, first[r]]) / period
+
+    prev = np.full(rows, np.nan)
+    for t in range(int(seed_at[ready].min()), n):
+        x = values[:, t]
+        smoothed = np.where(valid[:, t], prev + alpha * (x - prev), prev)
+        prev = np.where(seed_at == t, seed, np.where(seed_at < t, smoothed, prev))
+        out[:, t] = prev
+    return out
+
+
+# Moyennes mobiles
+
+def sma(values: Any, period: int) -> np.ndarray:
+    """
+    Moyenne mobile simple de chaque ligne.
+
+    Args:
+        values: Prix (symboles × barres)
+        period: Nombre de valeurs de la fenêtre
+
+    Returns:
+        SMA (NaN tant que la fenêtre n'est pas entièrement définie)
+    """
+    _check_period(period)
+    x = as_panel(values)
+    rows, n = x.shape
+    out = np.full((rows, n), np.nan)
+    if n < period:
+        return out
+
+    valid = ~np.isnan(x)
+    csum = np.zeros((rows, n + 1))
+    count = np.zeros((rows, n + 1))
+    np.cumsum(np.where(valid, x, 0.0), axis=1, out=csum[:, 1:])
+    np.cumsum(valid, axis=1, out=count[:, 1:])
+    sums = csum[:, period:] - csum[:, :-period]
+    full = (count[:, period:] - count[:, :-period]) == period
+    out[:, period - 1:] = np.where(full, sums / period, np.nan)
+    return out
+
+
+def ema(values: Any, period: int) -> np.ndarray:
+    """
+    Moyenne mobile exponentielle de chaque ligne, amorcée par la SMA.
+
+    Args:
+        values: Prix (symboles × barres)
+        period: Période (alpha = 2 / (period + 1))
+
+    Returns:
+        EMA (NaN pendant la chauffe)
+    """
+    _check_period(period)
+    return _seeded_ewm(as_panel(values), period, 2.0 / (period + 1))
+
+
+# Oscillateurs
+
+def rsi(values: Any, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index (lissage de Wilder) de chaque ligne.
+
+    Args:
+        values: Clôtures (symboles × barres)
+        period: Période (défaut: 14)
+
+    Returns:
+        RSI entre 0 et 100
+    """
+    _check_period(period, 2)
+    x = as_panel(values)
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] <= period:
+        return out
+
+    delta = np.diff(x, axis=1)
+    avg_gain = _seeded_ewm(np.clip(delta, 0.0, None), period, 1.0 / period)
+    avg_loss = _seeded_ewm(np.clip(-delta, 0.0, None), period, 1.0 / period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values_rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # Aucune baisse: 100, aucune variation: neutre
+    values_rsi = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), values_rsi)
+    out[:, 1:] = values_rsi
+    return out
+
+
+def macd(
+    values: Any,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD de chaque ligne.
+
+    Args:
+        values: Clôtures (symboles × barres)
+        fast: Période de l'EMA rapide
+        slow: Période de l'EMA lente
+        signal: Période de l'EMA de la ligne de signal
+
+    Returns:
+        Tuple (ligne MACD, ligne de signal, histogramme)
+    """
+    _check_period(signal)
+    if fast >= slow:
+        raise ValueError("La période rapide doit être < période lente")
+
+    x = as_panel(values)
+    macd_line = ema(x, fast) - ema(x, slow)
+    signal_line = _seeded_ewm(macd_line, signal, 2.0 / (signal + 1))
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def stochastic(
+    high: Any,
+    low: Any,
+    close: Any,
+    k_period: int = 14,
+    d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Oscillateur stochastique de chaque ligne.
+
+    Args:
+        high: Plus hauts (symboles × barres)
+        low: Plus bas
+        close: Clôtures
+        k_period: Période de %K
+        d_period: Période de lissage de %D
+
+    Returns:
+        Tuple (%K, %D) entre 0 et 100
+    """
+    _check_period(k_period)
+    _check_period(d_period)
+    h, l, c = as_panel(high), as_panel(low), as_panel(close)
+    n = c.shape[1]
+    if n < k_period:
+        nan = np.full(c.shape, np.nan)
+        return nan, nan.copy()
+
+    highest = _pad(_windows(h, k_period).max(axis=-1), n)
+    lowest = _pad(_windows(l, k_period).min(axis=-1), n)
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.where(span == 0, 50.0, 100.0 * (c - lowest) / span)
+    k[:, :k_period - 1] = np.nan
+    return k, sma(k, d_period)
+
+
+def williams_r(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """
+    Williams %R de chaque ligne.
+
+    Args:
+        high: Plus hauts (symboles × barres)
+        low: Plus bas
+        close: Clôtures
+        period: Période de la fenêtre
+
+    Returns:
+        %R entre -100 et 0
+    """
+    _check_period(period)
+    h, l, c = as_panel(high), as_panel(low), as_panel(close)
+    n = c.shape[1]
+    if n < period:
+        return np.full(c.shape, np.nan)
+
+    highest = _pad(_windows(h, period).max(axis=-1), n)
+    lowest = _pad(_windows(l, period).min(axis=-1), n)
+    span = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = np.where(span == 0, -50.0, -100.0 * (highest - c) / span)
+    out[:, :period - 1] = np.nan
+    return out
+
+
+def cci(
+    high: Any,
+    low: Any,
+    close: Any,
+    period: int = 20,
+    constant: float = 0.015
+) -> np.ndarray:
+    """
+    Commodity Channel Index de chaque ligne.
+
+    Args:
+        high: Plus hauts (symboles × barres)
+        low: Plus bas
+        close: Clôtures
+        period: Période de la fenêtre
+        constant: Constante de Lambert (défaut: 0.015)
+
+    Returns:
+        CCI (NaN pendant la chauffe)
+    """
+    _check_period(period)
+    typical = (as_panel(high) + as_panel(low) + as_panel(close)) / 3.0
+    n = typical.shape[1]
+    if n < period:
+        return np.full(typical.shape, np.nan)
+
+    windows = _windows(typical, period)
+    mean = windows.mean(axis=-1)
+    mean_deviation = np.abs(windows - mean[..., None]).mean(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values_cci = np.where(
+            mean_deviation == 0, 0.0,
+            (typical[:, period - 1:] - mean) / (constant * mean_deviation)
+        )
+    return _pad(values_cci, n)
+
+
+# Volatilité
+
+def bollinger_bands(
+    values: Any,
+    period: int = 20,
+    std_multiplier: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bandes de Bollinger (écart-type de population) de chaque ligne.
+
+    Args:
+        values: Clôtures (symboles × barres)
+        period: Période de la moyenne
+        std_multiplier: Nombre d'écarts-types des bandes
+
+    Returns:
+        Tuple (bande haute, bande médiane, bande basse, écart-type)
+    """
+    _check_period(period)
+    x = as_panel(values)
+    n = x.shape[1]
+    if n < period:
+        nan = np.full(x.shape, np.nan)
+        return nan, nan.copy(), nan.copy(), nan.copy()
+
+    windows = _windows(x, period)
+    middle = _pad(windows.mean(axis=-1), n)
+    std = _pad(windows.std(axis=-1), n)
+    return middle + std_multiplier * std, middle, middle - std_multiplier * std, std
+
+
+def true_range(high: Any, low: Any, close: Any) -> np.ndarray:
+    """
+    True Range de chaque ligne (la première barre vaut ``high - low``).
+
+    Args:
+        high: Plus hauts (symboles × barres)
+        low: Plus bas
+        close: Clôtures
+
+    Returns:
+        True Range de chaque barre
+    """
+    h, l, c = as_panel(high), as_panel(low), as_panel(close)
+    tr = h - l
+    if c.shape[1] > 1:
+        prev_close = c[:, :-1]
+        tr[:, 1:] = np.maximum.reduce([
+            tr[:, 1:], np.abs(h[:, 1:] - prev_close), np.abs(l[:, 1:] - prev_close)
+        ])
+    return tr
+
+
+def atr(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    """
+    Average True Range (lissage de Wilder) de chaque ligne.
+
+    Args:
+        high: Plus hauts (symboles × barres)
+        low: Plus bas
+        close: Clôtures
+        period: Période (défaut: 14)
+
+    Returns:
+        ATR (NaN pendant la chauffe)
+    """
+    _check_period(period)
+    tr = true_range(high, low, close)
+    out = np.full(tr.shape, np.nan)
+    if tr.shape[1] <= period:
+        return out
+    # La première barre n'a pas de clôture précédente: exclue de l'amorce
+    out[:, 1:] = _seeded_ewm(tr[:, 1:], period, 1.0 / period)
+    return out
+
+
+# Statistiques de séries
+
+def annualized_volatility(close: Any, periods_per_year: int = 252) -> np.ndarray:
+    """
+    Volatilité annualisée des rendements simples de chaque ligne.
+
+    Args:
+        close: Clôtures (symboles × barres)
+        periods_per_year: Nombre de barres par an
+
+    Returns:
+        Tableau 1D (NaN si moins de deux rendements)
+    """
+    c = as_panel(close)
+    if c.shape[1] < 3:
+        return np.full(c.shape[0], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = c[:, 1:] / c[:, :-1] - 1.0
+    counts = np.count_nonzero(~np.isnan(returns), axis=1)
+    std = np.full(c.shape[0], np.nan)
+    enough = counts >= 2
+    if enough.any():
+        std[enough] = np.nanstd(returns[enough], axis=1, ddof=1)
+    return std * np.sqrt(periods_per_year)
+
+
+def linear_slope(values: Any, window: int) -> np.ndarray:
+    """
+    Pente de la régression linéaire des ``window`` dernières valeurs de chaque ligne.
+
+    Args:
+        values: Série (symboles × barres)
+        window: Nombre de valeurs (bornée par la longueur)
+
+    Returns:
+        Tableau 1D (NaN si la fenêtre contient des valeurs non définies)
+    """
+    y = as_panel(values)[:, -window:]
+    n = y.shape[1]
+    if n < 2:
+        return np.full(y.shape[0], np.nan)
+    x = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+    return (y - y.mean(axis=1, keepdims=True)) @ x / (x @ x)
+
+
+def pivot_mask(values: Any, window: int, highs: bool = True) -> np.ndarray:
+    """
+    Pivots locaux: valeur extrême de sa fenêtre centrée de ``2 * window + 1`` barres.
+
+    Args:
+        values: Série (symboles × barres)
+        window: Nombre de barres de part et d'autre
+        highs: Pics (plus hauts) si vrai, creux (plus bas) sinon
+
+    Returns:
+        Masque booléen de même forme (faux sur les bords)
+    """
+    x = as_panel(values)
+    mask = np.zeros(x.shape, dtype=bool)
+    if x.shape[1] < 2 * window + 1:
+        return mask
+    windows = _windows(x, 2 * window + 1)
+    center = x[:, window:x.shape[1] - window]
+    with np.errstate(invalid='ignore'):
+        if highs:
+            mask[:, window:x.shape[1] - window] = center >= windows.max(axis=-1)
+        else:
+            mask[:, window:x.shape[1] - window] = center <= windows.min(axis=-1)
+    return mask
@@ -0,0 +1,562 @@
+"""
+Indicateurs techniques incrémentaux.
+
+Chaque indicateur conserve un état de taille constante (moyennes de
+Wilder, accumulateurs EMA, fenêtres glissantes, variance de Welford) et
+se met à jour en O(1) à chaque nouvelle barre. Les valeurs sont
+identiques à celles des noyaux vectorisés de ``kernels``.
+
+La dernière barre peut être révisée (barre en cours de formation en
+temps réel) sans rejouer l'historique.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _SeededAverage:
+    """
+    Moyenne exponentielle amorcée par la moyenne des ``period`` premières
+    valeurs (même convention que ``kernels._seeded_ewm``).
+    """
+
+    __slots__ = ("period", "alpha", "n", "total", "value")
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.n = 0
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    def push(self, x: float) -> Optional[float]:
+        """Ajoute une valeur et retourne la moyenne (None pendant l'amorce)."""
+        self.n += 1
+        if self.n < self.period:
+            self.total += x
+        elif self.n == self.period:
+            self.value = (self.total + x) / self.period
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def state(self) -> Tuple[int, float, Optional[float]]:
+        """Copie de l'état (pour révision de la dernière barre)."""
+        return self.n, self.total, self.value
+
+    def restore(self, state: Tuple[int, float, Optional[float]]) -> None:
+        """Restaure un état précédent."""
+        self.n, self.total, self.value = state
+
+
+class StreamingIndicator(ABC):
+    """
+    Indicateur mis à jour barre par barre.
+
+    Les sous-classes implémentent ``_push`` (ajout d'une barre),
+    ``_state``/``_restore`` (annulation de la dernière barre) et
+    ``value``.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.last_timestamp: Any = None
+        self._undo: Any = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Any:
+        """
+        Ajoute une nouvelle barre.
+
+        Args:
+            close: Prix de clôture
+            high: Plus haut (clôture par défaut)
+            low: Plus bas (clôture par défaut)
+
+        Returns:
+            Valeur courante de l'indicateur (None pendant la chauffe)
+        """
+        close = float(close)
+        high = close if high is None else float(high)
+        low = close if low is None else float(low)
+
+        self._undo = self._state()
+        self._push(close, high, low)
+        self.count += 1
+        return self.value
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Any:
+        """
+        Remplace la dernière barre (barre en cours de formation).
+
+        Args:
+            close: Prix de clôture révisé
+            high: Plus haut révisé
+            low: Plus bas révisé
+
+        Returns:
+            Valeur courante de l'indicateur
+        """
+        if self._undo is None:
+            return self.update(close, high, low)
+        self._restore(self._undo)
+        self.count -= 1
+        return self.update(close, high, low)
+
+    @property
+    def ready(self) -> bool:
+        """Indique si la période de chauffe est terminée."""
+        return self.value is not None
+
+    @property
+    @abstractmethod
+    def value(self) -> Any:
+        """Valeur courante de l'indicateur."""
+        pass
+
+    @abstractmethod
+    def _push(self, close: float, high: float, low: float) -> None:
+        """Intègre une barre dans l'état."""
+        pass
+
+    @abstractmethod
+    def _state(self) -> Any:
+        """Retourne de quoi annuler la prochaine barre."""
+        pass
+
+    @abstractmethod
+    def _restore(self, state: Any) -> None:
+        """Annule la dernière barre."""
+        pass
+
+
+class StreamingSMA(StreamingIndicator):
+    """Moyenne mobile simple (fenêtre glissante et somme courante)."""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self._window: deque = deque()
+        self._total = 0.0
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._window) < self.period:
+            return None
+        return self._total / self.period
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        self._window.append(close)
+        self._total += close
+        if len(self._window) > self.period:
+            self._total -= self._window.popleft()
+
+    def _state(self) -> Any:
+        evicted = self._window[0] if len(self._window) == self.period else None
+        return self._total, evicted
+
+    def _restore(self, state: Any) -> None:
+        self._total, evicted = state
+        self._window.pop()
+        if evicted is not None:
+            self._window.appendleft(evicted)
+
+
+class StreamingEMA(StreamingIndicator):
+    """Moyenne mobile exponentielle amorcée par la SMA."""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self._average = _SeededAverage(period, 2.0 / (period + 1))
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._average.value
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        self._average.push(close)
+
+    def _state(self) -> Any:
+        return self._average.state()
+
+    def _restore(self, state: Any) -> None:
+        self._average.restore(state)
+
+
+class StreamingRSI(StreamingIndicator):
+    """RSI avec moyennes de Wilder des hausses et des baisses."""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._gains = _SeededAverage(period, 1.0 / period)
+        self._losses = _SeededAverage(period, 1.0 / period)
+        self._prev_close: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        avg_gain, avg_loss = self._gains.value, self._losses.value
+        if avg_gain is None:
+            return None
+        if avg_loss == 0:
+            return 50.0 if avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            self._gains.push(max(delta, 0.0))
+            self._losses.push(max(-delta, 0.0))
+        self._prev_close = close
+
+    def _state(self) -> Any:
+        return self._gains.state(), self._losses.state(), self._prev_close
+
+    def _restore(self, state: Any) -> None:
+        gains, losses, self._prev_close = state
+        self._gains.restore(gains)
+        self._losses.restore(losses)
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD: deux EMA et une EMA de signal sur la ligne MACD."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__()
+        if fast >= slow:
+            raise ValueError("La période rapide doit être < période lente")
+        self._fast = _SeededAverage(fast, 2.0 / (fast + 1))
+        self._slow = _SeededAverage(slow, 2.0 / (slow + 1))
+        self._signal = _SeededAverage(signal, 2.0 / (signal + 1))
+
+    @property
+    def macd(self) -> Optional[float]:
+        """Ligne MACD (EMA rapide - EMA lente)."""
+        if self._slow.value is None:
+            return None
+        return self._fast.value - self._slow.value
+
+    @property
+    def value(self) -> Optional[Dict[str, float]]:
+        macd_line, signal_line = self.macd, self._signal.value
+        if macd_line is None or signal_line is None:
+            return None
+        return {'macd': macd_line, 'signal': signal_line, 'histogram': macd_line - signal_line}
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        self._fast.push(close)
+        self._slow.push(close)
+        macd_line = self.macd
+        if macd_line is not None:
+            self._signal.push(macd_line)
+
+    def _state(self) -> Any:
+        return self._fast.state(), self._slow.state(), self._signal.state()
+
+    def _restore(self, state: Any) -> None:
+        fast, slow, signal = state
+        self._fast.restore(fast)
+        self._slow.restore(slow)
+        self._signal.restore(signal)
+
+
+class StreamingBollinger(StreamingIndicator):
+    """Bandes de Bollinger par variance de Welford sur fenêtre glissante."""
+
+    def __init__(self, period: int = 20, std_multiplier: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.std_multiplier = std_multiplier
+        self._window: deque = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def value(self) -> Optional[Dict[str, float]]:
+        if len(self._window) < self.period:
+            return None
+        std = math.sqrt(max(self._m2, 0.0) / self.period)
+        return {
+            'upper': self._mean + self.std_multiplier * std,
+            'middle': self._mean,
+            'lower': self._mean - self.std_multiplier * std,
+            'std_dev': std
+        }
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        if len(self._window) == self.period:
+            # Remplacement de la plus ancienne valeur (taille constante)
+            old = self._window.popleft()
+            delta = close - old
+            new_mean = self._mean + delta / self.period
+            self._m2 += delta * (close - new_mean + old - self._mean)
+            self._mean = new_mean
+        else:
+            n = len(self._window) + 1
+            delta = close - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (close - self._mean)
+        self._window.append(close)
+
+    def _state(self) -> Any:
+        evicted = self._window[0] if len(self._window) == self.period else None
+        return self._mean, self._m2, evicted
+
+    def _restore(self, state: Any) -> None:
+        self._mean, self._m2, evicted = state
+        self._window.pop()
+        if evicted is not None:
+            self._window.appendleft(evicted)
+
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range avec lissage de Wilder."""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._average = _SeededAverage(period, 1.0 / period)
+        self._prev_close: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._average.value
+
+    def _push(self, close: float, high: float, low: float) -> None:
+        # La première barre n'a pas de clôture précédente (exclue comme dans kernels.atr)
+        if self._prev_close is not None:
+            self._average.push(max(
+                high - low, abs(high - self._prev_close), abs(low - self._prev_close)
+            ))
+        self._prev_close = close
+
+    def _state(self) -> Any:
+        return self._average.state(), self._prev_close
+
+    def _restore(self, state: Any) -> None:
+        average, self._prev_close = state
+        self._average.restore(average)
+
+
+# Constructeurs par nom d'indicateur de règle (paramètres du RuleCompiler)
+STREAMING_INDICATORS: Dict[str, Callable[[Dict[str, Any]], StreamingIndicator]] = {
+    'sma': lambda p: StreamingSMA(p.get('period', 20)),
+    'ema': lambda p: StreamingEMA(p.get('period', 20)),
+    'rsi': lambda p: StreamingRSI(p.get('period', 14)),
+    'macd': lambda p: StreamingMACD(
+        p.get('fast_period', 12), p.get('slow_period', 26), p.get('signal_period', 9)
+    ),
+    'bollinger_bands': lambda p: StreamingBollinger(p.get('period', 20), p.get('std_deviation', 2.0)),
+    'atr': lambda p: StreamingATR(p.get('period', 14))
+}
+
+
+def indicator_key(name: str, timeframe: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Clé canonique d'un indicateur paramétré.
+
+    Args:
+        name: Nom de l'indicateur (``rsi``, ``macd``...)
+        timeframe: Timeframe des barres
+        params: Paramètres de l'indicateur
+
+    Returns:
+        Clé indépendante de l'ordre des paramètres
+    """
+    args = ",".join(f"{k}={params[k]}" for k in sorted(params or {}))
+    return f"{name}:{timeframe}({args})"
+
+
+def _bar_time(bar: Any) -> Any:
+    """Horodatage d'une barre (None si absent)."""
+    if isinstance(bar, dict):
+        for field in ('timestamp', 'date', 'datetime'):
+            if bar.get(field) is not None:
+                return bar[field]
+    return None
+
+
+class IndicatorRegistry:
+    """
+    Registre des états d'indicateurs incrémentaux.
+
+    Les états sont indexés par symbole, timeframe, nom et paramètres et
+    réutilisés d'une évaluation à l'autre: seules les barres postérieures
+    à la dernière barre vue sont intégrées, la dernière barre pouvant être
+    révisée en place.
+    """
+
+    def __init__(self, max_states: int = 10000):
+        """
+        Initialise le registre.
+
+        Args:
+            max_states: Nombre maximum d'états conservés
+        """
+        self.max_states = max_states
+        self._states: Dict[Tuple[str, str, str], StreamingIndicator] = {}
+        self._specs: Dict[Tuple[str, str, str], Tuple[str, Dict[str, Any]]] = {}
+        self._by_series: Dict[Tuple[str, str], Dict[str, StreamingIndicator]] = {}
+
+        # Statistiques
+        self.bars_applied = 0
+        self.bars_revised = 0
+        self.replays = 0
+
+    def get(self, symbol: str, timeframe: str, name: str,
+            params: Optional[Dict[str, Any]] = None) -> StreamingIndicator:
+        """
+        Retourne (ou crée) l'état d'un indicateur.
+
+        Args:
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+            name: Nom de l'indicateur (clé de ``STREAMING_INDICATORS``)
+            params: Paramètres de l'indicateur
+
+        Returns:
+            État incrémental de l'indicateur
+
+        Raises:
+            KeyError: Si l'indicateur n'a pas d'implémentation incrémentale
+        """
+        key = indicator_key(name, timeframe, params)
+        state_id = (symbol, timeframe, key)
+        state = self._states.get(state_id)
+        if state is None:
+            if len(self._states) >= self.max_states:
+                self._evict_oldest()
+            state = STREAMING_INDICATORS[name](params or {})
+            self._states[state_id] = state
+            self._specs[state_id] = (name, dict(params or {}))
+            self._by_series.setdefault((symbol, timeframe), {})[key] = state
+        return state
+
+    def supports(self, name: str) -> bool:
+        """Indique si l'indicateur a une implémentation incrémentale."""
+        return name in STREAMING_INDICATORS
+
+    def update(self, symbol: str, timeframe: str, bars: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Intègre les nouvelles barres dans tous les états du couple
+        symbole/timeframe.
+
+        Des barres sans horodatage ne permettent pas de repérer les
+        barres nouvelles (une fenêtre glissante de même longueur paraît
+        inchangée): les états sont alors recalculés sur toutes les barres.
+
+        Args:
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+            bars: Barres (dictionnaires open/high/low/close) ou BarSeries
+
+        Returns:
+            Valeurs courantes par clé d'indicateur (états prêts uniquement)
+        """
+        states = self._by_series.get((symbol, timeframe), {})
+        untimed = not hasattr(bars, 'timestamps') and len(bars) > 0 and _bar_time(bars[-1]) is None
+        values = {}
+        for key, state in list(states.items()):
+            if untimed or not self._sync(state, bars):
+                # Aucun recouvrement avec l'état: historique remplacé, on rejoue
+                state_id = (symbol, timeframe, key)
+                name, params = self._specs[state_id]
+                state = STREAMING_INDICATORS[name](params)
+                self._states[state_id] = states[key] = state
+                self._sync(state, bars)
+            if state.ready:
+                values[key] = state.value
+        return values
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """
+        Supprime les états (tous ou ceux d'un symbole).
+
+        Args:
+            symbol: Symbole à oublier (tous si absent)
+        """
+        if symbol is None:
+            self._states.clear()
+            self._specs.clear()
+            self._by_series.clear()
+            return
+        for state_id in [s for s in self._states if s[0] == symbol]:
+            del self._states[state_id]
+            del self._specs[state_id]
+        for series_id in [s for s in self._by_series if s[0] == symbol]:
+            del self._by_series[series_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du registre."""
+        return {
+            'states': len(self._states),
+            'series': len(self._by_series),
+            'bars_applied': self.bars_applied,
+            'bars_revised': self.bars_revised,
+            'replays': self.replays
+        }
+
+    def _sync(self, state: StreamingIndicator, bars: Sequence[Any]) -> bool:
+        """
+        Applique à un état les barres qu'il n'a pas encore vues.
+
+        Returns:
+            False si les barres ne recouvrent plus l'état (rejeu nécessaire)
+        """
+        n = len(bars)
+        if n == 0:
+            return True
+
+        if hasattr(bars, 'timestamps'):
+            # Série columnar: recherche dichotomique
+            times = bars.timestamps
+            if state.last_timestamp is None:
+                start = 0
+            else:
+                start = int(np.searchsorted(times, state.last_timestamp, 'left'))
+            get_bar = lambda i: (bars.close[i], bars.high[i], bars.low[i])
+            get_time = lambda i: times[i]
+        else:
+            # Liste de barres: remontée depuis la fin (O(nouvelles barres))
+            start = n
+            if state.last_timestamp is None:
+                start = 0
+            else:
+                while start > 0 and _bar_time(bars[start - 1]) >= state.last_timestamp:
+                    start -= 1
+            get_bar = lambda i: (bars[i]['close'], bars[i].get('high'), bars[i].get('low'))
+            get_time = lambda i: _bar_time(bars[i])
+
+        if state.last_timestamp is None:
+            self.replays += 1
+        elif start < n and get_time(start) == state.last_timestamp:
+            # Dernière barre connue: révision en place
+            state.revise(*get_bar(start))
+            self.bars_revised += 1
+            start += 1
+        elif start == 0:
+            return False
+
+        for i in range(start, n):
+            state.update(*get_bar(i))
+            state.last_timestamp = get_time(i)
+            self.bars_applied += 1
+        return True
+
+    def _evict_oldest(self) -> None:
+        """Supprime l'état le plus ancien."""
+        state_id = next(iter(self._states))
+        del self._states[state_id]
+        del self._specs[state_id]
+        series = self._by_series.get(state_id[:2])
+        if series is not None:
+            series.pop(state_id[2], None)
+            if not series:
+                del self._by_series[state_id[:2]]
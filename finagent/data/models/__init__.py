@@ -23,6 +23,13 @@ from .market_data import (
     MarketDataCollection
 )
 
+# Stockage columnar des barres
+from .bar_series import (
+    BarSeries,
+    to_bar_series
+)
+from .price_panel import PricePanel
+
 # Modèles d'indicateurs techniques
 from .technical_indicators import (
     IndicatorType,
@@ -62,6 +69,9 @@ __all__ = [
     "OHLCV",
     "QuoteData",
     "MarketDataCollection",
+    "BarSeries",
+    "to_bar_series",
+    "PricePanel",
     
     # Technical Indicators
     "IndicatorType",
@@ -90,6 +100,7 @@ __version__ = "1.0.0"
 # Documentation des modèles principaux
 MODEL_DESCRIPTIONS = {
     "OHLCV": "Modèle pour les données de prix (Open, High, Low, Close, Volume)",
+    "BarSeries": "Série OHLCV en colonnes NumPy (conversion DataFrame sans copie)",
     "Symbol": "Modèle pour un symbole financier avec métadonnées",
     "RSI": "Indicateur de force relative (Relative Strength Index)",
     "MACD": "Indicateur MACD (Moving Average Convergence Divergence)",
@@ -0,0 +1,515 @@
+"""
+Série de barres OHLCV en colonnes.
+
+Ce module fournit un stockage columnar (tableaux NumPy) des données
+OHLCV, alternative légère à une liste d'objets OHLCV pydantic pour
+les volumes importants (barres minute, centaines de symboles).
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .base import Symbol, TimeFrame
+from .market_data import OHLCV, MarketDataCollection
+
+if TYPE_CHECKING:
+    import pandas
+
+
+# Correspondance des noms de colonnes acceptés (yfinance, OpenBB, interne)
+_COLUMN_ALIASES = {
+    'open': 'open',
+    'high': 'high',
+    'low': 'low',
+    'close': 'close',
+    'volume': 'volume',
+    'adj close': 'adjusted_close',
+    'adj_close': 'adjusted_close',
+    'adjusted_close': 'adjusted_close',
+    'date': 'timestamp',
+    'datetime': 'timestamp',
+    'timestamp': 'timestamp',
+}
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    """Vue en lecture seule (le tableau d'origine reste modifiable)."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class BarSeries:
+    """
+    Série temporelle de barres OHLCV stockée en colonnes.
+
+    Les prix sont des tableaux float64, le volume un tableau int64 et
+    les horodatages un tableau datetime64[ns]. Les tableaux sont en
+    lecture seule afin de pouvoir être partagés (cache, DataFrame)
+    sans copie. Les objets OHLCV ne sont construits qu'à la demande.
+    """
+
+    __slots__ = (
+        'symbol', 'timeframe', 'timestamps', 'open', 'high', 'low',
+        'close', 'volume', 'adjusted_close'
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: TimeFrame,
+        timestamps: Any,
+        open: Any,
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any = None,
+        adjusted_close: Any = None
+    ):
+        """
+        Initialise la série.
+
+        Args:
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+            timestamps: Horodatages (convertis en datetime64[ns])
+            open: Prix d'ouverture
+            high: Plus hauts
+            low: Plus bas
+            close: Prix de clôture
+            volume: Volumes (zéros si absent)
+            adjusted_close: Clôtures ajustées (optionnel)
+
+        Raises:
+            ValueError: Si les colonnes n'ont pas la même longueur
+        """
+        self.symbol = symbol.upper()
+        self.timeframe = timeframe
+        self.timestamps = _readonly(np.asarray(timestamps, dtype='datetime64[ns]'))
+        self.open = _readonly(np.asarray(open, dtype=np.float64))
+        self.high = _readonly(np.asarray(high, dtype=np.float64))
+        self.low = _readonly(np.asarray(low, dtype=np.float64))
+        self.close = _readonly(np.asarray(close, dtype=np.float64))
+
+        length = len(self.timestamps)
+        if volume is None:
+            volume = np.zeros(length, dtype=np.int64)
+        self.volume = _readonly(np.asarray(volume, dtype=np.int64))
+        self.adjusted_close = (
+            _readonly(np.asarray(adjusted_close, dtype=np.float64))
+            if adjusted_close is not None else None
+        )
+
+        for name in ('open', 'high', 'low', 'close', 'volume', 'adjusted_close'):
+            column = getattr(self, name)
+            if column is not None and len(column) != length:
+                raise ValueError(
+                    f"Colonne {name} de longueur {len(column)} != {length} horodatages"
+                )
+
+    @classmethod
+    def empty(cls, symbol: str, timeframe: TimeFrame) -> 'BarSeries':
+        """Crée une série vide."""
+        return cls(symbol, timeframe, [], [], [], [], [])
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: 'pandas.DataFrame',
+        symbol: str,
+        timeframe: TimeFrame = TimeFrame.DAY_1
+    ) -> 'BarSeries':
+        """
+        Construit une série depuis un DataFrame.
+
+        Accepte les colonnes yfinance (``Open``, ``Adj Close``...) ou
+        internes (``open``, ``adjusted_close``...). Les horodatages
+        proviennent d'une colonne date/timestamp ou de l'index.
+
+        Args:
+            df: DataFrame source
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+
+        Returns:
+            Série de barres
+        """
+        import pandas as pd
+
+        columns = {}
+        for col in df.columns:
+            target = _COLUMN_ALIASES.get(str(col).lower())
+            if target and target not in columns:
+                columns[target] = df[col]
+
+        missing = [c for c in ('open', 'high', 'low', 'close') if c not in columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes pour {symbol}: {missing}")
+
+        if 'timestamp' in columns:
+            timestamps = pd.to_datetime(columns['timestamp'])
+        else:
+            timestamps = pd.to_datetime(df.index)
+        timestamps = _to_naive_local(timestamps)
+
+        volume = columns.get('volume')
+        if volume is not None:
+            volume = volume.fillna(0).to_numpy(dtype=np.int64)
+        adjusted = columns.get('adjusted_close')
+
+        return cls(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamps=timestamps,
+            open=columns['open'].to_numpy(dtype=np.float64),
+            high=columns['high'].to_numpy(dtype=np.float64),
+            low=columns['low'].to_numpy(dtype=np.float64),
+            close=columns['close'].to_numpy(dtype=np.float64),
+            volume=volume,
+            adjusted_close=adjusted.to_numpy(dtype=np.float64) if adjusted is not None else None
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Dict[str, Any]],
+        symbol: str,
+        timeframe: TimeFrame = TimeFrame.DAY_1
+    ) -> 'BarSeries':
+        """
+        Construit une série depuis une liste de dictionnaires.
+
+        Args:
+            records: Enregistrements (clés date/open/high/low/close/volume)
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+
+        Returns:
+            Série de barres
+        """
+        import pandas as pd
+
+        if not records:
+            return cls.empty(symbol, timeframe)
+        return cls.from_dataframe(pd.DataFrame.from_records(records), symbol, timeframe)
+
+    @classmethod
+    def from_ohlcv(
+        cls,
+        bars: Iterable[OHLCV],
+        symbol: Optional[str] = None,
+        timeframe: Optional[TimeFrame] = None
+    ) -> 'BarSeries':
+        """
+        Construit une série depuis des objets OHLCV.
+
+        Args:
+            bars: Objets OHLCV (un seul symbole)
+            symbol: Symbole (déduit des barres si absent)
+            timeframe: Timeframe (déduit des barres si absent)
+
+        Returns:
+            Série de barres
+        """
+        bars = list(bars)
+        if not bars:
+            return cls.empty(symbol or "", timeframe or TimeFrame.DAY_1)
+
+        first = bars[0]
+        adjusted = None
+        if all(bar.adjusted_close is not None for bar in bars):
+            adjusted = [float(bar.adjusted_close) for bar in bars]
+
+        return cls(
+            symbol=symbol or first.symbol.symbol,
+            timeframe=timeframe or first.timeframe,
+            timestamps=[_to_naive_datetime(bar.timestamp) for bar in bars],
+            open=[float(bar.open) for bar in bars],
+            high=[float(bar.high) for bar in bars],
+            low=[float(bar.low) for bar in bars],
+            close=[float(bar.close) for bar in bars],
+            volume=[bar.volume or 0 for bar in bars],
+            adjusted_close=adjusted
+        )
+
+    @classmethod
+    def from_collection(
+        cls,
+        collection: MarketDataCollection,
+        symbol: Optional[str] = None
+    ) -> 'BarSeries':
+        """
+        Construit une série depuis une MarketDataCollection.
+
+        Args:
+            collection: Collection de données OHLCV
+            symbol: Symbole à extraire (requis si plusieurs symboles)
+
+        Returns:
+            Série de barres
+        """
+        bars = collection.get_by_symbol(symbol) if symbol else collection.data
+        return cls.from_ohlcv(bars, symbol=symbol, timeframe=collection.timeframe)
+
+    def __len__(self) -> int:
+        """Nombre de barres."""
+        return len(self.timestamps)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OHLCV, 'BarSeries']:
+        """
+        Accès par index (objet OHLCV construit à la demande) ou par
+        tranche (sous-série partageant la mémoire).
+        """
+        if isinstance(index, slice):
+            return self._slice(index)
+        return self.bar(index)
+
+    def __iter__(self) -> Iterator[OHLCV]:
+        """Itère sur les barres en construisant les objets OHLCV à la demande."""
+        for i in range(len(self)):
+            yield self.bar(i)
+
+    def __repr__(self) -> str:
+        return f"BarSeries({self.symbol}, {self.timeframe.value}, {len(self)} barres)"
+
+    def _slice(self, index: slice) -> 'BarSeries':
+        """Sous-série sans copie."""
+        return BarSeries(
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            timestamps=self.timestamps[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            adjusted_close=self.adjusted_close[index] if self.adjusted_close is not None else None
+        )
+
+    def bar(self, index: int) -> OHLCV:
+        """
+        Construit l'objet OHLCV d'une barre.
+
+        Args:
+            index: Position de la barre (négatif accepté)
+
+        Returns:
+            Objet OHLCV validé
+        """
+        adjusted = None
+        if self.adjusted_close is not None:
+            adjusted = Decimal(repr(float(self.adjusted_close[index])))
+
+        return OHLCV(
+            symbol=Symbol(symbol=self.symbol),
+            timestamp=self.timestamps[index].astype('datetime64[us]').astype(datetime),
+            timeframe=self.timeframe,
+            open=Decimal(repr(float(self.open[index]))),
+            high=Decimal(repr(float(self.high[index]))),
+            low=Decimal(repr(float(self.low[index]))),
+            close=Decimal(repr(float(self.close[index]))),
+            volume=int(self.volume[index]),
+            adjusted_close=adjusted
+        )
+
+    def to_ohlcv_list(self) -> List[OHLCV]:
+        """Matérialise toutes les barres en objets OHLCV."""
+        return list(self)
+
+    def to_collection(self) -> MarketDataCollection:
+        """Convertit en MarketDataCollection (matérialise les objets OHLCV)."""
+        return MarketDataCollection(
+            data=self.to_ohlcv_list(),
+            timeframe=self.timeframe,
+            start_date=self.start_date,
+            end_date=self.end_date
+        )
+
+    def to_dataframe(self) -> 'pandas.DataFrame':
+        """
+        Convertit en DataFrame sans copier les colonnes.
+
+        Returns:
+            DataFrame indexé par horodatage avec les colonnes
+            open/high/low/close/volume (et adjusted_close si présent)
+        """
+        import pandas as pd
+
+        data = {
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+        }
+        if self.adjusted_close is not None:
+            data['adjusted_close'] = self.adjusted_close
+
+        index = pd.DatetimeIndex(self.timestamps, name='timestamp', copy=False)
+        return pd.DataFrame(data, index=index, copy=False)
+
+    @property
+    def start_date(self) -> Optional[datetime]:
+        """Horodatage de la première barre."""
+        if len(self) == 0:
+            return None
+        return self.timestamps[0].astype('datetime64[us]').astype(datetime)
+
+    @property
+    def end_date(self) -> Optional[datetime]:
+        """Horodatage de la dernière barre."""
+        if len(self) == 0:
+            return None
+        return self.timestamps[-1].astype('datetime64[us]').astype(datetime)
+
+    @property
+    def last_close(self) -> Optional[float]:
+        """Dernier prix de clôture."""
+        return float(self.close[-1]) if len(self) else None
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les colonnes."""
+        columns = [self.timestamps, self.open, self.high, self.low, self.close, self.volume]
+        if self.adjusted_close is not None:
+            columns.append(self.adjusted_close)
+        return sum(column.nbytes for column in columns)
+
+    def returns(self, log: bool = False) -> np.ndarray:
+        """
+        Rendements de clôture à clôture.
+
+        Args:
+            log: Rendements logarithmiques si True
+
+        Returns:
+            Tableau de longueur ``len(self) - 1``
+        """
+        if len(self) < 2:
+            return np.empty(0, dtype=np.float64)
+        if log:
+            return np.diff(np.log(self.close))
+        return self.close[1:] / self.close[:-1] - 1.0
+
+    def merge(self, newer: 'BarSeries') -> 'BarSeries':
+        """
+        Fusionne des barres plus récentes dans la série.
+
+        Les barres existantes à partir du premier horodatage de
+        ``newer`` sont remplacées (barre en cours, corrections).
+
+        Args:
+            newer: Barres récentes du même symbole et timeframe
+
+        Returns:
+            Nouvelle série fusionnée
+        """
+        if len(newer) == 0:
+            return self
+        if len(self) == 0:
+            return newer
+
+        cut = int(np.searchsorted(self.timestamps, newer.timestamps[0], 'left'))
+        head = self._slice(slice(0, cut))
+
+        adjusted = None
+        if head.adjusted_close is not None and newer.adjusted_close is not None:
+            adjusted = np.concatenate([head.adjusted_close, newer.adjusted_close])
+
+        return BarSeries(
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            timestamps=np.concatenate([head.timestamps, newer.timestamps]),
+            open=np.concatenate([head.open, newer.open]),
+            high=np.concatenate([head.high, newer.high]),
+            low=np.concatenate([head.low, newer.low]),
+            close=np.concatenate([head.close, newer.close]),
+            volume=np.concatenate([head.volume, newer.volume]),
+            adjusted_close=adjusted
+        )
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> 'BarSeries':
+        """
+        Sous-série sur une plage temporelle (recherche dichotomique).
+
+        Args:
+            start: Début inclus
+            end: Fin incluse
+
+        Returns:
+            Sous-série partageant la mémoire
+        """
+        lo = 0
+        hi = len(self)
+        if start is not None:
+            lo = int(np.searchsorted(self.timestamps, np.datetime64(_to_naive_datetime(start), 'ns'), 'left'))
+        if end is not None:
+            hi = int(np.searchsorted(self.timestamps, np.datetime64(_to_naive_datetime(end), 'ns'), 'right'))
+        return self._slice(slice(lo, hi))
+
+
+def _to_naive_datetime(value: datetime) -> datetime:
+    """
+    Convertit un datetime avec fuseau en datetime naïf.
+
+    Même convention que ``_to_naive_local``: l'heure locale est conservée
+    et seul le fuseau est retiré.
+    """
+    if value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def _to_naive_local(timestamps: Any) -> np.ndarray:
+    """
+    Convertit des horodatages pandas en datetime64[ns] naïf.
+
+    L'heure locale de la place de cotation est conservée afin que les
+    barres journalières restent sur leur date de séance.
+    """
+    import pandas as pd
+
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy(dtype='datetime64[ns]')
+
+
+def to_bar_series(
+    data: Any,
+    symbol: str = "",
+    timeframe: TimeFrame = TimeFrame.DAY_1
+) -> BarSeries:
+    """
+    Convertit les formats de données historiques connus en BarSeries.
+
+    Point d'entrée commun des chemins indicateurs, analyse et risque:
+    accepte une BarSeries, une MarketDataCollection, un DataFrame ou
+    une liste de dictionnaires.
+
+    Args:
+        data: Données historiques
+        symbol: Symbole (si non porté par les données)
+        timeframe: Timeframe (si non porté par les données)
+
+    Returns:
+        Série de barres
+
+    Raises:
+        TypeError: Si le format n'est pas supporté
+    """
+    if isinstance(data, BarSeries):
+        return data
+    if isinstance(data, MarketDataCollection):
+        return BarSeries.from_collection(data, symbol or None)
+    if hasattr(data, 'to_bar_series'):
+        return data.to_bar_series()
+    if hasattr(data, 'columns') and hasattr(data, 'index'):
+        return BarSeries.from_dataframe(data, symbol, timeframe)
+    if isinstance(data, (list, tuple)):
+        return BarSeries.from_records(data, symbol, timeframe)
+
+    raise TypeError(f"Format de données historiques non supporté: {type(data).__name__}")
@@ -7,13 +7,16 @@ volumes, et autres informations de marché.
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 
 from pydantic import BaseModel, Field, validator
 import arrow
 
 from .base import BaseFinancialModel, Symbol, TimeFrame, MarketStatus, Currency, DataQuality
 
+if TYPE_CHECKING:
+    from .bar_series import BarSeries
+
 
 class Price(BaseModel):
     """
@@ -393,6 +396,19 @@ class MarketDataCollection(BaseModel):
         except ImportError:
             raise ImportError("pandas n'est pas disponible pour la conversion")
 
+    def to_bar_series(self, symbol: Optional[str] = None) -> 'BarSeries':
+        """
+        Convertit la collection en série columnar.
+        
+        Args:
+            symbol: Symbole à extraire (requis si plusieurs symboles)
+            
+        Returns:
+            BarSeries avec les colonnes OHLCV
+        """
+        from .bar_series import BarSeries
+        return BarSeries.from_collection(self, symbol)
+
     def __len__(self) -> int:
         """Retourne le nombre d'éléments dans la collection."""
         return len(self.data)
@@ -0,0 +1,147 @@
+"""
+Panel de prix aligné (symboles × dates).
+
+Ce module regroupe les séries de plusieurs symboles dans des tableaux
+2D partageant la même chronologie, pour calculer indicateurs et
+statistiques de tout un univers en une seule passe vectorielle.
+"""
+
+from typing import Any, List, Mapping, Sequence
+
+import numpy as np
+
+from .base import TimeFrame
+from .bar_series import to_bar_series
+
+
+class PricePanel:
+    """
+    Prix OHLCV de plusieurs symboles alignés sur une chronologie commune.
+
+    Chaque colonne est un tableau float64 ``(symboles, dates)``. Les
+    dates antérieures à la première barre d'un symbole valent NaN; une
+    barre absente en cours d'historique est remplacée par une barre plate
+    à la dernière clôture connue (volume NaN).
+    """
+
+    __slots__ = ('symbols', 'timeframe', 'timestamps', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        timestamps: Any,
+        open: Any,
+        high: Any,
+        low: Any,
+        close: Any,
+        volume: Any = None,
+        timeframe: TimeFrame = TimeFrame.DAY_1
+    ):
+        """
+        Initialise le panel.
+
+        Args:
+            symbols: Symboles (une ligne par symbole)
+            timestamps: Horodatages communs (convertis en datetime64[ns])
+            open: Prix d'ouverture
+            high: Plus hauts
+            low: Plus bas
+            close: Prix de clôture
+            volume: Volumes (NaN si absent)
+            timeframe: Timeframe des barres
+
+        Raises:
+            ValueError: Si les tableaux n'ont pas la forme (symboles, dates)
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self.timeframe = timeframe
+        self.timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = (
+            np.asarray(volume, dtype=np.float64) if volume is not None
+            else np.full(self.close.shape, np.nan)
+        )
+
+        shape = (len(self.symbols), len(self.timestamps))
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            column = getattr(self, name)
+            if column.shape != shape:
+                raise ValueError(f"Colonne {name} de forme {column.shape} != {shape}")
+
+    @classmethod
+    def from_series(
+        cls,
+        series_by_symbol: Mapping[str, Any],
+        timeframe: TimeFrame = TimeFrame.DAY_1
+    ) -> 'PricePanel':
+        """
+        Aligne des historiques sur l'union de leurs horodatages.
+
+        Args:
+            series_by_symbol: Historique par symbole (BarSeries, DataFrame, records)
+            timeframe: Timeframe des barres
+
+        Returns:
+            Panel aligné (symboles dans l'ordre du dictionnaire)
+        """
+        symbols = list(series_by_symbol)
+        series = [to_bar_series(series_by_symbol[s], s, timeframe) for s in symbols]
+        if not series:
+            empty = np.empty((0, 0))
+            return cls([], np.empty(0, dtype='datetime64[ns]'), empty, empty, empty, empty, empty, timeframe)
+
+        timestamps = np.unique(np.concatenate([s.timestamps for s in series]))
+        shape = (len(series), len(timestamps))
+        columns = {name: np.full(shape, np.nan) for name in ('open', 'high', 'low', 'close', 'volume')}
+        for row, bars in enumerate(series):
+            cols = np.searchsorted(timestamps, bars.timestamps)
+            for name, values in columns.items():
+                values[row, cols] = getattr(bars, name)
+
+        _fill_gaps(columns)
+        return cls(symbols, timestamps, timeframe=timeframe, **columns)
+
+    def __len__(self) -> int:
+        """Nombre de symboles."""
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"PricePanel({len(self.symbols)} symboles, {len(self.timestamps)} dates)"
+
+    @property
+    def shape(self) -> tuple:
+        """Forme (symboles, dates)."""
+        return self.close.shape
+
+    def valid_counts(self) -> np.ndarray:
+        """Nombre de barres définies par symbole."""
+        return np.count_nonzero(~np.isnan(self.close), axis=1)
+
+    def select(self, symbols: Sequence[str]) -> 'PricePanel':
+        """Sous-panel des symboles demandés (présents dans le panel)."""
+        index = {s: i for i, s in enumerate(self.symbols)}
+        rows: List[int] = [index[s.upper()] for s in symbols if s.upper() in index]
+        return PricePanel(
+            [self.symbols[r] for r in rows], self.timestamps,
+            self.open[rows], self.high[rows], self.low[rows], self.close[rows], self.volume[rows],
+            self.timeframe
+        )
+
+
+def _fill_gaps(columns: Mapping[str, np.ndarray]) -> None:
+    """Remplace les barres absentes en cours d'historique par la dernière clôture."""
+    close = columns['close']
+    valid = ~np.isnan(close)
+    if valid.all():
+        return
+
+    # Indice de la dernière barre définie (report vers l'avant vectorisé)
+    last = np.where(valid, np.arange(close.shape[1]), 0)
+    np.maximum.accumulate(last, axis=1, out=last)
+    filled = np.take_along_axis(close, last, axis=1)
+    gaps = ~valid & ~np.isnan(filled)
+    for name in ('open', 'high', 'low', 'close'):
+        columns[name][gaps] = filled[gaps]
@@ -9,14 +9,20 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
 
 import os
+import numpy as np
+import pandas as pd
 import structlog
 import sys
 from httpx import AsyncClient
 
+from finagent.data.models.base import TimeFrame
+from finagent.data.models.bar_series import BarSeries
+
 # Patch pour éviter l'importation de websockets.asyncio dans yfinance
 def patch_yfinance_websockets():
     """Patch yfinance pour éviter l'erreur websockets.asyncio."""
@@ -61,6 +67,133 @@ class MarketDataType(str, Enum):
     VOLUME = "volume"
 
 
+class HistoryOutput(str, Enum):
+    """Output formats for :meth:`OpenBBProvider.get_historical_data`."""
+
+    RECORDS = "records"
+    FRAME = "frame"
+    SERIES = "series"
+
+
+# yfinance intervals mapped to internal timeframes
+_INTERVAL_TIMEFRAMES = {
+    "1m": TimeFrame.MINUTE_1,
+    "5m": TimeFrame.MINUTE_5,
+    "15m": TimeFrame.MINUTE_15,
+    "30m": TimeFrame.MINUTE_30,
+    "1h": TimeFrame.HOUR_1,
+    "60m": TimeFrame.HOUR_1,
+    "1d": TimeFrame.DAY_1,
+    "1wk": TimeFrame.WEEK_1,
+    "1mo": TimeFrame.MONTH_1,
+}
+
+
+class HistoricalRecords(Sequence):
+    """Lazy list-of-dicts view over a :class:`BarSeries`.
+
+    Keeps backward compatibility with callers expecting
+    ``[{"date", "open", "high", "low", "close", "volume"}, ...]`` while
+    the data stays columnar; a dict is only built when a row is accessed.
+    """
+
+    __slots__ = ("series", "_dates")
+
+    def __init__(self, series: BarSeries) -> None:
+        self.series = series
+        self._dates: Optional[np.ndarray] = None
+
+    def _date_strings(self) -> np.ndarray:
+        if self._dates is None:
+            self._dates = np.datetime_as_string(self.series.timestamps, unit="D")
+        return self._dates
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        series = self.series
+        return {
+            "date": str(self._date_strings()[index]),
+            "open": float(series.open[index]),
+            "high": float(series.high[index]),
+            "low": float(series.low[index]),
+            "close": float(series.close[index]),
+            "volume": int(series.volume[index]),
+        }
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("historical record index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, HistoricalRecords)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoricalRecords({self.series!r})"
+
+    def to_bar_series(self) -> BarSeries:
+        """Return the underlying columnar series (no copy)."""
+        return self.series
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the data as a DataFrame (no copy)."""
+        return self.series.to_dataframe()
+
+
+def normalize_history_frame(hist: pd.DataFrame) -> pd.DataFrame:
+    """Normalise a yfinance history frame.
+
+    Columns are lower-cased (``Adj Close`` becomes ``adjusted_close``),
+    and the index becomes a tz-naive ``DatetimeIndex`` named ``date``
+    holding the exchange-local wall-clock time.
+    """
+    frame = hist.rename(columns=lambda c: str(c).lower().replace("adj close", "adjusted_close"))
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.rename("date")
+    return frame
+
+
+def split_batch_frame(data: pd.DataFrame, symbols: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Split a multi-ticker ``yf.download`` frame into normalised per-symbol frames.
+
+    Rows where a ticker has no data (other tickers traded) are dropped;
+    tickers with no data at all are omitted.
+    """
+    if data is None or data.empty:
+        return {}
+
+    if isinstance(data.columns, pd.MultiIndex):
+        level = 0 if set(symbols) & set(data.columns.get_level_values(0)) else 1
+        per_symbol = {
+            symbol: data.xs(symbol, axis=1, level=level)
+            for symbol in data.columns.get_level_values(level).unique()
+            if symbol in symbols
+        }
+    else:
+        per_symbol = {symbols[0]: data}
+
+    frames: Dict[str, pd.DataFrame] = {}
+    for symbol, frame in per_symbol.items():
+        frame = frame.dropna(how="all")
+        if not frame.empty:
+            frames[symbol] = normalize_history_frame(frame)
+    return frames
+
+
 @dataclass
 class OpenBBConfig:
     """Configuration for the OpenBB provider."""
@@ -107,25 +240,129 @@ class OpenBBProvider:
         price = float(data["Close"].iloc[-1]) if not data.empty else None
         return {"symbol": symbol, "price": price}
 
-    async def get_historical_data(self, symbol: str, period: str = "1y") -> List[Dict[str, Any]]:
-        """Return historical OHLCV data for ``symbol``."""
-        hist = await asyncio.to_thread(lambda: yf.Ticker(symbol).history(period=period))
-        if hist.empty:
-            return []
-        hist.reset_index(inplace=True)
-        records: List[Dict[str, Any]] = []
-        for _, row in hist.iterrows():
-            records.append(
-                {
-                    "date": row["Date"].strftime("%Y-%m-%d"),
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "close": float(row["Close"]),
-                    "volume": int(row["Volume"]),
-                }
+    async def get_historical_data(
+        self,
+        symbol: str,
+        period: str = "1y",
+        interval: str = "1d",
+        output: Union[str, HistoryOutput] = HistoryOutput.RECORDS,
+        start: Optional[datetime] = None,
+    ) -> Union[HistoricalRecords, pd.DataFrame, BarSeries]:
+        """Return historical OHLCV data for ``symbol``.
+
+        Args:
+            symbol: Ticker symbol.
+            period: yfinance period (``1mo``, ``1y``...).
+            interval: yfinance bar interval (``1d``, ``1h``...).
+            output: ``records`` (lazy list-of-dicts view, default),
+                ``frame`` (normalised DataFrame) or ``series``
+                (columnar :class:`BarSeries`, dates as datetime64).
+            start: Only return bars from this timestamp onwards
+                (overrides ``period``); used for incremental refreshes.
+        """
+        if start is not None:
+            fetch = lambda: yf.Ticker(symbol).history(start=start, interval=interval)
+        else:
+            fetch = lambda: yf.Ticker(symbol).history(period=period, interval=interval)
+        hist = await asyncio.to_thread(fetch)
+        return self._format_history(normalize_history_frame(hist), symbol, interval, output)
+
+    async def get_quotes(self, symbols: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the latest price of many symbols in one bulk download.
+
+        Symbols without data are omitted from the result.
+        """
+        # A few days of daily bars so that holidays still yield a last close
+        frames = await self._download_batch(symbols, period="5d", interval="1d")
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for symbol, frame in frames.items():
+            if "close" not in frame:
+                continue
+            close = frame["close"].dropna()
+            if not close.empty:
+                quotes[symbol] = {"symbol": symbol, "price": float(close.iloc[-1])}
+        return quotes
+
+    async def get_historical_batch(
+        self,
+        symbols: Sequence[str],
+        period: str = "1y",
+        interval: str = "1d",
+        output: Union[str, HistoryOutput] = HistoryOutput.RECORDS,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Union[HistoricalRecords, pd.DataFrame, BarSeries]]:
+        """Return historical OHLCV data for many symbols in one bulk download.
+
+        Args:
+            symbols: Ticker symbols.
+            period: yfinance period (``1mo``, ``1y``...).
+            interval: yfinance bar interval (``1d``, ``1h``...).
+            output: Same formats as :meth:`get_historical_data`.
+            start: Explicit range start (overrides ``period``).
+            end: Explicit range end (exclusive, defaults to now).
+
+        Returns:
+            Mapping symbol -> history; symbols without data are omitted.
+        """
+        frames = await self._download_batch(
+            symbols, period=period, interval=interval, start=start, end=end
+        )
+        return {
+            symbol: self._format_history(frame, symbol, interval, output)
+            for symbol, frame in frames.items()
+        }
+
+    async def _download_batch(
+        self,
+        symbols: Sequence[str],
+        period: str,
+        interval: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Download many tickers at once and split the result per symbol."""
+        tickers = list(dict.fromkeys(symbols))
+        if not tickers:
+            return {}
+
+        span = {"start": start, "end": end} if start is not None else {"period": period}
+        data = await asyncio.to_thread(
+            lambda: yf.download(
+                tickers,
+                **span,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
             )
-        return records
+        )
+        frames = split_batch_frame(data, tickers)
+        logger.debug("Téléchargement groupé", requested=len(tickers), received=len(frames))
+        return frames
+
+    @staticmethod
+    def _format_history(
+        frame: pd.DataFrame,
+        symbol: str,
+        interval: str,
+        output: Union[str, HistoryOutput],
+    ) -> Union[HistoricalRecords, pd.DataFrame, BarSeries]:
+        """Convert a normalised history frame to the requested output."""
+        output = HistoryOutput(output)
+        if output is HistoryOutput.FRAME:
+            return frame
+
+        timeframe = _INTERVAL_TIMEFRAMES.get(interval, TimeFrame.DAY_1)
+        if frame.empty:
+            series = BarSeries.empty(symbol, timeframe)
+        else:
+            series = BarSeries.from_dataframe(frame, symbol, timeframe)
+
+        if output is HistoryOutput.SERIES:
+            return series
+        return HistoricalRecords(series)
 
     async def get_company_info(self, symbol: str) -> Dict[str, Any]:
         """Return basic company information."""
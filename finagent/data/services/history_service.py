@@ -0,0 +1,324 @@
+"""
+Service d'historique incrémental.
+
+Ce module conserve en cache la série de barres de chaque couple
+symbole/timeframe et ne demande au provider que les barres postérieures
+au dernier horodatage connu. Les corrections d'historique (splits,
+dividendes) sont détectées sur la zone de recouvrement et déclenchent
+un rechargement complet.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+import numpy as np
+
+from ..cache import MultiLevelCacheManager, CacheKeys, CacheTags, RequestCoalescer
+from ..models.bar_series import BarSeries
+
+logger = logging.getLogger(__name__)
+
+
+# Durée couverte par les périodes provider (None: pas de troncature)
+_PERIOD_DAYS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 31,
+    "3mo": 92,
+    "6mo": 183,
+    "1y": 366,
+    "2y": 731,
+    "5y": 1827,
+    "10y": 3653,
+    "ytd": None,
+    "max": None
+}
+
+# Intervalle minimal entre deux rafraîchissements (secondes)
+_REFRESH_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "60m": 3600,
+    "1d": 3600,
+    "1wk": 86400,
+    "1mo": 86400
+}
+
+
+class HistoryRefreshError(Exception):
+    """Erreur lors du rafraîchissement de l'historique."""
+
+    def __init__(self, message: str, symbol: str = "", cause: Optional[Exception] = None):
+        self.message = message
+        self.symbol = symbol
+        self.cause = cause
+        super().__init__(message)
+
+
+class IncrementalHistoryService:
+    """
+    Historique de barres avec rafraîchissement incrémental.
+
+    Au premier appel la période complète est téléchargée; ensuite seules
+    les barres à partir de l'avant-dernier horodatage en cache sont
+    demandées puis fusionnées. Les barres déjà connues de la zone de
+    recouvrement servent à détecter une correction de l'historique.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        cache_manager: Optional[MultiLevelCacheManager] = None,
+        overlap_bars: int = 2,
+        restatement_tolerance: float = 1e-6,
+        cache_ttl: int = 7 * 86400
+    ):
+        """
+        Initialise le service.
+
+        Args:
+            provider: Provider exposant ``get_historical_data(..., start=, output="series")``
+            cache_manager: Gestionnaire de cache (mémoire locale si absent)
+            overlap_bars: Nombre de barres en cache re-téléchargées à chaque delta
+            restatement_tolerance: Écart relatif toléré sur les prix ajustés
+            cache_ttl: Durée de vie des séries en cache (secondes)
+        """
+        self.provider = provider
+        self.cache_manager = cache_manager
+        self.overlap_bars = max(1, overlap_bars)
+        self.restatement_tolerance = restatement_tolerance
+        self.cache_ttl = cache_ttl
+
+        self._local: Dict[str, BarSeries] = {}
+        self._last_refresh: Dict[str, float] = {}
+        self._full_history: Set[str] = set()
+        self._coalescer = RequestCoalescer()
+
+        # Statistiques
+        self.full_fetches = 0
+        self.delta_fetches = 0
+        self.skipped_refreshes = 0
+        self.restatements = 0
+        self.bars_fetched = 0
+
+    async def get_series(
+        self,
+        symbol: str,
+        period: str = "1y",
+        interval: str = "1d",
+        force_refresh: bool = False
+    ) -> BarSeries:
+        """
+        Retourne l'historique d'un symbole, rafraîchi de façon incrémentale.
+
+        Args:
+            symbol: Symbole financier
+            period: Période provider (``1y``, ``6mo``...)
+            interval: Intervalle des barres (``1d``, ``5m``...)
+            force_refresh: Ignore l'intervalle minimal de rafraîchissement
+
+        Returns:
+            Série de barres couvrant la période demandée
+        """
+        symbol = symbol.upper()
+        key = CacheKeys.market_data(symbol, interval)
+
+        series = await self._coalescer.run(
+            f"{key}:{period}",
+            lambda: self._refresh(key, symbol, period, interval, force_refresh)
+        )
+        return self._window(series, period)
+
+    async def invalidate(self, symbol: str, interval: str = "1d") -> None:
+        """
+        Supprime la série en cache (prochain appel: rechargement complet).
+
+        Args:
+            symbol: Symbole financier
+            interval: Intervalle des barres
+        """
+        key = CacheKeys.market_data(symbol.upper(), interval)
+        self._local.pop(key, None)
+        self._last_refresh.pop(key, None)
+        if self.cache_manager:
+            await self.cache_manager.delete(key)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Retourne les statistiques du service."""
+        return {
+            'full_fetches': self.full_fetches,
+            'delta_fetches': self.delta_fetches,
+            'skipped_refreshes': self.skipped_refreshes,
+            'restatements': self.restatements,
+            'bars_fetched': self.bars_fetched,
+            'cached_series': len(self._last_refresh),
+            'coalesced_requests': self._coalescer.coalesced_count
+        }
+
+    async def _refresh(
+        self,
+        key: str,
+        symbol: str,
+        period: str,
+        interval: str,
+        force_refresh: bool
+    ) -> BarSeries:
+        """Rafraîchit la série en cache (complet ou delta)."""
+        cached = await self._load(key)
+
+        if cached is None or len(cached) == 0 or not self._covers(key, cached, period):
+            series = await self._fetch_full(symbol, period, interval)
+            if period == "max":
+                self._full_history.add(key)
+            await self._store(key, symbol, interval, series)
+            return series
+
+        last_refresh = self._last_refresh.get(key, 0.0)
+        if not force_refresh and time.time() - last_refresh < _REFRESH_SECONDS.get(interval, 3600):
+            self.skipped_refreshes += 1
+            return cached
+
+        overlap = min(self.overlap_bars, len(cached))
+        start = cached.timestamps[-overlap].astype('datetime64[us]').astype(datetime)
+
+        try:
+            delta = await self.provider.get_historical_data(
+                symbol, interval=interval, start=start, output="series"
+            )
+        except Exception as e:
+            raise HistoryRefreshError(
+                f"Échec du rafraîchissement incrémental pour {symbol}: {e}",
+                symbol=symbol,
+                cause=e
+            )
+
+        self.delta_fetches += 1
+        self.bars_fetched += len(delta)
+
+        if self._is_restated(cached, delta):
+            self.restatements += 1
+            logger.info(f"Correction d'historique détectée pour {symbol}, rechargement complet")
+            # Recharge toute la profondeur déjà en cache
+            first = cached.timestamps[0].astype('datetime64[us]').astype(datetime)
+            series = await self._fetch_full(symbol, period, interval, start=first)
+        else:
+            series = self._keep_span(key, cached, cached.merge(delta))
+
+        await self._store(key, symbol, interval, series)
+        return series
+
+    async def _fetch_full(
+        self,
+        symbol: str,
+        period: str,
+        interval: str,
+        start: Optional[datetime] = None
+    ) -> BarSeries:
+        """Télécharge la période complète (ou tout depuis ``start``)."""
+        try:
+            series = await self.provider.get_historical_data(
+                symbol, period=period, interval=interval, output="series", start=start
+            )
+        except Exception as e:
+            raise HistoryRefreshError(
+                f"Échec du chargement de l'historique pour {symbol}: {e}",
+                symbol=symbol,
+                cause=e
+            )
+
+        self.full_fetches += 1
+        self.bars_fetched += len(series)
+        return series
+
+    def _is_restated(self, cached: BarSeries, delta: BarSeries) -> bool:
+        """
+        Détecte une correction de l'historique sur la zone de recouvrement.
+
+        Compare les prix ajustés (ou de clôture) des barres présentes dans
+        les deux séries, hors dernière barre en cache qui peut être
+        incomplète (séance en cours).
+        """
+        if len(delta) == 0 or len(cached) < 2:
+            return False
+
+        settled = cached._slice(slice(0, len(cached) - 1))
+        common, cached_idx, delta_idx = np.intersect1d(
+            settled.timestamps, delta.timestamps, assume_unique=True, return_indices=True
+        )
+        if len(common) == 0:
+            return False
+
+        if settled.adjusted_close is not None and delta.adjusted_close is not None:
+            old_prices = settled.adjusted_close[cached_idx]
+            new_prices = delta.adjusted_close[delta_idx]
+        else:
+            old_prices = settled.close[cached_idx]
+            new_prices = delta.close[delta_idx]
+
+        return not np.allclose(new_prices, old_prices, rtol=self.restatement_tolerance, atol=0.0)
+
+    async def _load(self, key: str) -> Optional[BarSeries]:
+        """Charge la série depuis le cache."""
+        if self.cache_manager:
+            series = await self.cache_manager.get(key)
+            if series is not None:
+                return series
+        return self._local.get(key)
+
+    async def _store(self, key: str, symbol: str, interval: str, series: BarSeries) -> None:
+        """Enregistre la série en cache."""
+        self._last_refresh[key] = time.time()
+        if self.cache_manager:
+            try:
+                await self.cache_manager.set(
+                    key, series, ttl=self.cache_ttl,
+                    tags=[CacheTags.symbol(symbol), CacheTags.timeframe(interval), CacheTags.HISTORICAL]
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Échec de mise en cache de l'historique {key}: {e}")
+        self._local[key] = series
+
+    @staticmethod
+    def _period_start(period: str, reference: np.datetime64) -> Optional[np.datetime64]:
+        """Début de la fenêtre couverte par une période (None: tout l'historique)."""
+        if period == "ytd":
+            return reference.astype('datetime64[Y]').astype('datetime64[ns]')
+        days = _PERIOD_DAYS.get(period, 366)
+        if days is None:
+            return None
+        return reference - np.timedelta64(days, 'D')
+
+    def _covers(self, key: str, series: BarSeries, period: str) -> bool:
+        """Vérifie que la série en cache remonte assez loin pour la période."""
+        start = self._period_start(period, np.datetime64(datetime.now(), 'ns'))
+        if start is None:
+            return key in self._full_history
+        # Tolérance d'une semaine (week-ends, jours fériés en début de période)
+        return series.timestamps[0] <= start + np.timedelta64(7, 'D')
+
+    def _keep_span(self, key: str, previous: BarSeries, merged: BarSeries) -> BarSeries:
+        """
+        Borne la série fusionnée à la profondeur d'historique précédente
+        afin que le cache ne grossisse pas indéfiniment.
+        """
+        if key in self._full_history or len(previous) == 0:
+            return merged
+        span = previous.timestamps[-1] - previous.timestamps[0]
+        cut = int(np.searchsorted(merged.timestamps, merged.timestamps[-1] - span, 'left'))
+        return merged[cut:] if cut > 0 else merged
+
+    def _window(self, series: BarSeries, period: str) -> BarSeries:
+        """Fenêtre de la série correspondant à la période (sans copie)."""
+        if len(series) == 0:
+            return series
+        start = self._period_start(period, series.timestamps[-1])
+        if start is None:
+            return series
+        cut = int(np.searchsorted(series.timestamps, start, 'left'))
+        return series[cut:] if cut > 0 else series
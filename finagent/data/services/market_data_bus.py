@@ -0,0 +1,544 @@
+"""
+Bus de données de marché en processus.
+
+La couche données publie une seule fois chaque nouvelle barre ou
+cotation; les consommateurs (moteur de stratégies, moteur de décision,
+revalorisation des portefeuilles) s'abonnent avec des filtres par
+symbole, timeframe et type d'événement.
+
+Chaque abonnement dispose d'une file bornée: une mise à jour plus récente
+pour la même clé (type, symbole, timeframe) remplace celle qui n'a pas
+encore été livrée, et l'éditeur attend lorsque la file d'un abonné est
+pleine (contre-pression). Le bus conserve l'état courant (dernières
+cotations, fenêtre de barres) dont il fournit des instantanés cohérents.
+"""
+
+import asyncio
+import inspect
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..models.bar_series import BarSeries
+
+logger = logging.getLogger(__name__)
+
+
+class MarketEventType(str, Enum):
+    """Types d'événements publiés sur le bus."""
+    BAR = "bar"
+    QUOTE = "quote"
+
+
+@dataclass(frozen=True)
+class MarketEvent:
+    """Événement de marché (nouvelle barre ou cotation)."""
+    type: MarketEventType
+    symbol: str
+    data: Any
+    timeframe: Optional[str] = None
+    sequence: int = 0
+    published_at: datetime = field(default_factory=datetime.now)
+    new_bars: int = 0
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        """Clé de regroupement des mises à jour successives."""
+        return self.type.value, self.symbol, self.timeframe
+
+
+@dataclass
+class MarketSnapshot:
+    """
+    Instantané de l'état du bus, cohérent pour un cycle d'exécution.
+
+    Les listes de barres sont copiées: les publications ultérieures ne
+    modifient pas l'instantané.
+    """
+    sequence: int
+    created_at: datetime
+    quotes: Dict[str, Any]
+    bars: Dict[str, Dict[str, List[Dict[str, Any]]]]
+
+    def quote(self, symbol: str) -> Optional[Any]:
+        """Dernière cotation d'un symbole."""
+        return self.quotes.get(symbol)
+
+    def market_data(self, symbol: str) -> Dict[str, Any]:
+        """
+        Données d'un symbole au format attendu par les stratégies.
+
+        Args:
+            symbol: Symbole financier
+
+        Returns:
+            Dict: ``prices`` par timeframe, cotation, prix et volume courants
+        """
+        prices = self.bars.get(symbol, {})
+        data: Dict[str, Any] = {'prices': prices, 'snapshot_sequence': self.sequence}
+
+        quote = self.quotes.get(symbol)
+        if quote is not None:
+            data['quote'] = quote
+            data['price'] = quote.get('price')
+            data['volume'] = quote.get('volume', 0)
+            timestamp = quote.get('timestamp')
+            data['current_price'] = {
+                'price': quote.get('price'),
+                'timestamp': timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+            }
+        else:
+            last_bar = self._last_bar(prices)
+            if last_bar is not None:
+                data['price'] = last_bar['close']
+                data['volume'] = last_bar.get('volume', 0)
+        return data
+
+    @staticmethod
+    def _last_bar(prices: Dict[str, List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Barre la plus récente, toutes timeframes confondues."""
+        last = [bars[-1] for bars in prices.values() if bars]
+        return max(last, key=lambda bar: bar['timestamp']) if last else None
+
+
+class Subscription:
+    """
+    Abonnement au bus avec file bornée et regroupement des mises à jour.
+    """
+
+    def __init__(self,
+                 callback: Callable[[MarketEvent], Any],
+                 symbols: Optional[Iterable[str]] = None,
+                 timeframes: Optional[Iterable[str]] = None,
+                 event_types: Optional[Iterable[MarketEventType]] = None,
+                 max_pending: int = 1000,
+                 name: Optional[str] = None):
+        """
+        Initialise l'abonnement.
+
+        Args:
+            callback: Fonction (ou coroutine) appelée pour chaque événement
+            symbols: Symboles suivis (tous si absent)
+            timeframes: Timeframes des barres suivies (toutes si absent)
+            event_types: Types d'événements suivis (tous si absent)
+            max_pending: Nombre maximum de clés en attente de livraison
+            name: Nom de l'abonné (journalisation)
+        """
+        self.callback = callback
+        self.symbols: Optional[Set[str]] = set(symbols) if symbols else None
+        self.timeframes: Optional[Set[str]] = set(timeframes) if timeframes else None
+        self.event_types: Optional[Set[MarketEventType]] = set(event_types) if event_types else None
+        self.max_pending = max(1, max_pending)
+        self.name = name or getattr(callback, '__qualname__', 'subscriber')
+
+        self._pending: 'OrderedDict[Tuple[str, str, Optional[str]], MarketEvent]' = OrderedDict()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistiques
+        self.delivered = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.blocked = 0
+
+    def matches(self, event: MarketEvent) -> bool:
+        """Indique si l'événement passe les filtres de l'abonnement."""
+        if self.event_types is not None and event.type not in self.event_types:
+            return False
+        if self.symbols is not None and event.symbol not in self.symbols:
+            return False
+        if event.timeframe is not None and self.timeframes is not None and event.timeframe not in self.timeframes:
+            return False
+        return True
+
+    def update_filters(self, symbols: Optional[Iterable[str]] = None,
+                       timeframes: Optional[Iterable[str]] = None) -> None:
+        """
+        Remplace les filtres de symboles et de timeframes.
+
+        Args:
+            symbols: Symboles suivis (tous si absent)
+            timeframes: Timeframes suivies (toutes si absent)
+        """
+        self.symbols = set(symbols) if symbols else None
+        self.timeframes = set(timeframes) if timeframes else None
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'événements en attente de livraison."""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques de l'abonnement."""
+        return {
+            'name': self.name,
+            'pending': len(self._pending),
+            'delivered': self.delivered,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'blocked': self.blocked
+        }
+
+    async def _offer(self, event: MarketEvent) -> None:
+        """Place un événement en file (regroupement, attente si pleine)."""
+        while event.key not in self._pending and len(self._pending) >= self.max_pending:
+            # Contre-pression: l'éditeur attend que l'abonné consomme
+            self.blocked += 1
+            self._space.clear()
+            await self._space.wait()
+
+        if event.key in self._pending:
+            # Mise à jour périmée remplacée (position conservée dans la file)
+            self.coalesced += 1
+        self._pending[event.key] = event
+        self._idle.clear()
+        self._ready.set()
+
+    def _start(self) -> None:
+        """Démarre la tâche de livraison."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._deliver_loop())
+
+    async def _deliver_loop(self) -> None:
+        """Livre les événements dans l'ordre d'arrivée des clés."""
+        while True:
+            await self._ready.wait()
+            while self._pending:
+                _, event = self._pending.popitem(last=False)
+                self._space.set()
+                try:
+                    result = self.callback(event)
+                    if inspect.isawaitable(result):
+                        await result
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Erreur abonné {self.name} ({event.symbol}): {e}")
+                self.delivered += 1
+            self._ready.clear()
+            self._idle.set()
+
+
+class MarketDataBus:
+    """
+    Bus publication/abonnement des données de marché.
+    """
+
+    def __init__(self, max_pending: int = 1000, bar_history: int = 500):
+        """
+        Initialise le bus.
+
+        Args:
+            max_pending: Taille par défaut des files d'abonnés
+            bar_history: Nombre de barres conservées par symbole/timeframe
+        """
+        self.max_pending = max_pending
+        self.bar_history = bar_history
+
+        self._subscriptions: List[Subscription] = []
+        self._quotes: Dict[str, Any] = {}
+        self._bars: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}
+        self._sequence = 0
+
+        # Statistiques
+        self.stats = {
+            'published_bars': 0,
+            'published_quotes': 0,
+            'events': 0
+        }
+
+    def subscribe(self,
+                  callback: Callable[[MarketEvent], Any],
+                  symbols: Optional[Iterable[str]] = None,
+                  timeframes: Optional[Iterable[str]] = None,
+                  event_types: Optional[Iterable[MarketEventType]] = None,
+                  max_pending: Optional[int] = None,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        Abonne un consommateur au bus.
+
+        Args:
+            callback: Fonction (ou coroutine) appelée pour chaque événement
+            symbols: Symboles suivis (tous si absent)
+            timeframes: Timeframes des barres suivies (toutes si absent)
+            event_types: Types d'événements suivis (tous si absent)
+            max_pending: Taille de la file de l'abonné
+            name: Nom de l'abonné
+
+        Returns:
+            Subscription: Abonnement (à passer à ``unsubscribe``)
+        """
+        subscription = Subscription(
+            callback, symbols, timeframes, event_types,
+            max_pending or self.max_pending, name
+        )
+        self._subscriptions.append(subscription)
+        try:
+            asyncio.get_running_loop()
+            subscription._start()
+        except RuntimeError:
+            pass  # Démarrage différé (start)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Résilie un abonnement.
+
+        Args:
+            subscription: Abonnement à résilier
+        """
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if subscription._task is not None:
+            subscription._task.cancel()
+
+    async def start(self) -> None:
+        """Démarre la livraison des abonnements créés hors boucle."""
+        for subscription in self._subscriptions:
+            subscription._start()
+
+    async def close(self) -> None:
+        """Arrête la livraison pour tous les abonnés."""
+        tasks = [s._task for s in self._subscriptions if s._task is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def publish_quote(self, symbol: str, quote: Mapping[str, Any]) -> None:
+        """
+        Publie une cotation.
+
+        Args:
+            symbol: Symbole financier
+            quote: Cotation (dictionnaire du provider ou modèle)
+        """
+        quote = dict(quote.model_dump() if hasattr(quote, 'model_dump') else quote)
+        self._quotes[symbol] = quote
+        self.stats['published_quotes'] += 1
+        await self._publish(MarketEventType.QUOTE, symbol, quote)
+
+    async def publish_quotes(self, quotes: Mapping[str, Any]) -> None:
+        """
+        Publie un lot de cotations (résultat de ``get_quotes``).
+
+        Args:
+            quotes: Cotations par symbole (les erreurs sont ignorées)
+        """
+        for symbol, quote in quotes.items():
+            if quote is None or isinstance(quote, Exception):
+                continue
+            await self.publish_quote(symbol, quote)
+
+    async def publish_bars(self, symbol: str, timeframe: str, bars: Any) -> int:
+        """
+        Publie des barres: seules celles postérieures à la dernière barre
+        connue sont ajoutées, la dernière barre pouvant être révisée.
+
+        Args:
+            symbol: Symbole financier
+            timeframe: Timeframe des barres
+            bars: BarSeries, barre unique ou liste de barres (dictionnaires)
+
+        Returns:
+            int: Nombre de barres nouvelles ou révisées
+        """
+        store = self._bars.get((symbol, timeframe))
+        if store is None:
+            store = deque(maxlen=self.bar_history)
+            self._bars[(symbol, timeframe)] = store
+        records = _bar_records(bars, since=store[-1]['timestamp'] if store else None)
+
+        applied = 0
+        for record in records:
+            if store and record['timestamp'] < store[-1]['timestamp']:
+                continue  # Barre déjà connue
+            if store and record['timestamp'] == store[-1]['timestamp']:
+                if record == store[-1]:
+                    continue
+                store[-1] = record  # Barre en cours révisée
+            else:
+                store.append(record)
+            applied += 1
+
+        if applied:
+            self.stats['published_bars'] += applied
+            # Un seul événement pour le lot: la dernière barre
+            await self._publish(MarketEventType.BAR, symbol, store[-1], timeframe, applied)
+        return applied
+
+    def latest_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Dernière cotation publiée pour un symbole."""
+        return self._quotes.get(symbol)
+
+    def get_bars(self, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
+        """Barres conservées pour un symbole/timeframe (copie)."""
+        return list(self._bars.get((symbol, timeframe), ()))
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None,
+                 timeframes: Optional[Iterable[str]] = None) -> MarketSnapshot:
+        """
+        Instantané cohérent de l'état courant.
+
+        Args:
+            symbols: Symboles inclus (tous si absent)
+            timeframes: Timeframes incluses (toutes si absent)
+
+        Returns:
+            MarketSnapshot: État figé au numéro de séquence courant
+        """
+        symbol_set = set(symbols) if symbols is not None else None
+        timeframe_set = set(timeframes) if timeframes is not None else None
+
+        bars: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for (symbol, timeframe), store in self._bars.items():
+            if symbol_set is not None and symbol not in symbol_set:
+                continue
+            if timeframe_set is not None and timeframe not in timeframe_set:
+                continue
+            bars.setdefault(symbol, {})[timeframe] = list(store)
+
+        quotes = {
+            symbol: quote for symbol, quote in self._quotes.items()
+            if symbol_set is None or symbol in symbol_set
+        }
+        return MarketSnapshot(self._sequence, datetime.now(), quotes, bars)
+
+    async def join(self) -> None:
+        """Attend la livraison de tous les événements en file."""
+        await asyncio.gather(*(s._idle.wait() for s in self._subscriptions if s._task is not None))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du bus et des abonnés."""
+        return {
+            **self.stats,
+            'sequence': self._sequence,
+            'symbols': len({symbol for symbol, _ in self._bars} | set(self._quotes)),
+            'subscriptions': [s.get_stats() for s in self._subscriptions]
+        }
+
+    async def _publish(self, event_type: MarketEventType, symbol: str, data: Any,
+                       timeframe: Optional[str] = None, new_bars: int = 0) -> None:
+        """Distribue un événement aux abonnés concernés."""
+        self._sequence += 1
+        self.stats['events'] += 1
+        event = MarketEvent(event_type, symbol, data, timeframe, self._sequence, datetime.now(), new_bars)
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                await subscription._offer(event)
+
+
+class MarketDataPublisher:
+    """
+    Alimente le bus depuis le provider: une requête groupée de cotations
+    et un rafraîchissement incrémental de l'historique par cycle.
+    """
+
+    def __init__(self, bus: MarketDataBus, provider: Any, history_service: Any = None):
+        """
+        Initialise l'éditeur.
+
+        Args:
+            bus: Bus à alimenter
+            provider: Provider exposant ``get_quotes`` ou ``get_quote``
+            history_service: Service d'historique incrémental (barres)
+        """
+        self.bus = bus
+        self.provider = provider
+        self.history_service = history_service
+
+    async def refresh(self, symbols: List[str], timeframe: str = "1d", period: str = "1y") -> MarketSnapshot:
+        """
+        Publie cotations et nouvelles barres puis retourne l'instantané du cycle.
+
+        Args:
+            symbols: Symboles à rafraîchir
+            timeframe: Timeframe des barres
+            period: Période d'historique conservée
+
+        Returns:
+            MarketSnapshot: État des symboles après publication
+        """
+        if hasattr(self.provider, 'get_quotes'):
+            quotes = await self.provider.get_quotes(symbols)
+        else:
+            results = await asyncio.gather(
+                *(self.provider.get_quote(symbol) for symbol in symbols),
+                return_exceptions=True
+            )
+            quotes = dict(zip(symbols, results))
+        await self.bus.publish_quotes(quotes)
+
+        if self.history_service is not None:
+            series = await asyncio.gather(
+                *(self.history_service.get_series(symbol, period, timeframe) for symbol in symbols),
+                return_exceptions=True
+            )
+            for symbol, result in zip(symbols, series):
+                if isinstance(result, Exception):
+                    logger.warning(f"Historique indisponible pour {symbol}: {result}")
+                    continue
+                await self.bus.publish_bars(symbol, timeframe, result)
+
+        return self.bus.snapshot(symbols)
+
+
+def _bar_records(bars: Any, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Convertit des barres (BarSeries, OHLCV, dictionnaires) en dictionnaires.
+
+    Pour une BarSeries, seules les barres à partir de ``since`` (incluse,
+    pour la révision de la barre en cours) sont converties.
+    """
+    if isinstance(bars, BarSeries):
+        start = 0
+        if since is not None:
+            start = int(np.searchsorted(bars.timestamps, np.datetime64(since, 'ns'), 'left'))
+        timestamps = pd.DatetimeIndex(bars.timestamps[start:]).to_pydatetime()
+        return [
+            {
+                'timestamp': timestamps[i - start],
+                'date': timestamps[i - start].isoformat(),
+                'open': float(bars.open[i]),
+                'high': float(bars.high[i]),
+                'low': float(bars.low[i]),
+                'close': float(bars.close[i]),
+                'volume': int(bars.volume[i])
+            }
+            for i in range(start, len(bars))
+        ]
+
+    if isinstance(bars, (dict, Mapping)) or hasattr(bars, 'close'):
+        bars = [bars]
+
+    records = []
+    for bar in bars:
+        if hasattr(bar, 'model_dump'):
+            bar = bar.model_dump()
+        record = dict(bar)
+        timestamp = record.get('timestamp', record.get('date'))
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        elif isinstance(timestamp, np.datetime64):
+            timestamp = pd.Timestamp(timestamp).to_pydatetime()
+        record['timestamp'] = timestamp
+        record.setdefault('date', timestamp.isoformat())
+        for name in ('open', 'high', 'low', 'close'):
+            if name in record:
+                record[name] = float(record[name])
+        records.append(record)
+    return records
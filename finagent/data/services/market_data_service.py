@@ -9,7 +9,7 @@ du cache, validation et optimisations.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 
 import arrow
@@ -18,11 +18,24 @@ from ..models.base import Symbol, TimeFrame
 from ..models.market_data import OHLCV, QuoteData, Price, MarketDataCollection
 from ..providers import OpenBBProvider, OpenBBError, DataNotFoundError
 from ..validators import BaseValidator, ValidationError
-from ..cache import MultiLevelCacheManager, CacheKeys, CacheTags
+from ..cache import MultiLevelCacheManager, CacheKeys, CacheTags, RequestCoalescer
 
 logger = logging.getLogger(__name__)
 
 
+# Intervalles provider des timeframes supportés par le téléchargement groupé
+_TIMEFRAME_INTERVALS = {
+    TimeFrame.MINUTE_1: "1m",
+    TimeFrame.MINUTE_5: "5m",
+    TimeFrame.MINUTE_15: "15m",
+    TimeFrame.MINUTE_30: "30m",
+    TimeFrame.HOUR_1: "1h",
+    TimeFrame.DAY_1: "1d",
+    TimeFrame.WEEK_1: "1wk",
+    TimeFrame.MONTH_1: "1mo"
+}
+
+
 class MarketDataServiceError(Exception):
     """Exception du service de données de marché."""
     
@@ -45,7 +58,8 @@ class MarketDataService:
         self,
         provider: OpenBBProvider,
         cache_manager: Optional[MultiLevelCacheManager] = None,
-        default_limit: int = 100
+        default_limit: int = 100,
+        quote_ttl: int = 15
     ):
         """
         Initialise le service de données de marché.
@@ -54,10 +68,15 @@ class MarketDataService:
             provider: Provider OpenBB
             cache_manager: Gestionnaire de cache (optionnel)
             default_limit: Limite par défaut de données
+            quote_ttl: Durée de vie en cache des cotations (secondes)
         """
         self.provider = provider
         self.cache_manager = cache_manager
         self.default_limit = default_limit
+        self.quote_ttl = quote_ttl
+        
+        # Regroupement des requêtes concurrentes identiques
+        self._coalescer = RequestCoalescer()
         
         # Métriques du service
         self.requests_count = 0
@@ -66,6 +85,69 @@ class MarketDataService:
         
         logger.info("Service de données de marché initialisé")
 
+    async def _read_through(
+        self,
+        cache_key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: List[str]
+    ) -> Any:
+        """
+        Lecture via le cache avec écriture automatique en cas d'absence.
+        
+        Les requêtes concurrentes sur la même clé sont regroupées pour
+        ne déclencher qu'un seul appel au provider.
+        
+        Args:
+            cache_key: Clé de cache
+            fetch: Coroutine de récupération auprès du provider
+            ttl: Durée de vie en cache (secondes)
+            tags: Tags d'invalidation
+            
+        Returns:
+            Valeur en cache ou fraîchement récupérée
+        """
+        if self.cache_manager:
+            cached = await self.cache_manager.get(cache_key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        
+        async def fetch_and_store():
+            value = await fetch()
+            if self.cache_manager and value is not None:
+                try:
+                    await self.cache_manager.set(cache_key, value, ttl=ttl, tags=tags)
+                except Exception as e:
+                    logger.warning(f"Échec de mise en cache pour {cache_key}: {e}")
+            return value
+        
+        return await self._coalescer.run(cache_key, fetch_and_store)
+
+    def _get_historical_cache_ttl(self, timeframe: TimeFrame) -> int:
+        """
+        Détermine la durée de cache des données historiques selon le timeframe.
+        
+        Args:
+            timeframe: Timeframe des données
+            
+        Returns:
+            Durée en secondes
+        """
+        ttl_mapping = {
+            TimeFrame.MINUTE_1: 60,
+            TimeFrame.MINUTE_5: 300,
+            TimeFrame.MINUTE_15: 900,
+            TimeFrame.MINUTE_30: 1800,
+            TimeFrame.HOUR_1: 3600,
+            TimeFrame.HOUR_4: 14400,
+            TimeFrame.DAY_1: 86400,
+            TimeFrame.WEEK_1: 604800,
+            TimeFrame.MONTH_1: 2592000
+        }
+        
+        return ttl_mapping.get(timeframe, 3600)
+
     async def get_current_price(self, symbol: str) -> Price:
         """
         Récupère le prix actuel d'un symbole.
@@ -86,7 +168,7 @@ class MarketDataService:
             
             logger.debug(f"Récupération prix actuel: {symbol}")
             
-            quote = await self.provider.get_quote(symbol)
+            quote = await self._fetch_quote(symbol)
             
             logger.debug(f"Prix actuel {symbol}: {quote.last_price}")
             return quote.last_price
@@ -124,7 +206,7 @@ class MarketDataService:
             
             logger.debug(f"Récupération cotation: {symbol}")
             
-            quote = await self.provider.get_quote(symbol)
+            quote = await self._fetch_quote(symbol)
             
             logger.debug(f"Cotation {symbol}: {quote}")
             return quote
@@ -146,6 +228,15 @@ class MarketDataService:
                 cause=e
             )
 
+    async def _fetch_quote(self, symbol: str) -> QuoteData:
+        """Récupère une cotation via le cache (symbole déjà normalisé)."""
+        return await self._read_through(
+            CacheKeys.quote(symbol),
+            lambda: self.provider.get_quote(symbol),
+            ttl=self.quote_ttl,
+            tags=[CacheTags.symbol(symbol), CacheTags.REAL_TIME]
+        )
+
     async def get_historical_data(
         self,
         symbol: str,
@@ -178,6 +269,11 @@ class MarketDataService:
             if days_back is not None:
                 end_date = arrow.utcnow().datetime
                 start_date = end_date - timedelta(days=days_back)
+                # Fenêtre glissante: la clé ne dépend pas de l'instant exact
+                start_key, end_key = f"-{days_back}d", "now"
+            else:
+                start_key = start_date.isoformat() if start_date else "none"
+                end_key = end_date.isoformat() if end_date else "none"
             
             # Validation des dates
             if start_date and end_date:
@@ -190,12 +286,27 @@ class MarketDataService:
             
             logger.info(f"Récupération données historiques: {symbol} {timeframe.value}")
             
-            collection = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date,
-                limit=limit
+            cache_key = CacheKeys.historical_data(
+                symbol, start_key, end_key, timeframe.value, limit
+            )
+            tags = [
+                CacheTags.symbol(symbol),
+                CacheTags.timeframe(timeframe.value),
+                CacheTags.HISTORICAL,
+                CacheTags.source("openbb")
+            ]
+            
+            collection = await self._read_through(
+                cache_key,
+                lambda: self.provider.get_historical_data(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=limit
+                ),
+                ttl=self._get_historical_cache_ttl(timeframe),
+                tags=tags
             )
             
             logger.info(f"Récupéré {len(collection.data)} points pour {symbol}")
@@ -289,20 +400,23 @@ class MarketDataService:
             
             logger.info(f"Récupération cotations multiples: {len(symbols)} symboles")
             
-            # Exécution en parallèle
-            tasks = [self.get_quote(symbol) for symbol in symbols]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Traitement des résultats
-            quotes = {}
-            errors = {}
-            
-            for symbol, result in zip(symbols, results):
-                if isinstance(result, Exception):
-                    errors[symbol] = result
-                    logger.warning(f"Erreur pour {symbol}: {result}")
-                else:
-                    quotes[symbol] = result
+            if hasattr(self.provider, 'get_quotes'):
+                quotes, errors = await self._get_quotes_batch(symbols)
+            else:
+                # Exécution en parallèle
+                tasks = [self.get_quote(symbol) for symbol in symbols]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                # Traitement des résultats
+                quotes = {}
+                errors = {}
+                
+                for symbol, result in zip(symbols, results):
+                    if isinstance(result, Exception):
+                        errors[symbol] = result
+                        logger.warning(f"Erreur pour {symbol}: {result}")
+                    else:
+                        quotes[symbol] = result
             
             logger.info(f"Récupéré {len(quotes)} cotations, {len(errors)} erreurs")
             
@@ -320,6 +434,71 @@ class MarketDataService:
             self.errors_count += 1
             raise MarketDataServiceError(f"Erreur lors de la récupération multiple: {e}", cause=e)
 
+    async def _get_quotes_batch(
+        self,
+        symbols: List[str]
+    ) -> Tuple[Dict[str, QuoteData], Dict[str, Exception]]:
+        """
+        Récupère des cotations en un seul appel groupé au provider.
+        
+        Les cotations présentes en cache ne sont pas redemandées.
+        
+        Args:
+            symbols: Symboles normalisés
+            
+        Returns:
+            Tuple (cotations par symbole, erreurs par symbole)
+        """
+        self.requests_count += len(symbols)
+        quotes: Dict[str, QuoteData] = {}
+        missing: List[str] = []
+        
+        for symbol in symbols:
+            cached = None
+            if self.cache_manager:
+                cached = await self.cache_manager.get(CacheKeys.quote(symbol))
+            if cached is not None:
+                self.cache_hits += 1
+                quotes[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        errors: Dict[str, Exception] = {}
+        if not missing:
+            return quotes, errors
+        
+        try:
+            batch_key = "quotes:" + ",".join(sorted(missing))
+            fetched = await self._coalescer.run(
+                batch_key, lambda: self.provider.get_quotes(missing)
+            )
+        except Exception as e:
+            self.errors_count += len(missing)
+            logger.warning(f"Erreur cotations groupées ({len(missing)} symboles): {e}")
+            return quotes, {symbol: e for symbol in missing}
+        
+        for symbol in missing:
+            quote = fetched.get(symbol)
+            if quote is None:
+                self.errors_count += 1
+                errors[symbol] = MarketDataServiceError(
+                    f"Aucune cotation disponible pour {symbol}", symbol=symbol
+                )
+                logger.warning(f"Erreur pour {symbol}: cotation absente")
+                continue
+            
+            quotes[symbol] = quote
+            if self.cache_manager:
+                try:
+                    await self.cache_manager.set(
+                        CacheKeys.quote(symbol), quote, ttl=self.quote_ttl,
+                        tags=[CacheTags.symbol(symbol), CacheTags.REAL_TIME]
+                    )
+                except Exception as e:
+                    logger.warning(f"Échec de mise en cache pour {symbol}: {e}")
+        
+        return quotes, errors
+
     async def get_multiple_historical_data(
         self,
         symbols: List[str],
@@ -343,6 +522,10 @@ class MarketDataService:
             
             logger.info(f"Récupération données historiques multiples: {len(symbols)} symboles")
             
+            interval = _TIMEFRAME_INTERVALS.get(timeframe)
+            if interval and hasattr(self.provider, 'get_historical_batch'):
+                return await self._get_historical_batch(symbols, timeframe, interval, days_back)
+            
             # Exécution en parallèle avec limitation de concurrence
             semaphore = asyncio.Semaphore(5)  # Max 5 requêtes simultanées
             
@@ -380,6 +563,86 @@ class MarketDataService:
             self.errors_count += 1
             raise MarketDataServiceError(f"Erreur lors de la récupération multiple: {e}", cause=e)
 
+    async def _get_historical_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        interval: str,
+        days_back: int
+    ) -> Dict[str, MarketDataCollection]:
+        """
+        Récupère l'historique de plusieurs symboles en un seul appel groupé.
+        
+        Args:
+            symbols: Symboles normalisés
+            timeframe: Timeframe des données
+            interval: Intervalle provider correspondant
+            days_back: Nombre de jours en arrière
+            
+        Returns:
+            Dictionnaire symbole -> collection de données
+        """
+        self.requests_count += len(symbols)
+        collections: Dict[str, MarketDataCollection] = {}
+        missing: List[str] = []
+        
+        # Même clé (et même limite) que get_historical_data(days_back=...)
+        limit = self.default_limit
+        
+        def cache_key(symbol: str) -> str:
+            return CacheKeys.historical_data(symbol, f"-{days_back}d", "now", timeframe.value, limit)
+        
+        for symbol in symbols:
+            cached = None
+            if self.cache_manager:
+                cached = await self.cache_manager.get(cache_key(symbol))
+            if cached is not None:
+                self.cache_hits += 1
+                collections[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return collections
+        
+        # Plage explicite: "<n>d" n'est pas une période yfinance valide
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        batch_key = f"historical_batch:{days_back}d:{interval}:" + ",".join(sorted(missing))
+        series_by_symbol = await self._coalescer.run(
+            batch_key,
+            lambda: self.provider.get_historical_batch(
+                missing, interval=interval, output="series", start=start_date, end=end_date
+            )
+        )
+        
+        for symbol in missing:
+            series = series_by_symbol.get(symbol)
+            if series is None or len(series) == 0:
+                self.errors_count += 1
+                logger.warning(f"Erreur données historiques pour {symbol}: aucune donnée")
+                continue
+            
+            collection = series[-limit:].to_collection()
+            collections[symbol] = collection
+            if self.cache_manager:
+                try:
+                    await self.cache_manager.set(
+                        cache_key(symbol), collection,
+                        ttl=self._get_historical_cache_ttl(timeframe),
+                        tags=[
+                            CacheTags.symbol(symbol),
+                            CacheTags.timeframe(timeframe.value),
+                            CacheTags.HISTORICAL,
+                            CacheTags.source("openbb")
+                        ]
+                    )
+                except Exception as e:
+                    logger.warning(f"Échec de mise en cache pour {symbol}: {e}")
+        
+        logger.info(f"Récupéré données pour {len(collections)} symboles en un appel groupé")
+        return collections
+
     async def search_symbols(self, query: str, limit: int = 10) -> List[Symbol]:
         """
         Recherche des symboles financiers.
@@ -571,6 +834,7 @@ class MarketDataService:
             'success_rate': success_rate,
             'cache_hits': self.cache_hits,
             'cache_hit_rate': cache_hit_rate,
+            'coalesced_requests': self._coalescer.coalesced_count,
             'provider_stats': self.provider.get_statistics()
         }
 
@@ -8,23 +8,25 @@ et récupérer les indicateurs techniques avec cache automatique.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union, Tuple
+from typing import Any, Callable, Dict, List, Optional, Union, Tuple
 from decimal import Decimal
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import arrow
 import pandas as pd
-import numpy as np
 
 from ..models.base import Symbol, TimeFrame
 from ..validators.base import ValidationError
 from ..models.market_data import MarketDataCollection
+from ..models.bar_series import BarSeries, to_bar_series
 from ..models.technical_indicators import (
     BaseIndicator, SimpleIndicator, MovingAverage, RSI, MACD,
     BollingerBands, Stochastic, IndicatorType, IndicatorCollection
 )
 from ..providers.openbb_provider import OpenBBProvider, OpenBBError
-from ..cache import MultiLevelCacheManager, CacheKeys, CacheTags
+from ..cache import MultiLevelCacheManager, CacheKeys, CacheTags, RequestCoalescer
+from ..indicators import kernels
 from ..validators import BaseValidator
 
 logger = logging.getLogger(__name__)
@@ -66,12 +68,14 @@ class TechnicalIndicatorsService:
         self.cache_manager = cache_manager
         self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._coalescer = RequestCoalescer()
         
         # Métriques
         self.cache_hits = 0
         self.cache_misses = 0
         self.calculations_count = 0
         self.errors_count = 0
+        self.series_fetches = 0
     
     async def calculate_moving_average(
         self,
@@ -110,7 +114,7 @@ class TechnicalIndicatorsService:
         
         # Vérification cache
         cache_key = CacheKeys.indicator(
-            symbol, timeframe, f"{ma_type}_{period}"
+            symbol, timeframe.value, f"{ma_type.value}_{period}"
         )
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key)
@@ -122,45 +126,11 @@ class TechnicalIndicatorsService:
             self.cache_misses += 1
             logger.info(f"Calcul {ma_type.upper()}({period}) pour {symbol}")
             
-            # Récupération des données
-            end_date = end_date or arrow.utcnow().datetime
-            start_date = end_date - timedelta(days=lookback_days)
+            # Récupération des données (série partagée entre indicateurs)
+            series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
             
-            market_data = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            if len(market_data.data) < period:
-                raise InsufficientDataError(
-                    f"Besoin de {period} points, seulement {len(market_data.data)} disponibles"
-                )
-            
-            # Conversion en DataFrame pour calculs
-            df = market_data.to_dataframe()
-            if df.empty:
-                raise InsufficientDataError("Aucune donnée disponible")
-            
-            # Calcul selon le type
-            if ma_type == IndicatorType.SMA:
-                ma_value = self._calculate_sma(df['close'], period)
-            elif ma_type == IndicatorType.EMA:
-                ma_value = self._calculate_ema(df['close'], period)
-            elif ma_type == IndicatorType.WMA:
-                ma_value = self._calculate_wma(df['close'], period)
-            else:
-                raise IndicatorCalculationError(f"Type MA non supporté: {ma_type}")
-            
-            # Création de l'indicateur
-            ma = MovingAverage(
-                symbol=Symbol(symbol=symbol),
-                timestamp=df.index[-1],
-                timeframe=timeframe,
-                indicator_type=ma_type,
-                period=period,
-                value=Decimal(str(ma_value))
+            ma = await self._run_builder(
+                partial(self._build_moving_average, symbol, timeframe, ma_type, period), series
             )
             
             # Mise en cache
@@ -168,13 +138,13 @@ class TechnicalIndicatorsService:
                 ttl = self._get_indicator_cache_ttl(timeframe)
                 tags = [
                     CacheTags.symbol(symbol),
-                    CacheTags.timeframe(str(timeframe)),
+                    CacheTags.timeframe(timeframe.value),
                     CacheTags.TECHNICAL_INDICATORS
                 ]
                 await self.cache_manager.set(cache_key, ma, ttl, tags)
             
             self.calculations_count += 1
-            logger.debug(f"{ma_type.upper()}({period}) = {ma_value:.2f}")
+            logger.debug(f"{ma_type.upper()}({period}) = {float(ma.value):.2f}")
             return ma
             
         except Exception as e:
@@ -209,7 +179,7 @@ class TechnicalIndicatorsService:
         if period <= 1:
             raise ValidationError("Période RSI doit être > 1")
         
-        cache_key = CacheKeys.indicator(symbol, timeframe, f"rsi_{period}")
+        cache_key = CacheKeys.indicator(symbol, timeframe.value, f"rsi_{period}")
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key)
             if cached:
@@ -220,41 +190,25 @@ class TechnicalIndicatorsService:
             self.cache_misses += 1
             logger.info(f"Calcul RSI({period}) pour {symbol}")
             
-            # Récupération des données
-            end_date = end_date or arrow.utcnow().datetime
-            start_date = end_date - timedelta(days=lookback_days)
+            # Récupération des données (série partagée entre indicateurs)
+            series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
             
-            market_data = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            if len(market_data.data) < period + 1:
-                raise InsufficientDataError(
-                    f"Besoin de {period + 1} points pour RSI, seulement {len(market_data.data)} disponibles"
-                )
-            
-            df = market_data.to_dataframe()
-            rsi_value = await self._calculate_rsi_async(df['close'], period)
-            
-            rsi = RSI(
-                symbol=Symbol(symbol=symbol),
-                timestamp=df.index[-1],
-                timeframe=timeframe,
-                period=period,
-                value=Decimal(str(rsi_value))
+            rsi = await self._run_builder(
+                partial(self._build_rsi, symbol, timeframe, period), series
             )
             
             # Cache
             if self.cache_manager:
                 ttl = self._get_indicator_cache_ttl(timeframe)
-                tags = [CacheTags.symbol(symbol), CacheTags.TECHNICAL_INDICATORS]
+                tags = [
+                    CacheTags.symbol(symbol),
+                    CacheTags.timeframe(timeframe.value),
+                    CacheTags.TECHNICAL_INDICATORS
+                ]
                 await self.cache_manager.set(cache_key, rsi, ttl, tags)
             
             self.calculations_count += 1
-            logger.debug(f"RSI({period}) = {rsi_value:.2f}")
+            logger.debug(f"RSI({period}) = {float(rsi.value):.2f}")
             return rsi
             
         except Exception as e:
@@ -294,7 +248,7 @@ class TechnicalIndicatorsService:
             raise ValidationError("Période rapide doit être < période lente")
         
         cache_key = CacheKeys.indicator(
-            symbol, timeframe, f"macd_{fast_period}_{slow_period}_{signal_period}"
+            symbol, timeframe.value, f"macd_{fast_period}_{slow_period}_{signal_period}"
         )
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key)
@@ -306,49 +260,26 @@ class TechnicalIndicatorsService:
             self.cache_misses += 1
             logger.info(f"Calcul MACD({fast_period},{slow_period},{signal_period}) pour {symbol}")
             
-            # Récupération des données
-            end_date = end_date or arrow.utcnow().datetime
-            start_date = end_date - timedelta(days=lookback_days)
+            # Récupération des données (série partagée entre indicateurs)
+            series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
             
-            market_data = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            min_required = max(slow_period, signal_period) + 10
-            if len(market_data.data) < min_required:
-                raise InsufficientDataError(
-                    f"Besoin de {min_required} points pour MACD"
-                )
-            
-            df = market_data.to_dataframe()
-            macd_data = await self._calculate_macd_async(
-                df['close'], fast_period, slow_period, signal_period
-            )
-            
-            macd = MACD(
-                symbol=Symbol(symbol=symbol),
-                timestamp=df.index[-1],
-                timeframe=timeframe,
-                period=slow_period,  # Période de référence
-                macd_line=Decimal(str(macd_data['macd'])),
-                signal_line=Decimal(str(macd_data['signal'])),
-                histogram=Decimal(str(macd_data['histogram'])),
-                fast_period=fast_period,
-                slow_period=slow_period,
-                signal_period=signal_period
+            macd = await self._run_builder(
+                partial(self._build_macd, symbol, timeframe, fast_period, slow_period, signal_period),
+                series
             )
             
             # Cache
             if self.cache_manager:
                 ttl = self._get_indicator_cache_ttl(timeframe)
-                tags = [CacheTags.symbol(symbol), CacheTags.TECHNICAL_INDICATORS]
+                tags = [
+                    CacheTags.symbol(symbol),
+                    CacheTags.timeframe(timeframe.value),
+                    CacheTags.TECHNICAL_INDICATORS
+                ]
                 await self.cache_manager.set(cache_key, macd, ttl, tags)
             
             self.calculations_count += 1
-            logger.debug(f"MACD = {macd_data['macd']:.4f}")
+            logger.debug(f"MACD = {float(macd.macd_line):.4f}")
             return macd
             
         except Exception as e:
@@ -388,7 +319,7 @@ class TechnicalIndicatorsService:
             raise ValidationError("Multiplicateur doit être > 0")
         
         cache_key = CacheKeys.indicator(
-            symbol, timeframe, f"bollinger_{period}_{std_multiplier}"
+            symbol, timeframe.value, f"bollinger_{period}_{std_multiplier}"
         )
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key)
@@ -400,47 +331,25 @@ class TechnicalIndicatorsService:
             self.cache_misses += 1
             logger.info(f"Calcul Bollinger({period},{std_multiplier}) pour {symbol}")
             
-            # Récupération des données
-            end_date = end_date or arrow.utcnow().datetime
-            start_date = end_date - timedelta(days=lookback_days)
+            # Récupération des données (série partagée entre indicateurs)
+            series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
             
-            market_data = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            if len(market_data.data) < period:
-                raise InsufficientDataError(
-                    f"Besoin de {period} points pour Bollinger"
-                )
-            
-            df = market_data.to_dataframe()
-            bb_data = await self._calculate_bollinger_async(
-                df['close'], period, std_multiplier
-            )
-            
-            bollinger = BollingerBands(
-                symbol=Symbol(symbol=symbol),
-                timestamp=df.index[-1],
-                timeframe=timeframe,
-                period=period,
-                middle_band=Decimal(str(bb_data['middle'])),
-                upper_band=Decimal(str(bb_data['upper'])),
-                lower_band=Decimal(str(bb_data['lower'])),
-                std_dev=Decimal(str(bb_data['std_dev'])),
-                std_multiplier=Decimal(str(std_multiplier))
+            bollinger = await self._run_builder(
+                partial(self._build_bollinger, symbol, timeframe, period, std_multiplier), series
             )
             
             # Cache
             if self.cache_manager:
                 ttl = self._get_indicator_cache_ttl(timeframe)
-                tags = [CacheTags.symbol(symbol), CacheTags.TECHNICAL_INDICATORS]
+                tags = [
+                    CacheTags.symbol(symbol),
+                    CacheTags.timeframe(timeframe.value),
+                    CacheTags.TECHNICAL_INDICATORS
+                ]
                 await self.cache_manager.set(cache_key, bollinger, ttl, tags)
             
             self.calculations_count += 1
-            logger.debug(f"Bollinger Upper:{bb_data['upper']:.2f} Lower:{bb_data['lower']:.2f}")
+            logger.debug(f"Bollinger Upper:{float(bollinger.upper_band):.2f} Lower:{float(bollinger.lower_band):.2f}")
             return bollinger
             
         except Exception as e:
@@ -478,7 +387,7 @@ class TechnicalIndicatorsService:
             raise ValidationError("Périodes doivent être > 0")
         
         cache_key = CacheKeys.indicator(
-            symbol, timeframe, f"stoch_{k_period}_{d_period}"
+            symbol, timeframe.value, f"stoch_{k_period}_{d_period}"
         )
         if self.cache_manager:
             cached = await self.cache_manager.get(cache_key)
@@ -490,47 +399,25 @@ class TechnicalIndicatorsService:
             self.cache_misses += 1
             logger.info(f"Calcul Stochastic({k_period},{d_period}) pour {symbol}")
             
-            # Récupération des données
-            end_date = end_date or arrow.utcnow().datetime
-            start_date = end_date - timedelta(days=lookback_days)
-            
-            market_data = await self.provider.get_historical_data(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            min_required = k_period + d_period
-            if len(market_data.data) < min_required:
-                raise InsufficientDataError(
-                    f"Besoin de {min_required} points pour Stochastic"
-                )
+            # Récupération des données (série partagée entre indicateurs)
+            series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
             
-            df = market_data.to_dataframe()
-            stoch_data = await self._calculate_stochastic_async(
-                df['high'], df['low'], df['close'], k_period, d_period
-            )
-            
-            stochastic = Stochastic(
-                symbol=Symbol(symbol=symbol),
-                timestamp=df.index[-1],
-                timeframe=timeframe,
-                period=k_period,
-                k_percent=Decimal(str(stoch_data['k'])),
-                d_percent=Decimal(str(stoch_data['d'])),
-                k_period=k_period,
-                d_period=d_period
+            stochastic = await self._run_builder(
+                partial(self._build_stochastic, symbol, timeframe, k_period, d_period), series
             )
             
             # Cache
             if self.cache_manager:
                 ttl = self._get_indicator_cache_ttl(timeframe)
-                tags = [CacheTags.symbol(symbol), CacheTags.TECHNICAL_INDICATORS]
+                tags = [
+                    CacheTags.symbol(symbol),
+                    CacheTags.timeframe(timeframe.value),
+                    CacheTags.TECHNICAL_INDICATORS
+                ]
                 await self.cache_manager.set(cache_key, stochastic, ttl, tags)
             
             self.calculations_count += 1
-            logger.debug(f"Stochastic %K:{stoch_data['k']:.1f} %D:{stoch_data['d']:.1f}")
+            logger.debug(f"Stochastic %K:{float(stochastic.k_percent):.1f} %D:{float(stochastic.d_percent):.1f}")
             return stochastic
             
         except Exception as e:
@@ -549,7 +436,11 @@ class TechnicalIndicatorsService:
         lookback_days: int = 100
     ) -> IndicatorCollection:
         """
-        Calcule une collection d'indicateurs en parallèle.
+        Calcule une collection d'indicateurs sur un historique commun.
+        
+        L'historique est récupéré une seule fois, converti une seule fois
+        puis tous les indicateurs absents du cache sont calculés en une
+        passe dans le pool de workers.
         
         Args:
             symbol: Symbole financier
@@ -578,136 +469,352 @@ class TechnicalIndicatorsService:
             timestamp=end_date or arrow.utcnow().datetime
         )
         
-        # Calculs en parallèle
-        tasks = []
+        # Plan de calcul: nom, clé de cache et fonction de calcul
+        plans = []
         for i, config in enumerate(indicators):
-            task_name = f"{config.get('type', 'unknown')}_{i}"
-            task = self._calculate_single_indicator(
-                symbol, timeframe, config, end_date, lookback_days, task_name
+            try:
+                plans.append(self._plan_indicator(symbol, timeframe, config))
+            except Exception as e:
+                self.errors_count += 1
+                logger.error(f"Erreur indicateur {i}: {e}")
+        
+        # Indicateurs déjà en cache
+        results: Dict[str, BaseIndicator] = {}
+        pending = []
+        for name, cache_key, builder in plans:
+            cached = await self.cache_manager.get(cache_key) if self.cache_manager else None
+            if cached:
+                self.cache_hits += 1
+                results[name] = cached
+            else:
+                self.cache_misses += 1
+                pending.append((name, cache_key, builder))
+        
+        # Un seul historique et une seule passe pour les indicateurs manquants
+        if pending:
+            try:
+                series = await self._get_bar_series(symbol, timeframe, end_date, lookback_days)
+                loop = asyncio.get_event_loop()
+                computed = await loop.run_in_executor(
+                    self.executor, self._compute_indicators,
+                    series, [builder for _, _, builder in pending]
+                )
+            except Exception as e:
+                logger.error(f"Erreur récupération historique pour {symbol}: {e}")
+                computed = [e] * len(pending)
+            
+            ttl = self._get_indicator_cache_ttl(timeframe)
+            tags = [
+                CacheTags.symbol(symbol),
+                CacheTags.timeframe(timeframe.value),
+                CacheTags.TECHNICAL_INDICATORS
+            ]
+            for (name, cache_key, _), result in zip(pending, computed):
+                if isinstance(result, Exception):
+                    self.errors_count += 1
+                    logger.error(f"Erreur calcul {name}: {result}")
+                    continue
+                results[name] = result
+                self.calculations_count += 1
+                if self.cache_manager:
+                    await self.cache_manager.set(cache_key, result, ttl, tags)
+        
+        # Ordre de la configuration conservé
+        for name, _, _ in plans:
+            if name in results:
+                collection.add_indicator(name, results[name])
+        
+        logger.info(f"Collection calculée: {len(collection.indicators)}/{len(indicators)} indicateurs")
+        return collection
+    
+    def _plan_indicator(
+        self,
+        symbol: str,
+        timeframe: TimeFrame,
+        config: Dict[str, Any]
+    ) -> Tuple[str, str, Callable[[pd.DataFrame], BaseIndicator]]:
+        """
+        Traduit une configuration d'indicateur en plan de calcul.
+        
+        Args:
+            symbol: Symbole normalisé
+            timeframe: Timeframe des données
+            config: Configuration de l'indicateur
+            
+        Returns:
+            Nom dans la collection, clé de cache et fonction de calcul
+        """
+        indicator_type = config.get('type', '').lower()
+        
+        if indicator_type in ('sma', 'ema', 'wma'):
+            ma_type = IndicatorType(indicator_type)
+            period = config.get('period', 20)
+            if period <= 0:
+                raise ValidationError("La période doit être positive")
+            return (
+                f"{indicator_type.upper()}_{period}",
+                CacheKeys.indicator(symbol, timeframe.value, f"{ma_type.value}_{period}"),
+                partial(self._build_moving_average, symbol, timeframe, ma_type, period)
             )
-            tasks.append(task)
         
-        # Attendre tous les calculs
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if indicator_type == 'rsi':
+            period = config.get('period', 14)
+            if period <= 1:
+                raise ValidationError("Période RSI doit être > 1")
+            return (
+                f"RSI_{period}",
+                CacheKeys.indicator(symbol, timeframe.value, f"rsi_{period}"),
+                partial(self._build_rsi, symbol, timeframe, period)
+            )
         
-        # Traiter les résultats
-        successful = 0
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Erreur indicateur {i}: {result}")
-                continue
-            
-            indicator_name, indicator = result
-            collection.add_indicator(indicator_name, indicator)
-            successful += 1
+        if indicator_type == 'macd':
+            fast, slow, signal = config.get('fast', 12), config.get('slow', 26), config.get('signal', 9)
+            if fast >= slow:
+                raise ValidationError("Période rapide doit être < période lente")
+            return (
+                "MACD",
+                CacheKeys.indicator(symbol, timeframe.value, f"macd_{fast}_{slow}_{signal}"),
+                partial(self._build_macd, symbol, timeframe, fast, slow, signal)
+            )
         
-        logger.info(f"Collection calculée: {successful}/{len(indicators)} indicateurs")
-        return collection
+        if indicator_type == 'bollinger':
+            period, std_multiplier = config.get('period', 20), config.get('std_multiplier', 2.0)
+            if period <= 1:
+                raise ValidationError("Période doit être > 1")
+            if std_multiplier <= 0:
+                raise ValidationError("Multiplicateur doit être > 0")
+            return (
+                "BOLLINGER",
+                CacheKeys.indicator(symbol, timeframe.value, f"bollinger_{period}_{std_multiplier}"),
+                partial(self._build_bollinger, symbol, timeframe, period, std_multiplier)
+            )
+        
+        if indicator_type == 'stochastic':
+            k_period, d_period = config.get('k_period', 14), config.get('d_period', 3)
+            if k_period <= 0 or d_period <= 0:
+                raise ValidationError("Périodes doivent être > 0")
+            return (
+                "STOCHASTIC",
+                CacheKeys.indicator(symbol, timeframe.value, f"stoch_{k_period}_{d_period}"),
+                partial(self._build_stochastic, symbol, timeframe, k_period, d_period)
+            )
+        
+        raise IndicatorCalculationError(f"Type d'indicateur non supporté: {indicator_type}")
     
-    async def _calculate_single_indicator(
+    async def _get_bar_series(
         self,
         symbol: str,
         timeframe: TimeFrame,
-        config: Dict[str, Any],
         end_date: Optional[datetime],
-        lookback_days: int,
-        task_name: str
-    ) -> Tuple[str, BaseIndicator]:
-        """Calcule un seul indicateur selon la configuration."""
-        indicator_type = config.get('type', '').lower()
+        lookback_days: int
+    ) -> BarSeries:
+        """
+        Récupère l'historique partagé par tous les indicateurs d'un symbole.
         
-        try:
-            if indicator_type == 'sma':
-                indicator = await self.calculate_moving_average(
-                    symbol, timeframe, IndicatorType.SMA,
-                    config.get('period', 20), end_date, lookback_days
-                )
-                return f"SMA_{config.get('period', 20)}", indicator
-                
-            elif indicator_type == 'ema':
-                indicator = await self.calculate_moving_average(
-                    symbol, timeframe, IndicatorType.EMA,
-                    config.get('period', 20), end_date, lookback_days
-                )
-                return f"EMA_{config.get('period', 20)}", indicator
-                
-            elif indicator_type == 'rsi':
-                indicator = await self.calculate_rsi(
-                    symbol, timeframe, config.get('period', 14),
-                    end_date, lookback_days
-                )
-                return f"RSI_{config.get('period', 14)}", indicator
-                
-            elif indicator_type == 'macd':
-                indicator = await self.calculate_macd(
-                    symbol, timeframe,
-                    config.get('fast', 12),
-                    config.get('slow', 26),
-                    config.get('signal', 9),
-                    end_date, lookback_days
-                )
-                return "MACD", indicator
-                
-            elif indicator_type == 'bollinger':
-                indicator = await self.calculate_bollinger_bands(
-                    symbol, timeframe,
-                    config.get('period', 20),
-                    config.get('std_multiplier', 2.0),
-                    end_date, lookback_days
-                )
-                return "BOLLINGER", indicator
-                
-            elif indicator_type == 'stochastic':
-                indicator = await self.calculate_stochastic(
-                    symbol, timeframe,
-                    config.get('k_period', 14),
-                    config.get('d_period', 3),
-                    end_date, lookback_days
+        La série est mise en cache et les récupérations concurrentes du
+        même historique sont regroupées en une seule requête provider.
+        
+        Args:
+            symbol: Symbole normalisé
+            timeframe: Timeframe des données
+            end_date: Date de fin (par défaut: maintenant)
+            lookback_days: Jours de données historiques
+            
+        Returns:
+            Série de barres columnar
+        """
+        if end_date is None:
+            # Fenêtre glissante: la clé ne dépend pas de l'instant exact
+            start_key, end_key = f"-{lookback_days}d", "now"
+        else:
+            start_key = (end_date - timedelta(days=lookback_days)).isoformat()
+            end_key = end_date.isoformat()
+        cache_key = CacheKeys.historical_series(symbol, start_key, end_key, timeframe.value)
+        
+        async def fetch() -> BarSeries:
+            if self.cache_manager:
+                cached = await self.cache_manager.get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            end = end_date or arrow.utcnow().datetime
+            market_data = await self.provider.get_historical_data(
+                symbol=symbol,
+                timeframe=timeframe,
+                start_date=end - timedelta(days=lookback_days),
+                end_date=end
+            )
+            series = to_bar_series(market_data, symbol, timeframe)
+            self.series_fetches += 1
+            
+            if self.cache_manager:
+                tags = [
+                    CacheTags.symbol(symbol),
+                    CacheTags.timeframe(timeframe.value),
+                    CacheTags.HISTORICAL
+                ]
+                await self.cache_manager.set(
+                    cache_key, series, self._get_indicator_cache_ttl(timeframe), tags
                 )
-                return "STOCHASTIC", indicator
-                
-            else:
-                raise IndicatorCalculationError(f"Type d'indicateur non supporté: {indicator_type}")
-                
-        except Exception as e:
-            logger.error(f"Erreur calcul {task_name}: {e}")
-            raise
-    
-    # Méthodes de calcul async
+            return series
+        
+        return await self._coalescer.run(cache_key, fetch)
     
-    async def _calculate_rsi_async(self, prices: pd.Series, period: int) -> float:
-        """Calcule le RSI de manière asynchrone."""
+    async def _run_builder(
+        self,
+        builder: Callable[[pd.DataFrame], BaseIndicator],
+        series: BarSeries
+    ) -> BaseIndicator:
+        """Calcule un indicateur dans le pool de workers."""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor, self._calculate_rsi, prices, period
+        result = (await loop.run_in_executor(
+            self.executor, self._compute_indicators, series, [builder]
+        ))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    def _compute_indicators(
+        self,
+        series: BarSeries,
+        builders: List[Callable[[pd.DataFrame], BaseIndicator]]
+    ) -> List[Union[BaseIndicator, Exception]]:
+        """
+        Calcule plusieurs indicateurs sur une même série en une passe.
+        
+        Args:
+            series: Historique partagé
+            builders: Fonctions de calcul recevant le DataFrame
+            
+        Returns:
+            Indicateur ou exception, dans l'ordre des fonctions
+        """
+        if len(series) == 0:
+            error = InsufficientDataError("Aucune donnée disponible")
+            return [error] * len(builders)
+        
+        # Conversion unique (sans copie) partagée par tous les calculs
+        df = series.to_dataframe()
+        results: List[Union[BaseIndicator, Exception]] = []
+        for builder in builders:
+            try:
+                results.append(builder(df))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    # Construction des indicateurs
+    
+    def _build_moving_average(
+        self, symbol: str, timeframe: TimeFrame, ma_type: IndicatorType,
+        period: int, df: pd.DataFrame
+    ) -> MovingAverage:
+        """Construit une moyenne mobile à partir de l'historique."""
+        if len(df) < period:
+            raise InsufficientDataError(
+                f"Besoin de {period} points, seulement {len(df)} disponibles"
+            )
+        
+        if ma_type == IndicatorType.SMA:
+            ma_value = self._calculate_sma(df['close'], period)
+        elif ma_type == IndicatorType.EMA:
+            ma_value = self._calculate_ema(df['close'], period)
+        elif ma_type == IndicatorType.WMA:
+            ma_value = self._calculate_wma(df['close'], period)
+        else:
+            raise IndicatorCalculationError(f"Type MA non supporté: {ma_type}")
+        
+        return MovingAverage(
+            symbol=Symbol(symbol=symbol),
+            timestamp=df.index[-1],
+            timeframe=timeframe,
+            indicator_type=ma_type,
+            period=period,
+            value=Decimal(str(ma_value))
         )
     
-    async def _calculate_macd_async(
-        self, prices: pd.Series, fast: int, slow: int, signal: int
-    ) -> Dict[str, float]:
-        """Calcule le MACD de manière asynchrone."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor, self._calculate_macd, prices, fast, slow, signal
+    def _build_rsi(
+        self, symbol: str, timeframe: TimeFrame, period: int, df: pd.DataFrame
+    ) -> RSI:
+        """Construit le RSI à partir de l'historique."""
+        if len(df) < period + 1:
+            raise InsufficientDataError(
+                f"Besoin de {period + 1} points pour RSI, seulement {len(df)} disponibles"
+            )
+        
+        return RSI(
+            symbol=Symbol(symbol=symbol),
+            timestamp=df.index[-1],
+            timeframe=timeframe,
+            period=period,
+            value=Decimal(str(self._calculate_rsi(df['close'], period)))
         )
     
-    async def _calculate_bollinger_async(
-        self, prices: pd.Series, period: int, std_mult: float
-    ) -> Dict[str, float]:
-        """Calcule les Bollinger Bands de manière asynchrone."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor, self._calculate_bollinger, prices, period, std_mult
+    def _build_macd(
+        self, symbol: str, timeframe: TimeFrame, fast_period: int,
+        slow_period: int, signal_period: int, df: pd.DataFrame
+    ) -> MACD:
+        """Construit le MACD à partir de l'historique."""
+        min_required = max(slow_period, signal_period) + 10
+        if len(df) < min_required:
+            raise InsufficientDataError(f"Besoin de {min_required} points pour MACD")
+        
+        macd_data = self._calculate_macd(df['close'], fast_period, slow_period, signal_period)
+        return MACD(
+            symbol=Symbol(symbol=symbol),
+            timestamp=df.index[-1],
+            timeframe=timeframe,
+            period=slow_period,  # Période de référence
+            macd_line=Decimal(str(macd_data['macd'])),
+            signal_line=Decimal(str(macd_data['signal'])),
+            histogram=Decimal(str(macd_data['histogram'])),
+            fast_period=fast_period,
+            slow_period=slow_period,
+            signal_period=signal_period
         )
     
-    async def _calculate_stochastic_async(
-        self, high: pd.Series, low: pd.Series, close: pd.Series,
-        k_period: int, d_period: int
-    ) -> Dict[str, float]:
-        """Calcule le Stochastic de manière asynchrone."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor, self._calculate_stochastic, high, low, close, k_period, d_period
+    def _build_bollinger(
+        self, symbol: str, timeframe: TimeFrame, period: int,
+        std_multiplier: float, df: pd.DataFrame
+    ) -> BollingerBands:
+        """Construit les Bandes de Bollinger à partir de l'historique."""
+        if len(df) < period:
+            raise InsufficientDataError(f"Besoin de {period} points pour Bollinger")
+        
+        bb_data = self._calculate_bollinger(df['close'], period, std_multiplier)
+        return BollingerBands(
+            symbol=Symbol(symbol=symbol),
+            timestamp=df.index[-1],
+            timeframe=timeframe,
+            period=period,
+            middle_band=Decimal(str(bb_data['middle'])),
+            upper_band=Decimal(str(bb_data['upper'])),
+            lower_band=Decimal(str(bb_data['lower'])),
+            std_dev=Decimal(str(bb_data['std_dev'])),
+            std_multiplier=Decimal(str(std_multiplier))
+        )
+    
+    def _build_stochastic(
+        self, symbol: str, timeframe: TimeFrame, k_period: int,
+        d_period: int, df: pd.DataFrame
+    ) -> Stochastic:
+        """Construit l'oscillateur Stochastique à partir de l'historique."""
+        min_required = k_period + d_period
+        if len(df) < min_required:
+            raise InsufficientDataError(f"Besoin de {min_required} points pour Stochastic")
+        
+        stoch_data = self._calculate_stochastic(
+            df['high'], df['low'], df['close'], k_period, d_period
+        )
+        return Stochastic(
+            symbol=Symbol(symbol=symbol),
+            timestamp=df.index[-1],
+            timeframe=timeframe,
+            period=k_period,
+            k_percent=Decimal(str(stoch_data['k'])),
+            d_percent=Decimal(str(stoch_data['d'])),
+            k_period=k_period,
+            d_period=d_period
         )
     
     # Méthodes de calcul synchrones
@@ -716,36 +823,25 @@ class TechnicalIndicatorsService:
         """Calcule la Simple Moving Average."""
         if len(prices) < period:
             raise InsufficientDataError(f"Besoin de {period} valeurs pour SMA")
-        return float(prices.tail(period).mean())
+        return kernels.last_value(kernels.sma(prices, period))
     
     def _calculate_ema(self, prices: pd.Series, period: int) -> float:
         """Calcule l'Exponential Moving Average."""
         if len(prices) < period:
             raise InsufficientDataError(f"Besoin de {period} valeurs pour EMA")
-        return float(prices.ewm(span=period).mean().iloc[-1])
+        return kernels.last_value(kernels.ema(prices, period))
     
     def _calculate_wma(self, prices: pd.Series, period: int) -> float:
         """Calcule la Weighted Moving Average."""
         if len(prices) < period:
             raise InsufficientDataError(f"Besoin de {period} valeurs pour WMA")
-        
-        weights = np.arange(1, period + 1)
-        values = prices.tail(period).values
-        return float(np.sum(weights * values) / np.sum(weights))
+        return kernels.last_value(kernels.wma(prices, period))
     
     def _calculate_rsi(self, prices: pd.Series, period: int) -> float:
-        """Calcule le RSI."""
+        """Calcule le RSI (lissage de Wilder)."""
         if len(prices) < period + 1:
             raise InsufficientDataError(f"Besoin de {period + 1} valeurs pour RSI")
-        
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return float(rsi.iloc[-1])
+        return kernels.last_value(kernels.rsi(prices, period))
     
     def _calculate_macd(
         self, prices: pd.Series, fast: int, slow: int, signal: int
@@ -754,17 +850,11 @@ class TechnicalIndicatorsService:
         if len(prices) < slow:
             raise InsufficientDataError(f"Besoin de {slow} valeurs pour MACD")
         
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
-        
+        macd_line, signal_line, histogram = kernels.macd(prices, fast, slow, signal)
         return {
-            'macd': float(macd_line.iloc[-1]),
-            'signal': float(signal_line.iloc[-1]),
-            'histogram': float(histogram.iloc[-1])
+            'macd': kernels.last_value(macd_line),
+            'signal': kernels.last_value(signal_line),
+            'histogram': kernels.last_value(histogram)
         }
     
     def _calculate_bollinger(
@@ -774,17 +864,12 @@ class TechnicalIndicatorsService:
         if len(prices) < period:
             raise InsufficientDataError(f"Besoin de {period} valeurs pour Bollinger")
         
-        sma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
-        
-        upper = sma + (std * std_mult)
-        lower = sma - (std * std_mult)
-        
+        upper, middle, lower, std = kernels.bollinger_bands(prices, period, std_mult)
         return {
-            'upper': float(upper.iloc[-1]),
-            'middle': float(sma.iloc[-1]),
-            'lower': float(lower.iloc[-1]),
-            'std_dev': float(std.iloc[-1])
+            'upper': kernels.last_value(upper),
+            'middle': kernels.last_value(middle),
+            'lower': kernels.last_value(lower),
+            'std_dev': kernels.last_value(std)
         }
     
     def _calculate_stochastic(
@@ -795,15 +880,10 @@ class TechnicalIndicatorsService:
         if len(close) < k_period:
             raise InsufficientDataError(f"Besoin de {k_period} valeurs pour Stochastic")
         
-        lowest_low = low.rolling(window=k_period).min()
-        highest_high = high.rolling(window=k_period).max()
-        
-        k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-        d_percent = k_percent.rolling(window=d_period).mean()
-        
+        k_percent, d_percent = kernels.stochastic(high, low, close, k_period, d_period)
         return {
-            'k': float(k_percent.iloc[-1]),
-            'd': float(d_percent.iloc[-1])
+            'k': kernels.last_value(k_percent),
+            'd': kernels.last_value(d_percent)
         }
     
     def _get_indicator_cache_ttl(self, timeframe: TimeFrame) -> int:
@@ -832,6 +912,8 @@ class TechnicalIndicatorsService:
                 'hit_rate': self.cache_hits / max(1, self.cache_hits + self.cache_misses),
                 'calculations_count': self.calculations_count,
                 'errors_count': self.errors_count,
+                'series_fetches': self.series_fetches,
+                'coalesced_requests': self._coalescer.coalesced_count,
                 'max_workers': self.max_workers
             },
             'provider_status': await self.provider.get_health_status()
@@ -151,8 +151,9 @@ class BaseValidator:
         if end_date <= start_date:
             return False
         
-        # Les dates ne doivent pas être dans le futur (sauf quelques minutes de tolérance)
-        now = arrow.utcnow().naive
+        # Les dates ne doivent pas être dans le futur (sauf quelques minutes de tolérance),
+        # "maintenant" étant exprimé avec le même fuseau (ou son absence) que les dates
+        now = arrow.utcnow().datetime if start_date.tzinfo else arrow.utcnow().naive
         future_tolerance = timedelta(minutes=5)
         
         if start_date > now + future_tolerance:
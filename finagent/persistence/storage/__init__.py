@@ -0,0 +1,11 @@
+"""
+Stockage local des données FinAgent.
+
+- PortfolioStore : Séries de portefeuille (snapshots, positions, transactions)
+"""
+
+from .portfolio_store import PortfolioStore
+
+__all__ = [
+    'PortfolioStore'
+]
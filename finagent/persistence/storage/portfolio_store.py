@@ -0,0 +1,292 @@
+"""
+Stockage des séries de portefeuille - SQLite en mode WAL.
+
+Ce module conserve sur disque les snapshots de valeur des portefeuilles
+(courbe de capitaux propres), le détail des positions de chaque snapshot,
+les transactions et l'état des portefeuilles. Les tables de séries sont
+organisées en clé primaire ``(portfolio_id, ts)`` sans rowid: les lignes
+d'un portefeuille sont contiguës et triées par date, une requête par
+période est donc un simple parcours d'intervalle de l'index. SQLite lit
+les pages du fichier par mappage mémoire (``PRAGMA mmap_size``) plutôt
+que par appels ``read``; les lignes d'une période sont ensuite copiées
+(``fetchall``) puis converties en colonnes numpy.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from uuid import UUID
+
+import numpy as np
+
+from finagent.business.models.portfolio_models import Portfolio, Transaction
+from finagent.business.portfolio.performance_history import PortfolioHistory, SNAPSHOT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+    portfolio_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    {', '.join(f'{name} REAL NOT NULL' for name in SNAPSHOT_COLUMNS)},
+    PRIMARY KEY (portfolio_id, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS position_snapshots (
+    portfolio_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    market_value REAL NOT NULL,
+    weight REAL NOT NULL,
+    pnl REAL NOT NULL,
+    PRIMARY KEY (portfolio_id, ts, symbol)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    portfolio_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    transaction_type TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    total_amount REAL NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_portfolio_ts ON transactions (portfolio_id, ts);
+
+CREATE TABLE IF NOT EXISTS portfolios (
+    id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+_POSITION_FIELDS = ('quantity', 'market_value', 'weight', 'pnl')
+
+
+class PortfolioStore:
+    """
+    Stockage durable des séries temporelles de portefeuille.
+
+    Une seule connexion est conservée (journal WAL, synchronisation
+    ``NORMAL``): un snapshot est un ajout en fin d'index dans une seule
+    transaction, sans bloquer les lectures concurrentes. Les méthodes sont
+    synchrones et protégées par un verrou: les appelants asynchrones les
+    exécutent dans un thread (``asyncio.to_thread``).
+    """
+
+    def __init__(self, path: Union[str, Path], mmap_size: int = 256 * 1024 * 1024):
+        """
+        Ouvre (ou crée) le stockage.
+
+        Args:
+            path: Chemin du fichier SQLite (``:memory:`` pour un stockage temporaire)
+            mmap_size: Taille maximale du fichier lue par mappage mémoire (octets)
+        """
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        logger.info(f"Stockage de portefeuille ouvert: {self.path}")
+
+    def close(self) -> None:
+        """Ferme la connexion (le journal WAL est reporté dans la base)."""
+        with self._lock:
+            self._conn.close()
+
+    # Snapshots
+
+    def append_snapshot(self,
+                        portfolio_id: UUID,
+                        timestamp: datetime,
+                        values: Mapping[str, float],
+                        positions: Optional[Mapping[str, Mapping[str, float]]] = None) -> None:
+        """
+        Enregistre un snapshot de portefeuille et le détail de ses positions.
+
+        Args:
+            portfolio_id: ID du portefeuille
+            timestamp: Horodatage du snapshot
+            values: Valeurs des colonnes de ``SNAPSHOT_COLUMNS``
+            positions: Détail par symbole (quantity, market_value, weight, pnl)
+        """
+        key, ts = str(portfolio_id), timestamp.timestamp()
+        row = (key, ts, *(float(values.get(name, 0.0)) for name in SNAPSHOT_COLUMNS))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO portfolio_snapshots VALUES ({', '.join('?' * len(row))})", row
+            )
+            if positions:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO position_snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (key, ts, symbol, *(float(position.get(name, 0.0)) for name in _POSITION_FIELDS))
+                        for symbol, position in positions.items()
+                    ]
+                )
+
+    def load_snapshots(self,
+                       portfolio_id: UUID,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Charge les snapshots d'une période sous forme de colonnes.
+
+        Args:
+            portfolio_id: ID du portefeuille
+            start: Début de la période (inclus)
+            end: Fin de la période (incluse)
+
+        Returns:
+            Horodatages (secondes epoch) et colonnes par nom
+        """
+        where, params = self._range(portfolio_id, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, {', '.join(SNAPSHOT_COLUMNS)} FROM portfolio_snapshots "
+                f"WHERE {where} ORDER BY ts", params
+            ).fetchall()
+
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), len(SNAPSHOT_COLUMNS) + 1)
+        return data[:, 0].copy(), {name: data[:, i + 1].copy() for i, name in enumerate(SNAPSHOT_COLUMNS)}
+
+    def load_history(self,
+                     portfolio_id: UUID,
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     **kwargs: Any) -> PortfolioHistory:
+        """
+        Reconstruit l'historique de performance d'un portefeuille.
+
+        Args:
+            portfolio_id: ID du portefeuille
+            start: Début de la période (inclus)
+            end: Fin de la période (incluse)
+            **kwargs: Paramètres de ``PortfolioHistory`` (rétention...)
+        """
+        timestamps, columns = self.load_snapshots(portfolio_id, start, end)
+        return PortfolioHistory.from_columns(timestamps, columns, **kwargs)
+
+    def load_positions(self,
+                       portfolio_id: UUID,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Charge le détail des positions des snapshots d'une période."""
+        where, params = self._range(portfolio_id, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, symbol, {', '.join(_POSITION_FIELDS)} FROM position_snapshots "
+                f"WHERE {where} ORDER BY ts, symbol", params
+            ).fetchall()
+
+        return [
+            {'timestamp': datetime.fromtimestamp(row[0]), 'symbol': row[1], **dict(zip(_POSITION_FIELDS, row[2:]))}
+            for row in rows
+        ]
+
+    def prune_snapshots(self, portfolio_id: UUID, before: datetime) -> int:
+        """
+        Supprime les snapshots antérieurs à une date.
+
+        Returns:
+            Nombre de snapshots supprimés
+        """
+        params = (str(portfolio_id), before.timestamp())
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM portfolio_snapshots WHERE portfolio_id = ? AND ts < ?", params
+            ).rowcount
+            self._conn.execute("DELETE FROM position_snapshots WHERE portfolio_id = ? AND ts < ?", params)
+        return deleted
+
+    # Transactions et portefeuilles
+
+    def save_transaction(self, portfolio_id: UUID, transaction: Transaction) -> None:
+        """Enregistre (ou met à jour) une transaction."""
+        self.save_transactions(portfolio_id, [transaction])
+
+    def save_transactions(self, portfolio_id: UUID, transactions: Iterable[Transaction]) -> None:
+        """Enregistre plusieurs transactions dans une seule écriture."""
+        rows = [
+            (
+                str(t.id), str(portfolio_id), (t.executed_at or t.created_at).timestamp(), t.symbol,
+                getattr(t.transaction_type, 'value', str(t.transaction_type)),
+                float(t.quantity), float(t.price), float(t.total_amount), t.model_dump_json()
+            )
+            for t in transactions
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def load_transactions(self,
+                          portfolio_id: UUID,
+                          start: Optional[datetime] = None,
+                          end: Optional[datetime] = None) -> List[Transaction]:
+        """Charge les transactions d'une période, triées par date."""
+        where, params = self._range(portfolio_id, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM transactions WHERE {where} ORDER BY ts", params
+            ).fetchall()
+        return [Transaction.model_validate_json(row[0]) for row in rows]
+
+    def save_portfolio(self, portfolio: Portfolio) -> None:
+        """Enregistre l'état courant d'un portefeuille (positions comprises)."""
+        self.save_portfolios([portfolio])
+
+    def save_portfolios(self, portfolios: Iterable[Portfolio]) -> None:
+        """Enregistre l'état de plusieurs portefeuilles dans une seule écriture."""
+        rows = [
+            (str(p.id), p.last_updated.timestamp(), p.model_dump_json())
+            for p in portfolios
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO portfolios VALUES (?, ?, ?)", rows)
+
+    def load_portfolios(self) -> List[Portfolio]:
+        """Charge l'état enregistré de tous les portefeuilles."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM portfolios ORDER BY updated_at").fetchall()
+        return [Portfolio.model_validate_json(row[0]) for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du stockage."""
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('portfolios', 'portfolio_snapshots', 'position_snapshots', 'transactions')
+            }
+        return {'path': self.path, **counts}
+
+    # Implémentation
+
+    @staticmethod
+    def _range(portfolio_id: UUID,
+               start: Optional[datetime],
+               end: Optional[datetime]) -> Tuple[str, List[Any]]:
+        """Condition SQL d'une période (parcours d'intervalle de la clé primaire)."""
+        clauses, params = ["portfolio_id = ?"], [str(portfolio_id)]
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(end.timestamp())
+        return " AND ".join(clauses), params
@@ -8,14 +8,18 @@ pour tous les tests du projet.
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import tempfile
 import os
 
+import numpy as np
+import pandas as pd
+
 from finagent.ai.models.base import ModelType, ProviderType
 from finagent.ai.config import AIConfig, OllamaConfig, ClaudeConfig, FallbackStrategy
 from finagent.ai.providers.ollama_provider import OllamaProvider, OllamaModelInfo
 from finagent.ai.services.model_discovery_service import ModelDiscoveryService
+from finagent.data.models import BarSeries, TimeFrame
 
 
 @pytest.fixture(scope="session")
@@ -363,6 +367,47 @@ def test_helpers():
     return TestHelpers
 
 
+class RandomWalk:
+    """Séries de prix reproductibles (marche aléatoire autour de 100)."""
+    
+    @staticmethod
+    def close(n: int, seed: int = 0, scale: float = 1.0) -> np.ndarray:
+        """Clôtures d'une marche aléatoire gaussienne."""
+        return 100 + np.cumsum(np.random.default_rng(seed).normal(0, scale, n))
+    
+    @staticmethod
+    def ohlc(n: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Clôtures, plus hauts et plus bas (clôture ± 1)."""
+        close = RandomWalk.close(n, seed)
+        return close, close + 1, close - 1
+    
+    @staticmethod
+    def bars(close: np.ndarray, start: str = "2024-01-01", volume: float = 5000) -> List[Dict[str, Any]]:
+        """Barres journalières au format liste de dictionnaires."""
+        dates = pd.date_range(start, periods=len(close), freq="D").strftime("%Y-%m-%d")
+        return [
+            {'date': d, 'open': c, 'high': c + 1, 'low': c - 1, 'close': c, 'volume': volume}
+            for d, c in zip(dates, close)
+        ]
+    
+    @staticmethod
+    def series(symbol: str, close: np.ndarray, start: str = "2024-01-01",
+               freq: str = "D", volume: float = 5000) -> BarSeries:
+        """Série columnar construite à partir des clôtures."""
+        return BarSeries(
+            symbol=symbol, timeframe=TimeFrame.DAY_1,
+            timestamps=pd.date_range(start, periods=len(close), freq=freq),
+            open=close, high=close + 1, low=close - 1, close=close,
+            volume=np.full(len(close), volume)
+        )
+
+
+@pytest.fixture
+def random_walk():
+    """Fixture pour générer des historiques de prix de test."""
+    return RandomWalk
+
+
 # Configuration des timeouts pour les tests asyncio
 @pytest.fixture(autouse=True)
 def setup_test_timeout():
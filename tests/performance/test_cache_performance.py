@@ -0,0 +1,78 @@
+"""
+Tests de Performance - Cache mémoire
+
+Microbenchmark du backend mémoire : compare l'éviction LRU en O(1)
+(OrderedDict) à l'ancienne éviction par parcours complet (min() sur
+toutes les clés) à 10k et 100k entrées.
+"""
+
+import time
+
+import pytest
+
+from finagent.data.cache import MemoryCacheBackend
+
+
+class LinearScanCacheBackend(MemoryCacheBackend):
+    """Référence reproduisant l'ancienne éviction en O(n)."""
+
+    def _evict_lru(self) -> None:
+        lru_key = min(self.cache.keys(), key=lambda k: self.cache[k].last_accessed)
+        self._remove(lru_key)
+        self.evictions += 1
+
+
+async def _fill(backend: MemoryCacheBackend, size: int) -> None:
+    """Remplit le cache jusqu'à sa capacité."""
+    for i in range(size):
+        await backend.set(f"key:{i}", i, ttl=3600, tags=[f"symbol:{i % 100}"])
+
+
+async def _time_inserts(backend: MemoryCacheBackend, count: int) -> float:
+    """Mesure le temps moyen (µs) d'une insertion provoquant une éviction."""
+    start = time.perf_counter()
+    for i in range(count):
+        await backend.set(f"new:{i}", i, ttl=3600)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+@pytest.mark.performance
+class TestMemoryCachePerformance:
+    """Benchmarks du backend de cache mémoire."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [10_000, 100_000])
+    async def test_eviction_scaling(self, size):
+        """Test coût d'insertion à pleine capacité : O(1) vs O(n)"""
+        inserts = 200
+
+        fast = MemoryCacheBackend(max_size=size)
+        await _fill(fast, size)
+        fast_us = await _time_inserts(fast, inserts)
+
+        slow = LinearScanCacheBackend(max_size=size)
+        await _fill(slow, size)
+        slow_us = await _time_inserts(slow, inserts)
+
+        print(f"\n📊 Cache {size} entrées: set+éviction "
+              f"O(1)={fast_us:.1f}µs  O(n)={slow_us:.1f}µs  "
+              f"(x{slow_us / fast_us:.0f})")
+
+        assert fast.evictions == inserts
+        assert fast_us < slow_us
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [10_000, 100_000])
+    async def test_tag_invalidation(self, size):
+        """Test invalidation par tag via l'index inverse"""
+        backend = MemoryCacheBackend(max_size=size)
+        await _fill(backend, size)
+
+        start = time.perf_counter()
+        removed = await backend.invalidate_by_tag("symbol:7")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n📊 Cache {size} entrées: invalidation de {removed} clés en {elapsed_ms:.2f}ms")
+
+        assert removed == size // 100
+        assert len(backend.cache) == size - removed
@@ -0,0 +1,178 @@
+"""
+Tests unitaires pour le backtest événementiel.
+
+Ce module vérifie le rejeu barre par barre à travers le moteur de
+stratégies: conventions d'exécution partagées avec le backtest vectoriel,
+stop-loss issus des règles, contraintes de l'allocateur, gestionnaire de
+risques et mise à jour incrémentale des indicateurs.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import finagent
+from finagent.business.backtesting import (
+    BacktestConfig, BacktestError, EventDrivenBacktester, SimulatedClock, VectorizedBacktester
+)
+from finagent.business.strategy.engine.signal_generator import TradingSignal
+from finagent.business.strategy.parser import StrategyYAMLParser
+from finagent.data.models import BarSeries, TimeFrame
+
+TEMPLATE = Path(finagent.__file__).parent / "business/strategy/templates/simple_test_strategy.yaml"
+
+RULES = {
+    'buy_conditions': {'conditions': [{'indicator': 'close', 'operator': '<', 'value': 95}]},
+    'sell_conditions': {'conditions': [{'indicator': 'close', 'operator': '>', 'value': 105}]}
+}
+
+
+def make_strategy(rules=RULES):
+    """Stratégie du template avec des règles sur la clôture."""
+    strategy = StrategyYAMLParser().parse_file(str(TEMPLATE))
+    return strategy.model_copy(update={'rules': rules})
+
+
+def make_series(opens, closes, symbol="AAPL", start="2024-01-01", freq="B"):
+    """Série à partir des ouvertures et clôtures."""
+    opens, closes = np.asarray(opens, float), np.asarray(closes, float)
+    return BarSeries(
+        symbol=symbol, timeframe=TimeFrame.DAY_1,
+        timestamps=pd.date_range(start, periods=len(closes), freq=freq),
+        open=opens, high=np.maximum(opens, closes) + 1, low=np.minimum(opens, closes) - 1,
+        close=closes, volume=np.full(len(closes), 1000)
+    )
+
+
+def config(**overrides):
+    values = dict(initial_capital=10000.0, commission=0.001, slippage=0.0005)
+    values.update(overrides)
+    return BacktestConfig(**values)
+
+
+async def run(strategy, data, backtest_config, **kwargs):
+    return await EventDrivenBacktester(**kwargs).run(strategy, data, backtest_config)
+
+
+class RejectAll:
+    """Gestionnaire de risques refusant tous les signaux."""
+
+    class Assessment:
+        is_acceptable = False
+
+    def __init__(self):
+        self.signals = []
+
+    async def assess_signal_risk(self, signal, portfolio_state):
+        self.signals.append(signal)
+        return self.Assessment()
+
+
+class TestReplay:
+    """Tests du rejeu à travers le moteur de stratégies."""
+
+    @pytest.mark.asyncio
+    async def test_fills_match_vectorized_conventions(self):
+        """Test exécution à l'ouverture suivante, taille issue de la chaîne."""
+        series = make_series([100, 100, 96, 100, 104, 104], [100, 94, 97, 106, 104, 104])
+        result = await run(make_strategy(), {"AAPL": series}, config())
+        vectorized = VectorizedBacktester().run(make_strategy(), {"AAPL": series}, config())
+
+        trade = result.trades.iloc[0]
+        reference = vectorized.trades.iloc[0]
+        assert len(result.trades) == 1
+        assert (trade['entry_time'], trade['exit_time']) == (reference['entry_time'], reference['exit_time'])
+        assert trade['entry_price'] == pytest.approx(96 * 1.0005)
+        assert trade['exit_price'] == pytest.approx(104 * 0.9995)
+        assert trade['exit_reason'] == "signal"
+        # Allocation par parité de risque: 10% de la valeur du portefeuille
+        assert trade['quantity'] == pytest.approx(1000 / 94)
+        assert result.final_equity == pytest.approx(10000 + trade['pnl'])
+        assert result.metadata['evaluations'] == 6
+
+    @pytest.mark.asyncio
+    async def test_rule_stop_loss_uses_position(self):
+        """Test stop-loss des règles évalué sur la position simulée."""
+        rules = {
+            'buy_conditions': RULES['buy_conditions'],
+            'sell_conditions': {'conditions': [
+                {'indicator': 'stop_loss', 'operator': '>', 'value': 0.5, 'parameters': {'percentage': 0.05}}
+            ]}
+        }
+        series = make_series([100, 100, 96, 90, 97, 97], [100, 94, 97, 89, 97, 97])
+        result = await run(make_strategy(rules), {"AAPL": series}, config())
+
+        trade = result.trades.iloc[0]
+        assert trade['exit_reason'] == "stop_loss"
+        assert trade['exit_time'] == series.timestamps[4]
+        assert trade['exit_price'] == pytest.approx(97 * 0.9995)
+
+    @pytest.mark.asyncio
+    async def test_allocator_constraints_across_signals(self):
+        """Test limites de l'allocateur sur les signaux d'une même barre."""
+        data = {s: make_series([100, 100, 96, 97], [100, 94, 97, 97], symbol=s) for s in "ABCD"}
+        result = await run(make_strategy(), data, config(close_at_end=False))
+
+        values = result.position_values[:, 2]
+        # Secteur inconnu commun plafonné à 25%: deux positions pleines, une réduite
+        assert (values > 0).sum() == 3
+        assert values[2] == pytest.approx(values[0] / 2)
+        assert result.metadata['allocation_rejected'] == 1
+
+    @pytest.mark.asyncio
+    async def test_risk_manager_blocks_entries(self):
+        """Test signaux d'achat refusés par le gestionnaire de risques."""
+        series = make_series([100, 100, 96, 100, 104, 104], [100, 94, 97, 106, 104, 104])
+        risk_manager = RejectAll()
+        result = await run(make_strategy(), {"AAPL": series}, config(), risk_manager=risk_manager)
+
+        assert len(result.trades) == 0
+        assert result.metadata['risk_rejected'] == 1
+        assert isinstance(risk_manager.signals[0], TradingSignal)
+        assert result.final_equity == pytest.approx(10000)
+
+    @pytest.mark.asyncio
+    async def test_incremental_indicators_on_minute_bars(self, random_walk):
+        """Test barres minute: une intégration par barre et préchauffage."""
+        rules = {
+            'buy_conditions': {'conditions': [
+                {'indicator': 'rsi', 'operator': '<', 'value': 30, 'timeframe': '1m', 'parameters': {'period': 14}}
+            ]},
+            'sell_conditions': {'conditions': [
+                {'indicator': 'rsi', 'operator': '>', 'value': 70, 'timeframe': '1m', 'parameters': {'period': 14}}
+            ]}
+        }
+        closes = random_walk.close(600, seed=3, scale=0.1)
+        series = make_series(closes, closes, start="2024-01-02 09:30", freq="min")
+        start = pd.Timestamp(series.timestamps[100]).to_pydatetime()
+        result = await run(make_strategy(rules), {"AAPL": series}, config(start_date=start))
+
+        assert len(result.equity) == 500
+        assert result.timestamps[0] == np.datetime64(start)
+        assert result.metadata['indicators']['bars_applied'] == 600
+        assert result.metadata['indicators']['replays'] == 1
+        assert result.metrics['trades_count'] > 0
+
+    @pytest.mark.asyncio
+    async def test_requires_timestamps(self):
+        """Test historique sans horodatage refusé."""
+        with pytest.raises(BacktestError):
+            await run(make_strategy(), {"AAPL": {'close': [100.0] * 5}}, config())
+
+
+class TestSimulatedClock:
+    """Tests de l'horloge simulée."""
+
+    @pytest.mark.asyncio
+    async def test_signal_validity_on_simulated_time(self):
+        """Test validité des signaux historiques évaluée à l'heure simulée."""
+        series = make_series([100, 100, 96, 100], [100, 94, 97, 97])
+        backtester = EventDrivenBacktester(clock=SimulatedClock())
+
+        result = await backtester.run(make_strategy(), {"AAPL": series}, config())
+
+        # Signaux datés de 2024: expirés à l'heure réelle, acceptés à l'heure simulée
+        assert backtester.allocator.clock() == pd.Timestamp(series.timestamps[-1]).to_pydatetime()
+        assert len(result.trades) == 1
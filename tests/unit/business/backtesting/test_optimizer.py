@@ -0,0 +1,245 @@
+"""
+Tests unitaires pour l'optimiseur de paramètres.
+
+Ce module vérifie l'espace de recherche, l'application des paramètres à
+la stratégie, le découpage walk-forward, le classement des essais et
+l'exécution sur un pool de processus en mémoire partagée.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import finagent
+from finagent.business.backtesting import (
+    BacktestConfig, OptimizationError, ParameterOptimizer, ParameterRange, ParameterSpace,
+    TrialResult, apply_parameters, walk_forward_windows
+)
+from finagent.business.backtesting.optimizer import _SharedPrices, rank_trials
+from finagent.business.strategy.parser import StrategyYAMLParser
+from finagent.business.strategy.parser.vector_compiler import PriceFrame
+from finagent.data.models import BarSeries, TimeFrame
+
+TEMPLATE = Path(finagent.__file__).parent / "business/strategy/templates/simple_test_strategy.yaml"
+
+RULES = {
+    'buy_conditions': {'conditions': [{'indicator': 'close', 'operator': '<', 'value': 95}]},
+    'sell_conditions': {'conditions': [{'indicator': 'close', 'operator': '>', 'value': 105}]}
+}
+
+
+def make_strategy(rules=RULES):
+    """Stratégie du template avec des règles sur la clôture."""
+    strategy = StrategyYAMLParser().parse_file(str(TEMPLATE))
+    return strategy.model_copy(update={'rules': rules})
+
+
+def make_series(n=240, symbol="AAPL", seed=0):
+    """Série journalière oscillant autour de 100."""
+    rng = np.random.default_rng(seed)
+    closes = 100 + 8 * np.sin(np.arange(n) / 6) + rng.normal(0, 0.5, n)
+    opens = np.concatenate([[closes[0]], closes[:-1]])
+    return BarSeries(
+        symbol=symbol, timeframe=TimeFrame.DAY_1,
+        timestamps=pd.bdate_range("2023-01-02", periods=n),
+        open=opens, high=np.maximum(opens, closes) + 1, low=np.minimum(opens, closes) - 1,
+        close=closes, volume=np.full(n, 1000)
+    )
+
+
+def config(**overrides):
+    values = dict(initial_capital=10000.0, commission=0.001, slippage=0.0005, position_size=0.5)
+    values.update(overrides)
+    return BacktestConfig(**values)
+
+
+class TestParameterSpace:
+    """Tests de l'espace de recherche."""
+
+    def test_grid_from_dict(self):
+        """Test grille depuis une section YAML (intervalle, liste, valeur fixe)."""
+        space = ParameterSpace.from_dict({
+            'rsi_period': {'min': 10, 'max': 20, 'step': 5},
+            'buy_close_value': [90, 95],
+            'sell_close_value': 105
+        })
+
+        assert space.grid_size == 6
+        assert space.ranges[0].grid() == [10, 15, 20]
+        assert all(isinstance(v, int) for v in space.ranges[0].grid())
+        assert space.grid()[0] == {'rsi_period': 10, 'buy_close_value': 90, 'sell_close_value': 105}
+
+    def test_unit_round_trip(self):
+        """Test correspondance cube unité <-> valeurs du domaine."""
+        discrete = ParameterRange('period', min=5, max=50, step=5)
+        continuous = ParameterRange('stop_loss', min=0.01, max=0.1, log=True)
+
+        assert discrete.from_unit(discrete.to_unit(25)) == 25
+        assert continuous.from_unit(continuous.to_unit(0.03)) == pytest.approx(0.03)
+        assert 0.01 <= continuous.from_unit(0.999) <= 0.1
+
+    def test_invalid_range(self):
+        """Test domaines invalides."""
+        with pytest.raises(OptimizationError):
+            ParameterRange('period', min=20, max=10)
+        with pytest.raises(OptimizationError):
+            ParameterRange('ratio', min=0.1, max=0.5).grid()
+
+
+class TestApplyParameters:
+    """Tests de l'application des paramètres à la stratégie."""
+
+    def test_condition_and_risk_parameters(self):
+        """Test seuils de conditions et gestion des risques, sans modifier l'original."""
+        strategy = make_strategy()
+        tuned = apply_parameters(strategy, {'buy_close_value': 90, 'stop_loss': 0.07})
+
+        assert tuned.rules['buy_conditions']['conditions'][0]['value'] == 90
+        assert tuned.rules['sell_conditions']['conditions'][0]['value'] == 105
+        assert float(tuned.risk_management.stop_loss.value) == pytest.approx(0.07)
+        assert strategy.rules['buy_conditions']['conditions'][0]['value'] == 95
+
+    def test_dotted_path(self):
+        """Test chemin pointé dans les règles."""
+        tuned = apply_parameters(make_strategy(), {'rules.sell_conditions.conditions.0.value': 110})
+        assert tuned.rules['sell_conditions']['conditions'][0]['value'] == 110
+
+    def test_unknown_parameter(self):
+        """Test paramètre sans condition correspondante."""
+        with pytest.raises(OptimizationError):
+            apply_parameters(make_strategy(), {'macd_fast': 12})
+
+
+class TestWalkForward:
+    """Tests du découpage entraînement/test."""
+
+    def test_rolling_windows(self):
+        """Test fenêtres de test consécutives précédées d'un entraînement de longueur fixe."""
+        timestamps = pd.bdate_range("2024-01-01", periods=100).values
+        windows = walk_forward_windows(timestamps, folds=3, train_ratio=0.7)
+
+        assert len(windows) == 3
+        assert windows[0].test_start == pd.Timestamp(timestamps[70]).to_pydatetime()
+        assert windows[-1].test_end == pd.Timestamp(timestamps[-1]).to_pydatetime()
+        for previous, current in zip(windows, windows[1:]):
+            assert current.test_start > previous.test_end
+            assert current.train_start > previous.train_start
+        assert all(w.train_end < w.test_start for w in windows)
+
+    def test_anchored_windows(self):
+        """Test fenêtres d'entraînement ancrées au début."""
+        timestamps = pd.bdate_range("2024-01-01", periods=100).values
+        windows = walk_forward_windows(timestamps, folds=2, anchored=True)
+        assert all(w.train_start == windows[0].train_start for w in windows)
+
+    def test_insufficient_history(self):
+        """Test historique trop court."""
+        with pytest.raises(OptimizationError):
+            walk_forward_windows(pd.bdate_range("2024-01-01", periods=5).values, folds=4)
+
+
+class TestRanking:
+    """Tests du classement des essais."""
+
+    def test_objective_then_declared_metrics(self):
+        """Test objectif, départage par drawdown (plus faible = meilleur), échecs en dernier."""
+        trials = [
+            TrialResult({'p': 1}, {'sharpe_ratio': 1.0, 'max_drawdown': 0.2}),
+            TrialResult({'p': 2}, None, error="boom"),
+            TrialResult({'p': 3}, {'sharpe_ratio': 1.0, 'max_drawdown': 0.1}),
+            TrialResult({'p': 4}, {'sharpe_ratio': 0.5, 'max_drawdown': 0.05})
+        ]
+        ranked = rank_trials(trials, 'sharpe_ratio', ['sharpe_ratio', 'max_drawdown'])
+        assert [t.parameters['p'] for t in ranked] == [3, 1, 4, 2]
+
+
+class TestParameterOptimizer:
+    """Tests de l'optimiseur."""
+
+    SPACE = {'buy_close_value': [92, 95, 98], 'sell_close_value': [102, 105, 108]}
+
+    def test_grid_search_local(self):
+        """Test recherche sur grille: un essai par combinaison, classement décroissant."""
+        result = ParameterOptimizer(workers=1).optimize(
+            make_strategy(), {"AAPL": make_series()}, self.SPACE, config=config()
+        )
+
+        assert len(result.trials) == 9
+        assert result.metadata['failed'] == 0
+        scores = [t.metrics['sharpe_ratio'] for t in result.trials]
+        assert scores == sorted(scores, reverse=True)
+        assert result.best_parameters == result.trials[0].parameters
+        assert result.out_of_sample is None
+        assert set(result.parameter_sensitivity()) == set(self.SPACE)
+
+    def test_walk_forward_out_of_sample(self):
+        """Test walk-forward: sélection par fenêtre et métriques hors-échantillon."""
+        result = ParameterOptimizer(workers=1).optimize(
+            make_strategy(), {"AAPL": make_series()}, self.SPACE, config=config(),
+            walk_forward=3, out_of_sample=0.3
+        )
+
+        assert len(result.windows) == 3
+        assert all(len(t.fold_metrics) == 3 for t in result.trials)
+        assert all(f['out_of_sample'] is not None for f in result.folds)
+        assert result.out_of_sample is not None
+        assert result.metadata['evaluations'] == 9 * 3 + 3
+
+    def test_random_and_bayesian_budgets(self):
+        """Test budgets des recherches aléatoire et bayésienne, reproductibles avec une graine."""
+        space = {'buy_close_value': {'min': 88, 'max': 99, 'step': 1},
+                 'sell_close_value': {'min': 101, 'max': 112, 'step': 1}}
+        data = {"AAPL": make_series()}
+
+        random_result = ParameterOptimizer(workers=1, seed=1).optimize(
+            make_strategy(), data, space, method='random', iterations=10, config=config()
+        )
+        bayesian = [ParameterOptimizer(workers=1, seed=7).optimize(
+            make_strategy(), data, space, method='bayesian', iterations=12, config=config()
+        ) for _ in range(2)]
+
+        assert 1 <= len(random_result.trials) <= 10
+        assert len(bayesian[0].trials) <= 12
+        assert len({tuple(t.parameters.items()) for t in bayesian[0].trials}) == len(bayesian[0].trials)
+        assert bayesian[0].best_parameters == bayesian[1].best_parameters
+
+    def test_process_pool_matches_local(self):
+        """Test pool de processus: mêmes résultats qu'une exécution locale."""
+        data = {"AAPL": make_series(), "MSFT": make_series(symbol="MSFT", seed=1)}
+        local = ParameterOptimizer(workers=1).optimize(make_strategy(), data, self.SPACE, config=config())
+        pooled = ParameterOptimizer(workers=2).optimize(make_strategy(), data, self.SPACE, config=config())
+
+        assert pooled.metadata['workers'] == 2
+        assert [t.parameters for t in pooled.trials] == [t.parameters for t in local.trials]
+        for a, b in zip(pooled.trials, local.trials):
+            assert a.metrics['total_return'] == pytest.approx(b.metrics['total_return'])
+
+    def test_shared_prices_round_trip(self):
+        """Test publication et relecture des colonnes en mémoire partagée."""
+        series = make_series(50)
+        shared = _SharedPrices({"AAPL": PriceFrame.from_data(series)})
+        try:
+            blocks, frames = _SharedPrices.attach(shared.descriptor)
+            np.testing.assert_array_equal(frames["AAPL"].columns['close'], series.close)
+            assert len(frames["AAPL"].timestamps) == 50
+            del frames
+            for block in blocks:
+                block.close()
+        finally:
+            shared.close()
+
+    def test_all_trials_failed(self):
+        """Test aucune combinaison évaluée: erreur plutôt que des paramètres en échec."""
+        with pytest.raises(OptimizationError, match="aucune condition correspondante"):
+            ParameterOptimizer(workers=1).optimize(
+                make_strategy(), {"AAPL": make_series()}, {'fast_ma': [5, 10]}, config=config()
+            )
+
+    def test_invalid_method(self):
+        """Test méthode inconnue."""
+        with pytest.raises(OptimizationError):
+            ParameterOptimizer(workers=1).optimize(
+                make_strategy(), {"AAPL": make_series()}, self.SPACE, method='genetic'
+            )
@@ -0,0 +1,177 @@
+"""
+Tests unitaires pour le backtest vectoriel.
+
+Ce module vérifie l'exécution des ordres (ouverture suivante, slippage,
+commissions), les stop-loss/take-profit, l'allocation du capital entre
+symboles et les métriques de performance.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import finagent
+from finagent.business.backtesting import (
+    BacktestConfig, BacktestError, VectorizedBacktester, compute_performance_metrics
+)
+from finagent.business.models.portfolio_models import PerformanceMetrics
+from finagent.business.strategy.parser import StrategyYAMLParser
+from finagent.data.models import BarSeries, TimeFrame
+
+TEMPLATE = Path(finagent.__file__).parent / "business/strategy/templates/simple_test_strategy.yaml"
+
+RULES = {
+    'buy_conditions': {'conditions': [{'indicator': 'close', 'operator': '<', 'value': 95}]},
+    'sell_conditions': {'conditions': [{'indicator': 'close', 'operator': '>', 'value': 105}]}
+}
+
+
+def make_strategy(rules=RULES):
+    """Stratégie du template avec des règles sur la clôture."""
+    strategy = StrategyYAMLParser().parse_file(str(TEMPLATE))
+    return strategy.model_copy(update={'rules': rules})
+
+
+def make_series(opens, closes, symbol="AAPL", highs=None, lows=None, start="2024-01-01"):
+    """Série journalière à partir des ouvertures et clôtures."""
+    opens, closes = np.asarray(opens, float), np.asarray(closes, float)
+    highs = np.maximum(opens, closes) + 1 if highs is None else np.asarray(highs, float)
+    lows = np.minimum(opens, closes) - 1 if lows is None else np.asarray(lows, float)
+    return BarSeries(
+        symbol=symbol, timeframe=TimeFrame.DAY_1,
+        timestamps=pd.bdate_range(start, periods=len(closes)),
+        open=opens, high=highs, low=lows, close=closes, volume=np.full(len(closes), 1000)
+    )
+
+
+def config(**overrides):
+    values = dict(initial_capital=10000.0, commission=0.001, slippage=0.0005, position_size=0.5)
+    values.update(overrides)
+    return BacktestConfig(**values)
+
+
+class TestSimulation:
+    """Tests de la simulation des ordres."""
+
+    def test_next_open_fill_with_costs(self):
+        """Test exécution à l'ouverture suivante, slippage et commissions."""
+        series = make_series([100, 100, 96, 100, 104, 104], [100, 94, 97, 106, 104, 104])
+        result = VectorizedBacktester().run(make_strategy(), {"AAPL": series}, config())
+
+        entry_fill = 96 * 1.0005
+        quantity = 5000 / entry_fill
+        proceeds = quantity * 104 * 0.9995
+        expected = 10000 - 5005 + proceeds * 0.999
+
+        trade = result.trades.iloc[0]
+        assert len(result.trades) == 1
+        assert trade['entry_time'] == series.timestamps[2]
+        assert trade['exit_time'] == series.timestamps[4]
+        assert trade['exit_reason'] == "signal"
+        assert trade['pnl'] == pytest.approx(proceeds * 0.999 - 5005)
+        assert result.final_equity == pytest.approx(expected)
+        assert result.equity[1] == pytest.approx(10000)
+        assert result.costs['commission'] == pytest.approx(5 + proceeds * 0.001)
+
+    def test_stop_loss_gap_fills_at_open(self):
+        """Test stop-loss franchi en gap: sortie à l'ouverture."""
+        series = make_series([100, 100, 96, 90, 90], [100, 94, 97, 91, 91])
+        result = VectorizedBacktester().run(make_strategy(), {"AAPL": series}, config(stop_loss=0.05))
+
+        trade = result.trades.iloc[0]
+        assert trade['exit_reason'] == "stop_loss"
+        assert trade['exit_price'] == pytest.approx(90 * 0.9995)
+
+    def test_take_profit_and_stop_priority(self):
+        """Test take-profit intrabarre et priorité du stop sur une même barre."""
+        opens, closes = [100, 100, 96, 100, 100], [100, 94, 97, 100, 100]
+        target = 96 * 1.0005 * 1.10
+
+        take = VectorizedBacktester().run(
+            make_strategy(), {"AAPL": make_series(opens, closes, highs=[101, 101, 98, 107, 101])},
+            config(take_profit=0.10)
+        )
+        assert take.trades.iloc[0]['exit_reason'] == "take_profit"
+        assert take.trades.iloc[0]['exit_price'] == pytest.approx(target * 0.9995)
+
+        both = VectorizedBacktester().run(
+            make_strategy(),
+            {"AAPL": make_series(opens, closes, highs=[101, 101, 98, 107, 101], lows=[99, 93, 95, 80, 99])},
+            config(stop_loss=0.05, take_profit=0.10)
+        )
+        assert both.trades.iloc[0]['exit_reason'] == "stop_loss"
+
+    def test_cash_scaling_and_max_positions(self):
+        """Test allocation réduite au cash disponible et nombre maximum de positions."""
+        data = {s: make_series([100, 100, 96, 97], [100, 94, 97, 97], symbol=s) for s in ("A", "B", "C")}
+
+        scaled = VectorizedBacktester().run(make_strategy(), data, config(close_at_end=False))
+        assert scaled.cash[2] == pytest.approx(0.0, abs=1e-6)
+        values = scaled.position_values[:, 2]
+        assert values == pytest.approx(np.full(3, values[0]))
+
+        limited = VectorizedBacktester().run(make_strategy(), data, config(max_positions=1, close_at_end=False))
+        assert (limited.position_values[:, 2] > 0).sum() == 1
+
+    def test_unaligned_universe_and_window(self):
+        """Test symboles d'historiques différents et fenêtre de dates."""
+        data = {
+            "A": make_series([100, 100, 96, 100, 104, 104], [100, 94, 97, 106, 104, 104], symbol="A"),
+            "B": make_series([100, 100, 96, 100], [100, 94, 97, 106], symbol="B", start="2024-01-03")
+        }
+        result = VectorizedBacktester().run(make_strategy(), data, config(position_size=0.25))
+        assert len(result.equity) == 6
+        assert sorted(result.trades['symbol']) == ["A", "B"]
+
+        window = VectorizedBacktester().run(
+            make_strategy(), data,
+            config(start_date=pd.Timestamp("2024-01-03").to_pydatetime(), end_date=pd.Timestamp("2024-01-08").to_pydatetime())
+        )
+        assert window.timestamps[0] == np.datetime64("2024-01-03")
+        assert len(window.equity) == 4
+
+    def test_rules_without_buy_conditions(self):
+        """Test règles non compilables en conditions d'achat."""
+        strategy = StrategyYAMLParser().parse_file(str(TEMPLATE))
+        with pytest.raises(BacktestError):
+            VectorizedBacktester().run(strategy, {"AAPL": make_series([100] * 5, [100] * 5)}, config())
+
+
+class TestMetrics:
+    """Tests des métriques de performance."""
+
+    def test_drawdown_and_trade_stats(self):
+        """Test drawdown, récupération et statistiques de trades."""
+        metrics = compute_performance_metrics(
+            np.array([100.0, 120.0, 90.0, 95.0, 130.0]), np.array([10.0, -5.0, 20.0])
+        )
+
+        assert metrics['relative_return'] == pytest.approx(0.30)
+        assert metrics['max_drawdown'] == pytest.approx(0.25)
+        assert metrics['recovery_time'] == 2
+        assert metrics['win_rate'] == pytest.approx(2 / 3)
+        assert metrics['profit_factor'] == pytest.approx(6.0)
+        assert metrics['avg_loss'] == pytest.approx(5.0)
+
+    def test_profit_factor_without_losses(self):
+        """Test facteur de profit infini sans trade perdant, nul sans gain."""
+        equity = np.array([100.0, 110.0, 120.0])
+
+        assert compute_performance_metrics(equity, np.array([10.0, 10.0]))['profit_factor'] == float('inf')
+        assert compute_performance_metrics(equity, np.array([]))['profit_factor'] == 0.0
+        assert compute_performance_metrics(equity, np.array([-5.0]))['profit_factor'] == 0.0
+
+    def test_performance_metrics_model_and_benchmark(self):
+        """Test conversion en PerformanceMetrics et comparaison au benchmark."""
+        rng = np.random.default_rng(1)
+        closes = 100 + np.cumsum(rng.normal(size=120))
+        series = make_series(closes, closes)
+        result = VectorizedBacktester().run(make_strategy(), {"AAPL": series}, config(), benchmark=series)
+
+        performance = result.to_performance_metrics()
+        assert isinstance(performance, PerformanceMetrics)
+        assert performance.trades_count == result.metrics['trades_count']
+        assert result.metrics['benchmark_return'] == pytest.approx(closes[-1] / closes[0] - 1)
+        assert result.equity_curve.index[0] == series.timestamps[0]
@@ -0,0 +1,77 @@
+"""
+Fixtures partagées des tests de la couche métier.
+
+Provider de marché simulé (séries en marche aléatoire, appels comptés),
+moteur de décision hors ligne et portefeuille minimal.
+"""
+
+from collections import Counter
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from finagent.business.decision import DecisionEngine, MarketAnalyzer, RiskEvaluator, SignalAggregator
+
+
+class FakeProvider:
+    """Provider comptant ses appels."""
+
+    def __init__(self, random_walk):
+        self.random_walk = random_walk
+        self.calls = Counter()
+
+    def series(self, symbol, seed=0, n=252, start="2024-01-01"):
+        """Série journalière (marche aléatoire)."""
+        close = self.random_walk.close(n, seed)
+        return self.random_walk.series(symbol, close, start=start, freq="B", volume=2_000_000.0)
+
+    async def get_quote(self, symbol):
+        self.calls['get_quote'] += 1
+        return {'symbol': symbol, 'price': 101.0}
+
+    async def get_quotes(self, symbols):
+        self.calls['get_quotes'] += 1
+        return {s: {'symbol': s, 'price': 101.0} for s in symbols}
+
+    async def get_historical_data(self, symbol, period="1y", interval="1d", output="records"):
+        self.calls['get_historical_data'] += 1
+        return self.series(symbol)
+
+    async def get_historical_batch(self, symbols, period="1y", interval="1d", output="records"):
+        self.calls['get_historical_batch'] += 1
+        return {s: self.series(s, seed=i) for i, s in enumerate(symbols)}
+
+    async def get_company_info(self, symbol):
+        self.calls['get_company_info'] += 1
+        return {'sector': 'Technology', 'market_cap': 1e12, 'pe_ratio': 25.0}
+
+
+@pytest.fixture
+def fake_provider(random_walk):
+    """Provider de marché simulé."""
+    return FakeProvider(random_walk)
+
+
+@pytest.fixture
+def decision_engine(fake_provider):
+    """Moteur de décision sur le provider simulé, services IA hors ligne."""
+    analysis_service = SimpleNamespace(analyze_sentiment=AsyncMock(side_effect=RuntimeError("offline")))
+    decision_service = SimpleNamespace(make_trading_decision=AsyncMock(side_effect=RuntimeError("offline")))
+    strategy_manager = SimpleNamespace(get_active_strategy_names=AsyncMock(return_value=[]))
+    return DecisionEngine(
+        analysis_service=analysis_service,
+        decision_service=decision_service,
+        strategy_manager=strategy_manager,
+        openbb_provider=fake_provider,
+        market_analyzer=MarketAnalyzer(fake_provider, analysis_service),
+        signal_aggregator=SignalAggregator(),
+        risk_evaluator=RiskEvaluator(fake_provider)
+    )
+
+
+@pytest.fixture
+def decision_portfolio():
+    """Portefeuille sans position."""
+    return SimpleNamespace(positions={}, available_cash=Decimal("10000"), total_value=Decimal("50000"))
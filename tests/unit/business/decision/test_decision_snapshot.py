@@ -0,0 +1,111 @@
+"""
+Tests unitaires pour les instantanés de décision.
+
+Ce module vérifie que les données d'un symbole sont récupérées une seule
+fois par décision (et en requêtes groupées pour un lot), puis partagées
+par l'analyseur de marché, l'évaluateur de risque et l'agrégateur.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from finagent.business.decision import DecisionSnapshot, DecisionSnapshotLoader
+
+
+class FakeBus:
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    def latest_quote(self, symbol):
+        return self.quotes.get(symbol)
+
+
+class TestDecisionSnapshot:
+    """Tests de l'instantané."""
+
+    def test_derived_frames_cached(self, fake_provider):
+        """Test DataFrames dérivés construits une fois, prix de repli sur la clôture."""
+        series = fake_provider.series("AAPL")
+        snapshot = DecisionSnapshot(symbol="AAPL", history=series)
+
+        assert snapshot.history_frame() is snapshot.history_frame()
+        assert {'returns', 'log_returns'} <= set(snapshot.returns_frame().columns)
+        assert len(snapshot.returns_frame()) == len(series) - 1
+        assert snapshot.price == pytest.approx(series.last_close)
+        assert len(snapshot.recent(63)) == 63
+
+    def test_empty_snapshot(self):
+        """Test instantané sans données."""
+        snapshot = DecisionSnapshot(symbol="AAPL")
+        assert snapshot.price is None
+        assert snapshot.history_frame() is None
+        assert snapshot.to_market_data() is None
+
+
+class TestDecisionSnapshotLoader:
+    """Tests du chargement des instantanés."""
+
+    @pytest.mark.asyncio
+    async def test_load_single_symbol(self, fake_provider):
+        """Test une requête par source, cotation du bus prioritaire."""
+        provider = fake_provider
+        snapshot = await DecisionSnapshotLoader(provider).load("AAPL")
+
+        assert provider.calls == {'get_quote': 1, 'get_historical_data': 1, 'get_company_info': 1}
+        assert snapshot.quote['price'] == 101.0
+        assert len(snapshot.history) == 252
+
+        bus = FakeBus({"AAPL": {'symbol': "AAPL", 'price': 99.0}})
+        provider.calls.clear()
+        snapshot = await DecisionSnapshotLoader(provider, bus).load("AAPL")
+        assert provider.calls['get_quote'] == 0
+        assert snapshot.price == 99.0
+
+    @pytest.mark.asyncio
+    async def test_load_many_bulk(self, fake_provider):
+        """Test lot: un téléchargement groupé pour les historiques et les cotations manquantes."""
+        provider = fake_provider
+        bus = FakeBus({"MSFT": {'symbol': "MSFT", 'price': 300.0}})
+        snapshots = await DecisionSnapshotLoader(provider, bus).load_many(["AAPL", "MSFT", "NVDA", "AAPL"])
+
+        assert list(snapshots) == ["AAPL", "MSFT", "NVDA"]
+        assert provider.calls == {'get_historical_batch': 1, 'get_quotes': 1, 'get_company_info': 3}
+        assert snapshots["MSFT"].price == 300.0
+        assert all(s.has_history for s in snapshots.values())
+
+    @pytest.mark.asyncio
+    async def test_errors_recorded(self, fake_provider):
+        """Test erreurs de source notées sans faire échouer le chargement."""
+        provider = fake_provider
+        provider.get_historical_data = AsyncMock(side_effect=RuntimeError("timeout"))
+        snapshot = await DecisionSnapshotLoader(provider).load("AAPL")
+
+        assert snapshot.history is None
+        assert snapshot.errors == {'history': "timeout"}
+        assert snapshot.quote['price'] == 101.0
+
+
+class TestDecisionEngineSnapshot:
+    """Tests du partage de l'instantané dans le moteur de décision."""
+
+    @pytest.mark.asyncio
+    async def test_single_fetch_per_decision(self, fake_provider, decision_engine, decision_portfolio):
+        """Test historique et informations récupérés une fois par décision."""
+        provider = fake_provider
+        decision = await decision_engine.make_decision("AAPL", decision_portfolio)
+
+        assert decision.symbol == "AAPL"
+        # Historique du symbole + benchmark de l'évaluateur de risque
+        assert provider.calls == {'get_quote': 1, 'get_historical_data': 2, 'get_company_info': 1}
+
+    @pytest.mark.asyncio
+    async def test_batch_prefetch(self, fake_provider, decision_engine, decision_portfolio):
+        """Test lot: historiques groupés, benchmark téléchargé une seule fois."""
+        provider = fake_provider
+        decisions = await decision_engine.make_batch_decisions(["AAPL", "MSFT", "NVDA"], decision_portfolio)
+
+        assert set(decisions) == {"AAPL", "MSFT", "NVDA"}
+        assert provider.calls == {
+            'get_historical_batch': 1, 'get_quotes': 1, 'get_company_info': 3, 'get_historical_data': 1
+        }
@@ -0,0 +1,108 @@
+"""
+Tests unitaires pour l'analyse groupée d'un univers de symboles.
+
+Ce module vérifie que l'analyse en panel reproduit l'analyse d'un symbole,
+y compris pour des historiques de longueurs différentes, et qu'un lot de
+décisions n'analyse l'univers qu'une seule fois.
+"""
+
+import math
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pandas as pd
+import pytest
+
+from finagent.business.decision import DecisionSnapshot, MarketAnalyzer
+from finagent.data.models import PricePanel
+
+
+CONTEXT = SimpleNamespace(volume=Decimal("0"))
+INFO = {'sector': 'Technology', 'market_cap': 1e12, 'pe_ratio': 25.0}
+
+
+def make_analyzer(provider):
+    analysis_service = SimpleNamespace(analyze_sentiment=AsyncMock(side_effect=RuntimeError("offline")))
+    return MarketAnalyzer(provider, analysis_service)
+
+
+def assert_same_analysis(batch, single):
+    assert batch.trend_direction == single.trend_direction
+    assert batch.volatility == pytest.approx(single.volatility)
+    assert batch.support_levels == single.support_levels
+    assert batch.resistance_levels == single.resistance_levels
+    assert batch.volume_trend == single.volume_trend
+    assert float(batch.avg_volume) == pytest.approx(float(single.avg_volume))
+    assert batch.liquidity_score == pytest.approx(single.liquidity_score)
+    assert batch.pe_ratio == single.pe_ratio
+    assert set(batch.technical_indicators) == set(single.technical_indicators)
+    for name, value in single.technical_indicators.items():
+        if math.isnan(value):
+            assert math.isnan(batch.technical_indicators[name]), name
+        else:
+            assert batch.technical_indicators[name] == pytest.approx(value), name
+
+
+class TestAnalyzeUniverse:
+    """Tests de l'analyse groupée."""
+
+    async def assert_matches_single(self, provider, histories):
+        analyzer = make_analyzer(provider)
+        snapshots = {
+            s: DecisionSnapshot(symbol=s, history=history, company_info=INFO)
+            for s, history in histories.items()
+        }
+
+        panel = PricePanel.from_series(histories)
+        analyses = await analyzer.analyze_universe(panel, snapshots)
+
+        assert list(analyses) == list(histories)
+        for symbol, snapshot in snapshots.items():
+            single = await analyzer.analyze_market(symbol, CONTEXT, snapshot)
+            assert_same_analysis(analyses[symbol], single)
+        return analyses
+
+    @pytest.mark.asyncio
+    async def test_matches_single_symbol_analysis(self, fake_provider):
+        """Test mêmes résultats que l'analyse symbole par symbole."""
+        provider = fake_provider
+        await self.assert_matches_single(
+            provider, {s: provider.series(s, seed=i) for i, s in enumerate(["AAPL", "MSFT", "NVDA"])}
+        )
+
+    @pytest.mark.asyncio
+    async def test_misaligned_histories_match_single_analysis(self, fake_provider):
+        """Test historiques de longueurs différentes: NaN de tête sans effet sur les résultats."""
+        provider = fake_provider
+        histories = {
+            s: provider.series(s, seed=i, n=n, start=pd.bdate_range(end="2024-12-31", periods=n)[0])
+            for i, (s, n) in enumerate([("AAPL", 252), ("MSFT", 120), ("NVDA", 35), ("TSLA", 15)])
+        }
+
+        analyses = await self.assert_matches_single(provider, histories)
+        assert analyses["NVDA"].technical_indicators
+        assert analyses["TSLA"].technical_indicators == {}
+
+    @pytest.mark.asyncio
+    async def test_short_history_has_no_technicals(self, fake_provider):
+        """Test symbole de moins de 21 barres: analyse neutre, volatilité par défaut."""
+        panel = PricePanel.from_series({"AAPL": fake_provider.series("AAPL", n=15)})
+        analysis = (await make_analyzer(fake_provider).analyze_universe(panel))["AAPL"]
+
+        assert analysis.technical_indicators == {}
+        assert analysis.trend_direction == "neutral"
+        assert analysis.volatility == 0.2
+
+    @pytest.mark.asyncio
+    async def test_batch_decisions_analyze_universe_once(self, decision_engine, decision_portfolio):
+        """Test lot de décisions: une seule analyse groupée, pas d'analyse par symbole."""
+        analyzer = decision_engine.market_analyzer
+        analyzer.analyze_universe = AsyncMock(wraps=analyzer.analyze_universe)
+        analyzer.analyze_market = AsyncMock(wraps=analyzer.analyze_market)
+
+        decisions = await decision_engine.make_batch_decisions(["AAPL", "MSFT", "NVDA"], decision_portfolio)
+
+        assert set(decisions) == {"AAPL", "MSFT", "NVDA"}
+        assert analyzer.analyze_universe.await_count == 1
+        assert analyzer.analyze_market.await_count == 0
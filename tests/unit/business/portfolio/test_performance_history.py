@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour l'historique de performance.
+
+Ce module vérifie les métriques incrémentales de l'historique en colonnes
+(rendements, volatilité, drawdown, gains/pertes) contre un calcul pandas
+sur la liste complète des snapshots, ainsi que la rétention glissante.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.business.portfolio import PortfolioHistory
+
+
+START = datetime(2024, 1, 1)
+
+
+def make_history(periods=400, step=timedelta(days=1), retention=None, seed=11):
+    """Historique aléatoire et sa liste de snapshots de référence."""
+    rng = np.random.default_rng(seed)
+    values = 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, periods))
+    pnl = values - 100000
+    history = PortfolioHistory(retention=retention, capacity=16)
+    snapshots = []
+    for i in range(periods):
+        timestamp = START + i * step
+        history.append(timestamp, {'total_value': values[i], 'total_pnl': pnl[i]})
+        snapshots.append({'timestamp': timestamp, 'total_value': values[i], 'total_pnl': pnl[i]})
+    return history, pd.DataFrame(snapshots)
+
+
+class TestPortfolioHistory:
+    """Tests des métriques de l'historique."""
+
+    def test_period_metrics_match_dataframe(self):
+        """Test rendement, volatilité et drawdown identiques au calcul pandas."""
+        history, df = make_history()
+        df['returns'] = df['total_value'].pct_change()
+        df['drawdown'] = (df['total_value'] - df['total_value'].cummax()) / df['total_value'].cummax()
+        start = START + timedelta(days=250)
+        period = df[df['timestamp'] >= start]
+
+        assert len(history) == 400
+        assert history.last_return() == pytest.approx(df['returns'].iloc[-1])
+        assert history.period_return(start) == pytest.approx(
+            period['total_value'].iloc[-1] / period['total_value'].iloc[0] - 1)
+        assert history.period_volatility(start) == pytest.approx(period['returns'].std() * np.sqrt(252))
+        assert history.period_max_drawdown(start) == pytest.approx(abs(period['drawdown'].min()))
+        assert history.current_drawdown() == pytest.approx(abs(df['drawdown'].iloc[-1]))
+
+    def test_win_loss_over_range(self):
+        """Test gains et pertes d'un intervalle par sommes cumulées."""
+        history, df = make_history()
+        a, b = history.range(START + timedelta(days=100), START + timedelta(days=199))
+        changes = df['total_pnl'].iloc[a:b].diff().dropna()
+        wins, losses = changes[changes > 0.01], changes[changes < -0.01]
+
+        stats = history.win_loss(a, b)
+        assert (a, b) == (100, 200)
+        assert stats['profitable_trades'] == len(wins)
+        assert stats['losing_trades'] == len(losses)
+        assert stats['avg_win'] == pytest.approx(wins.mean())
+        assert stats['profit_factor'] == pytest.approx(wins.sum() / abs(losses.sum()))
+
+    def test_retention_and_compaction(self):
+        """Test snapshots expirés écartés, métriques inchangées après compaction, plus haut conservé."""
+        history, df = make_history(retention=timedelta(days=100))
+        df = df[df['timestamp'] > df['timestamp'].iloc[-1] - timedelta(days=100)].copy()
+        df['returns'] = df['total_value'].pct_change()
+        peak = df['total_value'].max()
+
+        assert len(history) == len(df) == 100
+        assert history.records()[0]['timestamp'] == df['timestamp'].iloc[0]
+        assert history.period_volatility(START) == pytest.approx(df['returns'].std() * np.sqrt(252))
+        assert history.period_return(START) == pytest.approx(
+            df['total_value'].iloc[-1] / df['total_value'].iloc[0] - 1)
+        assert history.current_drawdown() == pytest.approx(1 - df['total_value'].iloc[-1] / peak)
@@ -0,0 +1,147 @@
+"""
+Tests unitaires pour la revalorisation groupée des portefeuilles.
+
+Ce module vérifie qu'une revalorisation de plusieurs portefeuilles cote
+chaque symbole une seule fois et produit les mêmes valeurs que la
+valorisation position par position en Decimal.
+"""
+
+import copy
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from finagent.business.models.decision_models import DecisionAction
+from finagent.business.models.portfolio_models import PositionStatus
+from finagent.business.portfolio import PortfolioManager
+
+
+PRICES = {"AAPL": 190.25, "MSFT": 410.5, "XOM": 101.75}
+
+
+class QuoteProvider:
+    """Provider de cotations comptant les symboles demandés."""
+
+    def __init__(self):
+        self.requested = []
+
+    async def get_quotes(self, symbols):
+        self.requested.append(list(symbols))
+        return {symbol: {'price': PRICES[symbol]} for symbol in symbols if symbol in PRICES}
+
+
+async def trade(manager, portfolio, action, symbol, quantity, price):
+    decision = SimpleNamespace(
+        id=uuid4(), symbol=symbol, action=action, is_actionable=True,
+        quantity=Decimal(quantity), price_target=None, decision_context={'current_price': Decimal(price)}
+    )
+    await manager.execute_decision(portfolio.id, decision)
+
+
+async def make_manager():
+    """Trois portefeuilles partageant des symboles, dont un sans cotation (TSLA)."""
+    manager = PortfolioManager(openbb_provider=QuoteProvider())
+    for i, symbols in enumerate((["AAPL", "MSFT"], ["AAPL", "XOM"], ["MSFT", "XOM", "TSLA"])):
+        portfolio = await manager.create_portfolio(f"model-{i}", Decimal("100000"))
+        for symbol in symbols:
+            await trade(manager, portfolio, DecisionAction.BUY, symbol, "10", "100")
+    return manager
+
+
+async def scalar_revaluation(manager):
+    """Revalorisation de référence, position par position en Decimal."""
+    expected = copy.deepcopy(list(manager._portfolios.values()))
+    for portfolio in expected:
+        for symbol in list(portfolio.active_positions):
+            if symbol in PRICES:
+                await manager._apply_price(portfolio, symbol, Decimal(str(PRICES[symbol])))
+        await manager._refresh_portfolio_totals(portfolio)
+    return expected
+
+
+class TestBatchRevaluation:
+    """Tests de la revalorisation groupée."""
+
+    @pytest.mark.asyncio
+    async def test_one_quote_per_symbol(self):
+        """Test symboles cotés une fois pour tous les portefeuilles."""
+        manager = await make_manager()
+        portfolios = await manager.update_all_portfolio_prices()
+
+        assert manager.openbb_provider.requested == [["AAPL", "MSFT", "TSLA", "XOM"]]
+        assert len(portfolios) == 3
+
+    @pytest.mark.asyncio
+    async def test_matches_decimal_revaluation(self):
+        """Test valeurs identiques à la valorisation position par position."""
+        manager = await make_manager()
+        expected = await scalar_revaluation(manager)
+
+        portfolios = await manager.update_all_portfolio_prices()
+        for reference in expected:
+            portfolio = portfolios[reference.id]
+            assert portfolio.total_value == reference.total_value
+            assert portfolio.unrealized_pnl == reference.unrealized_pnl
+            for symbol, position in portfolio.positions.items():
+                assert position.market_value == reference.positions[symbol].market_value
+                assert position.weight == pytest.approx(reference.positions[symbol].weight)
+
+    @pytest.mark.asyncio
+    async def test_matches_decimal_pnl(self):
+        """Test P&L latent et total identiques, P&L réalisé compris."""
+        manager = await make_manager()
+        portfolio = list(manager._portfolios.values())[0]
+        await trade(manager, portfolio, DecisionAction.SELL, "AAPL", "5", "150")
+        assert portfolio.positions["AAPL"].realized_pnl != 0
+        expected = await scalar_revaluation(manager)
+
+        portfolios = await manager.update_all_portfolio_prices()
+        for reference in expected:
+            portfolio = portfolios[reference.id]
+            assert portfolio.total_pnl == reference.total_pnl
+            assert portfolio.unrealized_pnl == reference.unrealized_pnl
+            for symbol, position in portfolio.positions.items():
+                assert position.unrealized_pnl == reference.positions[symbol].unrealized_pnl
+                assert position.total_pnl == reference.positions[symbol].total_pnl
+
+    @pytest.mark.asyncio
+    async def test_missing_quote_and_closed_position(self):
+        """Test position sans cotation inchangée, position fermée ignorée."""
+        manager = await make_manager()
+        portfolio = list(manager._portfolios.values())[2]
+        portfolio.positions["XOM"].status = PositionStatus.CLOSED
+        tsla = portfolio.positions["TSLA"].market_value
+
+        await manager.update_portfolio_prices(portfolio.id)
+        assert portfolio.positions["TSLA"].market_value == tsla
+        assert portfolio.positions["XOM"].current_price == Decimal("100")
+        assert portfolio.invested_amount == Decimal("4105") + tsla
+        assert manager.openbb_provider.requested == [["MSFT", "TSLA"]]
+
+    @pytest.mark.asyncio
+    async def test_position_manager_hook(self):
+        """Test revalorisation déléguée au gestionnaire de positions configuré."""
+        class PositionManager:
+            def __init__(self):
+                self.updated = []
+
+            async def update_position_price(self, position, new_price):
+                self.updated.append((position.symbol, new_price))
+                position.current_price = new_price
+                position.market_value = position.quantity * new_price
+                position.unrealized_pnl = position.market_value - position.total_cost
+                position.total_pnl = position.unrealized_pnl + position.realized_pnl
+                return position
+
+        manager = PortfolioManager(openbb_provider=QuoteProvider())
+        portfolio = await manager.create_portfolio("hook", Decimal("100000"))
+        for symbol in ("AAPL", "TSLA"):
+            await trade(manager, portfolio, DecisionAction.BUY, symbol, "10", "100")
+        manager.position_manager = PositionManager()
+
+        await manager.update_portfolio_prices(portfolio.id)
+        assert manager.position_manager.updated == [("AAPL", Decimal("190.25"))]
+        assert portfolio.positions["AAPL"].market_value == Decimal("1902.5")
+        assert portfolio.invested_amount == Decimal("2902.5")
@@ -0,0 +1,232 @@
+"""
+Tests unitaires pour le modèle de covariance.
+
+Ce module vérifie la covariance EWMA (ajustement groupé et mises à jour
+barre par barre), le rétrécissement et les métriques de risque d'un
+portefeuille, ainsi que leur utilisation par le gestionnaire de risques
+et son ajustement sur l'historique.
+"""
+
+from datetime import datetime
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.business.risk import CovarianceRiskModel
+from finagent.business.strategy.engine.signal_generator import (
+    SignalConfidence, SignalPriority, SignalType, TradingSignal
+)
+from finagent.business.strategy.manager.risk_manager import StrategyRiskManager
+from finagent.data.models import BarSeries, PricePanel, TimeFrame
+
+
+SYMBOLS = ["SPY", "AAPL", "MSFT", "XOM"]
+
+
+def make_panel(periods=120, seed=7):
+    """Prix corrélés (facteur de marché commun)."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, periods)
+    loadings = np.array([1.0, 1.2, 0.9, 0.4])
+    returns = loadings[:, None] * market + rng.normal(0, 0.005, (len(SYMBOLS), periods))
+    returns[0] = market
+    close = 100 * np.cumprod(1 + returns, axis=1)
+    return PricePanel(SYMBOLS, pd.bdate_range("2024-01-01", periods=periods), close, close, close, close)
+
+
+def ewma_reference(returns, decay, prior):
+    """Covariance EWMA par boucle explicite."""
+    cov = np.diag(np.full(returns.shape[1], prior))
+    for r in returns:
+        cov = decay * cov + (1 - decay) * np.outer(r, r)
+    return cov
+
+
+@pytest.fixture
+def model():
+    model = CovarianceRiskModel(shrinkage=0.0)
+    model.fit(make_panel())
+    return model
+
+
+class TestCovarianceUpdates:
+    """Tests de la covariance EWMA."""
+
+    def test_fit_matches_recursion(self, model):
+        """Test ajustement groupé identique à la récurrence EWMA."""
+        panel = make_panel()
+        returns = (panel.close[:, 1:] / panel.close[:, :-1] - 1).T
+        expected = ewma_reference(returns, 0.94, 0.25 ** 2 / 252)
+
+        assert np.allclose(model.covariance(), expected)
+        assert model.is_covered(SYMBOLS)
+
+    def test_incremental_update_matches_fit(self):
+        """Test mise à jour par barre identique à un ajustement sur l'historique prolongé."""
+        panel = make_panel(121)
+        incremental = CovarianceRiskModel()
+        incremental.fit(PricePanel(SYMBOLS, panel.timestamps[:-1], *(c[:, :-1] for c in (
+            panel.open, panel.high, panel.low, panel.close))))
+        last = panel.close[:, -1] / panel.close[:, -2] - 1
+        incremental.update(dict(zip(reversed(SYMBOLS), reversed(last))))
+
+        full = CovarianceRiskModel()
+        full.fit(panel)
+        assert np.allclose(incremental.covariance(), full.covariance())
+        assert np.allclose(incremental.returns_history()[-1], last)
+
+    def test_observe_commits_on_next_timestamp(self):
+        """Test période ajoutée à l'arrivée de la barre suivante; barre révisée remplacée."""
+        model = CovarianceRiskModel()
+        t0, t1, t2 = (datetime(2024, 1, d) for d in (2, 3, 4))
+        model.observe("AAPL", t0, 100.0)
+        model.observe("MSFT", t0, 200.0)
+        assert not model.observe("AAPL", t1, 90.0)
+        model.observe("AAPL", t1, 101.0)  # Barre révisée
+
+        assert model.observe("AAPL", t2, 102.0)
+        assert model.observations("AAPL") == 1
+        assert model.observations("MSFT") == 0
+        assert model.returns_history(["AAPL"])[-1, 0] == pytest.approx(0.01)
+
+    def test_partial_update_and_growth(self, model):
+        """Test symboles absents inchangés, univers agrandi sans perte."""
+        before = model.covariance(["SPY", "AAPL"]).copy()
+        xom = model.covariance(["XOM"])[0, 0]
+        model.update({f"NEW{i}": 0.01 for i in range(40)})
+
+        assert len(model) == 44
+        assert np.allclose(model.covariance(["SPY", "AAPL"]), before)
+        assert model.covariance(["XOM"])[0, 0] == xom
+        assert model.observations("NEW0") == 1
+
+    def test_reads_leave_universe_unchanged(self, model):
+        """Test symbole inconnu lu avec la volatilité par défaut, sans être ajouté."""
+        stats = model.get_stats()
+        positions = {"AAPL": 1000.0, "QQQ": 1000.0}
+
+        assert model.volatility(["QQQ"])[0] == pytest.approx(0.25)
+        assert model.covariance(["AAPL", "QQQ"])[0, 1] == 0.0
+        assert np.isnan(model.returns_history(["QQQ"])).all()
+        assert model.value_at_risk(positions) > model.value_at_risk({"AAPL": 1000.0})
+        assert model.correlation_with("QQQ", positions) is None
+        assert len(model) == len(SYMBOLS) and "QQQ" not in model
+        assert model.get_stats() == stats
+
+    def test_fitted_bars_ignored(self, model):
+        """Test barres déjà couvertes par l'ajustement ignorées par observe."""
+        last = pd.Timestamp(make_panel().timestamps[-1]).to_pydatetime()
+        periods = model.get_stats()['periods']
+
+        assert not model.observe("AAPL", last, 1.0)
+        assert model.flush() is False
+        model.observe("AAPL", datetime(2030, 1, 1), 100.0)
+        assert model.observe("AAPL", datetime(2030, 1, 2), 101.0)
+        assert model.get_stats()['periods'] == periods + 1
+
+    def test_shrinkage(self, model):
+        """Test rétrécissement vers la diagonale."""
+        shrunk = CovarianceRiskModel(shrinkage=0.5)
+        shrunk.fit(make_panel())
+        raw = model.covariance()
+        expected = 0.5 * raw + 0.5 * np.diag(np.diag(raw))
+        assert np.allclose(shrunk.covariance(), expected)
+
+
+class TestPortfolioRisk:
+    """Tests des métriques de portefeuille."""
+
+    def test_decomposition_and_var(self, model):
+        """Test contributions sommant à la volatilité, VaR et ES normales."""
+        positions = {"AAPL": 40000.0, "MSFT": 30000.0, "XOM": 30000.0}
+        cov = model.covariance(list(positions))
+        x = np.array(list(positions.values()))
+        sigma = np.sqrt(x @ cov @ x)
+
+        decomposition = model.decompose(positions)
+        assert decomposition.volatility == pytest.approx(sigma)
+        assert decomposition.component.sum() == pytest.approx(sigma)
+
+        z = NormalDist().inv_cdf(0.99)
+        assert model.value_at_risk(positions, 0.99, days=10) == pytest.approx(z * sigma * np.sqrt(10))
+        assert model.expected_shortfall(positions, 0.99) > model.value_at_risk(positions, 0.99)
+
+    def test_beta_and_correlation(self, model):
+        """Test beta de l'indice égal à 1, corrélations cohérentes."""
+        assert model.beta({"SPY": 1000.0}, "SPY", 1000.0) == pytest.approx(1.0)
+        assert model.beta({"AAPL": 1000.0}, "SPY", 1000.0) > model.beta({"XOM": 1000.0}, "SPY", 1000.0)
+        assert model.beta({"AAPL": 1.0}, "QQQ", 1.0) is None
+
+        assert model.correlation_with("AAPL", {"AAPL": 500.0}) == pytest.approx(1.0)
+        assert 0 < model.average_correlation({"AAPL": 1.0, "MSFT": 1.0, "XOM": 1.0}) < 1
+
+    def test_max_drawdown(self, model):
+        """Test drawdown des pondérations rejouées sur l'historique."""
+        positions = {"SPY": 1000.0}
+        equity = np.cumprod(1 + model.returns_history(["SPY"])[:, 0])
+        expected = np.max(1 - equity / np.maximum.accumulate(np.maximum(equity, 1.0)))
+        assert model.max_drawdown(positions, 1000.0) == pytest.approx(expected)
+
+
+class TestRiskManagerIntegration:
+    """Tests du gestionnaire de risques alimenté par le modèle."""
+
+    @pytest.mark.asyncio
+    async def test_portfolio_risk_from_covariance(self, model):
+        """Test métriques calculées, valeurs par défaut sans historique."""
+        manager = StrategyRiskManager(covariance_model=model)
+        state = {'total_value': 100000.0, 'positions': {"AAPL": 40000.0, "MSFT": 30000.0, "XOM": 30000.0}}
+
+        risk = await manager.calculate_portfolio_risk(state)
+        assert risk.var_1d == pytest.approx(model.value_at_risk(state['positions'], 0.95))
+        assert risk.beta == pytest.approx(model.beta(state['positions'], "SPY", 100000.0))
+        assert risk.correlation_risk == pytest.approx(model.average_correlation(state['positions']))
+
+        uncovered = StrategyRiskManager()
+        risk = await uncovered.calculate_portfolio_risk(state)
+        assert risk.beta == 1.0
+        assert risk.correlation_risk == 0.65
+
+    @pytest.mark.asyncio
+    async def test_signal_correlation_and_bars(self, model):
+        """Test corrélation d'un signal avec le portefeuille, barres du bus prises en compte."""
+        manager = StrategyRiskManager(covariance_model=model)
+        signal = TradingSignal(
+            signal_id="s1", strategy_id="st", symbol="MSFT", signal_type=SignalType.BUY,
+            timestamp=datetime.now(), confidence=0.8,
+            confidence_level=SignalConfidence.HIGH, priority=SignalPriority.MEDIUM
+        )
+        state = {'total_value': 100000.0, 'positions': {"AAPL": 50000.0}}
+        assessment = await manager.assess_signal_risk(signal, state)
+        metric = next(m for m in assessment.risk_metrics if m.metric_name == "correlation_risk")
+        assert metric.current_value == pytest.approx(model.correlation_with("MSFT", {"AAPL": 50000.0}))
+
+        periods = model.get_stats()['periods']
+        manager.on_bar("AAPL", "1d", {'timestamp': datetime(2030, 1, 1), 'close': 100.0})
+        manager.on_bar("AAPL", "1h", {'timestamp': datetime(2030, 1, 5), 'close': 1.0})
+        manager.on_bar("AAPL", "1d", {'timestamp': datetime(2030, 1, 2), 'close': 101.0})
+        assert model.get_stats()['periods'] == periods + 1
+
+    @pytest.mark.asyncio
+    async def test_load_history_fits_universe_and_benchmark(self):
+        """Test ajustement sur l'historique de l'univers, indice ajouté, symbole indisponible ignoré."""
+        panel = make_panel()
+
+        class HistoryService:
+            async def get_series(self, symbol, period, interval):
+                if symbol == "XXX":
+                    raise ValueError("symbole inconnu")
+                close = panel.close[SYMBOLS.index(symbol)]
+                return BarSeries(symbol=symbol, timeframe=TimeFrame.DAY_1, timestamps=panel.timestamps,
+                                 open=close, high=close, low=close, close=close, volume=np.full(len(close), 1000))
+
+        manager = StrategyRiskManager()
+        fitted = await manager.load_history(HistoryService(), ["aapl", "MSFT", "XOM", "XXX"])
+
+        assert fitted == 4
+        assert manager.covariance_model.is_covered(SYMBOLS)
+        reference = CovarianceRiskModel()
+        reference.fit(panel)
+        assert np.allclose(manager.covariance_model.covariance(SYMBOLS), reference.covariance(SYMBOLS))
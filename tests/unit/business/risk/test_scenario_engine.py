@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour le moteur de scénarios.
+
+Ce module vérifie les mesures de queue (VaR/CVaR), la simulation Monte
+Carlo contre la VaR paramétrique, la simulation historique par fenêtres
+et le calcul de la VaR de portefeuille par l'évaluateur de risque.
+"""
+
+import multiprocessing
+from statistics import NormalDist
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from finagent.business.decision import RiskEvaluator
+from finagent.business.models.portfolio_models import PositionType
+from finagent.business.risk import ScenarioEngine, cholesky_factor, tail_measures
+
+
+def make_covariance(n=20, seed=3):
+    """Covariance journalière à un facteur."""
+    rng = np.random.default_rng(seed)
+    loadings = rng.uniform(0.5, 1.5, n) * 0.01
+    return np.outer(loadings, loadings) + np.diag(rng.uniform(0.5, 1.0, n) * 1e-4)
+
+
+class TestTailMeasures:
+    """Tests des mesures de queue."""
+
+    def test_var_and_cvar(self):
+        """Test VaR et CVaR de plusieurs niveaux en un tri."""
+        pnl = -np.arange(1, 101, dtype=float)  # Pertes de 1 à 100
+        var, cvar = tail_measures(pnl, [0.95, 0.99])
+
+        assert var.tolist() == [96.0, 100.0]
+        assert cvar.tolist() == [98.0, 100.0]
+
+    def test_cholesky_of_singular_matrix(self):
+        """Test facteur d'une covariance singulière (symbole dupliqué)."""
+        cov = make_covariance(5)
+        cov = np.block([[cov, cov[:, :1]], [cov[:1, :], cov[:1, :1]]])
+        factor = cholesky_factor(cov)
+        assert np.allclose(factor @ factor.T, cov, atol=1e-12)
+
+
+class TestMonteCarlo:
+    """Tests de la simulation Monte Carlo."""
+
+    def test_matches_parametric_var(self):
+        """Test VaR simulée proche de la VaR normale sur une période."""
+        cov = make_covariance()
+        x = np.full(20, 10000.0)
+        sigma = np.sqrt(x @ cov @ x)
+
+        result = ScenarioEngine(scenarios=200_000, seed=1).monte_carlo(x, cov, confidence_levels=[0.95, 0.99])
+        for level in (0.95, 0.99):
+            assert result.var[level] == pytest.approx(NormalDist().inv_cdf(level) * sigma, rel=0.03)
+        assert result.cvar[0.99] > result.var[0.99]
+        assert result.std_pnl == pytest.approx(sigma, rel=0.02)
+
+    def test_multi_period_paths(self):
+        """Test horizon de plusieurs périodes: écart-type proche de sqrt(horizon)."""
+        cov = make_covariance(8)
+        x = np.full(8, 1000.0)
+        result = ScenarioEngine(scenarios=50_000, chunk_size=7_000, seed=2).monte_carlo(x, cov, horizon=5)
+
+        assert result.scenarios == 50_000
+        assert result.std_pnl == pytest.approx(np.sqrt(5 * x @ cov @ x), rel=0.05)
+
+    def test_seeded_and_parallel(self):
+        """Test résultats reproductibles, répartition sur un pool de processus."""
+        cov = make_covariance(4)
+        x = np.full(4, 100.0)
+        first = ScenarioEngine(scenarios=10_000, seed=5).monte_carlo(x, cov)
+        second = ScenarioEngine(scenarios=10_000, seed=5).monte_carlo(x, cov)
+        assert first.var == second.var
+
+        engine = ScenarioEngine(
+            scenarios=40_000, chunk_size=10_000, seed=5, workers=2, parallel_threshold=0,
+            mp_context=multiprocessing.get_context("fork"), keep_pnl=True
+        )
+        result = engine.monte_carlo(x, cov)
+        assert len(result.pnl) == 40_000
+        assert result.var[0.99] == pytest.approx(first.var[0.99], rel=0.1)
+
+
+class TestHistorical:
+    """Tests de la simulation historique."""
+
+    def test_compounded_windows(self):
+        """Test fenêtres composées: rendements constants."""
+        returns = np.full((50, 2), 0.01)
+        result = ScenarioEngine(scenarios=1_000, seed=0).historical([100.0, 200.0], returns, horizon=3)
+        assert result.mean_pnl == pytest.approx(300.0 * (1.01 ** 3 - 1))
+
+    def test_window_distribution(self):
+        """Test VaR proche du quantile empirique des gains et pertes."""
+        returns = np.random.default_rng(4).normal(0, 0.01, (500, 3))
+        x = np.array([1000.0, 2000.0, 3000.0])
+        result = ScenarioEngine(scenarios=200_000, seed=0).historical(x, returns)
+
+        expected = -np.quantile(returns @ x, 0.05)
+        assert result.var[0.95] == pytest.approx(expected, rel=0.05)
+
+        with pytest.raises(ValueError):
+            ScenarioEngine().historical(x, returns[:2], horizon=5)
+
+
+class TestRiskEvaluatorSimulation:
+    """Tests de la VaR de portefeuille de l'évaluateur de risque."""
+
+    @pytest.mark.asyncio
+    async def test_simulate_portfolio_risk(self, fake_provider):
+        """Test historiques téléchargés en une requête, positions courtes négatives."""
+        provider = fake_provider
+        evaluator = RiskEvaluator(provider, scenario_engine=ScenarioEngine(scenarios=20_000, seed=0))
+        portfolio = SimpleNamespace(name="test", positions={
+            "AAPL": SimpleNamespace(market_value=50000, position_type=PositionType.LONG),
+            "MSFT": SimpleNamespace(market_value=20000, position_type=PositionType.SHORT),
+        })
+
+        result = await evaluator.simulate_portfolio_risk(portfolio, confidence_levels=[0.99])
+        assert provider.calls == {'get_historical_batch': 1}
+        assert result.var[0.99] > 0
+
+        historical = await evaluator.simulate_portfolio_risk(portfolio, method="historical", horizon=5)
+        assert historical.method == "historical"
+        assert historical.horizon == 5
@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour le graphe d'indicateurs partagé entre stratégies.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from finagent.business.strategy.engine import EvaluationContext, IndicatorGraph, RuleEvaluator
+from finagent.business.strategy.parser import RuleCompiler
+from finagent.data.indicators import indicator_key, kernels
+
+
+def rsi_rule(threshold):
+    return {
+        'buy_conditions': {'operator': 'AND', 'conditions': [
+            {'indicator': 'rsi', 'parameters': {'period': 14}, 'operator': '<', 'value': threshold},
+            {'indicator': 'sma', 'parameters': {'period': 20}, 'operator': '>', 'value': 0}
+        ]},
+        'sell_conditions': {'conditions': [
+            {'indicator': 'stochastic', 'operator': '>', 'value': 0}
+        ]}
+    }
+
+
+@pytest.fixture
+def market_data(random_walk):
+    close = random_walk.close(120, seed=5)
+    return {'prices': {'1d': random_walk.bars(close)}}, close
+
+
+@pytest.fixture
+def compiler():
+    return RuleCompiler()
+
+
+class TestIndicatorGraph:
+    """Tests de déduplication et de calcul des nœuds."""
+
+    def test_nodes_are_shared(self, compiler):
+        """Test fusion des nœuds identiques entre stratégies."""
+        graph = IndicatorGraph(compiler)
+        for i in range(3):
+            graph.add_strategy(f"s{i}", compiler.compile(rsi_rule(30 + i), f"s{i}"))
+
+        stats = graph.get_stats()
+        assert stats['nodes'] == 3
+        assert stats['references'] == 9
+
+        graph.remove_strategy("s0")
+        graph.remove_strategy("s1")
+        graph.remove_strategy("s2")
+        assert graph.get_stats()['nodes'] == 0
+
+    def test_compute_once_per_cycle(self, compiler, market_data):
+        """Test calcul unique et compteur de calculs évités."""
+        data, close = market_data
+        graph = IndicatorGraph(compiler)
+        for i in range(3):
+            graph.add_strategy(f"s{i}", compiler.compile(rsi_rule(30 + i), f"s{i}"))
+
+        values = graph.compute("AAPL", data)
+
+        assert values[indicator_key('rsi', '1d', {'period': 14})] == pytest.approx(kernels.rsi(close, 14)[-1])
+        assert values[indicator_key('sma', '1d', {'period': 20})] == pytest.approx(kernels.sma(close, 20)[-1])
+        assert 'k' in values[indicator_key('stochastic', '1d', {})]
+        assert graph.stats['computations'] == 3
+        assert graph.stats['computations_saved'] == 6
+
+    def test_strategy_subset(self, compiler, market_data):
+        """Test calcul limité aux stratégies du symbole."""
+        data, _ = market_data
+        graph = IndicatorGraph(compiler)
+        graph.add_strategy("s0", compiler.compile(rsi_rule(30), "s0"))
+        graph.add_strategy("s1", compiler.compile({
+            'buy_conditions': {'conditions': [{'indicator': 'ema', 'parameters': {'period': 10}, 'operator': '>', 'value': 0}]}
+        }, "s1"))
+
+        values = graph.compute("AAPL", data, ["s1"])
+
+        assert list(values) == [indicator_key('ema', '1d', {'period': 10})]
+        assert graph.stats['computations_saved'] == 0
+
+    @pytest.mark.asyncio
+    async def test_evaluator_uses_shared_values(self, compiler, market_data):
+        """Test valeurs du graphe prioritaires dans l'évaluation."""
+        data, _ = market_data
+        graph = IndicatorGraph(compiler)
+        rule = compiler.compile(rsi_rule(30), "s0")
+        graph.add_strategy("s0", rule)
+        shared = graph.compute("AAPL", data)
+        # Valeur forcée: le RSI partagé déclenche le signal d'achat
+        shared[indicator_key('rsi', '1d', {'period': 14})] = 10.0
+
+        context = EvaluationContext(
+            strategy_id="s0", symbol="AAPL", timestamp=datetime(2024, 5, 1),
+            market_data=data, portfolio_state={}, indicators_cache=shared
+        )
+        result = await RuleEvaluator().evaluate(rule, context)
+
+        assert result.buy_signal_triggered
@@ -0,0 +1,147 @@
+"""
+Tests unitaires pour le planificateur d'exécution des stratégies.
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from finagent.business.strategy.manager.scheduler import (
+    MissedRunPolicy, ScheduleConfig, StrategyScheduler, TriggerType
+)
+
+
+class Recorder:
+    """Callback d'exécution enregistrant les appels et la concurrence."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = Counter()
+        self.payloads = []
+        self.active = Counter()
+        self.max_active = Counter()
+        self.max_total = 0
+
+    async def __call__(self, strategy_id, payload):
+        self.active[strategy_id] += 1
+        self.max_active[strategy_id] = max(self.max_active[strategy_id], self.active[strategy_id])
+        self.max_total = max(self.max_total, sum(self.active.values()))
+        try:
+            await asyncio.sleep(self.delays.get(strategy_id, 0))
+            self.calls[strategy_id] += 1
+            self.payloads.append((strategy_id, payload))
+        finally:
+            self.active[strategy_id] -= 1
+
+
+async def run_for(scheduler, seconds):
+    await scheduler.start()
+    await asyncio.sleep(seconds)
+    await scheduler.stop()
+
+
+class TestStrategyScheduler:
+    """Tests de la planification par tas."""
+
+    @pytest.mark.asyncio
+    async def test_independent_intervals(self):
+        """Test échéances propres: une stratégie lente ne bloque pas les autres."""
+        recorder = Recorder(delays={'slow': 0.2})
+        scheduler = StrategyScheduler(recorder, max_workers=2)
+        scheduler.schedule('fast', ScheduleConfig(interval_seconds=0.05))
+        scheduler.schedule('slow', ScheduleConfig(interval_seconds=0.05))
+
+        await run_for(scheduler, 0.33)
+
+        assert recorder.calls['fast'] >= 5
+        assert recorder.max_active['slow'] == 1
+        assert scheduler.stats['overruns'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_missed_run_policies(self):
+        """Test politiques de rattrapage sur un retard de 3,5 intervalles."""
+        def check(policy):
+            scheduler = StrategyScheduler(Recorder())
+            scheduler._ready = asyncio.Queue()
+            entry = scheduler.schedule('s', ScheduleConfig(interval_seconds=1.0, missed_run_policy=policy))
+            entry.slot = 0.0
+            scheduler._dispatch_due(entry, 3.5)
+            return scheduler._ready.qsize(), entry.missed_runs, entry.slot
+
+        assert check(MissedRunPolicy.SKIP) == (0, 4, 4.0)
+        assert check(MissedRunPolicy.RUN_ONCE) == (1, 3, 4.0)
+        assert check(MissedRunPolicy.CATCH_UP) == (1, 0, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_catch_up_runs_every_missed_slot(self):
+        """Test rattrapage: une exécution par échéance manquée, sans dépassement."""
+        recorder = Recorder()
+        scheduler = StrategyScheduler(recorder)
+        scheduler.schedule('s', ScheduleConfig(interval_seconds=1.0, missed_run_policy=MissedRunPolicy.CATCH_UP),
+                           start_delay=-4.5)
+
+        await run_for(scheduler, 0.1)
+
+        assert recorder.calls['s'] == 5
+        assert sum(1 for _, payload in recorder.payloads if payload.get('catch_up')) == 4
+        assert scheduler.stats['overruns'] == 0
+
+    @pytest.mark.asyncio
+    async def test_reschedule_after_unschedule(self):
+        """Test pause/reprise: les anciennes échéances du tas restent obsolètes."""
+        recorder = Recorder()
+        scheduler = StrategyScheduler(recorder)
+        for _ in range(3):
+            scheduler.schedule('s', ScheduleConfig(interval_seconds=0.1))
+            scheduler.unschedule('s')
+        scheduler.schedule('s', ScheduleConfig(interval_seconds=0.1))
+
+        await run_for(scheduler, 0.35)
+
+        assert 3 <= recorder.calls['s'] <= 4
+        assert len(scheduler._heap) == 1
+
+    def test_jitter_and_unschedule(self):
+        """Test gigue bornée et retrait d'une stratégie."""
+        scheduler = StrategyScheduler(Recorder())
+        scheduler.schedule('s', ScheduleConfig(interval_seconds=10.0, jitter_seconds=0.5))
+        due, _, _, _ = scheduler._heap[0]
+        entry = scheduler._entries['s']
+        assert entry.slot <= due <= entry.slot + 0.5
+
+        scheduler.unschedule('s')
+        assert not scheduler.trigger('s')
+
+    @pytest.mark.asyncio
+    async def test_new_bar_trigger(self):
+        """Test déclenchement sur barre filtré par symbole et timeframe."""
+        recorder = Recorder(delays={'bars': 0.05})
+        scheduler = StrategyScheduler(recorder)
+        scheduler.schedule('bars', ScheduleConfig(trigger=TriggerType.NEW_BAR, timeframe='1m', symbols={'AAPL'}))
+
+        await scheduler.start()
+        assert scheduler.notify_bar('MSFT', '1m') == 0
+        assert scheduler.notify_bar('AAPL', '1d') == 0
+        # Trois barres pendant une exécution: regroupées en une seule suivante
+        for _ in range(3):
+            scheduler.notify_bar('AAPL', '1m', {'close': 1.0})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert recorder.calls['bars'] == 2
+        assert recorder.payloads[0][1]['symbol'] == 'AAPL'
+
+    @pytest.mark.asyncio
+    async def test_bounded_workers(self):
+        """Test nombre borné d'exécutions simultanées."""
+        recorder = Recorder(delays={f"s{i}": 0.05 for i in range(6)})
+        scheduler = StrategyScheduler(recorder, max_workers=2)
+        for i in range(6):
+            scheduler.schedule(f"s{i}", ScheduleConfig(interval_seconds=60.0))
+
+        await run_for(scheduler, 0.25)
+
+        assert sum(recorder.calls.values()) == 6
+        assert recorder.max_total == 2
@@ -0,0 +1,99 @@
+"""
+Tests unitaires pour l'exécution parallèle des stratégies par le moteur.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import finagent
+from finagent.business.strategy.engine import StrategyEngine
+from finagent.business.strategy.parser import StrategyYAMLParser
+
+TEMPLATE = Path(finagent.__file__).parent / "business/strategy/templates/simple_test_strategy.yaml"
+
+
+def make_strategy(threshold):
+    """Stratégie du template avec une règle RSI."""
+    strategy = StrategyYAMLParser().parse_file(str(TEMPLATE))
+    return strategy.model_copy(update={'rules': {
+        'buy_conditions': {'conditions': [
+            {'indicator': 'rsi', 'parameters': {'period': 14}, 'operator': '<', 'value': threshold}
+        ]}
+    }})
+
+
+def make_market_data(random_walk, symbols):
+    """Barres journalières par symbole."""
+    return {
+        symbol: {'prices': {'1d': random_walk.bars(random_walk.close(60, seed))}}
+        for seed, symbol in enumerate(symbols)
+    }
+
+
+async def run_cycle(engine, random_walk, symbols, strategies=3):
+    await engine.start()
+    for i in range(strategies):
+        await engine.load_strategy(make_strategy(40 + 15 * i), f"s{i}")
+    try:
+        return await engine.execute_all_strategies(make_market_data(random_walk, symbols), symbols)
+    finally:
+        await engine.stop()
+
+
+class TestParallelExecution:
+    """Tests du fan-out symbole × stratégie."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_order(self, random_walk):
+        """Test ordre symbole puis stratégie malgré le parallélisme."""
+        symbols = ["AAPL", "MSFT", "NVDA", "AMZN"]
+        sequential = await run_cycle(StrategyEngine(), random_walk, symbols)
+        parallel = await run_cycle(StrategyEngine(max_parallelism=8), random_walk, symbols)
+
+        expected = [(symbol, f"s{i}") for symbol in symbols for i in range(3)]
+        assert [(r.symbol, r.strategy_id) for r in sequential] == expected
+        assert [(r.symbol, r.strategy_id) for r in parallel] == expected
+
+    @pytest.mark.asyncio
+    async def test_symbol_context_built_once(self, random_walk):
+        """Test contexte (indicateurs partagés) construit une fois par symbole."""
+        engine = StrategyEngine(max_parallelism=4)
+        await run_cycle(engine, random_walk, ["AAPL", "MSFT"])
+
+        stats = engine.indicator_graph.get_stats()
+        assert stats['cycles'] == 2
+        assert stats['computations_saved'] == 4
+
+    @pytest.mark.asyncio
+    async def test_timeout_skips_task(self, random_walk):
+        """Test timeout par tâche sans interrompre le cycle."""
+        engine = StrategyEngine(max_parallelism=4)
+        engine.execution_timeout = 0.05
+        evaluate = engine._evaluate_rule
+
+        async def slow_evaluate(strategy_id, compiled_rule, context):
+            if strategy_id == "s1":
+                await asyncio.sleep(1)
+            return await evaluate(strategy_id, compiled_rule, context)
+
+        engine._evaluate_rule = slow_evaluate
+        results = await run_cycle(engine, random_walk, ["AAPL", "MSFT"])
+
+        assert [(r.symbol, r.strategy_id) for r in results] == [
+            ("AAPL", "s0"), ("AAPL", "s2"), ("MSFT", "s0"), ("MSFT", "s2")
+        ]
+        assert engine.execution_stats['failed_executions'] == 2
+
+    @pytest.mark.asyncio
+    async def test_process_pool_backend(self, random_walk):
+        """Test évaluation des règles dans un pool de processus."""
+        symbols = ["AAPL", "MSFT"]
+        in_loop = await run_cycle(StrategyEngine(), random_walk, symbols)
+        pooled = await run_cycle(StrategyEngine(max_parallelism=4, process_workers=2), random_walk, symbols)
+
+        triggered = [r.metadata['evaluation_result']['buy_signal_triggered'] for r in in_loop]
+        assert any(triggered) and not all(triggered)
+        assert [r.metadata['evaluation_result']['buy_signal_triggered'] for r in pooled] == triggered
+        assert [(r.symbol, r.strategy_id) for r in pooled] == [(r.symbol, r.strategy_id) for r in in_loop]
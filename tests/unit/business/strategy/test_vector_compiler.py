@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour la compilation vectorielle des règles.
+
+Ce module vérifie que les règles compilées en expressions vectorielles
+produisent, en une passe, les signaux attendus sur toutes les barres
+d'un symbole ou d'un univers de symboles.
+"""
+
+import numpy as np
+import pytest
+
+from finagent.business.strategy.parser import CompilationError, RuleCompiler
+from finagent.data.indicators import kernels
+
+
+@pytest.fixture
+def close(random_walk):
+    """Clôtures d'une marche aléatoire."""
+    return random_walk.close(300, seed=3)
+
+
+@pytest.fixture
+def compiler():
+    return RuleCompiler()
+
+
+class TestVectorRuleCompiler:
+    """Tests de la cible de compilation vectorielle."""
+
+    def test_threshold_matches_kernel(self, compiler, close, random_walk):
+        """Test seuil RSI identique au noyau partagé."""
+        rule = compiler.compile_vectorized({
+            'buy_conditions': {'conditions': [{'indicator': 'rsi', 'operator': '<', 'value': 40}]},
+            'sell_conditions': {'conditions': [{'indicator': 'rsi', 'operator': '>', 'value': 60}]}
+        })
+
+        signals = rule.evaluate(random_walk.series("AAPL", close))
+        rsi = kernels.rsi(close, 14)
+
+        np.testing.assert_array_equal(signals.buy, np.nan_to_num(rsi, nan=np.inf) < 40)
+        np.testing.assert_array_equal(signals.sell, np.nan_to_num(rsi, nan=-np.inf) > 60)
+
+    def test_crossover_between_indicators(self, compiler, close, random_walk):
+        """Test croisement d'une moyenne courte au-dessus d'une longue."""
+        rule = compiler.compile_vectorized({
+            'buy_conditions': {'conditions': [{
+                'indicator': 'sma', 'parameters': {'period': 5}, 'operator': 'crossover_up',
+                'value': {'indicator': 'sma', 'parameters': {'period': 20}}
+            }]}
+        })
+
+        signals = rule.evaluate(random_walk.series("AAPL", close))
+        fast, slow = kernels.sma(close, 5), kernels.sma(close, 20)
+        expected = np.zeros(len(close), dtype=bool)
+        expected[1:] = (fast[1:] > slow[1:]) & (fast[:-1] <= slow[:-1])
+
+        np.testing.assert_array_equal(signals.buy, expected)
+        assert signals.buy.any()
+        assert not signals.sell.any()
+
+    def test_weighted_confidence_and_range(self, compiler, close, random_walk):
+        """Test confiance pondérée et opérateur between."""
+        rule = compiler.compile_vectorized({
+            'buy_conditions': {'operator': 'OR', 'conditions': [
+                {'indicator': 'rsi', 'operator': 'between', 'value': [40, 60], 'weight': 3.0},
+                {'indicator': 'close', 'operator': '>', 'value': 100, 'weight': 1.0}
+            ]}
+        })
+
+        signals = rule.evaluate(random_walk.series("AAPL", close))
+        rsi = kernels.rsi(close, 14)
+        in_range = (rsi >= 40) & (rsi <= 60)
+        expected = (3.0 * in_range + 1.0 * (close > 100)) / 4.0
+
+        np.testing.assert_allclose(signals.buy_confidence, expected)
+        np.testing.assert_array_equal(signals.buy, in_range | (close > 100))
+
+    def test_context_indicator_broadcast(self, compiler, close, random_walk):
+        """Test indicateur non série évalué une fois sur le contexte."""
+        rule = compiler.compile_vectorized({
+            'sell_conditions': {'conditions': [{'indicator': 'pe_ratio', 'operator': '>', 'value': 30}]}
+        })
+
+        signals = rule.evaluate(random_walk.series("AAPL", close), {'fundamentals': {'pe_ratio': 45}})
+
+        assert signals.sell.all()
+
+    def test_universe_evaluation(self, compiler, close, random_walk):
+        """Test évaluation symboles × barres, alignée ou non."""
+        rule = compiler.compile_vectorized({
+            'buy_conditions': {'conditions': [{'indicator': 'rsi', 'operator': '<', 'value': 45}]}
+        })
+        aapl = random_walk.series("AAPL", close)
+        single = rule.evaluate(aapl).buy
+
+        aligned = rule.evaluate_universe({'AAPL': aapl, 'MSFT': random_walk.series("MSFT", close[::-1].copy())})
+        assert aligned.buy.shape == (2, len(close))
+        np.testing.assert_array_equal(aligned.buy[0], single)
+
+        partial = rule.evaluate_universe({'AAPL': aapl, 'NVDA': aapl[100:]})
+        assert partial.symbols == ['AAPL', 'NVDA']
+        assert not partial.buy[1, :100].any()
+        np.testing.assert_array_equal(partial.buy[1, 100:], rule.evaluate(aapl[100:]).buy)
+
+    def test_mixed_timeframes_rejected(self, compiler):
+        """Test refus des règles multi-timeframes."""
+        with pytest.raises(CompilationError):
+            compiler.compile_vectorized({
+                'buy_conditions': {'conditions': [
+                    {'indicator': 'rsi', 'operator': '<', 'value': 30, 'timeframe': '1d'},
+                    {'indicator': 'rsi', 'operator': '<', 'value': 30, 'timeframe': '1h'}
+                ]}
+            })
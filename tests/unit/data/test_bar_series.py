@@ -0,0 +1,132 @@
+"""
+Tests unitaires pour la série de barres columnar.
+
+Ce module teste la construction de BarSeries depuis les différents
+formats de données historiques, la conversion DataFrame sans copie
+et la construction paresseuse des objets OHLCV.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.data.models import BarSeries, MarketDataCollection, OHLCV, TimeFrame, to_bar_series
+
+
+@pytest.fixture
+def sample_series():
+    """Série de 5 barres journalières."""
+    timestamps = pd.date_range("2024-01-01", periods=5, freq="D")
+    close = np.array([100.0, 101.5, 99.0, 102.25, 103.0])
+    return BarSeries(
+        symbol="aapl",
+        timeframe=TimeFrame.DAY_1,
+        timestamps=timestamps,
+        open=close - 0.5,
+        high=close + 1.0,
+        low=close - 1.0,
+        close=close,
+        volume=[1000, 1100, 900, 1200, 1300]
+    )
+
+
+class TestBarSeries:
+    """Tests pour BarSeries."""
+
+    def test_column_dtypes(self, sample_series):
+        """Test types des colonnes."""
+        assert sample_series.symbol == "AAPL"
+        assert sample_series.timestamps.dtype == np.dtype("datetime64[ns]")
+        assert sample_series.close.dtype == np.float64
+        assert sample_series.volume.dtype == np.int64
+        assert not sample_series.close.flags.writeable
+
+    def test_length_mismatch_rejected(self):
+        """Test rejet de colonnes de longueurs différentes."""
+        with pytest.raises(ValueError):
+            BarSeries("AAPL", TimeFrame.DAY_1, ["2024-01-01"], [1.0], [1.0], [1.0], [1.0, 2.0])
+
+    def test_to_dataframe_zero_copy(self, sample_series):
+        """Test conversion DataFrame sans copie."""
+        df = sample_series.to_dataframe()
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert isinstance(df.index, pd.DatetimeIndex)
+        assert np.shares_memory(df["close"].to_numpy(), sample_series.close)
+        assert np.shares_memory(df["volume"].to_numpy(), sample_series.volume)
+
+    def test_lazy_ohlcv(self, sample_series):
+        """Test construction d'objets OHLCV à la demande."""
+        bar = sample_series[-1]
+
+        assert isinstance(bar, OHLCV)
+        assert bar.close == Decimal("103.0")
+        assert bar.timestamp == datetime(2024, 1, 5)
+        assert bar.symbol.symbol == "AAPL"
+
+    def test_slice_and_time_range(self, sample_series):
+        """Test sous-séries par tranche et par plage de dates."""
+        window = sample_series.between(datetime(2024, 1, 2), datetime(2024, 1, 4))
+
+        assert len(window) == 3
+        assert window.close[0] == 101.5
+        assert np.shares_memory(window.close, sample_series.close)
+        assert len(sample_series[1:3]) == 2
+
+    def test_returns(self, sample_series):
+        """Test rendements simples et logarithmiques."""
+        returns = sample_series.returns()
+
+        assert len(returns) == 4
+        assert returns[0] == pytest.approx(0.015)
+        assert sample_series.returns(log=True)[0] == pytest.approx(np.log(1.015))
+
+
+class TestToBarSeries:
+    """Tests pour la conversion des formats historiques."""
+
+    def test_from_yfinance_frame(self):
+        """Test DataFrame au format yfinance (colonnes capitalisées, index tz)."""
+        index = pd.date_range("2024-01-01", periods=3, freq="D", tz="America/New_York")
+        df = pd.DataFrame({
+            "Open": [1.0, 2.0, 3.0], "High": [1.5, 2.5, 3.5], "Low": [0.5, 1.5, 2.5],
+            "Close": [1.2, 2.2, 3.2], "Volume": [10, 20, 30], "Adj Close": [1.1, 2.1, 3.1]
+        }, index=index)
+
+        series = to_bar_series(df, "MSFT")
+
+        assert len(series) == 3
+        assert series.adjusted_close[2] == 3.1
+        # Heure locale de cotation conservée (date de séance inchangée)
+        assert series.timestamps[0] == np.datetime64("2024-01-01T00:00:00", "ns")
+        # Bornes avec fuseau interprétées dans la même convention
+        assert len(series.between(start=index[1].to_pydatetime())) == 2
+
+    def test_from_records(self):
+        """Test liste de dictionnaires (format provider historique)."""
+        records = [
+            {"date": "2024-01-01", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10},
+            {"date": "2024-01-02", "open": 1.5, "high": 2.5, "low": 1, "close": 2, "volume": 20},
+        ]
+
+        series = to_bar_series(records, "AAPL")
+
+        assert series.close.tolist() == [1.5, 2.0]
+        assert series.end_date == datetime(2024, 1, 2)
+
+    def test_from_collection_roundtrip(self, sample_series):
+        """Test aller-retour via MarketDataCollection."""
+        collection = sample_series.to_collection()
+
+        assert isinstance(collection, MarketDataCollection)
+        series = to_bar_series(collection)
+        assert np.array_equal(series.close, sample_series.close)
+        assert np.array_equal(series.timestamps, sample_series.timestamps)
+
+    def test_unsupported_type(self):
+        """Test rejet d'un format inconnu."""
+        with pytest.raises(TypeError):
+            to_bar_series(42)
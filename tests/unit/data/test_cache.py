@@ -0,0 +1,378 @@
+"""
+Tests unitaires pour le système de cache de FinAgent.
+
+Ce module teste le cache multi-niveaux, la génération de clés
+et le regroupement des requêtes concurrentes.
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from finagent.data.cache import (
+    CacheCodec, CacheKeys, CacheTags, MemoryCacheBackend,
+    MultiLevelCacheManager, RequestCoalescer, SQLiteCacheBackend
+)
+from finagent.data.models.base import Symbol, TimeFrame
+from finagent.data.models.market_data import OHLCV
+from finagent.data.services.market_data_service import MarketDataService
+
+
+class TestCacheKeys:
+    """Tests pour la génération de clés de cache."""
+
+    def test_historical_data_key(self):
+        """Test clé historique avec et sans limite."""
+        assert CacheKeys.historical_data("AAPL", "-30d", "now", "1d") == "historical:AAPL:-30d:now:1d"
+        assert CacheKeys.historical_data("AAPL", "-30d", "now", "1d", 100) == "historical:AAPL:-30d:now:1d:100"
+        assert CacheKeys.historical_series("AAPL", "-30d", "now", "1d") == "historical_series:AAPL:-30d:now:1d"
+
+
+class TestRequestCoalescer:
+    """Tests pour le regroupement des requêtes (single-flight)."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_single_call(self):
+        """Test 50 requêtes concurrentes -> un seul appel."""
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"price": 150.0}
+
+        results = await asyncio.gather(*[coalescer.run("quote:AAPL", fetch) for _ in range(50)])
+
+        assert calls == 1
+        assert all(r == {"price": 150.0} for r in results)
+        assert coalescer.coalesced_count == 49
+        assert coalescer.inflight_count == 0
+
+    @pytest.mark.asyncio
+    async def test_error_propagated_to_all_waiters(self):
+        """Test propagation de l'erreur à tous les appelants."""
+        coalescer = RequestCoalescer()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("provider down")
+
+        results = await asyncio.gather(
+            *[coalescer.run("quote:AAPL", fetch) for _ in range(5)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert coalescer.inflight_count == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_not_coalesced(self):
+        """Test que les requêtes successives relancent l'appel."""
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await coalescer.run("k", fetch) == 1
+        assert await coalescer.run("k", fetch) == 2
+
+
+class TestMultiLevelCacheManager:
+    """Tests pour le gestionnaire de cache multi-niveaux."""
+
+    @pytest.mark.asyncio
+    async def test_set_get_and_tag_invalidation(self):
+        """Test stockage, lecture et invalidation par tag."""
+        manager = MultiLevelCacheManager(l1_backend=MemoryCacheBackend(max_size=10))
+
+        await manager.set("quote:AAPL", 1, ttl=60, tags=[CacheTags.symbol("AAPL")])
+        await manager.set("quote:MSFT", 2, ttl=60, tags=[CacheTags.symbol("MSFT")])
+
+        assert await manager.get("quote:AAPL") == 1
+        assert await manager.invalidate_by_tag(CacheTags.symbol("AAPL")) == 1
+        assert await manager.get("quote:AAPL") is None
+        assert await manager.get("quote:MSFT") == 2
+        assert manager.hits_l1 == 2
+        assert manager.misses == 1
+
+
+class TestMemoryCacheBackend:
+    """Tests pour le backend mémoire (LRU, index de tags, expiration)."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_order(self):
+        """Test éviction de l'élément le moins récemment utilisé."""
+        backend = MemoryCacheBackend(max_size=3)
+        for key in ("a", "b", "c"):
+            await backend.set(key, key)
+
+        # "a" devient le plus récent, "b" est le LRU
+        assert await backend.get("a") == "a"
+        await backend.set("d", "d")
+
+        assert await backend.exists("b") is False
+        assert await backend.exists("a") is True
+        assert backend.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_tag_index_maintained(self):
+        """Test cohérence de l'index de tags après réécriture et suppression."""
+        backend = MemoryCacheBackend(max_size=10)
+        await backend.set("k1", 1, tags=["t1", "t2"])
+        await backend.set("k2", 2, tags=["t1"])
+        await backend.set("k1", 10, tags=["t2"])
+
+        assert await backend.invalidate_by_tag("t1") == 1
+        assert await backend.get("k1") == 10
+        assert await backend.invalidate_by_tag("t2") == 1
+        stats = await backend.get_stats()
+        assert stats['total_items'] == 0
+        assert stats['tags'] == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_items_purged_before_eviction(self):
+        """Test purge des éléments expirés avant d'évincer un élément valide."""
+        backend = MemoryCacheBackend(max_size=2)
+        await backend.set("short", 1, ttl=0)
+        await backend.set("long", 2, ttl=60)
+        await asyncio.sleep(0.01)
+
+        await backend.set("new", 3, ttl=60)
+
+        assert await backend.get("long") == 2
+        assert await backend.get("new") == 3
+        assert backend.evictions == 0
+        assert backend.expirations == 1
+
+
+class TestCacheCodec:
+    """Tests pour l'encodage binaire du cache persistant."""
+
+    def test_json_roundtrip_with_decimal_and_datetime(self):
+        """Test aller-retour JSON des types financiers."""
+        codec = CacheCodec()
+        value = {"price": Decimal("150.25"), "at": datetime(2024, 1, 2, 15, 30), "tags": ["a", 1]}
+
+        blob = codec.encode(value)
+
+        assert blob[:1] == b"J"
+        assert codec.decode(blob) == value
+
+    def test_tuples_and_non_text_keys_roundtrip(self):
+        """Test que les tuples et clés non textuelles ne sont pas altérés."""
+        codec = CacheCodec()
+        value = {1: ("a", "b"), ("x", 2): [()]}
+
+        blob = codec.encode(value)
+
+        assert blob[:1] == b"J"
+        assert codec.decode(blob) == value
+
+    def test_unsupported_values_rejected(self):
+        """Test types non reconnus refusés, modèles non autorisés non décodés."""
+        codec = CacheCodec()
+
+        with pytest.raises(TypeError):
+            codec.encode({1, 2})
+        with pytest.raises(ValueError):
+            codec.decode(b"M\x00os:system\n{}")
+        with pytest.raises(ValueError):
+            codec.decode(b"P\x00payload")
+
+    def test_numpy_roundtrip(self):
+        """Test aller-retour d'un tableau NumPy."""
+        codec = CacheCodec()
+        array = np.arange(5000, dtype=np.float64).reshape(1000, 5)
+
+        blob = codec.encode(array)
+
+        assert blob[:1] == b"N"
+        assert np.array_equal(codec.decode(blob), array)
+
+    def test_pydantic_model_roundtrip(self):
+        """Test aller-retour d'un modèle de données."""
+        codec = CacheCodec()
+        bar = OHLCV(
+            symbol=Symbol(symbol="AAPL"), timestamp=datetime(2024, 1, 2),
+            timeframe=TimeFrame.DAY_1, open=Decimal("100"), high=Decimal("105"),
+            low=Decimal("99"), close=Decimal("104"), volume=1000
+        )
+
+        blob = codec.encode(bar)
+
+        assert blob[:1] == b"M"
+        assert codec.decode(blob) == bar
+
+
+class TestSQLiteCacheBackend:
+    """Tests pour le backend persistant SQLite."""
+
+    @pytest.mark.asyncio
+    async def test_unsupported_value_not_persisted(self, tmp_path):
+        """Test valeur non encodable: écriture L2 ignorée, L1 conservé."""
+        l2 = SQLiteCacheBackend(directory=str(tmp_path))
+        manager = MultiLevelCacheManager(l1_backend=MemoryCacheBackend(max_size=10), l2_backend=l2)
+
+        assert not await l2.set("key", {1, 2})
+        assert not await manager.set("key", {1, 2})
+        assert await manager.get("key") == {1, 2}
+        assert not await l2.exists("key")
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """Test démarrage à chaud depuis le disque."""
+        backend = SQLiteCacheBackend(directory=str(tmp_path))
+        await backend.set("quote:AAPL", {"price": Decimal("150")}, ttl=60)
+        backend.close()
+
+        reopened = SQLiteCacheBackend(directory=str(tmp_path))
+        assert await reopened.get("quote:AAPL") == {"price": Decimal("150")}
+        assert (await reopened.get_stats())['total_items'] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_tags(self, tmp_path):
+        """Test expiration et invalidation par tag."""
+        backend = SQLiteCacheBackend(directory=str(tmp_path))
+        await backend.set("expired", 1, ttl=-1)
+        await backend.set("k1", 1, ttl=60, tags=["symbol:AAPL"])
+        await backend.set("k2", 2, ttl=60, tags=["symbol:AAPL", "historical"])
+
+        assert await backend.get("expired") is None
+        assert await backend.invalidate_by_tag("symbol:AAPL") == 2
+        assert await backend.exists("k2") is False
+
+    @pytest.mark.asyncio
+    async def test_size_bounded_eviction(self, tmp_path):
+        """Test éviction LRU lorsque la taille maximale est dépassée."""
+        backend = SQLiteCacheBackend(directory=str(tmp_path), max_size_mb=1)
+        payload = np.random.default_rng(0).random(20_000)  # ~160 Ko non compressible
+
+        for i in range(10):
+            await backend.set(f"k{i}", payload, ttl=60)
+
+        stats = await backend.get_stats()
+        assert stats['size_bytes'] <= backend.max_size_bytes
+        assert backend.evictions > 0
+        assert await backend.exists("k9") is True
+        assert await backend.exists("k0") is False
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_write(self, tmp_path):
+        """Test lectures sans écriture, accès LRU reportés à l'écriture suivante."""
+        backend = SQLiteCacheBackend(directory=str(tmp_path))
+        await backend.set("k0", 0, ttl=60)
+        await backend.set("k1", 1, ttl=60)
+        changes = backend._conn.total_changes
+
+        assert await backend.get("k0") == 0
+        assert await backend.get("expired") is None
+        assert backend._conn.total_changes == changes
+
+        await backend.set("k2", 2, ttl=60)
+        accessed = dict(backend._conn.execute("SELECT key, last_accessed FROM cache_entries"))
+        assert accessed["k0"] > accessed["k1"]
+
+    @pytest.mark.asyncio
+    async def test_purge_expired_in_one_pass(self, tmp_path):
+        """Test purge des expirés, tags et taille totale mis à jour."""
+        backend = SQLiteCacheBackend(directory=str(tmp_path))
+        await backend.set("live", 1, ttl=60, tags=["symbol:AAPL"])
+        live_size = backend._total_bytes
+        for i in range(3):
+            await backend.set(f"expired{i}", i, ttl=-1, tags=["symbol:AAPL"])
+
+        assert await backend.purge_expired() == 3
+        assert backend._total_bytes == live_size
+        assert (await backend.get_stats())['total_items'] == 1
+        assert backend._conn.execute("SELECT COUNT(*) FROM cache_tags").fetchone()[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_promotion_keeps_ttl_and_tags(self, tmp_path):
+        """Test remontée en L1 avec TTL restant et tags."""
+        l2 = SQLiteCacheBackend(directory=str(tmp_path))
+        await l2.set("quote:AAPL", 1, ttl=15, tags=[CacheTags.symbol("AAPL")])
+        manager = MultiLevelCacheManager(l1_backend=MemoryCacheBackend(max_size=10), l2_backend=l2)
+
+        assert await manager.get("quote:AAPL") == 1
+        assert manager.hits_l2 == 1
+        assert manager.l1_backend.cache["quote:AAPL"].ttl <= 15
+        assert await manager.l1_backend.invalidate_by_tag(CacheTags.symbol("AAPL")) == 1
+
+
+class CountingProvider:
+    """Provider lent comptant ses appels."""
+
+    def __init__(self):
+        self.calls = {'get_quote': 0, 'get_historical_data': 0}
+
+    async def get_quote(self, symbol):
+        self.calls['get_quote'] += 1
+        await asyncio.sleep(0.01)
+        return {"symbol": symbol, "price": 150.0}
+
+    async def get_historical_data(self, symbol, timeframe, start_date, end_date, limit):
+        self.calls['get_historical_data'] += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(symbol=symbol, data=[1.0, 2.0, 3.0])
+
+
+class BatchProvider(CountingProvider):
+    """Provider avec téléchargement groupé d'historiques."""
+
+    def __init__(self, series):
+        super().__init__()
+        self.series = series
+        self.calls['get_historical_batch'] = 0
+
+    async def get_historical_batch(self, symbols, interval="1d", output="series", start=None, end=None):
+        self.calls['get_historical_batch'] += 1
+        return {symbol: self.series for symbol in symbols}
+
+
+class TestMarketDataServiceCoalescing:
+    """Tests du regroupement des requêtes au niveau du service."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_single_provider_call(self):
+        """Test appels concurrents regroupés, appels suivants servis par le cache."""
+        provider = CountingProvider()
+        manager = MultiLevelCacheManager(l1_backend=MemoryCacheBackend(max_size=10))
+        service = MarketDataService(provider, cache_manager=manager)
+
+        quotes = await asyncio.gather(*[service.get_quote("AAPL") for _ in range(20)])
+        histories = await asyncio.gather(*[service.get_historical_data("AAPL", days_back=30) for _ in range(20)])
+
+        assert provider.calls == {'get_quote': 1, 'get_historical_data': 1}
+        assert all(q == quotes[0] for q in quotes)
+        assert all(h is histories[0] for h in histories)
+        assert service.get_statistics()['coalesced_requests'] == 38
+
+        await service.get_quote("AAPL")
+        await service.get_historical_data("AAPL", days_back=30)
+        assert provider.calls == {'get_quote': 1, 'get_historical_data': 1}
+        assert service.cache_hits == 2
+        assert manager.hits_l1 == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_fills_single_symbol_cache(self, random_walk):
+        """Test historique groupé relu par l'appel symbole par symbole (même clé, même limite)."""
+        provider = BatchProvider(random_walk.series("AAPL", random_walk.close(150)))
+        service = MarketDataService(provider, cache_manager=MultiLevelCacheManager(
+            l1_backend=MemoryCacheBackend(max_size=10)
+        ))
+
+        batch = await service.get_multiple_historical_data(["AAPL"], days_back=200)
+        single = await service.get_historical_data("AAPL", days_back=200)
+
+        assert single is batch["AAPL"]
+        assert len(single.data) == service.default_limit
+        assert provider.calls == {'get_quote': 0, 'get_historical_data': 0, 'get_historical_batch': 1}
@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour le service d'historique incrémental.
+
+Ce module teste le chargement initial, les rafraîchissements delta,
+la détection des corrections d'historique et l'encodage des séries
+dans le cache persistant.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from finagent.data.cache import CacheCodec, MultiLevelCacheManager
+from finagent.data.models import BarSeries, TimeFrame
+from finagent.data.services.history_service import IncrementalHistoryService
+
+
+def make_series(start: datetime, closes, symbol: str = "AAPL") -> BarSeries:
+    """Série journalière à partir de prix de clôture."""
+    closes = np.asarray(closes, dtype=float)
+    timestamps = [start + timedelta(days=i) for i in range(len(closes))]
+    return BarSeries(symbol, TimeFrame.DAY_1, timestamps, closes, closes + 1, closes - 1, closes,
+                     volume=np.full(len(closes), 100))
+
+
+class FakeProvider:
+    """Provider en mémoire enregistrant les appels."""
+
+    def __init__(self, series: BarSeries):
+        self.series = series
+        self.calls = []
+
+    async def get_historical_data(self, symbol, period="1y", interval="1d", output="series", start=None):
+        self.calls.append({"period": period, "start": start})
+        if start is None:
+            return self.series
+        return self.series.between(start)
+
+
+@pytest.fixture
+def history_start():
+    """Début d'un historique d'un an se terminant aujourd'hui."""
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=364)
+
+
+class TestIncrementalHistoryService:
+    """Tests du rafraîchissement incrémental."""
+
+    @pytest.mark.asyncio
+    async def test_delta_fetch_after_initial_load(self, history_start):
+        """Test chargement complet puis delta sur les barres récentes."""
+        provider = FakeProvider(make_series(history_start, np.arange(100.0, 465.0)))
+        service = IncrementalHistoryService(provider, MultiLevelCacheManager())
+
+        first = await service.get_series("AAPL", period="1y")
+        assert len(first) == 365
+
+        # Une nouvelle barre arrive
+        provider.series = make_series(history_start, np.arange(100.0, 466.0))
+        second = await service.get_series("AAPL", period="1y", force_refresh=True)
+
+        assert provider.calls[1]["start"] is not None
+        assert service.full_fetches == 1
+        assert service.delta_fetches == 1
+        assert service.bars_fetched == 365 + 3
+        assert second.close[-1] == 465.0
+        assert np.all(np.diff(second.timestamps.astype(np.int64)) > 0)
+
+    @pytest.mark.asyncio
+    async def test_refresh_interval_skips_provider(self, history_start):
+        """Test absence d'appel provider dans l'intervalle de rafraîchissement."""
+        provider = FakeProvider(make_series(history_start, np.arange(100.0, 465.0)))
+        service = IncrementalHistoryService(provider)
+
+        await service.get_series("AAPL")
+        await service.get_series("AAPL")
+
+        assert len(provider.calls) == 1
+        assert service.skipped_refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_restatement_triggers_full_reload(self, history_start):
+        """Test rechargement complet après un split (prix ajustés modifiés)."""
+        provider = FakeProvider(make_series(history_start, np.arange(100.0, 465.0)))
+        service = IncrementalHistoryService(provider)
+        await service.get_series("AAPL")
+
+        # Split 2:1: tout l'historique ajusté est divisé par deux
+        provider.series = make_series(history_start, np.arange(100.0, 466.0) / 2)
+        series = await service.get_series("AAPL", force_refresh=True)
+
+        assert service.restatements == 1
+        assert service.full_fetches == 2
+        assert series.close[0] == 50.0
+        assert len(series) == 366
+
+    @pytest.mark.asyncio
+    async def test_shorter_period_is_a_window(self, history_start):
+        """Test période plus courte servie depuis la série en cache."""
+        provider = FakeProvider(make_series(history_start, np.arange(100.0, 465.0)))
+        service = IncrementalHistoryService(provider)
+        await service.get_series("AAPL", period="1y")
+
+        window = await service.get_series("AAPL", period="1mo")
+
+        assert len(provider.calls) == 1
+        assert 28 <= len(window) <= 32
+        assert window.close[-1] == 464.0
+
+
+class TestBarSeriesCodec:
+    """Tests de l'encodage des séries pour le cache persistant."""
+
+    def test_roundtrip(self, history_start):
+        """Test aller-retour binaire d'une série."""
+        codec = CacheCodec()
+        series = make_series(history_start, np.arange(100.0, 200.0))
+
+        blob = codec.encode(series)
+        decoded = codec.decode(blob)
+
+        assert blob[:1] == b"B"
+        assert decoded.symbol == "AAPL"
+        assert decoded.timeframe == TimeFrame.DAY_1
+        assert np.array_equal(decoded.timestamps, series.timestamps)
+        assert np.array_equal(decoded.close, series.close)
+        assert np.array_equal(decoded.volume, series.volume)
@@ -0,0 +1,147 @@
+"""
+Tests unitaires pour les noyaux d'indicateurs techniques.
+
+Ce module vérifie les noyaux vectorisés contre des implémentations de
+référence (pandas ou boucles explicites) et leurs conventions de
+période de chauffe.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.data.indicators import kernels
+
+
+@pytest.fixture
+def prices(random_walk):
+    """Marche aléatoire de 300 clôtures."""
+    return random_walk.close(300, seed=42)
+
+
+def wilder_reference(values, period):
+    """Lissage de Wilder par boucle explicite (amorce SMA)."""
+    out = [np.mean(values[:period])]
+    for value in values[period:]:
+        out.append(out[-1] + (value - out[-1]) / period)
+    return np.array(out)
+
+
+class TestMovingAverages:
+    """Tests des moyennes mobiles."""
+
+    def test_sma_matches_pandas(self, prices):
+        """Test SMA identique au rolling pandas."""
+        result = kernels.sma(prices, 20)
+
+        assert np.isnan(result[:19]).all()
+        assert np.allclose(result[19:], pd.Series(prices).rolling(20).mean()[19:])
+
+    def test_ema_seeded_with_sma(self, prices):
+        """Test EMA amorcée par la SMA puis récursive."""
+        result = kernels.ema(prices, 10)
+
+        expected = [prices[:10].mean()]
+        for value in prices[10:]:
+            expected.append(expected[-1] + 2 / 11 * (value - expected[-1]))
+
+        assert np.isnan(result[:9]).all()
+        assert np.allclose(result[9:], expected)
+
+    def test_wma_weights(self):
+        """Test pondération linéaire de la WMA."""
+        result = kernels.wma([1.0, 2.0, 3.0, 4.0], 3)
+
+        assert np.isnan(result[:2]).all()
+        assert result[2] == pytest.approx((1 * 1 + 2 * 2 + 3 * 3) / 6)
+        assert result[3] == pytest.approx((2 * 1 + 3 * 2 + 4 * 3) / 6)
+
+    def test_short_series(self):
+        """Test série plus courte que la période."""
+        assert np.isnan(kernels.sma([1.0, 2.0], 5)).all()
+        assert np.isnan(kernels.ema([1.0, 2.0], 5)).all()
+        assert kernels.last_value(kernels.sma([1.0, 2.0], 5), default=0.0) == 0.0
+
+
+class TestOscillators:
+    """Tests des oscillateurs."""
+
+    def test_rsi_wilder(self, prices):
+        """Test RSI avec lissage de Wilder."""
+        delta = np.diff(prices)
+        avg_gain = wilder_reference(np.clip(delta, 0, None), 14)
+        avg_loss = wilder_reference(np.clip(-delta, 0, None), 14)
+        expected = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        result = kernels.rsi(prices, 14)
+
+        assert np.isnan(result[:14]).all()
+        assert np.allclose(result[14:], expected)
+
+    def test_rsi_monotonic_series(self):
+        """Test RSI à 100 sans baisse et neutre sans variation."""
+        assert kernels.rsi(np.arange(30.0), 14)[-1] == 100.0
+        assert kernels.rsi(np.full(30, 5.0), 14)[-1] == 50.0
+
+    def test_macd_components(self, prices):
+        """Test cohérence ligne MACD, signal et histogramme."""
+        macd_line, signal_line, histogram = kernels.macd(prices, 12, 26, 9)
+
+        assert np.allclose(macd_line, kernels.ema(prices, 12) - kernels.ema(prices, 26), equal_nan=True)
+        assert np.isnan(signal_line[:33]).all()
+        assert not np.isnan(signal_line[33])
+        assert np.allclose(histogram[33:], macd_line[33:] - signal_line[33:])
+
+    def test_macd_invalid_periods(self, prices):
+        """Test rejet d'une période rapide >= période lente."""
+        with pytest.raises(ValueError):
+            kernels.macd(prices, 26, 12)
+
+    def test_stochastic_and_williams(self, prices):
+        """Test %K, %D et Williams %R sur les mêmes extrêmes."""
+        high, low = prices + 1, prices - 1
+        k, d = kernels.stochastic(high, low, prices, 14, 3)
+        williams = kernels.williams_r(high, low, prices, 14)
+
+        window_high = pd.Series(high).rolling(14).max().to_numpy()
+        window_low = pd.Series(low).rolling(14).min().to_numpy()
+        expected_k = 100 * (prices - window_low) / (window_high - window_low)
+
+        assert np.allclose(k[13:], expected_k[13:])
+        assert np.allclose(d[15:], pd.Series(k).rolling(3).mean()[15:])
+        assert np.allclose(williams[13:], k[13:] - 100)
+
+    def test_cci_matches_pandas(self, prices):
+        """Test CCI contre la déviation moyenne pandas."""
+        typical = pd.Series(prices)
+        sma = typical.rolling(20).mean()
+        mad = typical.rolling(20).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+        expected = (typical - sma) / (0.015 * mad)
+
+        result = kernels.cci(prices, prices, prices, 20)
+
+        assert np.allclose(result[19:], expected[19:])
+
+
+class TestVolatility:
+    """Tests des indicateurs de volatilité."""
+
+    def test_bollinger_population_std(self, prices):
+        """Test bandes de Bollinger à écart-type de population."""
+        upper, middle, lower, std = kernels.bollinger_bands(prices, 20, 2.0)
+        expected_std = pd.Series(prices).rolling(20).std(ddof=0)
+
+        assert np.allclose(std[19:], expected_std[19:])
+        assert np.allclose(upper - middle, 2 * std, equal_nan=True)
+        assert np.allclose(middle - lower, 2 * std, equal_nan=True)
+
+    def test_atr_wilder(self, prices):
+        """Test ATR avec True Range et lissage de Wilder."""
+        high, low = prices + 1.5, prices - 1.0
+        true_range = kernels.true_range(high, low, prices)
+
+        result = kernels.atr(high, low, prices, 14)
+
+        assert true_range[0] == pytest.approx(2.5)
+        assert np.isnan(result[:14]).all()
+        assert np.allclose(result[14:], wilder_reference(true_range[1:], 14))
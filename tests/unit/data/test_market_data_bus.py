@@ -0,0 +1,296 @@
+"""
+Tests unitaires pour le bus de données de marché.
+
+Ce module teste les filtres d'abonnement, le regroupement des mises à
+jour, la contre-pression, la fenêtre de barres et les instantanés, ainsi
+que le déclenchement des stratégies sur barre par le gestionnaire.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import finagent
+from finagent.business.strategy.manager import ScheduleConfig, StrategyManager, TriggerType
+from finagent.data.models import BarSeries, TimeFrame
+from finagent.business.strategy.manager import strategy_manager
+from finagent.data.cache import MultiLevelCacheManager
+from finagent.data.services.market_data_bus import (
+    MarketDataBus, MarketDataPublisher, MarketEventType, _bar_records
+)
+
+TEMPLATE = Path(finagent.__file__).parent / "business/strategy/templates/simple_test_strategy.yaml"
+
+
+def make_bar(day, close):
+    """Barre journalière."""
+    return {
+        'timestamp': datetime(2024, 1, 1) + timedelta(days=day),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000
+    }
+
+
+class FakeProvider:
+    """Provider avec cotation groupée."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_quotes(self, symbols):
+        self.calls += 1
+        return {
+            symbol: ValueError("symbole inconnu") if symbol == "XXX" else {'price': 100.0 + i, 'volume': 10}
+            for i, symbol in enumerate(symbols)
+        }
+
+
+class HistoryProvider(FakeProvider):
+    """Provider complet (cotations, historique) pour le gestionnaire de stratégies."""
+
+    def __init__(self, series):
+        super().__init__()
+        self.series = series
+        self.history_calls = 0
+
+    async def initialize(self):
+        pass
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def get_market_conditions(self):
+        return {}
+
+    async def get_historical_data(self, symbol, period="1y", interval="1d", output="series", start=None):
+        self.history_calls += 1
+        return self.series if start is None else self.series.between(start)
+
+
+def make_series(n, start="2024-01-01"):
+    """Série journalière de clôtures croissantes."""
+    close = 100.0 + np.arange(n)
+    return BarSeries(
+        symbol="AAPL", timeframe=TimeFrame.DAY_1,
+        timestamps=pd.date_range(start, periods=n, freq="D"),
+        open=close, high=close + 1, low=close - 1, close=close, volume=np.full(n, 10)
+    )
+
+
+class TestMarketDataBus:
+    """Tests de publication et d'abonnement."""
+
+    @pytest.mark.asyncio
+    async def test_filters(self):
+        """Test filtres par symbole, timeframe et type d'événement."""
+        bus = MarketDataBus()
+        received = []
+        bus.subscribe(lambda e: received.append((e.type, e.symbol, e.timeframe)),
+                      symbols=["AAPL"], timeframes=["1m"])
+        quotes = []
+        bus.subscribe(lambda e: quotes.append(e.symbol), event_types=[MarketEventType.QUOTE])
+
+        await bus.publish_bars("AAPL", "1m", make_bar(0, 100))
+        await bus.publish_bars("AAPL", "1d", make_bar(0, 100))
+        await bus.publish_bars("MSFT", "1m", make_bar(0, 100))
+        await bus.publish_quote("AAPL", {'price': 101.0})
+        await bus.publish_quote("MSFT", {'price': 201.0})
+        await bus.join()
+
+        assert received == [(MarketEventType.BAR, "AAPL", "1m"), (MarketEventType.QUOTE, "AAPL", None)]
+        assert quotes == ["AAPL", "MSFT"]
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_coalesces(self):
+        """Test abonné lent: seules les dernières cotations sont livrées."""
+        bus = MarketDataBus()
+        prices = []
+
+        async def slow(event):
+            await asyncio.sleep(0.02)
+            prices.append(event.data['price'])
+
+        subscription = bus.subscribe(slow)
+        for price in range(10):
+            await bus.publish_quote("AAPL", {'price': float(price)})
+        await bus.join()
+        stats = subscription.get_stats()
+
+        assert prices[-1] == 9.0
+        assert len(prices) < 10
+        assert stats['coalesced'] == 10 - stats['delivered']
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        """Test file pleine: l'éditeur attend la consommation."""
+        bus = MarketDataBus()
+        delivered = []
+
+        async def slow(event):
+            await asyncio.sleep(0.01)
+            delivered.append(event.symbol)
+
+        subscription = bus.subscribe(slow, max_pending=1)
+        symbols = [f"S{i}" for i in range(5)]
+        for symbol in symbols:
+            await bus.publish_quote(symbol, {'price': 1.0})
+            assert subscription.pending <= 1
+        await bus.join()
+
+        # Clés distinctes: aucune perte malgré la file d'une seule place
+        assert delivered == symbols
+        assert subscription.get_stats()['blocked'] > 0
+
+    @pytest.mark.asyncio
+    async def test_bar_window_and_snapshot(self):
+        """Test ajout, révision, doublons et isolation des instantanés."""
+        bus = MarketDataBus(bar_history=3)
+        events = []
+        bus.subscribe(events.append)
+
+        applied = [await bus.publish_bars("AAPL", "1d", [make_bar(i, 100 + i) for i in range(4)])]
+        snapshot = bus.snapshot(["AAPL"])
+        applied.append(await bus.publish_bars("AAPL", "1d", [make_bar(2, 102), make_bar(3, 103)]))
+        applied.append(await bus.publish_bars("AAPL", "1d", make_bar(3, 104)))
+        applied.append(await bus.publish_bars("AAPL", "1d", make_bar(4, 105)))
+        await bus.join()
+
+        assert applied == [4, 0, 1, 1]
+        assert [bar['close'] for bar in bus.get_bars("AAPL", "1d")] == [102.0, 104.0, 105.0]
+        assert [bar['close'] for bar in snapshot.bars["AAPL"]["1d"]] == [101.0, 102.0, 103.0]
+        # Publications sans point d'attente: regroupées sur la dernière barre
+        assert [(event.data['close'], event.new_bars) for event in events] == [(105.0, 1)]
+        assert snapshot.market_data("AAPL")['price'] == 103.0
+
+    @pytest.mark.asyncio
+    async def test_bar_series_input(self):
+        """Test publication d'une BarSeries."""
+        close = np.array([10.0, 11.0, 12.0])
+        series = BarSeries(
+            symbol="AAPL", timeframe=TimeFrame.DAY_1,
+            timestamps=pd.date_range("2024-01-01", periods=3, freq="D"),
+            open=close, high=close + 1, low=close - 1, close=close, volume=[1, 2, 3]
+        )
+
+        bus = MarketDataBus()
+        await bus.publish_bars("AAPL", "1d", series)
+        await bus.publish_quote("AAPL", {'price': 12.5, 'volume': 7})
+        data = bus.snapshot().market_data("AAPL")
+
+        assert [bar['date'] for bar in data['prices']['1d']] == [
+            "2024-01-01T00:00:00", "2024-01-02T00:00:00", "2024-01-03T00:00:00"
+        ]
+        assert data['price'] == 12.5
+        assert data['volume'] == 7
+
+    @pytest.mark.asyncio
+    async def test_bar_series_converted_incrementally(self):
+        """Test série republiée: seules les barres à partir de la dernière connue sont converties."""
+        bus = MarketDataBus()
+        applied = [await bus.publish_bars("AAPL", "1d", make_series(3))]
+        applied.append(await bus.publish_bars("AAPL", "1d", make_series(5)))
+
+        assert applied == [3, 2]
+        assert [bar['close'] for bar in bus.get_bars("AAPL", "1d")] == [100.0, 101.0, 102.0, 103.0, 104.0]
+        assert len(_bar_records(make_series(5), since=datetime(2024, 1, 3))) == 3
+
+    @pytest.mark.asyncio
+    async def test_intraday_bars_keep_time(self):
+        """Test date ISO conservant l'heure des barres intrajournalières."""
+        bus = MarketDataBus()
+        await bus.publish_bars("AAPL", "1m", make_series(2, start="2024-01-02 09:30"))
+
+        assert [bar['date'] for bar in bus.get_bars("AAPL", "1m")] == ["2024-01-02T09:30:00", "2024-01-03T09:30:00"]
+
+    @pytest.mark.asyncio
+    async def test_publisher_refresh(self):
+        """Test cotations groupées publiées et erreurs ignorées."""
+        bus = MarketDataBus()
+        provider = FakeProvider()
+        snapshot = await MarketDataPublisher(bus, provider).refresh(["AAPL", "XXX", "MSFT"])
+
+        assert provider.calls == 1
+        assert set(snapshot.quotes) == {"AAPL", "MSFT"}
+        assert snapshot.quote("MSFT")['price'] == 102.0
+
+
+class TestStrategyManagerFeed:
+    """Tests du gestionnaire de stratégies alimenté par le bus."""
+
+    @pytest.mark.asyncio
+    async def test_bar_event_runs_strategy_on_snapshot(self, tmp_path):
+        """Test barre publiée: exécution sur l'instantané du symbole."""
+        bus = MarketDataBus()
+        manager = StrategyManager(strategies_directory=str(tmp_path), market_data_bus=bus)
+        contexts = []
+
+        async def record(strategy_id, context):
+            contexts.append(context)
+            return await execute(strategy_id, context)
+
+        await manager.initialize()
+        try:
+            strategy_id = await manager.add_strategy_from_file(str(TEMPLATE))
+            instance = manager.strategy_instances[strategy_id]
+            execute = instance.engine.execute_strategy
+            instance.engine.execute_strategy = record
+
+            symbol = manager._strategy_symbols(instance.strategy)[0]
+            await manager.start_strategy(
+                strategy_id, ScheduleConfig(trigger=TriggerType.NEW_BAR, timeframe="1d")
+            )
+            await bus.publish_quote(symbol, {'price': 123.0, 'volume': 10})
+            await bus.publish_bars(symbol, "1d", [make_bar(i, 100 + i) for i in range(30)])
+            await bus.join()
+            await asyncio.sleep(0.1)
+        finally:
+            await manager.shutdown()
+
+        assert [context.symbol for context in contexts] == [symbol]
+        assert contexts[0].market_data['price'] == 123.0
+        assert len(contexts[0].market_data['prices']['1d']) == 30
+
+    @pytest.mark.asyncio
+    async def test_interval_run_refreshes_from_provider(self, tmp_path, monkeypatch):
+        """Test exécution planifiée: bus alimenté depuis le provider avant les contextes."""
+        monkeypatch.setattr(strategy_manager, "get_cache_manager", MultiLevelCacheManager)
+        provider = HistoryProvider(make_series(30))
+
+        manager = StrategyManager(strategies_directory=str(tmp_path), market_data_provider=provider)
+        await manager.initialize()
+        try:
+            strategy_id = await manager.add_strategy_from_file(str(TEMPLATE))
+            symbols = manager._strategy_symbols(manager.strategy_instances[strategy_id].strategy)
+            contexts = await manager._create_execution_contexts(strategy_id, {'trigger': 'interval'})
+        finally:
+            await manager.shutdown()
+
+        assert [context.symbol for context in contexts] == symbols
+        assert provider.calls == 1
+        assert provider.history_calls == len(symbols)
+        assert all(len(context.market_data['prices']['1d']) == 30 for context in contexts)
+
+    @pytest.mark.asyncio
+    async def test_risk_model_fitted_at_startup(self, tmp_path, monkeypatch):
+        """Test modèle de covariance ajusté sur l'historique des stratégies chargées au démarrage."""
+        monkeypatch.setattr(strategy_manager, "get_cache_manager", MultiLevelCacheManager)
+        (tmp_path / TEMPLATE.name).write_text(TEMPLATE.read_text())
+        provider = HistoryProvider(make_series(30))
+
+        manager = StrategyManager(strategies_directory=str(tmp_path), market_data_provider=provider)
+        await manager.initialize()
+        try:
+            instance = next(iter(manager.strategy_instances.values()))
+            symbols = manager._strategy_symbols(instance.strategy)
+            model = manager.risk_manager.covariance_model
+        finally:
+            await manager.shutdown()
+
+        assert model.is_covered([*symbols, "SPY"])
+        assert model.get_stats()['periods'] == 29
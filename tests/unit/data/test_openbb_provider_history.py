@@ -0,0 +1,139 @@
+"""
+Tests unitaires pour la récupération d'historique du provider OpenBB.
+
+Ce module teste les formats de sortie de get_historical_data
+(vue paresseuse, DataFrame, série columnar) sans accès réseau.
+"""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.data.models import BarSeries, TimeFrame
+from finagent.data.providers.openbb_provider import HistoricalRecords, OpenBBProvider
+
+
+@pytest.fixture
+def yf_history():
+    """Historique au format yfinance (index avec fuseau, colonnes capitalisées)."""
+    index = pd.date_range("2024-01-02", periods=3, freq="D", tz="America/New_York", name="Date")
+    return pd.DataFrame({
+        "Open": [100.0, 101.0, 102.0],
+        "High": [101.0, 102.0, 103.0],
+        "Low": [99.0, 100.0, 101.0],
+        "Close": [100.5, 101.5, 102.5],
+        "Volume": [1000, 2000, 3000],
+        "Dividends": [0.0, 0.0, 0.0],
+        "Stock Splits": [0.0, 0.0, 0.0],
+    }, index=index)
+
+
+@pytest.fixture
+def provider(yf_history):
+    """Provider avec yfinance simulé."""
+    ticker = Mock()
+    ticker.history.return_value = yf_history
+    with patch("finagent.data.providers.openbb_provider.yf.Ticker", return_value=ticker):
+        yield OpenBBProvider()
+
+
+class TestHistoricalData:
+    """Tests des formats de sortie de l'historique."""
+
+    @pytest.mark.asyncio
+    async def test_records_compatibility_view(self, provider):
+        """Test vue liste de dictionnaires (format historique)."""
+        records = await provider.get_historical_data("AAPL", period="1mo")
+
+        assert isinstance(records, HistoricalRecords)
+        assert len(records) == 3
+        assert records[0] == {
+            "date": "2024-01-02", "open": 100.0, "high": 101.0,
+            "low": 99.0, "close": 100.5, "volume": 1000,
+        }
+        assert records[-1]["date"] == "2024-01-04"
+        assert [r["close"] for r in records] == [100.5, 101.5, 102.5]
+
+    @pytest.mark.asyncio
+    async def test_series_output(self, provider):
+        """Test sortie columnar avec dates datetime64."""
+        series = await provider.get_historical_data("AAPL", interval="1d", output="series")
+
+        assert isinstance(series, BarSeries)
+        assert series.timeframe == TimeFrame.DAY_1
+        assert series.timestamps.dtype == np.dtype("datetime64[ns]")
+        assert series.close.tolist() == [100.5, 101.5, 102.5]
+
+    @pytest.mark.asyncio
+    async def test_frame_output(self, provider):
+        """Test sortie DataFrame normalisée."""
+        frame = await provider.get_historical_data("AAPL", output="frame")
+
+        assert frame.index.name == "date"
+        assert frame.index.tz is None
+        assert {"open", "high", "low", "close", "volume"} <= set(frame.columns)
+
+    @pytest.mark.asyncio
+    async def test_empty_history(self):
+        """Test historique vide."""
+        ticker = Mock()
+        ticker.history.return_value = pd.DataFrame()
+        with patch("finagent.data.providers.openbb_provider.yf.Ticker", return_value=ticker):
+            records = await OpenBBProvider().get_historical_data("ZZZZ")
+
+        assert len(records) == 0
+        assert not records
+
+
+@pytest.fixture
+def yf_batch():
+    """Téléchargement groupé yfinance (colonnes MultiIndex ticker/champ)."""
+    index = pd.date_range("2024-01-02", periods=3, freq="D", tz="America/New_York", name="Date")
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Open", "High", "Low", "Close", "Volume"]])
+    data = pd.DataFrame(np.arange(30.0).reshape(3, 10), index=index, columns=columns)
+    # MSFT sans donnée le premier jour
+    data.loc[index[0], ("MSFT", slice(None))] = np.nan
+    return data
+
+
+class TestBatchDownload:
+    """Tests des méthodes groupées multi-symboles."""
+
+    @pytest.mark.asyncio
+    async def test_get_quotes_single_round_trip(self, yf_batch):
+        """Test cotations multiples en un seul téléchargement."""
+        with patch("finagent.data.providers.openbb_provider.yf.download", return_value=yf_batch) as download:
+            quotes = await OpenBBProvider().get_quotes(["AAPL", "MSFT", "ZZZZ"])
+
+        assert download.call_count == 1
+        assert quotes == {
+            "AAPL": {"symbol": "AAPL", "price": 23.0},
+            "MSFT": {"symbol": "MSFT", "price": 28.0},
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_historical_batch_split_per_symbol(self, yf_batch):
+        """Test découpage par symbole de l'historique groupé."""
+        with patch("finagent.data.providers.openbb_provider.yf.download", return_value=yf_batch):
+            histories = await OpenBBProvider().get_historical_batch(
+                ["AAPL", "MSFT"], period="5d", output="series"
+            )
+
+        assert set(histories) == {"AAPL", "MSFT"}
+        assert len(histories["AAPL"]) == 3
+        assert len(histories["MSFT"]) == 2
+        assert histories["MSFT"].close.tolist() == [18.0, 28.0]
+
+    @pytest.mark.asyncio
+    async def test_get_historical_batch_explicit_range(self, yf_batch):
+        """Test plage explicite transmise à yfinance à la place de la période."""
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 5)
+        with patch("finagent.data.providers.openbb_provider.yf.download", return_value=yf_batch) as download:
+            await OpenBBProvider().get_historical_batch(["AAPL", "MSFT"], start=start, end=end)
+
+        kwargs = download.call_args.kwargs
+        assert (kwargs["start"], kwargs["end"]) == (start, end)
+        assert "period" not in kwargs
@@ -0,0 +1,120 @@
+"""
+Tests unitaires pour les indicateurs en panel et le PricePanel.
+
+Ce module vérifie que chaque ligne d'un noyau 2D est identique au noyau
+1D appliqué au symbole seul, y compris pour des historiques de
+longueurs différentes (NaN en tête de ligne).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finagent.data.indicators import kernels, panel
+from finagent.data.models import BarSeries, PricePanel, TimeFrame
+
+
+@pytest.fixture
+def ragged(random_walk):
+    """Trois symboles de 300, 250 et 120 barres alignés à droite."""
+    lengths = (300, 250, 120)
+    rows = []
+    for seed, n in enumerate(lengths):
+        close, high, low = random_walk.ohlc(n, seed)
+        rows.append((high, low, close))
+    high, low, close = (np.full((3, 300), np.nan) for _ in range(3))
+    for i, (h, l, c) in enumerate(rows):
+        high[i, -len(h):], low[i, -len(l):], close[i, -len(c):] = h, l, c
+    return high, low, close, rows
+
+
+def assert_rows_match(result, expected_rows):
+    for row, expected in zip(result, expected_rows):
+        tail = row[-len(expected):]
+        assert np.isnan(row[:-len(expected)]).all()
+        assert np.allclose(tail, expected, equal_nan=True)
+
+
+class TestPanelKernels:
+    """Parité des noyaux 2D avec les noyaux 1D."""
+
+    @pytest.mark.parametrize("name,args", [
+        ("sma", (20,)), ("ema", (12,)), ("rsi", (14,)),
+    ])
+    def test_close_indicators(self, ragged, name, args):
+        """Test indicateurs de clôture ligne par ligne."""
+        _, _, close, rows = ragged
+        result = getattr(panel, name)(close, *args)
+        assert_rows_match(result, [getattr(kernels, name)(c, *args) for _, _, c in rows])
+
+    def test_macd_and_bollinger(self, ragged):
+        """Test sorties multiples (MACD, bandes de Bollinger)."""
+        _, _, close, rows = ragged
+        for result, reference in (
+            (panel.macd(close, 12, 26, 9), [kernels.macd(c, 12, 26, 9) for _, _, c in rows]),
+            (panel.bollinger_bands(close, 20, 2.0), [kernels.bollinger_bands(c, 20, 2.0) for _, _, c in rows]),
+        ):
+            for k, output in enumerate(result):
+                assert_rows_match(output, [ref[k] for ref in reference])
+
+    @pytest.mark.parametrize("name", ["atr", "williams_r", "cci"])
+    def test_range_indicators(self, ragged, name):
+        """Test indicateurs haut/bas/clôture."""
+        high, low, close, rows = ragged
+        result = getattr(panel, name)(high, low, close)
+        assert_rows_match(result, [getattr(kernels, name)(h, l, c) for h, l, c in rows])
+
+    def test_stochastic(self, ragged):
+        """Test stochastique %K et %D."""
+        high, low, close, rows = ragged
+        k, d = panel.stochastic(high, low, close, 14, 3)
+        reference = [kernels.stochastic(h, l, c, 14, 3) for h, l, c in rows]
+        assert_rows_match(k, [ref[0] for ref in reference])
+        assert_rows_match(d, [ref[1] for ref in reference])
+
+    def test_statistics(self, ragged):
+        """Test volatilité, pente et pivots contre numpy/pandas."""
+        high, _, close, rows = ragged
+        volatility = panel.annualized_volatility(close)
+        slope = panel.linear_slope(close, 20)
+        for i, (h, _, c) in enumerate(rows):
+            expected = pd.Series(c).pct_change().dropna().std() * np.sqrt(252)
+            assert volatility[i] == pytest.approx(expected)
+            assert slope[i] == pytest.approx(np.polyfit(np.arange(20), c[-20:], 1)[0])
+
+        mask = panel.pivot_mask(high[:1], 5)[0]
+        h = rows[0][0]
+        expected = [i for i in range(5, len(h) - 5) if h[i] >= h[i - 5:i + 6].max()]
+        assert np.flatnonzero(mask).tolist() == expected
+
+    def test_last_values_default(self, ragged):
+        """Test valeur par défaut des lignes non définies."""
+        _, _, close, _ = ragged
+        values = panel.sma(close, 200)
+        assert np.isnan(panel.last_values(values)[2])
+        assert panel.last_values(values, 0.0)[2] == 0.0
+
+
+class TestPricePanel:
+    """Tests de l'alignement du panel."""
+
+    def test_alignment_and_gaps(self):
+        """Test union des dates, NaN en tête, barres manquantes reportées."""
+        dates = pd.bdate_range("2024-01-01", periods=6)
+        a = BarSeries(symbol="aaa", timeframe=TimeFrame.DAY_1, timestamps=dates,
+                      open=np.arange(6.0), high=np.arange(6.0) + 1, low=np.arange(6.0) - 1,
+                      close=np.arange(6.0), volume=np.full(6, 10.0))
+        keep = [1, 2, 4, 5]
+        b = BarSeries(symbol="bbb", timeframe=TimeFrame.DAY_1, timestamps=dates[keep],
+                      open=np.array(keep, float), high=np.array(keep, float), low=np.array(keep, float),
+                      close=np.array(keep, float) * 10, volume=np.full(4, 5.0))
+
+        prices = PricePanel.from_series({"aaa": a, "bbb": b})
+
+        assert prices.symbols == ["AAA", "BBB"]
+        assert prices.shape == (2, 6)
+        assert np.isnan(prices.close[1, 0])
+        assert prices.close[1, 3] == prices.high[1, 3] == 20.0
+        assert np.isnan(prices.volume[1, 3])
+        assert prices.valid_counts().tolist() == [6, 5]
+        assert prices.select(["bbb", "zzz"]).symbols == ["BBB"]
@@ -0,0 +1,172 @@
+"""
+Tests unitaires pour les indicateurs incrémentaux.
+
+Ce module vérifie que les états incrémentaux reproduisent les noyaux
+vectorisés, la révision de la barre en cours et la synchronisation du
+registre avec un historique qui s'allonge.
+"""
+
+import pandas as pd
+import pytest
+
+from finagent.data.indicators import kernels
+from finagent.data.indicators.streaming import (
+    IndicatorRegistry, StreamingATR, StreamingBollinger, StreamingEMA,
+    StreamingMACD, StreamingRSI, StreamingSMA, indicator_key
+)
+from finagent.data.models import BarSeries, TimeFrame
+
+
+@pytest.fixture
+def ohlc(random_walk):
+    """Clôtures, plus hauts et plus bas d'une marche aléatoire."""
+    return random_walk.ohlc(250, seed=7)
+
+
+def feed(indicator, close, high, low):
+    """Alimente un indicateur barre par barre."""
+    for c, h, l in zip(close, high, low):
+        indicator.update(c, h, l)
+    return indicator
+
+
+class TestStreamingIndicators:
+    """Tests d'équivalence avec les noyaux vectorisés."""
+
+    def test_moving_averages(self, ohlc):
+        """Test SMA et EMA."""
+        close, high, low = ohlc
+
+        assert feed(StreamingSMA(20), *ohlc).value == pytest.approx(kernels.sma(close, 20)[-1])
+        assert feed(StreamingEMA(10), *ohlc).value == pytest.approx(kernels.ema(close, 10)[-1])
+
+    def test_rsi_and_atr(self, ohlc):
+        """Test RSI et ATR (lissage de Wilder)."""
+        close, high, low = ohlc
+
+        assert feed(StreamingRSI(14), *ohlc).value == pytest.approx(kernels.rsi(close, 14)[-1])
+        assert feed(StreamingATR(14), *ohlc).value == pytest.approx(kernels.atr(high, low, close, 14)[-1])
+
+    def test_macd_and_bollinger(self, ohlc):
+        """Test MACD et bandes de Bollinger."""
+        close = ohlc[0]
+        macd_line, signal_line, histogram = kernels.macd(close, 12, 26, 9)
+        upper, middle, lower, std = kernels.bollinger_bands(close, 20, 2.0)
+
+        macd = feed(StreamingMACD(12, 26, 9), *ohlc).value
+        bands = feed(StreamingBollinger(20, 2.0), *ohlc).value
+
+        assert macd['macd'] == pytest.approx(macd_line[-1])
+        assert macd['signal'] == pytest.approx(signal_line[-1])
+        assert macd['histogram'] == pytest.approx(histogram[-1])
+        assert bands['upper'] == pytest.approx(upper[-1])
+        assert bands['lower'] == pytest.approx(lower[-1])
+
+    def test_warmup(self):
+        """Test absence de valeur pendant la chauffe."""
+        rsi = StreamingRSI(14)
+        for price in range(14):
+            rsi.update(float(price))
+
+        assert not rsi.ready
+        rsi.update(14.0)
+        assert rsi.value == 100.0
+
+    def test_revise_last_bar(self, ohlc):
+        """Test révision de la barre en cours sans rejouer l'historique."""
+        close, high, low = ohlc
+        revised = close.copy()
+        revised[-1] += 3.0
+        indicators = [StreamingSMA(20), StreamingRSI(14), StreamingBollinger(20, 2.0)]
+        for indicator in indicators:
+            feed(indicator, *ohlc)
+            indicator.revise(close[-1] + 1.0)
+            indicator.revise(revised[-1])
+
+        assert indicators[0].value == pytest.approx(kernels.sma(revised, 20)[-1])
+        assert indicators[1].value == pytest.approx(kernels.rsi(revised, 14)[-1])
+        assert indicators[2].value['middle'] == pytest.approx(kernels.sma(revised, 20)[-1])
+
+
+class TestIndicatorRegistry:
+    """Tests du registre d'états."""
+
+    def test_incremental_sync(self, ohlc, random_walk):
+        """Test intégration des seules nouvelles barres."""
+        close = ohlc[0]
+        bars = random_walk.bars(close)
+        registry = IndicatorRegistry()
+        registry.get("AAPL", "1d", "rsi", {'period': 14})
+        key = indicator_key("rsi", "1d", {'period': 14})
+
+        registry.update("AAPL", "1d", bars[:200])
+        values = registry.update("AAPL", "1d", bars[:201])
+
+        assert values[key] == pytest.approx(kernels.rsi(close[:201], 14)[-1])
+        # 200 barres initiales + révision de la 200e + 1 nouvelle
+        assert registry.bars_applied == 201
+        assert registry.bars_revised == 1
+
+    def test_live_bar_revision(self, ohlc, random_walk):
+        """Test mise à jour de la barre en cours (même date)."""
+        close = ohlc[0]
+        bars = random_walk.bars(close)
+        registry = IndicatorRegistry()
+        registry.get("AAPL", "1d", "sma", {'period': 20})
+        registry.update("AAPL", "1d", bars)
+
+        bars[-1] = {**bars[-1], 'close': close[-1] + 2.0}
+        values = registry.update("AAPL", "1d", bars)
+
+        revised = close.copy()
+        revised[-1] += 2.0
+        assert values[indicator_key("sma", "1d", {'period': 20})] == pytest.approx(kernels.sma(revised, 20)[-1])
+
+    def test_rolling_window_and_replay(self, ohlc, random_walk):
+        """Test fenêtre glissante puis historique sans recouvrement."""
+        close = ohlc[0]
+        bars = random_walk.bars(close)
+        registry = IndicatorRegistry()
+        registry.get("AAPL", "1d", "ema", {'period': 10})
+        key = indicator_key("ema", "1d", {'period': 10})
+
+        registry.update("AAPL", "1d", bars[:100])
+        values = registry.update("AAPL", "1d", bars[20:120])
+        assert values[key] == pytest.approx(kernels.ema(close[:120], 10)[-1])
+
+        values = registry.update("AAPL", "1d", bars[200:])
+        assert values[key] == pytest.approx(kernels.ema(close[200:], 10)[-1])
+        assert registry.replays == 2
+
+    def test_untimed_sliding_window(self, ohlc, random_walk):
+        """Test fenêtre glissante de même longueur sans horodatage."""
+        close = ohlc[0]
+        bars = [{k: v for k, v in bar.items() if k != 'date'} for bar in random_walk.bars(close)]
+        registry = IndicatorRegistry()
+        registry.get("AAPL", "1d", "sma", {'period': 20})
+        key = indicator_key("sma", "1d", {'period': 20})
+
+        registry.update("AAPL", "1d", bars[:100])
+        values = registry.update("AAPL", "1d", bars[1:101])
+        assert values[key] == pytest.approx(kernels.sma(close[1:101], 20)[-1])
+
+    def test_bar_series_input(self, ohlc):
+        """Test synchronisation depuis une série columnar."""
+        close, high, low = ohlc
+        timestamps = pd.date_range("2024-01-01", periods=len(close), freq="D")
+        series = BarSeries("AAPL", TimeFrame.DAY_1, timestamps, close, high, low, close)
+        registry = IndicatorRegistry()
+        registry.get("AAPL", "1d", "atr", {'period': 14})
+
+        registry.update("AAPL", "1d", series[:150])
+        values = registry.update("AAPL", "1d", series)
+
+        assert values[indicator_key("atr", "1d", {'period': 14})] == pytest.approx(
+            kernels.atr(high, low, close, 14)[-1]
+        )
+        assert registry.bars_applied == len(close)
+
+    def test_key_is_order_independent(self):
+        """Test clé indépendante de l'ordre des paramètres."""
+        assert indicator_key("macd", "1d", {'fast_period': 12, 'slow_period': 26}) == \
+            indicator_key("macd", "1d", {'slow_period': 26, 'fast_period': 12})
@@ -0,0 +1,76 @@
+"""
+Tests unitaires pour le service d'indicateurs techniques.
+
+Ce module vérifie les clés et tags de cache (valeur du timeframe) et le
+partage d'un seul historique entre les indicateurs d'un même symbole.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from finagent.data.cache import CacheTags, MultiLevelCacheManager
+from finagent.data.models import BarSeries, IndicatorType, TimeFrame
+from finagent.data.services.technical_indicators_service import TechnicalIndicatorsService
+
+
+class SeriesProvider:
+    """Provider lent renvoyant une série journalière et comptant ses appels."""
+
+    def __init__(self, periods: int = 100):
+        closes = 100 + np.cumsum(np.random.default_rng(5).normal(0, 1, periods))
+        timestamps = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(periods)]
+        self.series = BarSeries("AAPL", TimeFrame.DAY_1, timestamps, closes, closes + 1, closes - 1, closes,
+                                volume=np.full(periods, 1000))
+        self.calls = 0
+
+    async def get_historical_data(self, symbol, timeframe, start_date, end_date):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.series
+
+
+@pytest.fixture
+def service():
+    service = TechnicalIndicatorsService(SeriesProvider(), cache_manager=MultiLevelCacheManager(), max_workers=2)
+    yield service
+    service.executor.shutdown(wait=True)
+
+
+class TestTechnicalIndicatorsService:
+    """Tests du cache et du partage d'historique."""
+
+    @pytest.mark.asyncio
+    async def test_cache_keys_use_timeframe_value(self, service):
+        """Test clés et tags construits avec la valeur du timeframe ("1d")."""
+        await service.calculate_rsi("AAPL", TimeFrame.DAY_1, period=14)
+
+        keys = set(service.cache_manager.l1_backend.cache)
+        assert keys == {"indicator:AAPL:1d:rsi_14", "historical_series:AAPL:-100d:now:1d"}
+        assert await service.cache_manager.l1_backend.invalidate_by_tag(CacheTags.timeframe("1d")) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_indicators_share_one_fetch(self, service):
+        """Test indicateurs concurrents calculés sur un seul historique."""
+        rsi, sma = await asyncio.gather(
+            service.calculate_rsi("AAPL", TimeFrame.DAY_1, period=14),
+            service.calculate_moving_average("AAPL", TimeFrame.DAY_1, IndicatorType.SMA, 20)
+        )
+
+        assert service.provider.calls == 1
+        assert "indicator:AAPL:1d:sma_20" in service.cache_manager.l1_backend.cache
+        assert float(sma.value) == pytest.approx(service.provider.series.close[-20:].mean())
+        assert 0 <= float(rsi.value) <= 100
+
+    @pytest.mark.asyncio
+    async def test_collection_served_from_cache(self, service):
+        """Test collection recalculée depuis le cache sans nouvel appel provider."""
+        config = [{'type': 'sma', 'period': 20}, {'type': 'rsi', 'period': 14}]
+        first = await service.calculate_indicator_collection("AAPL", TimeFrame.DAY_1, config)
+        second = await service.calculate_indicator_collection("AAPL", TimeFrame.DAY_1, config)
+
+        assert service.provider.calls == 1
+        assert list(first.indicators) == list(second.indicators) == ["SMA_20", "RSI_14"]
+        assert service.calculations_count == 2
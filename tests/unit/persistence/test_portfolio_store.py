@@ -0,0 +1,164 @@
+"""
+Tests unitaires pour le stockage des séries de portefeuille.
+
+Ce module vérifie l'enregistrement et la relecture par période des
+snapshots, transactions et portefeuilles, ainsi que la reprise de
+l'historique de performance et des portefeuilles (revalorisation
+comprise) après redémarrage.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from finagent.business.models.decision_models import DecisionAction
+from finagent.business.models.portfolio_models import Portfolio
+from finagent.business.portfolio import PerformanceTracker, PortfolioHistory, PortfolioManager
+from finagent.persistence.storage import PortfolioStore
+
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PortfolioStore(tmp_path / "portfolio.db")
+    yield store
+    store.close()
+
+
+def append_days(store, portfolio_id, days=60):
+    """Snapshots journaliers d'une courbe de valeur aléatoire."""
+    values = 10000 * np.cumprod(1 + np.random.default_rng(2).normal(0, 0.01, days))
+    for i, value in enumerate(values):
+        store.append_snapshot(
+            portfolio_id, START + timedelta(days=i),
+            {'total_value': value, 'total_pnl': value - 10000, 'position_count': 1},
+            {'AAPL': {'quantity': 10.0, 'market_value': value, 'weight': 1.0, 'pnl': value - 10000}}
+        )
+    return values
+
+
+def buy_decision():
+    """Décision d'achat de 10 AAPL à 100."""
+    return SimpleNamespace(
+        id=uuid4(), symbol="AAPL", action=DecisionAction.BUY, is_actionable=True,
+        quantity=Decimal("10"), price_target=None, decision_context={'current_price': Decimal("100")}
+    )
+
+
+class TestPortfolioStore:
+    """Tests du stockage."""
+
+    def test_snapshot_range_query(self, store):
+        """Test colonnes d'une période, portefeuilles isolés."""
+        portfolio_id = uuid4()
+        values = append_days(store, portfolio_id)
+        append_days(store, uuid4(), 5)
+
+        timestamps, columns = store.load_snapshots(
+            portfolio_id, START + timedelta(days=10), START + timedelta(days=19))
+        assert len(timestamps) == 10
+        assert np.allclose(columns['total_value'], values[10:20])
+        assert len(store.load_positions(portfolio_id, end=START + timedelta(days=2))) == 3
+        assert store.get_stats()['portfolio_snapshots'] == 65
+
+        assert store.prune_snapshots(portfolio_id, START + timedelta(days=30)) == 30
+        assert len(store.load_snapshots(portfolio_id)[0]) == 30
+
+    def test_history_rebuilt_without_replay(self, store):
+        """Test historique reconstruit identique à l'historique alimenté snapshot par snapshot."""
+        portfolio_id = uuid4()
+        values = append_days(store, portfolio_id)
+        appended = PortfolioHistory(retention=None)
+        for i, value in enumerate(values):
+            appended.append(START + timedelta(days=i), {'total_value': value, 'total_pnl': value - 10000})
+
+        loaded = store.load_history(portfolio_id, retention=None)
+        since = START + timedelta(days=20)
+        assert len(loaded) == len(appended)
+        assert loaded.period_volatility(since) == pytest.approx(appended.period_volatility(since))
+        assert loaded.period_max_drawdown(since) == pytest.approx(appended.period_max_drawdown(since))
+        assert loaded.win_loss() == pytest.approx(appended.win_loss())
+        assert loaded.current_drawdown() == pytest.approx(appended.current_drawdown())
+
+        retention = timedelta(days=30)
+        windowed = PortfolioHistory(retention=retention)
+        for i, value in enumerate(values):
+            windowed.append(START + timedelta(days=i), {'total_value': value, 'total_pnl': value - 10000})
+        reloaded = store.load_history(portfolio_id, retention=retention)
+        assert len(reloaded) == len(windowed)
+        assert reloaded.current_drawdown() == pytest.approx(windowed.current_drawdown())
+        assert reloaded.current_drawdown() == pytest.approx(1 - values[-1] / values[-len(windowed):].max())
+
+
+class TestRestart:
+    """Tests de reprise après redémarrage."""
+
+    @pytest.mark.asyncio
+    async def test_tracker_history_survives_restart(self, tmp_path):
+        """Test snapshots rechargés par un nouveau tracker."""
+        path = tmp_path / "portfolio.db"
+        portfolio = Portfolio(
+            name="test", total_value=Decimal("1000"), cash_balance=Decimal("1000"),
+            invested_amount=Decimal("0"), available_cash=Decimal("1000")
+        )
+        store = PortfolioStore(path)
+        tracker = PerformanceTracker(None, store=store)
+        for value in ("1000", "1010", "990"):
+            portfolio.total_value = Decimal(value)
+            await tracker.track_portfolio_snapshot(portfolio)
+        store.close()
+
+        store = PortfolioStore(path)
+        history = PerformanceTracker(None, store=store).get_history(portfolio.id)
+        assert len(history) == 3
+        assert history.last_return() == pytest.approx(990 / 1010 - 1)
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_portfolios_and_transactions_survive_restart(self, tmp_path):
+        """Test portefeuille et transactions rechargés par un nouveau gestionnaire."""
+        path = tmp_path / "portfolio.db"
+        store = PortfolioStore(path)
+        manager = PortfolioManager(openbb_provider=None, store=store)
+        portfolio = await manager.create_portfolio("test", Decimal("10000"))
+        transaction = await manager.execute_decision(portfolio.id, buy_decision())
+        store.close()
+
+        store = PortfolioStore(path)
+        restarted = PortfolioManager(openbb_provider=None, store=store)
+        assert await restarted.load_portfolios() == 1
+        restored = await restarted.get_portfolio(portfolio.id)
+        assert restored.cash_balance == portfolio.cash_balance
+        assert restored.positions["AAPL"].quantity == Decimal("10")
+        history = await restarted.get_transaction_history(portfolio.id)
+        assert [t.id for t in history] == [transaction.id]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_revaluation_survives_restart(self, tmp_path):
+        """Test portefeuilles revalorisés enregistrés en une écriture."""
+        class QuoteProvider:
+            async def get_quotes(self, symbols):
+                return {symbol: {'price': 120.0} for symbol in symbols}
+
+        path = tmp_path / "portfolio.db"
+        store = PortfolioStore(path)
+        manager = PortfolioManager(openbb_provider=QuoteProvider(), store=store)
+        portfolio = await manager.create_portfolio("test", Decimal("10000"))
+        await manager.execute_decision(portfolio.id, buy_decision())
+        await manager.update_portfolio_prices(portfolio.id)
+        store.close()
+
+        store = PortfolioStore(path)
+        restarted = PortfolioManager(openbb_provider=None, store=store)
+        await restarted.load_portfolios()
+        restored = await restarted.get_portfolio(portfolio.id)
+        assert restored.positions["AAPL"].current_price == Decimal("120.0")
+        assert restored.total_value == portfolio.total_value
+        store.close()